@@ -9,8 +9,11 @@ import logging
 import asyncio
 import psutil
 import time
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Any, Tuple, Union
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 from transformers import (
@@ -27,6 +30,7 @@ from enum import Enum
 
 # Import our model catalog
 from model_catalog import ModelCatalog, ModelInfo, ModelType, ModelCategory
+from inference_batcher import InferenceBatchManager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -49,6 +53,32 @@ ENABLE_GPU = os.getenv("ENABLE_GPU", "false").lower() == "true"
 MAX_CONCURRENT_MODELS = int(os.getenv("MAX_CONCURRENT_MODELS", "3"))
 AUTO_UNLOAD_INACTIVE_MODELS = os.getenv("AUTO_UNLOAD_INACTIVE_MODELS", "true").lower() == "true"
 INACTIVE_THRESHOLD_MINUTES = int(os.getenv("INACTIVE_THRESHOLD_MINUTES", "30"))
+MODEL_SELECTION_CACHE_TTL_SECONDS = int(os.getenv("MODEL_SELECTION_CACHE_TTL_SECONDS", "300"))
+SYSTEM_RESOURCES_REFRESH_SECONDS = float(os.getenv("SYSTEM_RESOURCES_REFRESH_SECONDS", "5"))
+MODEL_LOAD_WORKERS = int(os.getenv("MODEL_LOAD_WORKERS", "2"))
+# Memory kept free for inference and the rest of the process when deciding whether to evict
+MODEL_MEMORY_HEADROOM_GB = float(os.getenv("MODEL_MEMORY_HEADROOM_GB", "1.0"))
+# Optional cap on total measured model memory (0 = limited only by available memory)
+MODEL_MEMORY_BUDGET_GB = float(os.getenv("MODEL_MEMORY_BUDGET_GB", "0"))
+
+# Per-model micro-batching workers for chat and embedding inference
+inference_batches = InferenceBatchManager()
+
+# Auto-selection results keyed by (catalog recommendation, model type) -> (model_id, expires_at)
+model_selection_cache: Dict[Tuple[Optional[str], ModelType], Tuple[Optional[str], float]] = {}
+
+# Latest system resource sample, refreshed in the background so requests never wait on psutil
+system_resources_snapshot: Dict[str, Any] = {}
+service_state: Dict[str, Any] = {"startup_complete": False, "resource_refresh_task": None}
+
+# Load state per model id: "loading", "loaded" or "failed"
+model_load_state: Dict[str, Dict[str, Any]] = {}
+
+# In-flight loads keyed by model id, so concurrent requests share one load
+model_load_tasks: Dict[str, "asyncio.Task"] = {}
+
+# Model downloads and weight loading run here instead of on the event loop
+model_load_executor = ThreadPoolExecutor(max_workers=MODEL_LOAD_WORKERS, thread_name_prefix="model-load")
 
 # Pydantic models for API
 class ModelSelectionRequest(BaseModel):
@@ -111,17 +141,50 @@ class ModelStatusResponse(BaseModel):
     recommendations: Dict[str, Any] = Field(..., description="System recommendations")
 
 # Utility functions
-def get_system_resources() -> Dict[str, Any]:
-    """Get current system resource usage"""
+def refresh_system_resources() -> Dict[str, Any]:
+    """Sample system resource usage without blocking and store it as the current snapshot"""
+    global system_resources_snapshot
     memory = psutil.virtual_memory()
-    return {
+    if "has_gpu" in system_resources_snapshot:
+        has_gpu = system_resources_snapshot["has_gpu"]
+        gpu_count = system_resources_snapshot["gpu_count"]
+    else:
+        has_gpu = torch.cuda.is_available() if ENABLE_GPU else False
+        gpu_count = torch.cuda.device_count() if has_gpu else 0
+    system_resources_snapshot = {
         "total_memory_gb": round(memory.total / (1024**3), 2),
         "available_memory_gb": round(memory.available / (1024**3), 2),
         "memory_usage_percent": memory.percent,
         "cpu_count": psutil.cpu_count(),
-        "cpu_usage_percent": psutil.cpu_percent(interval=1),
-        "has_gpu": torch.cuda.is_available() if ENABLE_GPU else False,
-        "gpu_count": torch.cuda.device_count() if ENABLE_GPU and torch.cuda.is_available() else 0
+        # Usage since the previous sample; interval=None never sleeps
+        "cpu_usage_percent": psutil.cpu_percent(interval=None),
+        "has_gpu": has_gpu,
+        "gpu_count": gpu_count,
+        "sampled_at": datetime.utcnow().isoformat()
+    }
+    return system_resources_snapshot
+
+def get_system_resources() -> Dict[str, Any]:
+    """Get the latest system resource usage snapshot"""
+    if not system_resources_snapshot:
+        return dict(refresh_system_resources())
+    return dict(system_resources_snapshot)
+
+async def _refresh_system_resources_periodically():
+    """Keep the system resource snapshot fresh"""
+    while True:
+        try:
+            refresh_system_resources()
+        except Exception as e:
+            logger.warning(f"Failed to sample system resources: {e}")
+        await asyncio.sleep(SYSTEM_RESOURCES_REFRESH_SECONDS)
+
+def _set_model_load_state(model_id: str, state: str, error: Optional[str] = None):
+    """Record a model's load state for readiness and status reporting"""
+    model_load_state[model_id] = {
+        "state": state,
+        "error": error,
+        "updated_at": datetime.utcnow().isoformat()
     }
 
 def get_model_performance_metrics(model_id: str, processing_time: float, response_length: int) -> Dict[str, Any]:
@@ -142,11 +205,27 @@ def get_model_performance_metrics(model_id: str, processing_time: float, respons
     }
 
 async def auto_select_model_for_task(task_description: str, model_type: ModelType = ModelType.SMALL_LLM) -> Optional[str]:
-    """Automatically select the best model for a given task"""
-    system_resources = get_system_resources()
-    
+    """
+    Automatically select the best model for a given task.
+    The catalog recommendation only depends on a few keywords, so the validated
+    choice is cached per recommendation and model type instead of re-checking
+    system resources on every request.
+    """
     # Get recommended model from catalog
     recommended_model = ModelCatalog.get_recommended_model_for_task(task_description)
+    cache_key = (recommended_model.id if recommended_model else None, model_type)
+    cached = model_selection_cache.get(cache_key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    
+    model_id = _select_model(recommended_model, model_type)
+    model_selection_cache[cache_key] = (model_id, time.monotonic() + MODEL_SELECTION_CACHE_TTL_SECONDS)
+    return model_id
+
+def _select_model(recommended_model: Optional[ModelInfo], model_type: ModelType) -> Optional[str]:
+    """Validate the recommended model against system resources, falling back to defaults"""
+    system_resources = get_system_resources()
+    
     if recommended_model:
         # Validate if the recommended model can be loaded
         validation = ModelCatalog.validate_model_selection(
@@ -191,16 +270,91 @@ async def unload_inactive_models():
         await unload_model(model_id)
         logger.info(f"Auto-unloaded inactive model: {model_id}")
 
+def _model_memory_gb(model_id: str) -> float:
+    """Measured memory of a loaded model, falling back to the catalog requirement"""
+    memory_bytes = loaded_models.get(model_id, {}).get("memory_bytes")
+    if memory_bytes:
+        return memory_bytes / (1024**3)
+    model_info = ModelCatalog.get_model_info(model_id)
+    return model_info.memory_requirement_gb if model_info else 0.0
+
+def _eviction_priority(model_id: str, now: float) -> float:
+    """
+    How much a loaded model is worth keeping; the lowest is evicted first.
+    Recently used models and models that are slow to reload are kept, while
+    idle models that free a lot of memory go first.
+    """
+    stats = model_usage_stats.get(model_id, {})
+    idle_seconds = max(0.0, now - stats.get("last_used", 0))
+    load_seconds = stats.get("load_seconds", 1.0)
+    return load_seconds / ((idle_seconds + 1.0) * max(_model_memory_gb(model_id), 0.01))
+
+def _needs_room(required_gb: float) -> bool:
+    """Whether loading a model of the given size requires evicting another first"""
+    if MAX_CONCURRENT_MODELS > 0 and len(loaded_models) >= MAX_CONCURRENT_MODELS:
+        return True
+    if MODEL_MEMORY_BUDGET_GB > 0:
+        used_gb = sum(_model_memory_gb(model_id) for model_id in loaded_models)
+        if used_gb + required_gb > MODEL_MEMORY_BUDGET_GB:
+            return True
+    return get_system_resources()["available_memory_gb"] < required_gb + MODEL_MEMORY_HEADROOM_GB
+
+async def _make_room_for(model_id: str, required_gb: float):
+    """Evict loaded models, least valuable first, until the new model fits"""
+    reclaimable_gb = sum(_model_memory_gb(loaded_id) for loaded_id in loaded_models if loaded_id != model_id)
+    if get_system_resources()["available_memory_gb"] + reclaimable_gb < required_gb:
+        # Evicting everything would still not free enough memory; let validation reject the load
+        return
+    while loaded_models and _needs_room(required_gb):
+        now = time.time()
+        candidates = [loaded_id for loaded_id in loaded_models if loaded_id != model_id]
+        if not candidates:
+            break
+        victim = min(candidates, key=lambda loaded_id: _eviction_priority(loaded_id, now))
+        logger.info(f"Evicting model {victim} ({_model_memory_gb(victim):.2f}GB) to load {model_id}")
+        await unload_model(victim)
+
+def _measure_model_memory(model: Any) -> int:
+    """Bytes held by a model's parameters and buffers"""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+    except Exception:
+        return 0
+
 # Model loading functions
 async def load_model_from_catalog(model_id: str) -> bool:
-    """Load a model from the catalog"""
+    """
+    Load a model from the catalog.
+    Concurrent calls for the same model share a single load.
+    """
+    if model_id in loaded_models:
+        logger.info(f"Model {model_id} already loaded")
+        return True
+    
+    load_task = model_load_tasks.get(model_id)
+    if load_task is None:
+        load_task = asyncio.create_task(_load_model(model_id))
+        model_load_tasks[model_id] = load_task
+        load_task.add_done_callback(lambda _: model_load_tasks.pop(model_id, None))
+    
+    # A cancelled caller must not cancel the load other callers are waiting on
+    return await asyncio.shield(load_task)
+
+async def _load_model(model_id: str) -> bool:
+    """Validate, make room for and load one model"""
     try:
         model_info = ModelCatalog.get_model_info(model_id)
         if not model_info:
             raise ValueError(f"Model {model_id} not found in catalog")
         
+        _set_model_load_state(model_id, "loading")
+        
+        # Evict less valuable models if the new one would not fit
+        await _make_room_for(model_id, model_info.memory_requirement_gb)
+        
         # Validate system resources
-        system_resources = get_system_resources()
+        system_resources = refresh_system_resources()
         validation = ModelCatalog.validate_model_selection(
             model_id,
             system_resources["available_memory_gb"],
@@ -210,18 +364,8 @@ async def load_model_from_catalog(model_id: str) -> bool:
         if not validation["valid"]:
             raise ValueError(f"Cannot load model: {validation['reason']}")
         
-        # Check if already loaded
-        if model_id in loaded_models:
-            logger.info(f"Model {model_id} already loaded")
-            return True
-        
-        # Unload inactive models if we're at the limit
-        if len(loaded_models) >= MAX_CONCURRENT_MODELS:
-            await unload_inactive_models()
-            if len(loaded_models) >= MAX_CONCURRENT_MODELS:
-                raise ValueError(f"Maximum concurrent models limit reached ({MAX_CONCURRENT_MODELS})")
-        
         logger.info(f"Loading model: {model_info.name}")
+        load_started = time.perf_counter()
         
         # Load based on model type
         if model_info.model_type in [ModelType.SMALL_LLM, ModelType.LARGE_LLM, ModelType.SPECIALIZED]:
@@ -236,18 +380,24 @@ async def load_model_from_catalog(model_id: str) -> bool:
             "loaded_at": time.time(),
             "last_used": time.time(),
             "usage_count": 0,
-            "total_processing_time": 0.0
+            "total_processing_time": 0.0,
+            "load_seconds": time.perf_counter() - load_started
         }
         
-        logger.info(f"Successfully loaded model: {model_info.name}")
+        _set_model_load_state(model_id, "loaded")
+        refresh_system_resources()
+        logger.info(f"Successfully loaded model: {model_info.name} "
+                    f"({_model_memory_gb(model_id):.2f}GB in {model_usage_stats[model_id]['load_seconds']:.1f}s)")
         return True
         
     except Exception as e:
+        if model_id not in loaded_models:
+            _set_model_load_state(model_id, "failed", str(e))
         logger.error(f"Error loading model {model_id}: {e}")
         raise
 
-async def load_chat_model(model_id: str, model_info: ModelInfo):
-    """Load a chat model"""
+def _load_chat_model_sync(model_info: ModelInfo) -> Tuple[Any, Any, Any]:
+    """Download and load a chat model, tokenizer and pipeline (blocking)"""
     tokenizer = AutoTokenizer.from_pretrained(
         model_info.huggingface_id,
         trust_remote_code=False,
@@ -262,6 +412,9 @@ async def load_chat_model(model_id: str, model_info: ModelInfo):
         else:
             tokenizer.add_special_tokens({'pad_token': '[PAD]'})
     
+    # Decoder-only models must be left-padded for batched generation
+    tokenizer.padding_side = "left"
+    
     model = AutoModelForCausalLM.from_pretrained(
         model_info.huggingface_id,
         torch_dtype=torch.float16 if ENABLE_GPU else torch.float32,
@@ -277,18 +430,10 @@ async def load_chat_model(model_id: str, model_info: ModelInfo):
         tokenizer=tokenizer,
         device=0 if ENABLE_GPU else -1
     )
-    
-    # Store in global variables
-    loaded_models[model_id] = {
-        "model": model,
-        "tokenizer": tokenizer,
-        "type": "chat",
-        "model_info": model_info.dict()
-    }
-    model_pipelines[model_id] = pipe
+    return model, tokenizer, pipe
 
-async def load_embedding_model(model_id: str, model_info: ModelInfo):
-    """Load an embedding model"""
+def _load_embedding_model_sync(model_info: ModelInfo) -> Tuple[Any, Any, Any]:
+    """Download and load an embedding model, tokenizer and pipeline (blocking)"""
     tokenizer = AutoTokenizer.from_pretrained(
         model_info.huggingface_id,
         trust_remote_code=False,
@@ -311,16 +456,32 @@ async def load_embedding_model(model_id: str, model_info: ModelInfo):
         tokenizer=tokenizer,
         device=0 if ENABLE_GPU else -1
     )
-    
-    # Store in global variables
+    return model, tokenizer, pipe
+
+def _store_loaded_model(model_id: str, model_info: ModelInfo, model_type: str, loaded: Tuple[Any, Any, Any]):
+    """Register a loaded model and its pipeline"""
+    model, tokenizer, pipe = loaded
     loaded_models[model_id] = {
         "model": model,
         "tokenizer": tokenizer,
-        "type": "embedding",
-        "model_info": model_info.dict()
+        "type": model_type,
+        "model_info": model_info.dict(),
+        "memory_bytes": _measure_model_memory(model)
     }
     model_pipelines[model_id] = pipe
 
+async def load_chat_model(model_id: str, model_info: ModelInfo):
+    """Load a chat model in the model loading executor"""
+    loop = asyncio.get_running_loop()
+    loaded = await loop.run_in_executor(model_load_executor, _load_chat_model_sync, model_info)
+    _store_loaded_model(model_id, model_info, "chat", loaded)
+
+async def load_embedding_model(model_id: str, model_info: ModelInfo):
+    """Load an embedding model in the model loading executor"""
+    loop = asyncio.get_running_loop()
+    loaded = await loop.run_in_executor(model_load_executor, _load_embedding_model_sync, model_info)
+    _store_loaded_model(model_id, model_info, "embedding", loaded)
+
 async def unload_model(model_id: str):
     """Unload a model to free memory"""
     try:
@@ -328,6 +489,9 @@ async def unload_model(model_id: str):
             logger.warning(f"Model {model_id} not loaded")
             return
         
+        # Stop the model's batching workers before dropping the pipeline
+        await inference_batches.remove_model(model_id)
+        
         # Remove from loaded models
         del loaded_models[model_id]
         if model_id in model_pipelines:
@@ -336,6 +500,7 @@ async def unload_model(model_id: str):
         # Remove usage stats
         if model_id in model_usage_stats:
             del model_usage_stats[model_id]
+        model_load_state.pop(model_id, None)
         
         # Force garbage collection
         import gc
@@ -344,12 +509,45 @@ async def unload_model(model_id: str):
         if ENABLE_GPU and torch.cuda.is_available():
             torch.cuda.empty_cache()
         
+        refresh_system_resources()
         logger.info(f"Successfully unloaded model: {model_id}")
         
     except Exception as e:
         logger.error(f"Error unloading model {model_id}: {e}")
         raise
 
+# Batched inference functions, run in the batcher's worker thread
+def _run_chat_batch(pipe, input_texts: List[str], generation_params: Tuple[int, float, float]) -> List[str]:
+    """Generate completions for a batch of prompts sharing generation parameters"""
+    max_length, temperature, top_p = generation_params
+    results = pipe(
+        list(input_texts),
+        max_length=max_length,
+        temperature=temperature,
+        top_p=top_p,
+        do_sample=True,
+        pad_token_id=pipe.tokenizer.eos_token_id,
+        batch_size=len(input_texts)
+    )
+    return [result[0]["generated_text"] for result in results]
+
+def _run_embedding_batch(pipe, texts: List[str], _group_key: Any = None) -> List[List[float]]:
+    """
+    Embed a batch of texts with one forward pass.
+    
+    Texts are padded to the longest in the batch, so each one is mean-pooled
+    over its own tokens via the attention mask; otherwise an embedding would
+    depend on which requests happened to share its batch.
+    """
+    tokenizer, model = pipe.tokenizer, pipe.model
+    encoded = tokenizer(list(texts), padding=True, truncation=True, return_tensors="pt")
+    encoded = {name: tensor.to(model.device) for name, tensor in encoded.items()}
+    with torch.no_grad():
+        hidden_states = model(**encoded)[0]
+    mask = encoded["attention_mask"].unsqueeze(-1).to(hidden_states.dtype)
+    pooled = (hidden_states * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+    return pooled.float().cpu().tolist()
+
 # API Endpoints
 @app.on_event("startup")
 async def startup_event():
@@ -359,6 +557,10 @@ async def startup_event():
     # Set random seed for reproducibility
     set_seed(42)
     
+    # Establish the CPU usage baseline and start background resource sampling
+    refresh_system_resources()
+    service_state["resource_refresh_task"] = asyncio.create_task(_refresh_system_resources_periodically())
+    
     # Load default models
     default_models = ModelCatalog.get_default_models()
     for model_id in default_models.keys():
@@ -367,8 +569,18 @@ async def startup_event():
         except Exception as e:
             logger.warning(f"Could not load default model {model_id}: {e}")
     
+    service_state["startup_complete"] = True
     logger.info("Enhanced service startup completed")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the inference batching workers and resource sampling"""
+    refresh_task = service_state.get("resource_refresh_task")
+    if refresh_task:
+        refresh_task.cancel()
+    await inference_batches.close()
+    model_load_executor.shutdown(wait=False)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint with enhanced information"""
@@ -382,6 +594,22 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: startup finished and at least one model can serve requests"""
+    ready = service_state["startup_complete"] and bool(loaded_models)
+    body = {
+        "status": "ready" if ready else "not_ready",
+        "startup_complete": service_state["startup_complete"],
+        "models": {model_id: entry["state"] for model_id, entry in model_load_state.items()}
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
 @app.get("/models", response_model=Dict[str, Any])
 async def list_available_models(
     model_type: Optional[str] = Query(None, description="Filter by model type"),
@@ -504,6 +732,9 @@ async def load_model_endpoint(model_id: str, background_tasks: BackgroundTasks):
         if model_id in loaded_models:
             return {"message": f"Model {model_id} already loaded", "status": "already_loaded"}
         
+        if model_id in model_load_tasks:
+            return {"message": f"Model {model_id} is already loading", "status": "loading"}
+        
         # Load model in background
         background_tasks.add_task(load_model_from_catalog, model_id)
         
@@ -537,16 +768,24 @@ async def get_model_status(model_id: str):
     
     is_loaded = model_id in loaded_models
     usage_stats = model_usage_stats.get(model_id, {})
+    system_resources = get_system_resources()
+    if is_loaded:
+        status = "loaded"
+    elif model_id in model_load_tasks:
+        status = "loading"
+    else:
+        status = "available"
     
     return {
         "model_id": model_id,
         "model_info": model_info.dict(),
-        "status": "loaded" if is_loaded else "available",
+        "status": status,
+        "load_state": model_load_state.get(model_id),
         "usage_stats": usage_stats,
         "system_validation": ModelCatalog.validate_model_selection(
             model_id,
-            get_system_resources()["available_memory_gb"],
-            get_system_resources()["has_gpu"]
+            system_resources["available_memory_gb"],
+            system_resources["has_gpu"]
         )
     }
 
@@ -601,18 +840,14 @@ async def chat(request: ChatRequest):
                 context += f"{sanitized_role}: {sanitized_content}\n"
             input_text = context + f"user: {sanitized_message}\nassistant:"
         
-        # Generate response
-        result = pipe(
+        # Generate response, batched with concurrent requests using the same parameters
+        batcher = inference_batches.get_batcher(model_id, "chat", partial(_run_chat_batch, pipe))
+        generated_text = await batcher.submit(
             input_text,
-            max_length=request.max_length,
-            temperature=request.temperature,
-            top_p=request.top_p,
-            do_sample=True,
-            pad_token_id=pipe.tokenizer.eos_token_id
+            (request.max_length, request.temperature, request.top_p)
         )
         
         # Extract response
-        generated_text = result[0]["generated_text"]
         response = generated_text[len(input_text):].strip()
         
         # Calculate processing time
@@ -685,20 +920,9 @@ async def generate_embeddings(request: EmbeddingRequest):
         import re
         sanitized_text = re.sub(r'[<>"\']', '', request.text.strip())
         
-        # Generate embeddings
-        embeddings = pipe(sanitized_text)
-        
-        # Extract the embedding vector
-        if isinstance(embeddings, list) and len(embeddings) > 0:
-            result = embeddings[0]
-            if isinstance(result, list):
-                import torch
-                tensor_result = torch.tensor(result)
-                embedding_vector = tensor_result.mean(dim=0).tolist()
-            else:
-                embedding_vector = result.mean(dim=0).tolist() if hasattr(result, 'mean') else list(result)
-        else:
-            embedding_vector = embeddings.mean(dim=0).tolist() if hasattr(embeddings, 'mean') else list(embeddings)
+        # Generate embeddings, batched with concurrent requests for the same model
+        batcher = inference_batches.get_batcher(model_id, "embedding", partial(_run_embedding_batch, pipe))
+        embedding_vector = await batcher.submit(sanitized_text)
         
         # Calculate processing time
         processing_time = time.time() - start_time
@@ -736,12 +960,13 @@ async def get_system_status():
         loaded_models_info[model_id] = {
             "model_info": model_info.dict() if model_info else {},
             "usage_stats": model_usage_stats.get(model_id, {}),
-            "memory_usage": "Unknown"  # Could add actual memory tracking
+            "memory_usage_gb": round(_model_memory_gb(model_id), 3)
         }
     
     # Generate recommendations
     recommendations = {
-        "can_load_more_models": len(loaded_models) < MAX_CONCURRENT_MODELS,
+        "can_load_more_models": not _needs_room(0.0),
+        "loading_models": list(model_load_tasks.keys()),
         "suggested_models": [],
         "resource_warnings": []
     }
@@ -758,6 +983,15 @@ async def get_system_status():
         recommendations=recommendations
     )
 
+@app.get("/inference/metrics")
+async def get_inference_metrics():
+    """Throughput, queue depth and batch size histograms of the inference batchers"""
+    return {
+        "batchers": inference_batches.get_metrics(),
+        "model_selection_cache_size": len(model_selection_cache),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @app.get("/")
 async def root():
     """Root endpoint with service information"""
@@ -768,17 +1002,21 @@ async def root():
         "features": [
             "Multi-LLM support",
             "Automatic model selection",
+            "Dynamic request batching",
             "Resource management",
             "Usage analytics",
             "Model recommendations"
         ],
         "endpoints": {
             "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready",
             "models": "/models",
             "recommendations": "/models/recommend",
             "chat": "/chat",
             "embeddings": "/embeddings",
-            "system_status": "/system/status"
+            "system_status": "/system/status",
+            "inference_metrics": "/inference/metrics"
         },
         "available_models": len(ModelCatalog.get_available_models()),
         "loaded_models": len(loaded_models)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Dynamic Micro-Batching for Model Inference
+Collects concurrent requests per model into batches and runs them off the event loop
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Batching configuration
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "8"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+# Window used to compute recent throughput
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class _PendingRequest:
+    """A single queued inference request"""
+    payload: Any
+    group_key: Hashable
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class BatcherMetrics:
+    """Counters and histograms for one batcher"""
+    requests_total: int = 0
+    batches_total: int = 0
+    errors_total: int = 0
+    inference_seconds_total: float = 0.0
+    queue_wait_seconds_total: float = 0.0
+    batch_size_histogram: Dict[str, int] = field(
+        default_factory=lambda: {**{str(b): 0 for b in BATCH_SIZE_BUCKETS}, "+Inf": 0}
+    )
+    recent_completions: Deque[Tuple[float, int]] = field(default_factory=deque)
+
+    def record_batch(self, size: int, inference_seconds: float, queue_wait_seconds: float):
+        """Record a completed batch"""
+        self.batches_total += 1
+        self.requests_total += size
+        self.inference_seconds_total += inference_seconds
+        self.queue_wait_seconds_total += queue_wait_seconds
+        for bound in BATCH_SIZE_BUCKETS:
+            if size <= bound:
+                self.batch_size_histogram[str(bound)] += 1
+                break
+        else:
+            self.batch_size_histogram["+Inf"] += 1
+
+        now = time.monotonic()
+        self.recent_completions.append((now, size))
+        while self.recent_completions and now - self.recent_completions[0][0] > THROUGHPUT_WINDOW_SECONDS:
+            self.recent_completions.popleft()
+
+    def throughput(self) -> float:
+        """Requests completed per second over the recent window"""
+        if not self.recent_completions:
+            return 0.0
+        now = time.monotonic()
+        completed = sum(size for ts, size in self.recent_completions if now - ts <= THROUGHPUT_WINDOW_SECONDS)
+        return completed / THROUGHPUT_WINDOW_SECONDS
+
+
+class DynamicBatcher:
+    """
+    Per-model inference worker that groups concurrent requests into batches.
+
+    A batch is dispatched as soon as it reaches max_batch_size or the oldest
+    queued request has waited max_wait_ms. Requests with different group keys
+    (e.g. different generation parameters) are never mixed in one call to the
+    batch function. The batch function runs in a thread pool so the event loop
+    stays responsive while the model computes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any], Hashable], List[Any]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Args:
+            name: Identifier used in logs and metrics
+            batch_fn: Callable taking (payloads, group_key) and returning one result per payload
+            max_batch_size: Maximum number of requests per batch
+            max_wait_ms: Maximum time the first request of a batch waits for company
+            executor: Thread pool for inference; a single-worker pool is created if omitted
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"infer-{name}")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._carry: Optional[_PendingRequest] = None
+        self.metrics = BatcherMetrics()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched"""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return depth + (1 if self._carry is not None else 0)
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, payload: Any, group_key: Hashable = None) -> Any:
+        """
+        Queue a payload for batched inference and wait for its result
+
+        Args:
+            payload: Input for the batch function
+            group_key: Requests are only batched with others sharing this key
+
+        Returns:
+            The batch function's result for this payload
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(payload, group_key, future, time.monotonic()))
+        return await future
+
+    async def _collect_batch(self) -> List[_PendingRequest]:
+        """Wait for the next request, then gather compatible ones until full or timed out"""
+        first = self._carry or await self._queue.get()
+        self._carry = None
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                else:
+                    request = self._queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if request.group_key != first.group_key:
+                # Incompatible parameters start the next batch
+                self._carry = request
+                break
+            batch.append(request)
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            batch = [request for request in batch if not request.future.cancelled()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            queue_wait = sum(started - request.enqueued_at for request in batch)
+            payloads = [request.payload for request in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.batch_fn, payloads, batch[0].group_key
+                )
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch function returned {len(results)} results for {len(batch)} inputs"
+                    )
+            except Exception as e:
+                self.metrics.errors_total += 1
+                logger.error(f"Batched inference failed for {self.name}: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self.metrics.record_batch(len(batch), time.monotonic() - started, queue_wait)
+            for request, result in zip(batch, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+
+    async def close(self):
+        """Stop the worker and fail any requests still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for request in pending:
+            if not request.future.done():
+                request.future.set_exception(RuntimeError(f"Batcher {self.name} was closed"))
+
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of throughput, queue depth and batch size distribution"""
+        metrics = self.metrics
+        return {
+            "queue_depth": self.queue_depth,
+            "requests_total": metrics.requests_total,
+            "batches_total": metrics.batches_total,
+            "errors_total": metrics.errors_total,
+            "average_batch_size": round(metrics.requests_total / metrics.batches_total, 2) if metrics.batches_total else 0.0,
+            "average_inference_seconds": round(metrics.inference_seconds_total / metrics.batches_total, 4) if metrics.batches_total else 0.0,
+            "average_queue_wait_seconds": round(metrics.queue_wait_seconds_total / metrics.requests_total, 4) if metrics.requests_total else 0.0,
+            "throughput_per_second": round(metrics.throughput(), 3),
+            "batch_size_histogram": dict(metrics.batch_size_histogram),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0
+        }
+
+
+class InferenceBatchManager:
+    """Registry of batchers, one per model and task"""
+
+    def __init__(self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._batchers: Dict[str, DynamicBatcher] = {}
+
+    def get_batcher(self, model_id: str, task: str, batch_fn: Callable[[List[Any], Hashable], List[Any]]) -> DynamicBatcher:
+        """Get or create the batcher for a model/task pair"""
+        key = f"{model_id}:{task}"
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = DynamicBatcher(key, batch_fn, self.max_batch_size, self.max_wait_ms)
+            self._batchers[key] = batcher
+        return batcher
+
+    async def remove_model(self, model_id: str):
+        """Close and drop all batchers of a model, e.g. when it is unloaded"""
+        prefix = f"{model_id}:"
+        for key in [k for k in self._batchers if k.startswith(prefix)]:
+            await self._batchers.pop(key).close()
+
+    async def close(self):
+        """Close every batcher"""
+        for batcher in list(self._batchers.values()):
+            await batcher.close()
+        self._batchers.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Metrics of every batcher keyed by model and task"""
+        return {key: batcher.get_metrics() for key, batcher in self._batchers.items()}
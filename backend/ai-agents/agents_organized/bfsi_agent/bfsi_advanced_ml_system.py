@@ -6,13 +6,15 @@ Enhanced ML capabilities with deep learning, neural networks, and advanced algor
 import asyncio
 import json
 import logging
+import os
+import sys
 import uuid
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Deque
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
 import math
 import pickle
 import hashlib
@@ -34,9 +36,39 @@ from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 import joblib
 
+try:
+    from .bfsi_feature_schema import FeatureSchema
+    from .bfsi_hyperparameter_search import HyperparameterSearch, SearchStrategy, TrialStore
+    from .bfsi_training_jobs import TrainingJobManager, TrainingJob, TrainingContext
+    from .bfsi_streaming_anomaly import StreamingAnomalyDetector, HalfSpaceTrees
+except ImportError:
+    from bfsi_feature_schema import FeatureSchema
+    from bfsi_hyperparameter_search import HyperparameterSearch, SearchStrategy, TrialStore
+    from bfsi_training_jobs import TrainingJobManager, TrainingJob, TrainingContext
+    from bfsi_streaming_anomaly import StreamingAnomalyDetector, HalfSpaceTrees
+
+try:
+    from model_registry import ModelRegistry, ModelStage, hash_arrays
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'utils'))
+    from model_registry import ModelRegistry, ModelStage, hash_arrays
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of recent predictions kept for reporting
+PREDICTION_HISTORY_LIMIT = 1000
+
+# Rows per inference call in batch prediction
+DEFAULT_PREDICTION_BATCH_SIZE = 256
+
+# Directory of resumable hyperparameter search trial stores
+HYPERPARAMETER_TRIALS_DIR = os.getenv("BFSI_HYPERPARAMETER_TRIALS_DIR", os.path.join("data", "ml_trials"))
+
+# Directory of training job state, data snapshots and checkpoints
+TRAINING_JOBS_DIR = os.getenv("BFSI_TRAINING_JOBS_DIR", os.path.join("data", "ml_training_jobs"))
+MAX_TRAINING_WORKERS = int(os.getenv("BFSI_MAX_TRAINING_WORKERS", "1"))
+
 class MLAlgorithm(Enum):
     """Machine Learning Algorithms"""
     NEURAL_NETWORK = "neural_network"
@@ -83,6 +115,7 @@ class MLModel:
     model_object: Optional[Any] = None
     feature_importance: Optional[List[float]] = None
     hyperparameters: Dict[str, Any] = None
+    feature_schema: Optional[FeatureSchema] = None
 
 @dataclass
 class TrainingData:
@@ -229,6 +262,18 @@ else:
             # This method is not used with sklearn fallback
             pass
 
+def _to_builtin(value: Any) -> Any:
+    """Convert numpy scalars and arrays in nested metadata to JSON-compatible values"""
+    if isinstance(value, dict):
+        return {key: _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
 class BFSIAdvancedMLSystem:
     """
     Advanced Machine Learning System for BFSI Agent with deep learning capabilities
@@ -238,9 +283,19 @@ class BFSIAdvancedMLSystem:
         self.system_id = "bfsi_advanced_ml_system"
         self.ml_models: Dict[str, MLModel] = {}
         self.training_data: List[TrainingData] = []
-        self.prediction_history: List[PredictionResult] = []
+        self.prediction_history: Deque[PredictionResult] = deque(maxlen=PREDICTION_HISTORY_LIMIT)
+        self.total_predictions = 0
+        self.total_prediction_confidence = 0.0
         self.feature_scalers: Dict[str, StandardScaler] = {}
         
+        # Training runs in worker processes; the manager is created on first use
+        self.training_jobs: Optional[TrainingJobManager] = None
+        # Set inside a training worker to report epochs, checkpoint and cancel
+        self.training_context: Optional[TrainingContext] = None
+        
+        # Versioned model storage; created on first use
+        self.model_registry: Optional[ModelRegistry] = None
+        
         # Initialize ML system
         self._initialize_ml_system()
         
@@ -348,34 +403,108 @@ class BFSIAdvancedMLSystem:
     
     async def train_reasoning_model(self, training_data: List[Dict[str, Any]], 
                                   model_type: MLAlgorithm = MLAlgorithm.NEURAL_NETWORK) -> MLModel:
-        """Train a reasoning model with advanced ML"""
-        logger.info(f"Training reasoning model with {model_type.value}")
+        """Train a reasoning model with advanced ML in a worker process and wait for it"""
+        job = await self.start_training_job(training_data, model_type)
+        return await self._get_training_jobs().wait(job.job_id)
+    
+    async def start_training_job(self, training_data: List[Dict[str, Any]],
+                                 model_type: MLAlgorithm = MLAlgorithm.NEURAL_NETWORK,
+                                 kind: str = "reasoning") -> TrainingJob:
+        """
+        Start training in a worker process without waiting for it to finish
+        
+        Args:
+            training_data: Training examples with features and outcome
+            model_type: Algorithm of reasoning models (ignored for anomaly detection)
+            kind: "reasoning" or "anomaly_detection"
+        
+        Returns:
+            The queued training job; the model is added to ml_models when it completes
+        """
+        logger.info(f"Training {kind} model with {model_type.value}")
         
         # Prepare training data
-        features, labels = self._prepare_training_data(training_data)
+        features, labels, feature_schema = self._prepare_training_data(training_data)
         
-        if features is None or labels is None:
+        if features is None or (kind == "reasoning" and labels is None):
             raise ValueError("Invalid training data")
         
         # Create model
-        model_id = f"reasoning_{model_type.value}_{uuid.uuid4().hex[:8]}"
+        if kind == "anomaly_detection":
+            model_id = f"anomaly_detection_{uuid.uuid4().hex[:8]}"
+            labels = None
+        else:
+            model_id = f"reasoning_{model_type.value}_{uuid.uuid4().hex[:8]}"
         
+        return await self._get_training_jobs().submit(
+            kind, model_type.value, model_id, features, labels,
+            metadata={
+                "feature_schema": feature_schema.to_dict(),
+                "training_data_hash": hash_arrays(features, labels)
+            }
+        )
+    
+    def get_training_job(self, job_id: str) -> TrainingJob:
+        """Current status and progress of a training job"""
+        return self._get_training_jobs().get_job(job_id)
+    
+    def list_training_jobs(self) -> List[TrainingJob]:
+        """All known training jobs, including those from before a restart"""
+        return self._get_training_jobs().list_jobs()
+    
+    def cancel_training_job(self, job_id: str) -> TrainingJob:
+        """Request cancellation of a training job"""
+        return self._get_training_jobs().cancel(job_id)
+    
+    async def resume_training_job(self, job_id: str) -> TrainingJob:
+        """Restart an interrupted or cancelled job from its last checkpoint"""
+        return await self._get_training_jobs().resume(job_id)
+    
+    def training_job_events(self, job_id: str):
+        """Async iterator of per-epoch progress events of a training job"""
+        return self._get_training_jobs().events(job_id)
+    
+    def _get_training_jobs(self) -> TrainingJobManager:
+        if self.training_jobs is None:
+            self.training_jobs = TrainingJobManager(
+                TRAINING_JOBS_DIR,
+                max_workers=MAX_TRAINING_WORKERS,
+                on_complete=self._on_training_job_complete
+            )
+        return self.training_jobs
+    
+    def _on_training_job_complete(self, job: TrainingJob, model: MLModel):
+        """Register a model trained by a worker together with its feature schema"""
+        self._attach_feature_schema(model, FeatureSchema.from_dict(job.metadata["feature_schema"]))
+        if job.metadata.get("training_data_hash"):
+            model.parameters["training_data_hash"] = job.metadata["training_data_hash"]
+        self.ml_models[model.model_id] = model
+    
+    async def _fit_reasoning_model(self, features: np.ndarray, labels: np.ndarray, model_id: str,
+                                   model_type: MLAlgorithm) -> MLModel:
+        """Fit a reasoning model on encoded data; runs inside a training worker"""
         if model_type == MLAlgorithm.NEURAL_NETWORK and self.pytorch_available:
-            model = await self._train_neural_network(features, labels, model_id)
+            return await self._train_neural_network(features, labels, model_id)
         elif model_type == MLAlgorithm.LSTM and self.pytorch_available:
-            model = await self._train_lstm_model(features, labels, model_id)
+            return await self._train_lstm_model(features, labels, model_id)
         elif model_type == MLAlgorithm.RANDOM_FOREST:
-            model = await self._train_random_forest(features, labels, model_id)
+            return await self._train_random_forest(features, labels, model_id)
         elif model_type == MLAlgorithm.GRADIENT_BOOSTING:
-            model = await self._train_gradient_boosting(features, labels, model_id)
+            return await self._train_gradient_boosting(features, labels, model_id)
         else:
             # Fallback to sklearn neural network
-            model = await self._train_sklearn_neural_network(features, labels, model_id)
-        
-        # Store model
-        self.ml_models[model_id] = model
-        
-        return model
+            return await self._train_sklearn_neural_network(features, labels, model_id)
+    
+    def _restore_checkpoint(self, model, optimizer) -> Tuple[int, Optional[float]]:
+        """First epoch to run and the loss so far, from the job checkpoint when resuming"""
+        if self.training_context is None:
+            return 0, None
+        return self.training_context.restore(model, optimizer)
+    
+    def _end_epoch(self, epoch: int, total_epochs: int, loss: float, model=None, optimizer=None):
+        """Report progress, checkpoint and honour cancellation when running as a training job"""
+        if self.training_context is not None:
+            self.training_context.end_epoch(epoch, total_epochs, loss, model, optimizer)
     
     async def _train_neural_network(self, features: np.ndarray, labels: np.ndarray, model_id: str) -> MLModel:
         """Train PyTorch neural network"""
@@ -401,8 +530,10 @@ class BFSIAdvancedMLSystem:
         # Training loop
         num_epochs = 100
         batch_size = 32
+        start_epoch, last_loss = self._restore_checkpoint(model, optimizer)
         
-        for epoch in range(num_epochs):
+        for epoch in range(start_epoch, num_epochs):
+            model.train()
             for i in range(0, len(X), batch_size):
                 batch_X = X[i:i+batch_size]
                 batch_y = y[i:i+batch_size]
@@ -412,9 +543,11 @@ class BFSIAdvancedMLSystem:
                 loss = criterion(outputs, batch_y)
                 loss.backward()
                 optimizer.step()
+            last_loss = loss.item()
             
             if epoch % 20 == 0:
-                logger.info(f"Epoch {epoch}, Loss: {loss.item():.4f}")
+                logger.info(f"Epoch {epoch}, Loss: {last_loss:.4f}")
+            self._end_epoch(epoch, num_epochs, last_loss, model, optimizer)
         
         # Evaluate model
         with torch.no_grad():
@@ -436,7 +569,7 @@ class BFSIAdvancedMLSystem:
                 "batch_size": batch_size,
                 "learning_rate": 0.001
             },
-            performance_metrics={"accuracy": accuracy, "loss": loss.item()},
+            performance_metrics={"accuracy": accuracy, "loss": last_loss if last_loss is not None else 0.0},
             training_data_size=len(features),
             validation_data_size=0,
             last_updated=datetime.now(),
@@ -457,14 +590,9 @@ class BFSIAdvancedMLSystem:
         if len(features.shape) == 2:
             # Add sequence dimension
             sequence_length = 10  # Default sequence length
-            if len(features) >= sequence_length:
-                X = torch.FloatTensor(features[:-(len(features) % sequence_length)].reshape(-1, sequence_length, features.shape[1]))
-                y = torch.LongTensor(labels[:-(len(labels) % sequence_length):sequence_length])
-            else:
-                # Pad if not enough data
-                padded_features = np.pad(features, ((0, sequence_length - len(features)), (0, 0)), mode='constant')
-                X = torch.FloatTensor(padded_features.reshape(1, sequence_length, features.shape[1]))
-                y = torch.LongTensor([labels[0]])
+            sequences, sequence_labels = self._training_sequences(features, labels, sequence_length)
+            X = torch.FloatTensor(sequences)
+            y = torch.LongTensor(sequence_labels)
         else:
             X = torch.FloatTensor(features)
             y = torch.LongTensor(labels)
@@ -483,15 +611,19 @@ class BFSIAdvancedMLSystem:
         
         # Training loop
         num_epochs = 50
-        for epoch in range(num_epochs):
+        start_epoch, last_loss = self._restore_checkpoint(model, optimizer)
+        for epoch in range(start_epoch, num_epochs):
+            model.train()
             optimizer.zero_grad()
             outputs = model(X)
             loss = criterion(outputs, y)
             loss.backward()
             optimizer.step()
+            last_loss = loss.item()
             
             if epoch % 10 == 0:
-                logger.info(f"LSTM Epoch {epoch}, Loss: {loss.item():.4f}")
+                logger.info(f"LSTM Epoch {epoch}, Loss: {last_loss:.4f}")
+            self._end_epoch(epoch, num_epochs, last_loss, model, optimizer)
         
         # Evaluate model
         with torch.no_grad():
@@ -510,9 +642,10 @@ class BFSIAdvancedMLSystem:
                 "hidden_size": hidden_size,
                 "num_layers": num_layers,
                 "output_size": output_size,
-                "sequence_length": X.shape[1]
+                "sequence_length": X.shape[1],
+                "training_sequences": X.shape[0]
             },
-            performance_metrics={"accuracy": accuracy, "loss": loss.item()},
+            performance_metrics={"accuracy": accuracy, "loss": last_loss if last_loss is not None else 0.0},
             training_data_size=len(features),
             validation_data_size=0,
             last_updated=datetime.now(),
@@ -642,19 +775,24 @@ class BFSIAdvancedMLSystem:
         
         return ml_model
     
-    def _prepare_training_data(self, training_data: List[Dict[str, Any]]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Prepare training data for ML models"""
+    def _prepare_training_data(self, training_data: List[Dict[str, Any]],
+                               feature_schema: Optional[FeatureSchema] = None
+                               ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[FeatureSchema]]:
+        """
+        Prepare training data for ML models.
+        A feature schema is fitted on the training records unless one is given,
+        and the same schema must be used to encode records at inference time.
+        """
         if not training_data:
-            return None, None
+            return None, None, None
         
-        features = []
-        labels = []
+        feature_records = [item.get("features", {}) for item in training_data]
+        if feature_schema is None:
+            feature_schema = FeatureSchema.fit(feature_records)
+        features = feature_schema.transform(feature_records)
         
+        labels = []
         for item in training_data:
-            # Extract features
-            feature_vector = self._extract_feature_vector(item.get("features", {}))
-            features.append(feature_vector)
-            
             # Extract labels
             outcome = item.get("outcome", {})
             if isinstance(outcome, dict):
@@ -664,10 +802,16 @@ class BFSIAdvancedMLSystem:
             else:
                 labels.append(0)  # Default label
         
-        return np.array(features), np.array(labels)
+        return features, np.array(labels), feature_schema
+    
+    def _attach_feature_schema(self, model: MLModel, feature_schema: FeatureSchema):
+        """Store the training feature schema with the model version"""
+        model.feature_schema = feature_schema
+        model.parameters["feature_schema_version"] = feature_schema.version
+        model.parameters["feature_dimension"] = feature_schema.dimension
     
     def _extract_feature_vector(self, features_dict: Dict[str, Any]) -> List[float]:
-        """Extract numerical feature vector from feature dictionary"""
+        """Extract numerical feature vector for models trained without a feature schema"""
         feature_vector = []
         
         for key, value in features_dict.items():
@@ -702,96 +846,174 @@ class BFSIAdvancedMLSystem:
     
     async def predict_with_model(self, model_id: str, features: Dict[str, Any]) -> PredictionResult:
         """Make prediction using trained model"""
+        results = await self.predict_batch(model_id, [features], explain=True)
+        return results[0]
+    
+    async def predict_batch(self, model_id: str, records: Union[List[Dict[str, Any]], Any],
+                            batch_size: int = DEFAULT_PREDICTION_BATCH_SIZE,
+                            explain: bool = False) -> List[PredictionResult]:
+        """
+        Make predictions for many feature records with one vectorization pass
+        and chunked model inference.
+        
+        Args:
+            model_id: Trained model to use
+            records: List of feature dictionaries or a pandas DataFrame (one row per record)
+            batch_size: Number of rows passed to the model per inference call
+            explain: Build explanations and feature contributions now. When False they
+                are left empty and can be filled in later with explain_prediction().
+        
+        Returns:
+            One PredictionResult per record, in input order
+        """
         if model_id not in self.ml_models:
             raise ValueError(f"Model {model_id} not found")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
         
         model = self.ml_models[model_id]
         
-        # Extract features
-        feature_vector = self._extract_feature_vector(features)
-        feature_array = np.array([feature_vector])
-        
-        # Make prediction
-        if model.algorithm == MLAlgorithm.NEURAL_NETWORK and self.pytorch_available:
-            prediction, confidence, probabilities = await self._predict_neural_network(model, feature_array)
-        elif model.algorithm == MLAlgorithm.LSTM and self.pytorch_available:
-            prediction, confidence, probabilities = await self._predict_lstm(model, feature_array)
-        else:
-            prediction, confidence, probabilities = await self._predict_sklearn_model(model, feature_array)
-        
-        # Generate explanation
-        explanation = self._generate_prediction_explanation(model, features, prediction)
-        
-        # Calculate feature contributions
-        feature_contributions = self._calculate_feature_contributions(model, features)
-        
-        # Estimate uncertainty
-        uncertainty = self._estimate_uncertainty(model, feature_array, confidence)
-        
-        result = PredictionResult(
-            prediction=prediction,
-            confidence=confidence,
-            probabilities=probabilities,
-            explanation=explanation,
-            feature_contributions=feature_contributions,
-            uncertainty_estimate=uncertainty
-        )
-        
-        self.prediction_history.append(result)
+        if hasattr(records, "to_dict") and hasattr(records, "columns"):
+            records = records.to_dict(orient="records")
+        records = list(records)
+        if not records:
+            return []
+        
+        # Vectorize once, then run inference chunk by chunk off the event loop
+        feature_matrix = self._vectorize_records(records, model)
+        loop = asyncio.get_running_loop()
+        predictions: List[Any] = []
+        probability_chunks: List[np.ndarray] = []
+        # LSTM rows are read as the sequence starting at that row, so chunks carry the following rows too
+        lookahead = model.parameters.get("sequence_length", 1) - 1 if model.algorithm == MLAlgorithm.LSTM else 0
+        for start in range(0, len(feature_matrix), batch_size):
+            rows = min(batch_size, len(feature_matrix) - start)
+            chunk = feature_matrix[start:start + rows + lookahead]
+            chunk_predictions, chunk_probabilities = await loop.run_in_executor(
+                None, self._predict_chunk, model, chunk, rows
+            )
+            predictions.extend(chunk_predictions)
+            probability_chunks.append(chunk_probabilities)
+        
+        probabilities = np.concatenate(probability_chunks, axis=0)
+        confidences = probabilities.max(axis=1)
+        uncertainties = self._estimate_uncertainty_batch(model, confidences)
+        
+        results = []
+        for i, record in enumerate(records):
+            result = PredictionResult(
+                prediction=predictions[i],
+                confidence=float(confidences[i]),
+                probabilities=probabilities[i],
+                explanation="",
+                feature_contributions=None,
+                uncertainty_estimate=float(uncertainties[i])
+            )
+            if explain:
+                self.explain_prediction(model_id, record, result)
+            results.append(result)
+        
+        self.prediction_history.extend(results)
+        self.total_predictions += len(results)
+        self.total_prediction_confidence += float(confidences.sum())
+        return results
+    
+    def explain_prediction(self, model_id: str, features: Dict[str, Any], result: PredictionResult) -> PredictionResult:
+        """Fill in the explanation and feature contributions of a prediction"""
+        model = self.ml_models[model_id]
+        result.explanation = self._generate_prediction_explanation(model, features, result.prediction)
+        result.feature_contributions = self._calculate_feature_contributions(model, features)
         return result
     
-    async def _predict_neural_network(self, model: MLModel, features: np.ndarray) -> Tuple[Any, float, np.ndarray]:
-        """Make prediction using PyTorch neural network"""
+    def _vectorize_records(self, records: List[Dict[str, Any]], model: MLModel) -> np.ndarray:
+        """Convert feature dictionaries into a 2D feature matrix using the model's schema"""
+        if model.feature_schema is not None:
+            return model.feature_schema.transform(records)
+        return np.array([self._extract_feature_vector(record) for record in records], dtype=np.float32)
+    
+    def _predict_chunk(self, model: MLModel, features: np.ndarray,
+                       rows: Optional[int] = None) -> Tuple[List[Any], np.ndarray]:
+        """
+        Run one inference call and return predictions with class probabilities
+        for the first ``rows`` rows; any rows after them are LSTM sequence context
+        """
+        rows = len(features) if rows is None else rows
+        if model.algorithm == MLAlgorithm.NEURAL_NETWORK and self.pytorch_available and isinstance(model.model_object, nn.Module):
+            return self._predict_neural_network(model, features[:rows])
+        elif model.algorithm == MLAlgorithm.LSTM and self.pytorch_available and isinstance(model.model_object, nn.Module):
+            return self._predict_lstm(model, features, rows)
+        else:
+            return self._predict_sklearn_model(model, features[:rows])
+    
+    def _predict_neural_network(self, model: MLModel, features: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        """Make predictions using PyTorch neural network"""
         pytorch_model = model.model_object
         pytorch_model.eval()
         
         with torch.no_grad():
-            X = torch.FloatTensor(features)
+            X = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32))
             outputs = pytorch_model(X)
-            probabilities = torch.softmax(outputs, dim=1).numpy()[0]
-            prediction = np.argmax(probabilities)
-            confidence = float(np.max(probabilities))
+            probabilities = torch.softmax(outputs, dim=1).numpy()
         
-        return prediction, confidence, probabilities
+        return probabilities.argmax(axis=1).tolist(), probabilities
     
-    async def _predict_lstm(self, model: MLModel, features: np.ndarray) -> Tuple[Any, float, np.ndarray]:
-        """Make prediction using LSTM model"""
+    @staticmethod
+    def _training_sequences(features: np.ndarray, labels: np.ndarray,
+                            sequence_length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Consecutive non-overlapping blocks of sequence_length rows, each labelled
+        with its first row; trailing rows that do not fill a block are dropped,
+        and fewer rows than one block are zero-padded into a single sequence
+        """
+        if len(features) < sequence_length:
+            padded = np.pad(features, ((0, sequence_length - len(features)), (0, 0)), mode='constant')
+            return padded.reshape(1, sequence_length, features.shape[1]), np.asarray(labels[:1])
+        usable = len(features) - len(features) % sequence_length
+        return (features[:usable].reshape(-1, sequence_length, features.shape[1]),
+                np.asarray(labels[:usable:sequence_length]))
+    
+    @staticmethod
+    def _sequence_windows(features: np.ndarray, sequence_length: int, rows: int) -> np.ndarray:
+        """
+        LSTM input of shape (rows, sequence_length, n_features) built as in training:
+        row i is read as the sequence of rows i .. i + sequence_length - 1,
+        zero-padded past the last row
+        """
+        shortfall = rows + sequence_length - 1 - len(features)
+        if shortfall > 0:
+            features = np.pad(features, ((0, shortfall), (0, 0)), mode='constant')
+        windows = np.lib.stride_tricks.sliding_window_view(features, sequence_length, axis=0)
+        return windows[:rows].transpose(0, 2, 1)
+    
+    def _predict_lstm(self, model: MLModel, features: np.ndarray,
+                      rows: Optional[int] = None) -> Tuple[List[Any], np.ndarray]:
+        """Make predictions using LSTM model for the first ``rows`` rows of ``features``"""
         pytorch_model = model.model_object
         pytorch_model.eval()
         
+        sequence_length = model.parameters.get("sequence_length", 10)
+        windows = self._sequence_windows(features, sequence_length, len(features) if rows is None else rows)
+        
         with torch.no_grad():
-            # Reshape for LSTM
-            sequence_length = model.parameters.get("sequence_length", 10)
-            if len(features[0]) >= sequence_length:
-                X = torch.FloatTensor(features.reshape(-1, sequence_length, features.shape[1] // sequence_length))
-            else:
-                # Pad if necessary
-                padded = np.pad(features, ((0, 0), (0, sequence_length * (features.shape[1] // sequence_length + 1) - features.shape[1])), mode='constant')
-                X = torch.FloatTensor(padded.reshape(-1, sequence_length, features.shape[1] // sequence_length))
-            
+            X = torch.from_numpy(np.ascontiguousarray(windows, dtype=np.float32))
             outputs = pytorch_model(X)
-            probabilities = torch.softmax(outputs, dim=1).numpy()[0]
-            prediction = np.argmax(probabilities)
-            confidence = float(np.max(probabilities))
+            probabilities = torch.softmax(outputs, dim=1).numpy()
         
-        return prediction, confidence, probabilities
+        return probabilities.argmax(axis=1).tolist(), probabilities
     
-    async def _predict_sklearn_model(self, model: MLModel, features: np.ndarray) -> Tuple[Any, float, np.ndarray]:
-        """Make prediction using sklearn model"""
+    def _predict_sklearn_model(self, model: MLModel, features: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        """Make predictions using sklearn model"""
         sklearn_model = model.model_object
         
-        # Make prediction
-        prediction = sklearn_model.predict(features)[0]
-        
-        # Get probabilities if available
+        # Get probabilities if available; predictions follow from them without a second pass
         if hasattr(sklearn_model, 'predict_proba'):
-            probabilities = sklearn_model.predict_proba(features)[0]
-            confidence = float(np.max(probabilities))
+            probabilities = sklearn_model.predict_proba(features)
+            predictions = sklearn_model.classes_[probabilities.argmax(axis=1)].tolist()
         else:
-            probabilities = np.array([0.5, 0.5])  # Default probabilities
-            confidence = 0.5
+            predictions = sklearn_model.predict(features).tolist()
+            probabilities = np.full((len(features), 2), 0.5)  # Default probabilities
         
-        return prediction, confidence, probabilities
+        return predictions, probabilities
     
     def _generate_prediction_explanation(self, model: MLModel, features: Dict[str, Any], prediction: Any) -> str:
         """Generate explanation for prediction"""
@@ -804,7 +1026,11 @@ class BFSIAdvancedMLSystem:
         # Add feature importance if available
         if model.feature_importance:
             top_features = np.argsort(model.feature_importance)[-3:][::-1]
-            explanation_parts.append(f"Key features: {top_features.tolist()}")
+            if model.feature_schema is not None:
+                feature_names = model.feature_schema.feature_names
+                explanation_parts.append(f"Key features: {[feature_names[i] for i in top_features]}")
+            else:
+                explanation_parts.append(f"Key features: {top_features.tolist()}")
         
         return " | ".join(explanation_parts)
     
@@ -812,7 +1038,12 @@ class BFSIAdvancedMLSystem:
         """Calculate feature contributions to prediction"""
         contributions = {}
         
-        if model.feature_importance:
+        if model.feature_importance and model.feature_schema is not None:
+            # Sum the importance of every encoded position back onto its source column
+            for source, importance in zip(model.feature_schema.feature_sources, model.feature_importance):
+                if source in features:
+                    contributions[source] = contributions.get(source, 0.0) + float(importance)
+        elif model.feature_importance:
             feature_names = list(features.keys())
             for i, importance in enumerate(model.feature_importance):
                 if i < len(feature_names):
@@ -820,38 +1051,30 @@ class BFSIAdvancedMLSystem:
         
         return contributions
     
-    def _estimate_uncertainty(self, model: MLModel, features: np.ndarray, confidence: float) -> float:
-        """Estimate prediction uncertainty"""
+    def _estimate_uncertainty_batch(self, model: MLModel, confidences: np.ndarray) -> np.ndarray:
+        """Estimate uncertainty for a vector of prediction confidences"""
         # Simple uncertainty estimation based on confidence and model performance
-        base_uncertainty = 1.0 - confidence
+        base_uncertainty = 1.0 - confidences
         model_uncertainty = 1.0 - model.performance_metrics.get('accuracy', 0.5)
         
         # Combine uncertainties
         total_uncertainty = (base_uncertainty + model_uncertainty) / 2.0
         
-        return min(total_uncertainty, 1.0)
+        return np.minimum(total_uncertainty, 1.0)
     
     async def train_anomaly_detection_model(self, training_data: List[Dict[str, Any]]) -> MLModel:
-        """Train anomaly detection model using autoencoder"""
+        """Train anomaly detection model using autoencoder in a worker process and wait for it"""
         logger.info("Training anomaly detection model")
-        
-        # Prepare training data
-        features, _ = self._prepare_training_data(training_data)
-        
-        if features is None:
-            raise ValueError("Invalid training data for anomaly detection")
-        
-        # Train autoencoder
-        model_id = f"anomaly_detection_{uuid.uuid4().hex[:8]}"
-        
+        job = await self.start_training_job(training_data, MLAlgorithm.AUTOENCODER, kind="anomaly_detection")
+        return await self._get_training_jobs().wait(job.job_id)
+    
+    async def _fit_anomaly_model(self, features: np.ndarray, model_id: str) -> MLModel:
+        """Fit an anomaly detector on encoded data; runs inside a training worker"""
         if self.pytorch_available:
-            model = await self._train_autoencoder(features, model_id)
+            return await self._train_autoencoder(features, model_id)
         else:
             # Fallback to isolation forest or one-class SVM
-            model = await self._train_isolation_forest(features, model_id)
-        
-        self.ml_models[model_id] = model
-        return model
+            return await self._train_isolation_forest(features, model_id)
     
     async def _train_autoencoder(self, features: np.ndarray, model_id: str) -> MLModel:
         """Train autoencoder for anomaly detection"""
@@ -875,8 +1098,10 @@ class BFSIAdvancedMLSystem:
         # Training loop
         num_epochs = 100
         batch_size = 32
+        start_epoch, last_loss = self._restore_checkpoint(autoencoder, optimizer)
         
-        for epoch in range(num_epochs):
+        for epoch in range(start_epoch, num_epochs):
+            autoencoder.train()
             for i in range(0, len(X), batch_size):
                 batch_X = X[i:i+batch_size]
                 
@@ -885,9 +1110,11 @@ class BFSIAdvancedMLSystem:
                 loss = criterion(decoded, batch_X)
                 loss.backward()
                 optimizer.step()
+            last_loss = loss.item()
             
             if epoch % 20 == 0:
-                logger.info(f"Autoencoder Epoch {epoch}, Loss: {loss.item():.4f}")
+                logger.info(f"Autoencoder Epoch {epoch}, Loss: {last_loss:.4f}")
+            self._end_epoch(epoch, num_epochs, last_loss, autoencoder, optimizer)
         
         # Calculate reconstruction error threshold
         with torch.no_grad():
@@ -908,7 +1135,7 @@ class BFSIAdvancedMLSystem:
                 "num_epochs": num_epochs
             },
             performance_metrics={
-                "reconstruction_error": float(loss.item()),
+                "reconstruction_error": float(last_loss) if last_loss is not None else 0.0,
                 "threshold": threshold
             },
             training_data_size=len(features),
@@ -1014,8 +1241,7 @@ class BFSIAdvancedMLSystem:
         model = self.ml_models[model_id]
         
         # Extract features
-        feature_vector = self._extract_feature_vector(features)
-        feature_array = np.array([feature_vector])
+        feature_array = self._vectorize_records([features], model)
         
         if model.algorithm == MLAlgorithm.AUTOENCODER:
             return await self._detect_anomalies_autoencoder(model, feature_array)
@@ -1026,24 +1252,10 @@ class BFSIAdvancedMLSystem:
         """Detect anomalies using autoencoder or PCA fallback"""
         model_object = model.model_object
         threshold = model.parameters.get("threshold", 0.1)
-        
-        if self.pytorch_available and hasattr(model_object, 'forward'):
-            # PyTorch autoencoder
-            with torch.no_grad():
-                model_object.eval()
-                X = torch.FloatTensor(features)
-                decoded, encoded = model_object(X)
-                reconstruction_error = torch.mean((X - decoded) ** 2, dim=1).item()
-        else:
-            # PCA fallback
-            pca = model_object['pca']
+        if isinstance(model_object, dict):
             threshold = model_object['threshold']
-            
-            # Transform features using PCA
-            pca_features = pca.transform(features)
-            reconstructed = pca.inverse_transform(pca_features)
-            reconstruction_error = np.mean((features - reconstructed) ** 2, axis=1)[0]
         
+        reconstruction_error = self._reconstruction_errors(model, features)[0]
         is_anomaly = reconstruction_error > threshold
         
         return {
@@ -1054,6 +1266,68 @@ class BFSIAdvancedMLSystem:
             "confidence": 0.9 if is_anomaly else 0.1
         }
     
+    def _reconstruction_errors(self, model: MLModel, features: np.ndarray) -> np.ndarray:
+        """Per-row reconstruction error of an autoencoder or its PCA fallback"""
+        model_object = model.model_object
+        
+        if self.pytorch_available and hasattr(model_object, 'forward'):
+            # PyTorch autoencoder
+            with torch.no_grad():
+                model_object.eval()
+                X = torch.FloatTensor(features)
+                decoded, encoded = model_object(X)
+                return torch.mean((X - decoded) ** 2, dim=1).numpy()
+        
+        # PCA fallback
+        pca = model_object['pca']
+        reconstructed = pca.inverse_transform(pca.transform(features))
+        return np.mean((features - reconstructed) ** 2, axis=1)
+    
+    def _anomaly_scores(self, model: MLModel, features: np.ndarray) -> np.ndarray:
+        """Batch anomaly scores where higher is more anomalous"""
+        if model.algorithm == MLAlgorithm.AUTOENCODER:
+            return self._reconstruction_errors(model, features)
+        # sklearn outlier detectors return lower decision values for outliers
+        return -model.model_object.decision_function(features)
+    
+    def create_streaming_detector(self, model_id: Optional[str] = None,
+                                  feature_schema: Optional[FeatureSchema] = None,
+                                  **options) -> StreamingAnomalyDetector:
+        """
+        Build a detector that scores event micro-batches with rolling thresholds
+        
+        Args:
+            model_id: Trained anomaly detection model used as the scorer. When
+                omitted, half-space trees learn the stream incrementally instead.
+            feature_schema: Encoding for events; required without a model,
+                otherwise the model's own schema is used
+            **options: Passed to StreamingAnomalyDetector (quantile, warmup,
+                baseline_window, dedup_window_seconds, key_field)
+        
+        Returns:
+            Streaming anomaly detector
+        """
+        if model_id is not None:
+            if model_id not in self.ml_models:
+                raise ValueError(f"Model {model_id} not found")
+            model = self.ml_models[model_id]
+            return StreamingAnomalyDetector(
+                encode=lambda records: self._vectorize_records(records, model),
+                scorer=lambda features: self._anomaly_scores(model, features),
+                **options
+            )
+        
+        if feature_schema is None:
+            raise ValueError("A feature schema is required to stream without a trained model")
+        trees = HalfSpaceTrees(feature_schema.dimension)
+        return StreamingAnomalyDetector(
+            encode=feature_schema.transform,
+            scorer=trees.score,
+            updater=trees.update,
+            ready=lambda: trees.ready,
+            **options
+        )
+    
     async def _detect_anomalies_sklearn(self, model: MLModel, features: np.ndarray) -> Dict[str, Any]:
         """Detect anomalies using sklearn model"""
         sklearn_model = model.model_object
@@ -1070,129 +1344,235 @@ class BFSIAdvancedMLSystem:
             "confidence": 0.9 if is_anomaly else 0.1
         }
     
-    async def optimize_hyperparameters(self, model_id: str, training_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Optimize hyperparameters for a model"""
+    async def optimize_hyperparameters(self, model_id: str, training_data: List[Dict[str, Any]],
+                                       strategy: str = "grid",
+                                       n_trials: Optional[int] = None,
+                                       n_folds: int = 3,
+                                       early_stopping: bool = True,
+                                       cpu_budget: Optional[int] = None,
+                                       resume: bool = True) -> Dict[str, Any]:
+        """
+        Optimize hyperparameters for a model with cross-validated, parallel search
+        
+        Args:
+            model_id: Trained model whose algorithm and feature schema are tuned
+            training_data: Training examples with features and outcome
+            strategy: "grid", "random" or "bayesian" proposal of configurations
+            n_trials: Number of configurations to start (defaults to the full grid)
+            n_folds: Cross-validation folds per trial
+            early_stopping: Use successive halving on training-data budgets
+            cpu_budget: Maximum worker processes (defaults to all CPUs but one)
+            resume: Reuse trials recorded by an earlier run of the same search
+        
+        Returns:
+            Best parameters, best cross-validated score and search statistics
+        """
         logger.info(f"Optimizing hyperparameters for model {model_id}")
         
-        # Simple grid search optimization
-        best_params = {}
-        best_score = 0.0
+        if model_id not in self.ml_models:
+            return {
+                "best_params": {},
+                "best_score": 0.0,
+                "optimization_method": strategy
+            }
+        model = self.ml_models[model_id]
         
         # Define parameter grid based on model type
-        if model_id in self.ml_models:
-            model = self.ml_models[model_id]
-            
-            if model.algorithm == MLAlgorithm.NEURAL_NETWORK:
-                param_grid = {
-                    "learning_rate": [0.001, 0.01, 0.1],
-                    "hidden_size": [64, 128, 256],
-                    "dropout": [0.1, 0.2, 0.3]
-                }
-            elif model.algorithm == MLAlgorithm.RANDOM_FOREST:
-                param_grid = {
-                    "n_estimators": [50, 100, 200],
-                    "max_depth": [5, 10, 15],
-                    "min_samples_split": [2, 5, 10]
-                }
-            else:
-                param_grid = {"learning_rate": [0.001, 0.01]}
-            
-            # Simple grid search
-            for params in self._generate_param_combinations(param_grid):
-                score = await self._evaluate_hyperparameters(model_id, params, training_data)
-                if score > best_score:
-                    best_score = score
-                    best_params = params
-        
-        return {
-            "best_params": best_params,
-            "best_score": best_score,
-            "optimization_method": "grid_search"
-        }
-    
-    def _generate_param_combinations(self, param_grid: Dict[str, List]) -> List[Dict[str, Any]]:
-        """Generate parameter combinations for grid search"""
-        import itertools
+        if model.algorithm == MLAlgorithm.NEURAL_NETWORK:
+            param_grid = {
+                "learning_rate": [0.001, 0.01, 0.1],
+                "hidden_size": [64, 128, 256],
+                "dropout": [0.1, 0.2, 0.3]
+            }
+        elif model.algorithm == MLAlgorithm.RANDOM_FOREST:
+            param_grid = {
+                "n_estimators": [50, 100, 200],
+                "max_depth": [5, 10, 15],
+                "min_samples_split": [2, 5, 10]
+            }
+        elif model.algorithm == MLAlgorithm.GRADIENT_BOOSTING:
+            param_grid = {
+                "n_estimators": [50, 100, 200],
+                "learning_rate": [0.05, 0.1, 0.2],
+                "max_depth": [3, 6]
+            }
+        else:
+            param_grid = {"learning_rate": [0.001, 0.01]}
+        
+        features, labels, _ = self._prepare_training_data(training_data, model.feature_schema)
+        if features is None or labels is None or len(np.unique(labels)) < 2:
+            logger.warning(f"Not enough labelled data to optimize {model_id}")
+            return {
+                "best_params": {},
+                "best_score": 0.0,
+                "optimization_method": strategy
+            }
         
-        keys = param_grid.keys()
-        values = param_grid.values()
+        search = HyperparameterSearch(
+            algorithm=model.algorithm.value,
+            param_grid=param_grid,
+            strategy=SearchStrategy(strategy),
+            n_trials=n_trials,
+            n_folds=n_folds,
+            min_budget=1.0 / 9.0 if early_stopping else 1.0,
+            cpu_budget=cpu_budget,
+            use_torch=self.pytorch_available and isinstance(model.model_object, nn.Module)
+        )
+        search.store = TrialStore(os.path.join(HYPERPARAMETER_TRIALS_DIR, f"{model_id}_{search.study_id()}.jsonl"))
         
-        combinations = []
-        for combination in itertools.product(*values):
-            combinations.append(dict(zip(keys, combination)))
+        # The search blocks on its worker processes, so keep it off the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, search.run, features, labels, resume)
         
-        return combinations
-    
-    async def _evaluate_hyperparameters(self, model_id: str, params: Dict[str, Any], training_data: List[Dict[str, Any]]) -> float:
-        """Evaluate hyperparameters using cross-validation"""
-        # Simple evaluation - in practice, use proper cross-validation
-        features, labels = self._prepare_training_data(training_data)
-        
-        if features is None or labels is None:
-            return 0.0
-        
-        # Split data (simple train/test split)
-        split_idx = int(0.8 * len(features))
-        X_train, X_test = features[:split_idx], features[split_idx:]
-        y_train, y_test = labels[:split_idx], labels[split_idx:]
-        
-        # Train model with given parameters (simplified)
-        try:
-            if self.pytorch_available:
-                # Create temporary model with new parameters
-                temp_model = NeuralNetwork(
-                    X_train.shape[1],
-                    [params.get("hidden_size", 128)],
-                    len(np.unique(labels)),
-                    params.get("dropout", 0.2)
-                )
-                
-                # Quick training
-                criterion = nn.CrossEntropyLoss()
-                optimizer = optim.Adam(temp_model.parameters(), lr=params.get("learning_rate", 0.001))
-                
-                for epoch in range(10):  # Reduced epochs for speed
-                    optimizer.zero_grad()
-                    outputs = temp_model(torch.FloatTensor(X_train))
-                    loss = criterion(outputs, torch.LongTensor(y_train))
-                    loss.backward()
-                    optimizer.step()
-                
-                # Evaluate
-                with torch.no_grad():
-                    temp_model.eval()
-                    outputs = temp_model(torch.FloatTensor(X_test))
-                    _, predicted = torch.max(outputs.data, 1)
-                    accuracy = (predicted == torch.LongTensor(y_test)).float().mean().item()
-                
-                return accuracy
+        model.hyperparameters = result["best_params"]
+        result["optimization_method"] = f"{strategy}_successive_halving" if early_stopping else strategy
+        result["cross_validation_folds"] = n_folds
+        result["trial_store"] = search.store.path
+        return result
+
+    def register_model(self, model_id: str, name: Optional[str] = None,
+                       stage: Optional[ModelStage] = None) -> Dict[str, Any]:
+        """
+        Store a trained model as a new version in the model registry
+
+        Args:
+            model_id: Model in ml_models to register
+            name: Registry name; defaults to the model id without its random suffix
+            stage: Optional stage to promote the new version to
+
+        Returns:
+            The version manifest
+        """
+        if model_id not in self.ml_models:
+            raise ValueError(f"Model {model_id} not found")
+
+        model = self.ml_models[model_id]
+        registry = self._get_model_registry()
+        name = name or model_id.rsplit("_", 1)[0]
+
+        manifest = registry.register(
+            name,
+            artifacts=self._store_model_artifacts(registry, model),
+            metrics=_to_builtin(model.performance_metrics),
+            parameters=_to_builtin({
+                **model.parameters,
+                "algorithm": model.algorithm.value,
+                "architecture": model.architecture.value,
+                "confidence_threshold": model.confidence_threshold,
+                "hyperparameters": model.hyperparameters or {},
+                "feature_importance": model.feature_importance,
+                "training_data_size": model.training_data_size,
+                "validation_data_size": model.validation_data_size
+            }),
+            feature_schema=model.feature_schema.to_dict() if model.feature_schema else None,
+            training_data_hash=model.parameters.get("training_data_hash"),
+            tags={"model_id": model_id},
+            stage=stage or ModelStage.NONE
+        )
+        model.version = str(manifest["version"])
+        return manifest
+
+    def promote_model(self, name: str, version: int, stage: ModelStage) -> Dict[str, Any]:
+        """Move a registered model version to staging, production or archived"""
+        return self._get_model_registry().promote(name, version, stage)
+
+    def list_model_versions(self, name: str) -> List[Dict[str, Any]]:
+        """Version manifests of a registered model, oldest first"""
+        return self._get_model_registry().list_versions(name)
+
+    def load_registered_model(self, name: str, version: Optional[int] = None,
+                              stage: ModelStage = ModelStage.PRODUCTION) -> MLModel:
+        """
+        Load a registered model version into ml_models
+
+        Args:
+            name: Registry name
+            version: Exact version to load; when omitted the version in the given stage is used
+            stage: Stage to load from when no version is given
+
+        Returns:
+            The loaded model
+        """
+        registry = self._get_model_registry()
+        manifest = registry.get_version(name, version, None if version is not None else stage)
+        parameters = dict(manifest["parameters"])
+        algorithm = MLAlgorithm(parameters.pop("algorithm"))
+        architecture = ModelArchitecture(parameters.pop("architecture"))
+
+        model = MLModel(
+            model_id=manifest["tags"].get("model_id", f"{name}_v{manifest['version']}"),
+            algorithm=algorithm,
+            architecture=architecture,
+            parameters=parameters,
+            performance_metrics=manifest["metrics"],
+            training_data_size=parameters.pop("training_data_size", 0),
+            validation_data_size=parameters.pop("validation_data_size", 0),
+            last_updated=datetime.fromisoformat(manifest["created_at"]),
+            version=str(manifest["version"]),
+            confidence_threshold=parameters.pop("confidence_threshold", 0.7),
+            model_object=self._load_model_object(registry, manifest, algorithm),
+            feature_importance=parameters.pop("feature_importance", None),
+            hyperparameters=parameters.pop("hyperparameters", {}),
+            feature_schema=FeatureSchema.from_dict(manifest["feature_schema"]) if manifest.get("feature_schema") else None
+        )
+        self.ml_models[model.model_id] = model
+        logger.info(f"Loaded registered model {name} version {manifest['version']} as {model.model_id}")
+        return model
+
+    def _get_model_registry(self) -> ModelRegistry:
+        if self.model_registry is None:
+            # Location and pickle policy come from MODEL_REGISTRY_DIR / MODEL_REGISTRY_ALLOW_PICKLE
+            self.model_registry = ModelRegistry()
+        return self.model_registry
+
+    def _store_model_artifacts(self, registry: ModelRegistry, model: MLModel) -> Dict[str, Dict[str, Any]]:
+        """Write a model's weights or estimator into the registry's artifact store"""
+        model_object = model.model_object
+        if self.pytorch_available and isinstance(model_object, nn.Module):
+            return {"weights": registry.put_tensors(model_object.state_dict())}
+        if isinstance(model_object, dict):
+            # PCA anomaly detector
+            return {
+                "estimator": registry.put_estimator(model_object["pca"]),
+                "reconstruction_errors": registry.put_array(model_object["reconstruction_errors"])
+            }
+        return {"estimator": registry.put_estimator(model_object)}
+
+    def _load_model_object(self, registry: ModelRegistry, manifest: Dict[str, Any], algorithm: MLAlgorithm) -> Any:
+        """Rebuild a model object from its registered artifacts"""
+        artifacts = manifest["artifacts"]
+        parameters = manifest["parameters"]
+
+        if "weights" in artifacts:
+            if not self.pytorch_available:
+                raise RuntimeError("PyTorch is required to load registered neural network weights")
+            if algorithm == MLAlgorithm.LSTM:
+                model_object = LSTMModel(parameters["input_size"], parameters["hidden_size"],
+                                         parameters["num_layers"], parameters["output_size"])
+            elif algorithm == MLAlgorithm.AUTOENCODER:
+                model_object = AutoEncoder(parameters["input_size"], parameters["encoding_size"])
             else:
-                # Fallback to sklearn for hyperparameter optimization
-                from sklearn.ensemble import RandomForestClassifier
-                from sklearn.metrics import accuracy_score
-                
-                model = RandomForestClassifier(
-                    n_estimators=params.get("n_estimators", 100),
-                    max_depth=params.get("max_depth", 10),
-                    random_state=42
-                )
-                
-                model.fit(X_train, y_train)
-                predictions = model.predict(X_test)
-                accuracy = accuracy_score(y_test, predictions)
-                
-                return accuracy
-            
-        except Exception as e:
-            logger.error(f"Error evaluating hyperparameters: {e}")
-            return 0.0
-    
+                model_object = NeuralNetwork(parameters["input_size"], parameters["hidden_sizes"], parameters["output_size"])
+            weights = registry.get_artifact(artifacts["weights"])
+            model_object.load_state_dict({key: torch.from_numpy(np.array(value)) for key, value in weights.items()})
+            model_object.eval()
+            return model_object
+
+        estimator = registry.get_artifact(artifacts["estimator"])
+        if "reconstruction_errors" in artifacts:
+            return {
+                "pca": estimator,
+                "threshold": parameters["threshold"],
+                "reconstruction_errors": registry.get_artifact(artifacts["reconstruction_errors"])
+            }
+        return estimator
+
     async def get_ml_statistics(self) -> Dict[str, Any]:
         """Get comprehensive ML system statistics"""
         stats = {
             "total_models": len(self.ml_models),
             "model_types": defaultdict(int),
-            "total_predictions": len(self.prediction_history),
+            "total_predictions": self.total_predictions,
             "average_confidence": 0.0,
             "pytorch_available": self.pytorch_available,
             "training_data_size": len(self.training_data)
@@ -1203,9 +1583,8 @@ class BFSIAdvancedMLSystem:
             stats["model_types"][model.algorithm.value] += 1
         
         # Average confidence
-        if self.prediction_history:
-            confidences = [pred.confidence for pred in self.prediction_history]
-            stats["average_confidence"] = sum(confidences) / len(confidences)
+        if self.total_predictions:
+            stats["average_confidence"] = self.total_prediction_confidence / self.total_predictions
         
         return stats
     
@@ -1222,7 +1601,8 @@ class BFSIAdvancedMLSystem:
                     "performance_metrics": model.performance_metrics,
                     "training_data_size": model.training_data_size,
                     "last_updated": model.last_updated.isoformat(),
-                    "version": model.version
+                    "version": model.version,
+                    "feature_schema_version": model.feature_schema.version if model.feature_schema else None
                 }
                 for model_id, model in self.ml_models.items()
             },
@@ -1232,7 +1612,7 @@ class BFSIAdvancedMLSystem:
                     "confidence": pred.confidence,
                     "explanation": pred.explanation
                 }
-                for pred in self.prediction_history[-10:]
+                for pred in list(self.prediction_history)[-10:]
             ],
             "recommendations": await self._generate_ml_recommendations(),
             "timestamp": datetime.now().isoformat()
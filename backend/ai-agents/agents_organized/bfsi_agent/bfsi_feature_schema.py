@@ -0,0 +1,282 @@
+"""
+BFSI Feature Schema
+Fitted, persistable mapping from feature dictionaries to fixed-width numeric vectors
+"""
+
+import hashlib
+import json
+import logging
+import math
+import zlib
+from dataclasses import dataclass, field, asdict
+from enum import Enum
+from typing import Dict, List, Any, Optional, Iterable
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class FeatureKind(Enum):
+    """How a source column is encoded"""
+    NUMERIC = "numeric"
+    BOOLEAN = "boolean"
+    CATEGORICAL = "categorical"
+    HASHED = "hashed"
+    SEQUENCE = "sequence"
+
+class MissingValuePolicy(Enum):
+    """How missing numeric values are filled"""
+    MEAN = "mean"
+    MEDIAN = "median"
+    ZERO = "zero"
+    CONSTANT = "constant"
+
+@dataclass
+class FeatureColumn:
+    """Encoding of one source column"""
+    name: str
+    kind: FeatureKind
+    width: int
+    missing_policy: MissingValuePolicy = MissingValuePolicy.ZERO
+    fill_value: float = 0.0
+    mean: float = 0.0
+    scale: float = 1.0
+    categories: List[str] = field(default_factory=list)
+    hash_buckets: int = 0
+
+    def output_names(self) -> List[str]:
+        """Names of the vector positions produced by this column"""
+        if self.kind == FeatureKind.CATEGORICAL:
+            return [f"{self.name}={category}" for category in self.categories] + [f"{self.name}=<other>"]
+        if self.kind == FeatureKind.HASHED:
+            return [f"{self.name}#{bucket}" for bucket in range(self.hash_buckets)]
+        if self.kind == FeatureKind.SEQUENCE:
+            return [f"{self.name}[{i}]" for i in range(self.width)]
+        return [self.name]
+
+def _stable_bucket(value: str, buckets: int) -> int:
+    """Process-independent hash bucket for a categorical value"""
+    return zlib.crc32(value.encode('utf-8')) % buckets
+
+def _as_float(value: Any) -> float:
+    """Coerce a raw value to float, returning NaN when it is missing or not numeric"""
+    if value is None:
+        return math.nan
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _infer_kind(values: List[Any]) -> FeatureKind:
+    """Infer the encoding of a column from its observed non-missing values"""
+    if all(isinstance(v, bool) for v in values):
+        return FeatureKind.BOOLEAN
+    if all(isinstance(v, (int, float)) for v in values):
+        return FeatureKind.NUMERIC
+    if all(isinstance(v, (list, tuple)) for v in values):
+        return FeatureKind.SEQUENCE
+    return FeatureKind.CATEGORICAL
+
+class FeatureSchema:
+    """
+    Schema fitted on training records and applied identically at inference.
+    Columns are ordered by name, so vectors do not depend on dict key order,
+    and every column has a fixed width, so missing keys cannot shift later features.
+    """
+
+    SCHEMA_FORMAT = 1
+
+    def __init__(self, columns: List[FeatureColumn]):
+        self.columns = columns
+        self._category_index = {
+            column.name: {category: i for i, category in enumerate(column.categories)}
+            for column in columns if column.kind == FeatureKind.CATEGORICAL
+        }
+        self.dimension = sum(column.width for column in columns)
+        self.version = self._fingerprint()
+
+    @classmethod
+    def fit(cls, records: Iterable[Dict[str, Any]],
+            max_one_hot_categories: int = 20,
+            hash_buckets: int = 16,
+            missing_policy: MissingValuePolicy = MissingValuePolicy.MEAN,
+            fill_value: float = 0.0,
+            scale_numeric: bool = True) -> "FeatureSchema":
+        """
+        Fit a schema on training feature dictionaries
+
+        Args:
+            records: Feature dictionaries used for training
+            max_one_hot_categories: Categorical columns with more distinct values are hashed
+            hash_buckets: Width of hashed categorical columns
+            missing_policy: Fill strategy for missing numeric values
+            fill_value: Value used with MissingValuePolicy.CONSTANT
+            scale_numeric: Standardize numeric columns with the training mean and deviation
+
+        Returns:
+            Fitted FeatureSchema
+        """
+        records = list(records)
+        observed: Dict[str, List[Any]] = {}
+        for record in records:
+            for key, value in record.items():
+                if value is not None:
+                    observed.setdefault(key, []).append(value)
+
+        columns = []
+        for name in sorted(observed):
+            values = observed[name]
+            kind = _infer_kind(values)
+
+            if kind == FeatureKind.NUMERIC:
+                numbers = np.array([float(v) for v in values], dtype=np.float64)
+                mean = float(numbers.mean())
+                std = float(numbers.std())
+                if missing_policy == MissingValuePolicy.MEAN:
+                    column_fill = mean
+                elif missing_policy == MissingValuePolicy.MEDIAN:
+                    column_fill = float(np.median(numbers))
+                elif missing_policy == MissingValuePolicy.CONSTANT:
+                    column_fill = float(fill_value)
+                else:
+                    column_fill = 0.0
+                columns.append(FeatureColumn(
+                    name=name,
+                    kind=kind,
+                    width=1,
+                    missing_policy=missing_policy,
+                    fill_value=column_fill,
+                    mean=mean if scale_numeric else 0.0,
+                    scale=std if scale_numeric and std > 0 else 1.0
+                ))
+            elif kind == FeatureKind.BOOLEAN:
+                columns.append(FeatureColumn(name=name, kind=kind, width=1))
+            elif kind == FeatureKind.SEQUENCE:
+                columns.append(FeatureColumn(name=name, kind=kind, width=max(len(v) for v in values)))
+            else:
+                categories = sorted({str(v) for v in values})
+                if len(categories) <= max_one_hot_categories:
+                    # One slot per known category plus one for values unseen at training time
+                    columns.append(FeatureColumn(
+                        name=name, kind=FeatureKind.CATEGORICAL, width=len(categories) + 1, categories=categories
+                    ))
+                else:
+                    columns.append(FeatureColumn(
+                        name=name, kind=FeatureKind.HASHED, width=hash_buckets, hash_buckets=hash_buckets
+                    ))
+
+        schema = cls(columns)
+        logger.info(f"Fitted feature schema {schema.version}: {len(columns)} columns, {schema.dimension} features")
+        return schema
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Name of every position in the output vector"""
+        names = []
+        for column in self.columns:
+            names.extend(column.output_names())
+        return names
+
+    @property
+    def feature_sources(self) -> List[str]:
+        """Source column of every position in the output vector"""
+        sources = []
+        for column in self.columns:
+            sources.extend([column.name] * column.width)
+        return sources
+
+    def transform(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Encode feature dictionaries into a (len(records), dimension) matrix.
+        Unknown keys are ignored; missing keys follow the column's missing-value policy.
+        """
+        n_rows = len(records)
+        matrix = np.zeros((n_rows, self.dimension), dtype=np.float32)
+        offset = 0
+
+        for column in self.columns:
+            name = column.name
+            if column.kind == FeatureKind.NUMERIC:
+                values = np.fromiter((_as_float(record.get(name)) for record in records), dtype=np.float64, count=n_rows)
+                values[np.isnan(values)] = column.fill_value
+                matrix[:, offset] = (values - column.mean) / column.scale
+            elif column.kind == FeatureKind.BOOLEAN:
+                matrix[:, offset] = [1.0 if record.get(name) else 0.0 for record in records]
+            elif column.kind == FeatureKind.SEQUENCE:
+                for row, record in enumerate(records):
+                    sequence = record.get(name)
+                    if not isinstance(sequence, (list, tuple)):
+                        continue
+                    for i, item in enumerate(sequence[:column.width]):
+                        if isinstance(item, (int, float)):
+                            matrix[row, offset + i] = float(item)
+            elif column.kind == FeatureKind.CATEGORICAL:
+                index = self._category_index[name]
+                other = len(column.categories)
+                for row, record in enumerate(records):
+                    value = record.get(name)
+                    if value is not None:
+                        matrix[row, offset + index.get(str(value), other)] = 1.0
+            else:
+                for row, record in enumerate(records):
+                    value = record.get(name)
+                    if value is not None:
+                        matrix[row, offset + _stable_bucket(str(value), column.hash_buckets)] = 1.0
+            offset += column.width
+
+        return matrix
+
+    def transform_one(self, record: Dict[str, Any]) -> np.ndarray:
+        """Encode a single feature dictionary"""
+        return self.transform([record])[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the schema to plain JSON-compatible data"""
+        columns = []
+        for column in self.columns:
+            data = asdict(column)
+            data["kind"] = column.kind.value
+            data["missing_policy"] = column.missing_policy.value
+            columns.append(data)
+        return {"format": self.SCHEMA_FORMAT, "version": self.version, "columns": columns}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureSchema":
+        """Rebuild a schema produced by to_dict"""
+        if data.get("format") != cls.SCHEMA_FORMAT:
+            raise ValueError(f"Unsupported feature schema format: {data.get('format')}")
+        columns = []
+        for column_data in data["columns"]:
+            column_data = dict(column_data)
+            column_data["kind"] = FeatureKind(column_data["kind"])
+            column_data["missing_policy"] = MissingValuePolicy(column_data["missing_policy"])
+            columns.append(FeatureColumn(**column_data))
+        schema = cls(columns)
+        if data.get("version") and data["version"] != schema.version:
+            raise ValueError(f"Feature schema version mismatch: expected {data['version']}, got {schema.version}")
+        return schema
+
+    def save(self, path: str):
+        """Write the schema as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureSchema":
+        """Read a schema written by save"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def _fingerprint(self) -> str:
+        """Content hash identifying this exact encoding"""
+        payload = json.dumps(
+            [[c.name, c.kind.value, c.width, c.fill_value, c.mean, c.scale, c.categories, c.hash_buckets]
+             for c in self.columns],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
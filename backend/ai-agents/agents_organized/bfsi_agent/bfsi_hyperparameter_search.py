@@ -0,0 +1,474 @@
+"""
+BFSI Hyperparameter Search
+Parallel cross-validated search with successive-halving early stopping and a resumable trial store
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict, field
+from enum import Enum
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.model_selection import KFold, StratifiedKFold
+from sklearn.neural_network import MLPClassifier
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SearchStrategy(Enum):
+    """How candidate configurations are proposed"""
+    GRID = "grid"
+    RANDOM = "random"
+    BAYESIAN = "bayesian"
+
+@dataclass
+class Trial:
+    """One evaluated configuration at one budget"""
+    trial_id: str
+    params: Dict[str, Any]
+    rung: int
+    budget: float
+    score: float
+    fold_scores: List[float]
+    duration_seconds: float
+    status: str = "completed"
+    error: Optional[str] = None
+    timestamp: str = field(default_factory=lambda: time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+def params_key(params: Dict[str, Any]) -> str:
+    """Stable identifier of a parameter configuration"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+def generate_grid(param_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the parameter grid"""
+    keys = list(param_grid.keys())
+    return [dict(zip(keys, combination)) for combination in itertools.product(*param_grid.values())]
+
+class TrialStore:
+    """Append-only JSON lines file of completed trials, used to resume a study"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def load(self) -> List[Trial]:
+        """Read all trials recorded so far"""
+        if not os.path.exists(self.path):
+            return []
+        trials = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    trials.append(Trial(**json.loads(line)))
+                except (ValueError, TypeError):
+                    # A crash mid-write can leave a partial last line
+                    logger.warning(f"Skipping unreadable trial record in {self.path}")
+        return trials
+
+    def append(self, trial: Trial):
+        """Record a finished trial"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(trial), default=str) + "\n")
+            f.flush()
+
+def _build_sklearn_estimator(algorithm: str, params: Dict[str, Any], seed: int):
+    """Estimator for one trial; single-threaded so trials can run side by side"""
+    if algorithm == "random_forest":
+        return RandomForestClassifier(
+            n_estimators=params.get("n_estimators", 100),
+            max_depth=params.get("max_depth", 10),
+            min_samples_split=params.get("min_samples_split", 2),
+            random_state=seed,
+            n_jobs=1
+        )
+    if algorithm == "gradient_boosting":
+        return GradientBoostingClassifier(
+            n_estimators=params.get("n_estimators", 100),
+            learning_rate=params.get("learning_rate", 0.1),
+            max_depth=params.get("max_depth", 6),
+            random_state=seed
+        )
+    # MLPClassifier has no dropout, so only size and learning rate carry over
+    return MLPClassifier(
+        hidden_layer_sizes=(params.get("hidden_size", 128),),
+        learning_rate_init=params.get("learning_rate", 0.001),
+        max_iter=200,
+        random_state=seed
+    )
+
+def _fit_and_score_torch(params: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray,
+                         X_val: np.ndarray, y_val: np.ndarray, n_classes: int, seed: int) -> float:
+    """Train the PyTorch feed-forward network briefly and return validation accuracy"""
+    import torch
+    import torch.nn as nn
+    import torch.optim as optim
+    try:
+        from .bfsi_advanced_ml_system import NeuralNetwork
+    except ImportError:
+        from bfsi_advanced_ml_system import NeuralNetwork
+
+    torch.manual_seed(seed)
+    torch.set_num_threads(1)
+    model = NeuralNetwork(X_train.shape[1], [params.get("hidden_size", 128)], n_classes, params.get("dropout", 0.2))
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=params.get("learning_rate", 0.001))
+    X = torch.from_numpy(X_train.astype(np.float32))
+    y = torch.from_numpy(y_train.astype(np.int64))
+
+    model.train()
+    for _ in range(20):
+        optimizer.zero_grad()
+        loss = criterion(model(X), y)
+        loss.backward()
+        optimizer.step()
+
+    model.eval()
+    with torch.no_grad():
+        predicted = model(torch.from_numpy(X_val.astype(np.float32))).argmax(dim=1).numpy()
+    return float((predicted == y_val).mean())
+
+def _fit_and_score_lstm(params: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray,
+                        X_val: np.ndarray, y_val: np.ndarray, n_classes: int, seed: int) -> float:
+    """
+    Train the PyTorch LSTM briefly on windowed sequences and return validation accuracy
+
+    Sequences are built as in BFSIAdvancedMLSystem: consecutive blocks of training
+    rows for fitting, and one window starting at each validation row for scoring.
+    """
+    import torch
+    import torch.nn as nn
+    import torch.optim as optim
+    try:
+        from .bfsi_advanced_ml_system import BFSIAdvancedMLSystem, LSTMModel
+    except ImportError:
+        from bfsi_advanced_ml_system import BFSIAdvancedMLSystem, LSTMModel
+
+    torch.manual_seed(seed)
+    torch.set_num_threads(1)
+    sequence_length = params.get("sequence_length", 10)
+    sequences, sequence_labels = BFSIAdvancedMLSystem._training_sequences(X_train, y_train, sequence_length)
+    model = LSTMModel(X_train.shape[1], params.get("hidden_size", 64), params.get("num_layers", 2),
+                      n_classes, params.get("dropout", 0.2))
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=params.get("learning_rate", 0.001))
+    X = torch.from_numpy(np.ascontiguousarray(sequences, dtype=np.float32))
+    y = torch.from_numpy(sequence_labels.astype(np.int64))
+
+    model.train()
+    for _ in range(20):
+        optimizer.zero_grad()
+        loss = criterion(model(X), y)
+        loss.backward()
+        optimizer.step()
+
+    windows = BFSIAdvancedMLSystem._sequence_windows(X_val, sequence_length, len(X_val))
+    model.eval()
+    with torch.no_grad():
+        predicted = model(torch.from_numpy(np.ascontiguousarray(windows, dtype=np.float32))).argmax(dim=1).numpy()
+    return float((predicted == y_val).mean())
+
+def evaluate_trial(algorithm: str, params: Dict[str, Any], features: np.ndarray, labels: np.ndarray,
+                   budget: float, n_folds: int, seed: int, use_torch: bool) -> Tuple[float, List[float], float]:
+    """
+    Cross-validate one configuration. Runs in a worker process.
+
+    Args:
+        algorithm: MLAlgorithm value of the model being tuned
+        params: Hyperparameters to evaluate
+        features: Encoded feature matrix
+        labels: Class labels
+        budget: Fraction of each training fold used for fitting (successive-halving resource)
+        n_folds: Number of cross-validation folds
+        seed: Seed for fold assignment, subsampling and model initialization
+        use_torch: Evaluate neural networks with PyTorch instead of sklearn (the LSTM
+            as an LSTM over row sequences; without PyTorch it falls back to an MLP, as in training)
+
+    Returns:
+        Tuple of (mean validation accuracy, per-fold accuracies, duration in seconds)
+    """
+    started = time.time()
+    _, class_counts = np.unique(labels, return_counts=True)
+    n_classes = len(class_counts)
+    n_folds = max(2, min(n_folds, len(labels)))
+    if class_counts.min() >= n_folds:
+        splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    else:
+        splitter = KFold(n_splits=n_folds, shuffle=True, random_state=seed)
+
+    rng = np.random.default_rng(seed)
+    fold_scores = []
+    for train_idx, val_idx in splitter.split(features, labels):
+        # Low budgets fit on a subsample of the training fold; validation always uses the full fold
+        n_train = max(n_classes * 2, int(math.ceil(budget * len(train_idx))))
+        if n_train < len(train_idx):
+            # Kept in row order so LSTM training sequences follow the data
+            train_idx = np.sort(rng.choice(train_idx, size=n_train, replace=False))
+        X_train, y_train = features[train_idx], labels[train_idx]
+        X_val, y_val = features[val_idx], labels[val_idx]
+
+        if len(np.unique(y_train)) < 2:
+            # A single-class fold can only predict that class
+            fold_scores.append(float((y_val == y_train[0]).mean()))
+        elif algorithm == "lstm" and use_torch:
+            fold_scores.append(_fit_and_score_lstm(params, X_train, y_train, X_val, y_val, n_classes, seed))
+        elif algorithm == "neural_network" and use_torch:
+            fold_scores.append(_fit_and_score_torch(params, X_train, y_train, X_val, y_val, n_classes, seed))
+        else:
+            estimator = _build_sklearn_estimator(algorithm, params, seed)
+            estimator.fit(X_train, y_train)
+            fold_scores.append(float(estimator.score(X_val, y_val)))
+
+    return float(np.mean(fold_scores)), fold_scores, time.time() - started
+
+class _DiscreteTPESampler:
+    """
+    Tree-structured Parzen estimator over a discrete grid: values frequent among
+    the best trials and rare among the rest are preferred.
+    """
+
+    def __init__(self, param_grid: Dict[str, List[Any]], rng: random.Random, gamma: float = 0.25, n_startup: int = 5, n_candidates: int = 24):
+        self.param_grid = param_grid
+        self.rng = rng
+        self.gamma = gamma
+        self.n_startup = n_startup
+        self.n_candidates = n_candidates
+
+    def _random(self) -> Dict[str, Any]:
+        return {name: self.rng.choice(values) for name, values in self.param_grid.items()}
+
+    def sample(self, history: List[Tuple[Dict[str, Any], float]], exclude: set) -> Optional[Dict[str, Any]]:
+        """Propose a configuration not in exclude, or None if the grid is exhausted"""
+        candidates = []
+        for _ in range(self.n_candidates * 4):
+            candidate = self._random()
+            if params_key(candidate) not in exclude:
+                candidates.append(candidate)
+            if len(candidates) >= self.n_candidates:
+                break
+        if not candidates:
+            remaining = [p for p in generate_grid(self.param_grid) if params_key(p) not in exclude]
+            return remaining[0] if remaining else None
+        if len(history) < self.n_startup:
+            return candidates[0]
+
+        ranked = sorted(history, key=lambda item: item[1], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good, bad = ranked[:n_good], ranked[n_good:]
+
+        def density_ratio(candidate: Dict[str, Any]) -> float:
+            ratio = 1.0
+            for name, value in candidate.items():
+                in_good = sum(1 for params, _ in good if params.get(name) == value)
+                in_bad = sum(1 for params, _ in bad if params.get(name) == value)
+                ratio *= ((in_good + 1) / (len(good) + 1)) / ((in_bad + 1) / (len(bad) + 1))
+            return ratio
+
+        return max(candidates, key=density_ratio)
+
+class HyperparameterSearch:
+    """
+    Asynchronous successive halving (ASHA) over proposed configurations.
+    Every configuration starts at the smallest budget; a configuration is promoted
+    to the next rung once it ranks in the top 1/reduction_factor of its rung, so
+    workers never wait for a whole rung to finish.
+    """
+
+    def __init__(self, algorithm: str, param_grid: Dict[str, List[Any]],
+                 strategy: SearchStrategy = SearchStrategy.GRID,
+                 n_trials: Optional[int] = None,
+                 n_folds: int = 3,
+                 min_budget: float = 1.0 / 9.0,
+                 reduction_factor: int = 3,
+                 cpu_budget: Optional[int] = None,
+                 store: Optional[TrialStore] = None,
+                 seed: int = 42,
+                 use_torch: bool = False):
+        """
+        Args:
+            algorithm: MLAlgorithm value of the model being tuned
+            param_grid: Candidate values per hyperparameter
+            strategy: Grid, random or Bayesian (TPE) proposal of configurations
+            n_trials: Number of configurations started; defaults to the grid size
+            n_folds: Cross-validation folds per trial
+            min_budget: Training-data fraction of the lowest rung; 1.0 disables early stopping
+            reduction_factor: Fraction of configurations promoted per rung is 1/reduction_factor
+            cpu_budget: Maximum worker processes; defaults to all CPUs but one
+            store: Trial store used to resume and record the study
+            seed: Seed for sampling and cross-validation
+            use_torch: Evaluate neural networks with PyTorch
+        """
+        if reduction_factor < 2:
+            raise ValueError("reduction_factor must be at least 2")
+        self.algorithm = algorithm
+        self.param_grid = param_grid
+        self.strategy = strategy
+        self.grid = generate_grid(param_grid)
+        self.n_trials = min(n_trials or len(self.grid), len(self.grid))
+        self.n_folds = n_folds
+        self.reduction_factor = reduction_factor
+        self.cpu_budget = max(1, cpu_budget or (os.cpu_count() or 2) - 1)
+        self.store = store
+        self.seed = seed
+        self.use_torch = use_torch
+        self.rng = random.Random(seed)
+
+        # Rung budgets grow geometrically up to the full training fold
+        min_budget = min(max(min_budget, 1e-3), 1.0)
+        n_rungs = int(math.floor(math.log(1.0 / min_budget, reduction_factor) + 1e-9)) + 1
+        self.budgets = [min(1.0, min_budget * reduction_factor ** i) for i in range(n_rungs)]
+        self.budgets[-1] = 1.0
+
+        self._rungs: List[Dict[str, float]] = [{} for _ in self.budgets]
+        self._promoted: List[set] = [set() for _ in self.budgets]
+        self._params: Dict[str, Dict[str, Any]] = {}
+        self._started: set = set()
+        self._grid_order = list(self.grid)
+        if strategy != SearchStrategy.GRID:
+            self.rng.shuffle(self._grid_order)
+        self._tpe = _DiscreteTPESampler(param_grid, self.rng) if strategy == SearchStrategy.BAYESIAN else None
+        self.trials: List[Trial] = []
+
+    def study_id(self) -> str:
+        """Identifier of this search setup, used to name its trial store"""
+        payload = json.dumps([self.algorithm, self.param_grid, self.strategy.value, self.n_folds, self.budgets, self.seed],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+    def _record(self, trial: Trial):
+        key = params_key(trial.params)
+        self._params[key] = trial.params
+        self._started.add(key)
+        self._rungs[trial.rung][key] = trial.score
+        self.trials.append(trial)
+
+    def _next_job(self) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Promote a configuration if one qualifies, otherwise start a new one"""
+        for rung in range(len(self.budgets) - 2, -1, -1):
+            results = self._rungs[rung]
+            n_promotable = len(results) // self.reduction_factor
+            if n_promotable == 0:
+                continue
+            top = sorted(results, key=results.get, reverse=True)[:n_promotable]
+            for key in top:
+                if key not in self._promoted[rung] and key not in self._rungs[rung + 1]:
+                    self._promoted[rung].add(key)
+                    return self._params[key], rung + 1
+
+        if len(self._started) >= self.n_trials:
+            return None
+        if self._tpe is not None:
+            history = [(self._params[key], score) for key, score in self._rungs[0].items()]
+            params = self._tpe.sample(history, self._started)
+        else:
+            params = next((p for p in self._grid_order if params_key(p) not in self._started), None)
+        if params is None:
+            return None
+        key = params_key(params)
+        self._params[key] = params
+        self._started.add(key)
+        return params, 0
+
+    def _drain_trailing_promotions(self) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Once no new configurations remain, carry the best of each unfinished rung upward"""
+        for rung in range(len(self.budgets) - 1):
+            results = self._rungs[rung]
+            if not results or self._rungs[rung + 1]:
+                continue
+            best = max(results, key=results.get)
+            if best not in self._promoted[rung]:
+                self._promoted[rung].add(best)
+                return self._params[best], rung + 1
+        return None
+
+    def run(self, features: np.ndarray, labels: np.ndarray, resume: bool = True) -> Dict[str, Any]:
+        """
+        Run the search to completion
+
+        Args:
+            features: Encoded feature matrix
+            labels: Class labels
+            resume: Reuse trials already recorded in the store
+
+        Returns:
+            Best configuration, its full-budget score and search statistics
+        """
+        if resume and self.store is not None:
+            for trial in self.store.load():
+                if trial.status == "completed" and trial.rung < len(self.budgets):
+                    self._record(trial)
+            if self.trials:
+                logger.info(f"Resuming hyperparameter search with {len(self.trials)} recorded trials")
+        resumed = len(self.trials)
+
+        started = time.time()
+        pending = {}
+        with ProcessPoolExecutor(max_workers=self.cpu_budget) as executor:
+            while True:
+                while len(pending) < self.cpu_budget:
+                    job = self._next_job() or (None if pending else self._drain_trailing_promotions())
+                    if job is None:
+                        break
+                    params, rung = job
+                    if params_key(params) in self._rungs[rung]:
+                        continue  # Already evaluated in a resumed run
+                    future = executor.submit(
+                        evaluate_trial, self.algorithm, params, features, labels,
+                        self.budgets[rung], self.n_folds, self.seed, self.use_torch
+                    )
+                    pending[future] = (params, rung)
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    params, rung = pending.pop(future)
+                    try:
+                        score, fold_scores, duration = future.result()
+                        trial = Trial(
+                            trial_id=f"trial_{len(self.trials):04d}", params=params, rung=rung,
+                            budget=self.budgets[rung], score=score, fold_scores=fold_scores,
+                            duration_seconds=duration
+                        )
+                    except Exception as e:
+                        logger.error(f"Hyperparameter trial failed for {params}: {e}")
+                        trial = Trial(
+                            trial_id=f"trial_{len(self.trials):04d}", params=params, rung=rung,
+                            budget=self.budgets[rung], score=0.0, fold_scores=[], duration_seconds=0.0,
+                            status="failed", error=str(e)
+                        )
+                    self._record(trial)
+                    if self.store is not None:
+                        self.store.append(trial)
+
+        # Prefer configurations evaluated on the full budget
+        best_params, best_score, best_rung = {}, 0.0, -1
+        for rung in range(len(self.budgets) - 1, -1, -1):
+            if self._rungs[rung]:
+                best_key = max(self._rungs[rung], key=self._rungs[rung].get)
+                best_params, best_score, best_rung = self._params[best_key], self._rungs[rung][best_key], rung
+                break
+
+        return {
+            "best_params": best_params,
+            "best_score": best_score,
+            "best_budget": self.budgets[best_rung] if best_rung >= 0 else None,
+            "configurations_tried": len(self._rungs[0]),
+            "trials_evaluated": len(self.trials) - resumed,
+            "trials_resumed": resumed,
+            "rung_budgets": self.budgets,
+            "trials_per_rung": [len(results) for results in self._rungs],
+            "workers": self.cpu_budget,
+            "duration_seconds": time.time() - started
+        }
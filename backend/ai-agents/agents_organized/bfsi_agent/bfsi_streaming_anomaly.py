@@ -0,0 +1,490 @@
+"""
+BFSI Streaming Anomaly Detection
+Scores micro-batches of events against rolling thresholds and emits deduplicated alerts
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, AsyncIterator
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default micro-batch limits when grouping an event stream
+DEFAULT_MICRO_BATCH_SIZE = 256
+DEFAULT_MICRO_BATCH_WAIT_MS = 50.0
+
+# Alert keys are pruned once the dedup map grows past this size
+MAX_TRACKED_ALERT_KEYS = 10000
+
+class P2Quantile:
+    """
+    Streaming quantile estimate with constant memory (P-squared algorithm,
+    Jain & Chlamtac 1985). Five markers track the minimum, maximum, the
+    target quantile and two intermediate quantiles.
+    """
+
+    def __init__(self, quantile: float):
+        if not 0.0 < quantile < 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.count = 0
+        self._initial: List[float] = []
+        self._heights: List[float] = []
+        self._positions: List[float] = []
+        self._desired: List[float] = []
+        self._increments = [0.0, quantile / 2.0, quantile, (1.0 + quantile) / 2.0, 1.0]
+
+    def add(self, value: float):
+        """Include one observation"""
+        self.count += 1
+        if self.count <= 5:
+            self._initial.append(value)
+            if self.count == 5:
+                self._heights = sorted(self._initial)
+                self._positions = [0.0, 1.0, 2.0, 3.0, 4.0]
+                q = self.quantile
+                self._desired = [0.0, 2.0 * q, 4.0 * q, 2.0 + 2.0 * q, 4.0]
+            return
+
+        heights, positions = self._heights, self._positions
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while cell < 3 and value >= heights[cell + 1]:
+                cell += 1
+
+        for i in range(cell + 1, 5):
+            positions[i] += 1.0
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1.0 and positions[i + 1] - positions[i] > 1.0) or \
+               (offset <= -1.0 and positions[i - 1] - positions[i] < -1.0):
+                step = 1.0 if offset > 0 else -1.0
+                candidate = self._parabolic(i, step)
+                if heights[i - 1] < candidate < heights[i + 1]:
+                    heights[i] = candidate
+                else:
+                    j = i + int(step)
+                    heights[i] += step * (heights[j] - heights[i]) / (positions[j] - positions[i])
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: float) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        """Current quantile estimate (NaN before any observation)"""
+        if self.count == 0:
+            return math.nan
+        if self.count < 5:
+            return float(np.quantile(self._initial, self.quantile))
+        return self._heights[2]
+
+class RollingBaseline:
+    """
+    Threshold and score statistics over recent windows of observations.
+
+    Two quantile estimators alternate: the active one fills up while the one
+    completed last provides the threshold, so the baseline follows drift with
+    a lag of at most two windows without storing the scores themselves.
+    """
+
+    def __init__(self, quantile: float = 0.99, window_size: int = 1000, warmup: int = 100,
+                 ewma_alpha: float = 0.01):
+        self.quantile = quantile
+        self.window_size = window_size
+        self.warmup = warmup
+        self.ewma_alpha = ewma_alpha
+        self.observations = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self._active = P2Quantile(quantile)
+        self._reference: Optional[P2Quantile] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough scores have been seen to flag anomalies"""
+        return self.observations >= self.warmup
+
+    @property
+    def threshold(self) -> float:
+        """Score above which an observation is anomalous"""
+        if self._reference is not None:
+            return self._reference.value()
+        return self._active.value()
+
+    def add(self, score: float):
+        """Include one score in the baseline"""
+        self.observations += 1
+        if self.observations == 1:
+            self.mean = score
+        else:
+            delta = score - self.mean
+            self.mean += self.ewma_alpha * delta
+            self.variance = (1.0 - self.ewma_alpha) * (self.variance + self.ewma_alpha * delta * delta)
+
+        self._active.add(score)
+        if self._active.count >= self.window_size:
+            self._reference = self._active
+            self._active = P2Quantile(self.quantile)
+
+    def zscore(self, score: float) -> float:
+        """Distance of a score from the baseline mean in standard deviations"""
+        std = math.sqrt(self.variance)
+        return (score - self.mean) / std if std > 0 else 0.0
+
+class HalfSpaceTrees:
+    """
+    Streaming anomaly detector that learns incrementally (Tan, Ting & Liu 2011).
+
+    Each tree splits the feature space at the midpoints of random dimensions.
+    Mass profiles are counted over a window of recent observations and
+    replace the reference profile when the window is full, so the model tracks
+    the stream without retraining. Scores are in (0, 1]; higher is more anomalous.
+    """
+
+    def __init__(self, n_features: int, n_trees: int = 10, height: int = 8,
+                 window_size: int = 250, size_limit: Optional[float] = None, seed: int = 42):
+        self.n_features = n_features
+        self.n_trees = n_trees
+        self.height = height
+        self.window_size = window_size
+        self.size_limit = size_limit if size_limit is not None else 0.1 * window_size
+        self.windows_completed = 0
+        self._rng = np.random.default_rng(seed)
+        self._n_nodes = 2 ** (height + 1) - 1
+        self._split_dims = np.zeros((n_trees, self._n_nodes), dtype=np.int64)
+        self._split_values = np.zeros((n_trees, self._n_nodes), dtype=np.float64)
+        self._reference_mass = np.zeros((n_trees, self._n_nodes), dtype=np.float64)
+        self._latest_mass = np.zeros((n_trees, self._n_nodes), dtype=np.float64)
+        self._window_count = 0
+        self._built = False
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full reference window has been learned"""
+        return self.windows_completed > 0
+
+    def _build(self, features: np.ndarray):
+        """Lay out the trees over a work space derived from the first observations"""
+        lower = features.min(axis=0)
+        upper = features.max(axis=0)
+        span = np.where(upper > lower, upper - lower, 1.0)
+        lower, upper = lower - 0.5 * span, upper + 0.5 * span
+
+        for tree in range(self.n_trees):
+            # Random work space that still covers the observed range
+            pivot = lower + self._rng.random(self.n_features) * (upper - lower)
+            radius = 2.0 * np.maximum(pivot - lower, upper - pivot)
+            node_lower = np.empty((self._n_nodes, self.n_features))
+            node_upper = np.empty((self._n_nodes, self.n_features))
+            node_lower[0], node_upper[0] = pivot - radius, pivot + radius
+            for node in range(2 ** self.height - 1):
+                dim = int(self._rng.integers(self.n_features))
+                split = (node_lower[node, dim] + node_upper[node, dim]) / 2.0
+                self._split_dims[tree, node] = dim
+                self._split_values[tree, node] = split
+                left, right = 2 * node + 1, 2 * node + 2
+                node_lower[left], node_upper[left] = node_lower[node], node_upper[node]
+                node_lower[right], node_upper[right] = node_lower[node], node_upper[node]
+                node_upper[left, dim] = split
+                node_lower[right, dim] = split
+        self._built = True
+
+    def _paths(self, features: np.ndarray, tree: int) -> np.ndarray:
+        """Node index of every row at every depth, shape (height + 1, rows)"""
+        rows = np.arange(len(features))
+        nodes = np.zeros(len(features), dtype=np.int64)
+        paths = np.empty((self.height + 1, len(features)), dtype=np.int64)
+        paths[0] = nodes
+        for depth in range(1, self.height + 1):
+            dims = self._split_dims[tree, nodes]
+            go_right = features[rows, dims] >= self._split_values[tree, nodes]
+            nodes = 2 * nodes + 1 + go_right
+            paths[depth] = nodes
+        return paths
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """Anomaly score of each row against the reference window"""
+        features = np.asarray(features, dtype=np.float64)
+        if not self._built:
+            self._build(features)
+        mass_scores = np.zeros(len(features))
+        depth_weights = 2.0 ** np.arange(self.height + 1)
+
+        for tree in range(self.n_trees):
+            paths = self._paths(features, tree)
+            mass = self._reference_mass[tree][paths]
+            # Stop at the first node whose mass is below the size limit, or at the leaf
+            stop = mass < self.size_limit
+            stop[-1] = True
+            depth = stop.argmax(axis=0)
+            columns = np.arange(len(features))
+            mass_scores += mass[depth, columns] * depth_weights[depth]
+
+        return 1.0 / (1.0 + mass_scores / self.n_trees)
+
+    def update(self, features: np.ndarray):
+        """Count observations into the latest window, rotating windows as they fill"""
+        features = np.asarray(features, dtype=np.float64)
+        if not self._built:
+            self._build(features)
+        start = 0
+        while start < len(features):
+            take = min(self.window_size - self._window_count, len(features) - start)
+            chunk = features[start:start + take]
+            for tree in range(self.n_trees):
+                paths = self._paths(chunk, tree)
+                np.add.at(self._latest_mass[tree], paths.ravel(), 1.0)
+            self._window_count += take
+            start += take
+            if self._window_count >= self.window_size:
+                self._reference_mass, self._latest_mass = self._latest_mass, np.zeros_like(self._latest_mass)
+                self._window_count = 0
+                self.windows_completed += 1
+
+@dataclass
+class AnomalyAlert:
+    """An anomaly raised for one key; repeats within the dedup window are folded in"""
+    alert_id: str
+    key: str
+    score: float
+    threshold: float
+    zscore: float
+    record: Dict[str, Any]
+    first_seen: datetime
+    last_seen: datetime
+    occurrences: int = 1
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def severity(self) -> str:
+        """Severity from how far the score exceeds the threshold"""
+        ratio = self.score / self.threshold if self.threshold > 0 else math.inf
+        if ratio >= 3.0:
+            return "critical"
+        if ratio >= 2.0:
+            return "high"
+        if ratio >= 1.5:
+            return "medium"
+        return "low"
+
+class StreamingAnomalyDetector:
+    """
+    Scores a continuous stream of events in micro-batches.
+
+    Each batch is encoded, scored, compared with the rolling threshold and then
+    added to the baseline (and to the model when it learns incrementally).
+    Alerts are emitted once per key per dedup window; later anomalies for the
+    same key update the open alert instead of raising a new one.
+    """
+
+    def __init__(self, encode: Callable[[List[Dict[str, Any]]], np.ndarray],
+                 scorer: Callable[[np.ndarray], np.ndarray],
+                 updater: Optional[Callable[[np.ndarray], None]] = None,
+                 ready: Optional[Callable[[], bool]] = None,
+                 quantile: float = 0.99, baseline_window: int = 1000, warmup: int = 100,
+                 dedup_window_seconds: float = 300.0, key_field: str = "entity_id"):
+        """
+        Args:
+            encode: Turns event dictionaries into a feature matrix
+            scorer: Maps a feature matrix to anomaly scores (higher is more anomalous)
+            updater: Optional incremental model update called after scoring each batch
+            ready: Optional check that the model can be trusted, e.g. after its first window
+            quantile: Baseline quantile used as the alert threshold
+            baseline_window: Scores per baseline window
+            warmup: Scores required before anomalies are flagged
+            dedup_window_seconds: Repeated anomalies for a key within this time are folded into one alert
+            key_field: Event field identifying the entity an alert is about
+        """
+        self.encode = encode
+        self.scorer = scorer
+        self.updater = updater
+        self._model_ready = ready
+        self.baseline = RollingBaseline(quantile, baseline_window, warmup)
+        self.dedup_window_seconds = dedup_window_seconds
+        self.key_field = key_field
+        self._open_alerts: Dict[str, tuple] = {}
+        self.stats = {
+            "events_processed": 0,
+            "batches_processed": 0,
+            "anomalies_detected": 0,
+            "alerts_emitted": 0,
+            "alerts_suppressed": 0,
+            "scoring_seconds_total": 0.0
+        }
+
+    @property
+    def ready(self) -> bool:
+        """Whether anomalies are being flagged yet"""
+        return self.baseline.ready and (self._model_ready is None or self._model_ready())
+
+    def process_batch(self, records: List[Dict[str, Any]], now: Optional[float] = None) -> List[AnomalyAlert]:
+        """
+        Score one micro-batch
+
+        Args:
+            records: Event dictionaries
+            now: Monotonic timestamp used for deduplication (defaults to the current time)
+
+        Returns:
+            New alerts raised by this batch
+        """
+        if not records:
+            return []
+        now = time.monotonic() if now is None else now
+        started = time.perf_counter()
+
+        features = self.encode(records)
+        # Scores from a model that has not learned anything yet (e.g. half-space
+        # trees before their first window) are placeholders and must not shape the baseline
+        model_ready = self._model_ready is None or self._model_ready()
+        scores = np.asarray(self.scorer(features), dtype=np.float64)
+        if self.updater is not None:
+            self.updater(features)
+
+        alerts = []
+        if model_ready:
+            for record, score in zip(records, scores):
+                threshold = self.baseline.threshold
+                if self.baseline.ready and score > threshold:
+                    self.stats["anomalies_detected"] += 1
+                    alert = self._raise(record, float(score), threshold, now)
+                    if alert is not None:
+                        alerts.append(alert)
+                self.baseline.add(float(score))
+
+        self.stats["events_processed"] += len(records)
+        self.stats["batches_processed"] += 1
+        self.stats["scoring_seconds_total"] += time.perf_counter() - started
+        return alerts
+
+    def _raise(self, record: Dict[str, Any], score: float, threshold: float, now: float) -> Optional[AnomalyAlert]:
+        key = str(record.get(self.key_field, "global"))
+        open_alert = self._open_alerts.get(key)
+        if open_alert is not None and now - open_alert[0] < self.dedup_window_seconds:
+            alert = open_alert[1]
+            alert.occurrences += 1
+            alert.last_seen = datetime.now()
+            alert.score = max(alert.score, score)
+            self.stats["alerts_suppressed"] += 1
+            return None
+
+        if len(self._open_alerts) >= MAX_TRACKED_ALERT_KEYS:
+            self._prune_alerts(now)
+
+        timestamp = datetime.now()
+        alert = AnomalyAlert(
+            alert_id=f"alert_{uuid.uuid4().hex[:12]}",
+            key=key,
+            score=score,
+            threshold=threshold,
+            zscore=self.baseline.zscore(score),
+            record=record,
+            first_seen=timestamp,
+            last_seen=timestamp
+        )
+        self._open_alerts[key] = (now, alert)
+        self.stats["alerts_emitted"] += 1
+        return alert
+
+    def _prune_alerts(self, now: float):
+        """Forget keys whose dedup window has expired"""
+        self._open_alerts = {
+            key: entry for key, entry in self._open_alerts.items()
+            if now - entry[0] < self.dedup_window_seconds
+        }
+
+    async def run(self, batches: AsyncIterator[List[Dict[str, Any]]],
+                  on_alert: Callable[[AnomalyAlert], Any]):
+        """
+        Consume micro-batches until the stream ends, scoring off the event loop
+
+        Args:
+            batches: Async iterator of event lists, e.g. from micro_batches()
+            on_alert: Called (or awaited, if a coroutine function) for every new alert
+        """
+        loop = asyncio.get_running_loop()
+        async for batch in batches:
+            alerts = await loop.run_in_executor(None, self.process_batch, batch)
+            for alert in alerts:
+                result = on_alert(alert)
+                if asyncio.iscoroutine(result):
+                    await result
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Throughput, alert counts and the current baseline"""
+        stats = dict(self.stats)
+        stats.update({
+            "ready": self.ready,
+            "threshold": self.baseline.threshold,
+            "baseline_mean": self.baseline.mean,
+            "baseline_std": math.sqrt(self.baseline.variance),
+            "open_alert_keys": len(self._open_alerts),
+            "events_per_second": (
+                stats["events_processed"] / stats["scoring_seconds_total"]
+                if stats["scoring_seconds_total"] > 0 else 0.0
+            )
+        })
+        return stats
+
+async def micro_batches(events: AsyncIterator[Dict[str, Any]],
+                        max_batch_size: int = DEFAULT_MICRO_BATCH_SIZE,
+                        max_wait_ms: float = DEFAULT_MICRO_BATCH_WAIT_MS) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Group an event stream into micro-batches
+
+    A batch is yielded when it reaches max_batch_size or when max_wait_ms has
+    passed since its first event, whichever comes first.
+    """
+    iterator = events.__aiter__()
+    pending: Optional[asyncio.Task] = None
+    batch: List[Dict[str, Any]] = []
+    deadline = None
+
+    while True:
+        if pending is None:
+            pending = asyncio.ensure_future(iterator.__anext__())
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+        if not done:
+            # Wait expired with events buffered
+            yield batch
+            batch, deadline = [], None
+            continue
+
+        task, pending = pending, None
+        try:
+            event = task.result()
+        except StopAsyncIteration:
+            if batch:
+                yield batch
+            return
+
+        if not batch:
+            deadline = time.monotonic() + max_wait_ms / 1000.0
+        batch.append(event)
+        if len(batch) >= max_batch_size:
+            yield batch
+            batch, deadline = [], None
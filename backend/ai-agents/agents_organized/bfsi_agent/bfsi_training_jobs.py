@@ -0,0 +1,433 @@
+"""
+BFSI Training Job Manager
+Runs model training in worker processes with progress events, cancellation and checkpoint/resume
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Any, Optional, Callable, AsyncIterator
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds a worker gets to stop cooperatively before it is terminated
+CANCEL_GRACE_SECONDS = 5.0
+
+# Minimum seconds between job state writes caused by progress events
+STATE_WRITE_INTERVAL_SECONDS = 1.0
+
+class TrainingJobStatus(Enum):
+    """Lifecycle of a training job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    INTERRUPTED = "interrupted"
+
+TERMINAL_STATUSES = {
+    TrainingJobStatus.COMPLETED, TrainingJobStatus.FAILED,
+    TrainingJobStatus.CANCELLED, TrainingJobStatus.INTERRUPTED
+}
+
+class TrainingCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled"""
+
+@dataclass
+class TrainingJob:
+    """Persisted state of a training job"""
+    job_id: str
+    kind: str
+    algorithm: str
+    model_id: str
+    status: TrainingJobStatus
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    epoch: int = 0
+    total_epochs: int = 0
+    loss: Optional[float] = None
+    error: Optional[str] = None
+    resumed_from_epoch: Optional[int] = None
+    attempts: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrainingJob":
+        data = dict(data)
+        data["status"] = TrainingJobStatus(data["status"])
+        return cls(**data)
+
+class TrainingContext:
+    """
+    Hooks used by training loops running inside a worker process: per-epoch
+    progress events, cooperative cancellation and periodic checkpoints.
+    """
+
+    def __init__(self, events, cancel_event, checkpoint_path: str, resume: bool, checkpoint_every: int):
+        self.events = events
+        self.cancel_event = cancel_event
+        self.checkpoint_path = checkpoint_path
+        self.resume = resume
+        self.checkpoint_every = max(1, checkpoint_every)
+
+    def restore(self, model, optimizer):
+        """
+        Load the latest checkpoint into model and optimizer when resuming
+
+        Returns:
+            Tuple of (first epoch to run, loss at the checkpoint or None)
+        """
+        if not self.resume or not os.path.exists(self.checkpoint_path):
+            return 0, None
+        import torch
+        checkpoint = torch.load(self.checkpoint_path, map_location="cpu")
+        model.load_state_dict(checkpoint["model_state"])
+        optimizer.load_state_dict(checkpoint["optimizer_state"])
+        start_epoch = checkpoint["epoch"] + 1
+        self.events.put({"type": "resumed", "epoch": start_epoch})
+        return start_epoch, checkpoint.get("loss")
+
+    def end_epoch(self, epoch: int, total_epochs: int, loss: float, model=None, optimizer=None):
+        """Report an epoch, checkpoint if due and stop if the job was cancelled"""
+        self.events.put({"type": "epoch", "epoch": epoch + 1, "total_epochs": total_epochs, "loss": loss})
+        last_epoch = epoch + 1 == total_epochs
+        if model is not None and optimizer is not None and ((epoch + 1) % self.checkpoint_every == 0 or last_epoch):
+            import torch
+            tmp_path = self.checkpoint_path + ".tmp"
+            torch.save({
+                "epoch": epoch,
+                "loss": loss,
+                "model_state": model.state_dict(),
+                "optimizer_state": optimizer.state_dict()
+            }, tmp_path)
+            os.replace(tmp_path, self.checkpoint_path)
+        if self.cancel_event.is_set():
+            raise TrainingCancelled()
+
+def _training_worker(job_dir: str, kind: str, algorithm: str, model_id: str, resume: bool,
+                     checkpoint_every: int, events, cancel_event):
+    """Worker process entry point: train one model and send the result back"""
+    try:
+        try:
+            from .bfsi_advanced_ml_system import BFSIAdvancedMLSystem, MLAlgorithm
+        except ImportError:
+            from bfsi_advanced_ml_system import BFSIAdvancedMLSystem, MLAlgorithm
+
+        features = np.load(os.path.join(job_dir, "features.npy"))
+        labels_path = os.path.join(job_dir, "labels.npy")
+        labels = np.load(labels_path) if os.path.exists(labels_path) else None
+
+        system = BFSIAdvancedMLSystem()
+        system.training_context = TrainingContext(
+            events, cancel_event, os.path.join(job_dir, "checkpoint.pt"), resume, checkpoint_every
+        )
+        if kind == "anomaly_detection":
+            model = asyncio.run(system._fit_anomaly_model(features, model_id))
+        else:
+            model = asyncio.run(system._fit_reasoning_model(features, labels, model_id, MLAlgorithm(algorithm)))
+        events.put({"type": "completed", "model": model})
+    except TrainingCancelled:
+        events.put({"type": "cancelled"})
+    except Exception as e:
+        events.put({"type": "failed", "error": f"{type(e).__name__}: {e}"})
+
+class TrainingJobManager:
+    """
+    Schedules training jobs onto worker processes and tracks their state.
+    Job state is written to <state_dir>/<job_id>/job.json, so a restarted
+    service reports jobs that were cut off as interrupted and can resume them
+    from their last checkpoint.
+    """
+
+    def __init__(self, state_dir: str, max_workers: int = 1, checkpoint_every: int = 10,
+                 on_complete: Optional[Callable[[TrainingJob, Any], None]] = None):
+        """
+        Args:
+            state_dir: Directory holding job state, training data and checkpoints
+            max_workers: Maximum number of concurrently training worker processes
+            checkpoint_every: Epochs between checkpoints of neural network jobs
+            on_complete: Called in the event loop with (job, trained model) on success
+        """
+        self.state_dir = state_dir
+        self.max_workers = max_workers
+        self.checkpoint_every = checkpoint_every
+        self.on_complete = on_complete
+        self._mp = multiprocessing.get_context("spawn")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._jobs: Dict[str, TrainingJob] = {}
+        self._results: Dict[str, asyncio.Future] = {}
+        self._cancel_events: Dict[str, Any] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._last_write: Dict[str, float] = {}
+        os.makedirs(state_dir, exist_ok=True)
+        self._load_jobs()
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, job_id)
+
+    def _load_jobs(self):
+        """Reload persisted jobs; anything that was still active died with the previous process"""
+        for job_id in os.listdir(self.state_dir):
+            state_path = os.path.join(self._job_dir(job_id), "job.json")
+            if not os.path.exists(state_path):
+                continue
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    job = TrainingJob.from_dict(json.load(f))
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Skipping unreadable training job state {state_path}: {e}")
+                continue
+            if job.status not in TERMINAL_STATUSES:
+                job.status = TrainingJobStatus.INTERRUPTED
+                job.error = "Service stopped while the job was active"
+                job.finished_at = datetime.now().isoformat()
+                self._save(job)
+            self._jobs[job.job_id] = job
+
+    def _save(self, job: TrainingJob, force: bool = True):
+        """Atomically write job state, throttled for progress-only updates"""
+        now = time.monotonic()
+        if not force and now - self._last_write.get(job.job_id, 0.0) < STATE_WRITE_INTERVAL_SECONDS:
+            return
+        self._last_write[job.job_id] = now
+        state_path = os.path.join(self._job_dir(job.job_id), "job.json")
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job.to_dict(), f, indent=2, default=str)
+        os.replace(tmp_path, state_path)
+
+    def _publish(self, job_id: str, event: Dict[str, Any]):
+        for subscriber in self._subscribers.get(job_id, []):
+            subscriber.put_nowait(event)
+
+    async def submit(self, kind: str, algorithm: str, model_id: str, features: np.ndarray,
+                     labels: Optional[np.ndarray] = None, metadata: Optional[Dict[str, Any]] = None) -> TrainingJob:
+        """
+        Queue a training job
+
+        Args:
+            kind: "reasoning" or "anomaly_detection"
+            algorithm: MLAlgorithm value to train
+            model_id: Identifier given to the trained model
+            features: Encoded training features
+            labels: Training labels (reasoning models only)
+            metadata: Extra state persisted with the job, e.g. the feature schema
+
+        Returns:
+            The queued job
+        """
+        job = TrainingJob(
+            job_id=f"train_{uuid.uuid4().hex[:12]}",
+            kind=kind,
+            algorithm=algorithm,
+            model_id=model_id,
+            status=TrainingJobStatus.QUEUED,
+            created_at=datetime.now().isoformat(),
+            metadata=metadata or {}
+        )
+        job_dir = self._job_dir(job.job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        np.save(os.path.join(job_dir, "features.npy"), np.asarray(features, dtype=np.float32))
+        if labels is not None:
+            np.save(os.path.join(job_dir, "labels.npy"), np.asarray(labels))
+        self._jobs[job.job_id] = job
+        self._save(job)
+        self._start(job, resume=False)
+        return job
+
+    async def resume(self, job_id: str) -> TrainingJob:
+        """Restart an interrupted, failed or cancelled job from its last checkpoint"""
+        job = self._get(job_id)
+        if job.status not in TERMINAL_STATUSES or job.status == TrainingJobStatus.COMPLETED:
+            raise ValueError(f"Training job {job_id} is {job.status.value} and cannot be resumed")
+        job.status = TrainingJobStatus.QUEUED
+        job.error = None
+        job.finished_at = None
+        self._save(job)
+        self._start(job, resume=True)
+        return job
+
+    def _start(self, job: TrainingJob, resume: bool):
+        loop = asyncio.get_running_loop()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        self._results[job.job_id] = loop.create_future()
+        self._cancel_events[job.job_id] = self._mp.Event()
+        loop.create_task(self._run(job, resume))
+
+    async def _run(self, job: TrainingJob, resume: bool):
+        loop = asyncio.get_running_loop()
+        cancel_event = self._cancel_events[job.job_id]
+        result_future = self._results[job.job_id]
+
+        async with self._slots:
+            if cancel_event.is_set():
+                self._finish(job, TrainingJobStatus.CANCELLED)
+                result_future.set_exception(TrainingCancelled(f"Training job {job.job_id} was cancelled"))
+                result_future.exception()
+                return
+
+            events = self._mp.Queue()
+            process = self._mp.Process(
+                target=_training_worker,
+                args=(self._job_dir(job.job_id), job.kind, job.algorithm, job.model_id, resume,
+                      self.checkpoint_every, events, cancel_event),
+                daemon=True
+            )
+            job.status = TrainingJobStatus.RUNNING
+            job.started_at = datetime.now().isoformat()
+            job.attempts += 1
+            self._save(job)
+            self._publish(job.job_id, {"type": "started", "job_id": job.job_id})
+            process.start()
+
+            try:
+                outcome = await self._monitor(job, process, events, cancel_event)
+            except Exception as e:
+                logger.error(f"Lost track of training job {job.job_id}: {e}")
+                process.terminate()
+                outcome = {"type": "failed", "error": str(e)}
+            await loop.run_in_executor(None, process.join, CANCEL_GRACE_SECONDS)
+
+        if outcome["type"] == "completed":
+            model = outcome["model"]
+            self._finish(job, TrainingJobStatus.COMPLETED)
+            if self.on_complete is not None:
+                try:
+                    self.on_complete(job, model)
+                except Exception as e:
+                    logger.error(f"Completion callback failed for training job {job.job_id}: {e}")
+            result_future.set_result(model)
+        elif outcome["type"] == "cancelled":
+            self._finish(job, TrainingJobStatus.CANCELLED)
+            result_future.set_exception(TrainingCancelled(f"Training job {job.job_id} was cancelled"))
+        else:
+            self._finish(job, TrainingJobStatus.FAILED, outcome.get("error"))
+            result_future.set_exception(RuntimeError(f"Training job {job.job_id} failed: {outcome.get('error')}"))
+        # Nobody may be waiting on the result; avoid "exception was never retrieved" warnings
+        result_future.exception()
+
+    async def _monitor(self, job: TrainingJob, process, events, cancel_event) -> Dict[str, Any]:
+        """Relay worker events until the worker reports an outcome or dies"""
+        loop = asyncio.get_running_loop()
+        outcome: Optional[Dict[str, Any]] = None
+        cancel_requested_at: Optional[float] = None
+        while outcome is None:
+            try:
+                event = await loop.run_in_executor(None, events.get, True, 0.5)
+            except queue.Empty:
+                if cancel_event.is_set():
+                    cancel_requested_at = cancel_requested_at or time.monotonic()
+                    if time.monotonic() - cancel_requested_at > CANCEL_GRACE_SECONDS:
+                        # Non-epoch fits (e.g. random forests) cannot stop cooperatively
+                        process.terminate()
+                        outcome = {"type": "cancelled"}
+                elif not process.is_alive():
+                    outcome = {"type": "failed", "error": f"Worker exited with code {process.exitcode}"}
+                continue
+
+            if event["type"] in ("completed", "failed", "cancelled"):
+                outcome = event
+            elif event["type"] == "epoch":
+                job.epoch = event["epoch"]
+                job.total_epochs = event["total_epochs"]
+                job.loss = event["loss"]
+                self._save(job, force=False)
+                self._publish(job.job_id, {"job_id": job.job_id, **event})
+            elif event["type"] == "resumed":
+                job.resumed_from_epoch = event["epoch"]
+                self._save(job)
+                self._publish(job.job_id, {"job_id": job.job_id, **event})
+        return outcome
+
+    def _finish(self, job: TrainingJob, status: TrainingJobStatus, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now().isoformat()
+        self._save(job)
+        self._publish(job.job_id, {"type": status.value, "job_id": job.job_id, "error": error})
+        for subscriber in self._subscribers.pop(job.job_id, []):
+            subscriber.put_nowait(None)
+        logger.info(f"Training job {job.job_id} {status.value}")
+
+    def _get(self, job_id: str) -> TrainingJob:
+        if job_id not in self._jobs:
+            raise ValueError(f"Training job {job_id} not found")
+        return self._jobs[job_id]
+
+    def get_job(self, job_id: str) -> TrainingJob:
+        """Current state of a job"""
+        return self._get(job_id)
+
+    def list_jobs(self, status: Optional[TrainingJobStatus] = None) -> List[TrainingJob]:
+        """All known jobs, newest first"""
+        jobs = [job for job in self._jobs.values() if status is None or job.status == status]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> TrainingJob:
+        """Request cancellation; neural networks stop after the current epoch"""
+        job = self._get(job_id)
+        if job.status in TERMINAL_STATUSES:
+            return job
+        cancel_event = self._cancel_events.get(job_id)
+        if cancel_event is not None:
+            cancel_event.set()
+        return job
+
+    async def wait(self, job_id: str) -> Any:
+        """
+        Wait for a job started by this manager to finish
+
+        Returns:
+            The trained model
+
+        Raises:
+            TrainingCancelled: If the job was cancelled
+            RuntimeError: If training failed
+        """
+        self._get(job_id)
+        if job_id not in self._results:
+            raise ValueError(f"Training job {job_id} is not running in this process")
+        return await asyncio.shield(self._results[job_id])
+
+    async def events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream progress events of a job until it finishes"""
+        job = self._get(job_id)
+        if job.status in TERMINAL_STATUSES:
+            yield {"type": job.status.value, "job_id": job_id, "error": job.error}
+            return
+        subscriber: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(subscriber)
+        while True:
+            event = await subscriber.get()
+            if event is None:
+                return
+            yield event
+
+    def purge(self, job_id: str):
+        """Delete the state, data and checkpoints of a finished job"""
+        job = self._get(job_id)
+        if job.status not in TERMINAL_STATUSES:
+            raise ValueError(f"Training job {job_id} is still {job.status.value}")
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        self._jobs.pop(job_id, None)
+        self._results.pop(job_id, None)
+        self._cancel_events.pop(job_id, None)
@@ -10,6 +10,7 @@ Components:
 - orchestrator: Agent orchestration and coordination
 - subagents: Sub-agent definitions and implementations
 - performance: Performance optimization utilities
+- metrics: Latency histograms, process sampling and Prometheus exposition
 """
 
 from .agent import BFSIEnhancedAgent
@@ -0,0 +1,449 @@
+"""
+BFSI Metrics Core
+=================
+
+Low-overhead metrics shared by the BFSI agents:
+
+- LatencyHistogram: log-linear bucketed histogram (HDR style) with O(1)
+  recording, bounded memory and exact merging across agents
+- SlidingLatency: recent-window percentiles built from two rotating histograms
+- ProcessSampler: process memory/CPU read from one cached handle at most once
+  per sampling interval
+- ResourceSampler: background thread recording CPU time, RSS and IO counters
+  into a fixed-size ring buffer
+- PrometheusText: Prometheus text exposition format builder
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil  # type: ignore[import-untyped, reportMissingImports]
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None  # type: ignore[assignment]
+
+# Quantiles exported for every latency summary
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Minimum seconds between two reads of process statistics
+DEFAULT_SAMPLE_INTERVAL = 5.0
+
+# Background resource sampling: one sample per second, five minutes retained
+DEFAULT_RING_INTERVAL = 1.0
+DEFAULT_RING_CAPACITY = 300
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in seconds with relative bucket error of 2^-precision_bits.
+
+    Values are bucketed by power of two and then linearly within each power,
+    so recording is a couple of float operations and a dict increment.
+    Histograms with the same settings merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, precision_bits: int = 5, resolution: float = 1e-6):
+        """
+        Args:
+            precision_bits: Linear sub-buckets per power of two, as a power of two (5 -> ~3% error)
+            resolution: Smallest distinguishable value in seconds
+        """
+        self.precision_bits = precision_bits
+        self.resolution = resolution
+        self._sub_buckets = 1 << precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        scaled = value / self.resolution
+        if scaled < 1.0:
+            return 0
+        mantissa, exponent = math.frexp(scaled)
+        return exponent * self._sub_buckets + int((mantissa * 2.0 - 1.0) * self._sub_buckets) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        """Midpoint of a bucket in seconds"""
+        if index == 0:
+            return self.resolution / 2.0
+        exponent, sub_bucket = divmod(index - 1, self._sub_buckets)
+        lower = (1.0 + sub_bucket / self._sub_buckets) * 2.0 ** (exponent - 1)
+        upper = (1.0 + (sub_bucket + 1) / self._sub_buckets) * 2.0 ** (exponent - 1)
+        return (lower + upper) / 2.0 * self.resolution
+
+    def record(self, value: float):
+        """Add one duration"""
+        value = max(0.0, value)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's observations into this one"""
+        if (other.precision_bits, other.resolution) != (self.precision_bits, self.resolution):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        """Independent copy of this histogram"""
+        return LatencyHistogram(self.precision_bits, self.resolution).merge(self)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentiles(self, quantiles: Iterable[float]) -> List[float]:
+        """Estimated values at several quantiles (0-1) in one pass over the buckets"""
+        quantiles = list(quantiles)
+        if not self.count:
+            return [0.0] * len(quantiles)
+        targets = sorted((max(1, math.ceil(q * self.count)), i) for i, q in enumerate(quantiles))
+        results = [0.0] * len(quantiles)
+        seen = 0
+        position = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while position < len(targets) and seen >= targets[position][0]:
+                value = self._bucket_value(index)
+                results[targets[position][1]] = min(max(value, self.min), self.max)
+                position += 1
+            if position == len(targets):
+                break
+        return results
+
+    def percentile(self, quantile: float) -> float:
+        """Estimated value at a quantile (0-1)"""
+        return self.percentiles([quantile])[0]
+
+
+class SlidingLatency:
+    """
+    Percentiles over roughly the last window_size to 2 * window_size durations.
+    Two histograms alternate, so old observations are dropped a window at a time.
+    """
+
+    def __init__(self, window_size: int = 100):
+        self.window_size = window_size
+        self._current = LatencyHistogram()
+        self._previous = LatencyHistogram()
+
+    def record(self, value: float):
+        self._current.record(value)
+        if self._current.count >= self.window_size:
+            self._previous = self._current
+            self._current = LatencyHistogram()
+
+    def snapshot(self) -> LatencyHistogram:
+        """Histogram of the recent window"""
+        return self._previous.copy().merge(self._current)
+
+    @property
+    def mean(self) -> float:
+        count = self._current.count + self._previous.count
+        return (self._current.total + self._previous.total) / count if count else 0.0
+
+
+@dataclass
+class ProcessStats:
+    """Process resource usage at one point in time"""
+    memory_mb: float
+    cpu_percent: float
+    threads: int
+    sampled_at: float
+
+
+class ProcessSampler:
+    """
+    Cached process statistics.
+
+    One psutil.Process handle is kept for the lifetime of the sampler, so
+    cpu_percent() measures usage since the previous sample without blocking,
+    and the process is queried at most once per interval however often
+    callers ask.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._process = None
+        self._stats = ProcessStats(0.0, 0.0, 0, -math.inf)
+        self.samples_taken = 0
+        if PSUTIL_AVAILABLE:
+            try:
+                self._process = psutil.Process()
+                # The first call only establishes the CPU time baseline
+                self._process.cpu_percent(None)
+            except Exception as e:
+                logger.warning(f"Process metrics unavailable: {e}")
+                self._process = None
+
+    def sample(self, max_age: Optional[float] = None) -> ProcessStats:
+        """
+        Latest process statistics, refreshed when older than max_age
+
+        Args:
+            max_age: Maximum acceptable age in seconds (defaults to the sampler interval)
+        """
+        max_age = self.interval if max_age is None else max_age
+        now = time.monotonic()
+        if self._process is None or now - self._stats.sampled_at < max_age:
+            return self._stats
+        with self._lock:
+            if now - self._stats.sampled_at >= max_age:
+                try:
+                    with self._process.oneshot():
+                        self._stats = ProcessStats(
+                            memory_mb=self._process.memory_info().rss / 1024 / 1024,
+                            cpu_percent=self._process.cpu_percent(None),
+                            threads=self._process.num_threads(),
+                            sampled_at=now
+                        )
+                    self.samples_taken += 1
+                except Exception as e:
+                    logger.debug(f"Process sampling failed: {e}")
+        return self._stats
+
+    def current_rss_mb(self) -> float:
+        """
+        Resident memory in MB read now from the cached handle
+
+        Cheaper than a full sample (a single memory_info() call) and never
+        stale, so it can bracket one task to measure its memory delta.
+        Falls back to the last sample when psutil is unavailable.
+        """
+        if self._process is None:
+            return self._stats.memory_mb
+        try:
+            return self._process.memory_info().rss / 1024 / 1024
+        except Exception as e:
+            logger.debug(f"Reading process memory failed: {e}")
+            return self._stats.memory_mb
+
+
+_process_sampler: Optional[ProcessSampler] = None
+
+
+def get_process_sampler() -> ProcessSampler:
+    """Process-wide sampler shared by all agents"""
+    global _process_sampler
+    if _process_sampler is None:
+        _process_sampler = ProcessSampler()
+    return _process_sampler
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """Cumulative process counters at one point in time"""
+    timestamp: float
+    cpu_seconds: float
+    rss_mb: float
+    read_bytes: int
+    write_bytes: int
+
+
+class ResourceSampler:
+    """
+    Background sampler of process CPU time, RSS and IO counters.
+
+    A daemon thread is the only writer: it fills a preallocated ring slot and
+    then advances the write counter, so readers never take a lock. A reader
+    racing a full lap of the writer can at worst see one sample newer than
+    expected, which is harmless for rate calculations.
+    """
+
+    def __init__(self, interval: float = DEFAULT_RING_INTERVAL, capacity: int = DEFAULT_RING_CAPACITY):
+        self.interval = interval
+        self.capacity = capacity
+        self._ring: List[Optional[ResourceSample]] = [None] * capacity
+        self._written = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = None
+        if PSUTIL_AVAILABLE:
+            try:
+                self._process = psutil.Process()
+            except Exception as e:
+                logger.warning(f"Process metrics unavailable: {e}")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "ResourceSampler":
+        """Start the sampling thread (no-op when already running or psutil is missing)"""
+        if self._process is None or self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bfsi-resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the sampling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def sample_now(self) -> Optional[ResourceSample]:
+        """Take one sample immediately and append it to the ring"""
+        if self._process is None:
+            return None
+        try:
+            with self._process.oneshot():
+                cpu = self._process.cpu_times()
+                rss = self._process.memory_info().rss
+                try:
+                    io = self._process.io_counters()
+                    read_bytes, write_bytes = io.read_bytes, io.write_bytes
+                except (AttributeError, psutil.AccessDenied):
+                    read_bytes = write_bytes = 0
+        except Exception as e:
+            logger.debug(f"Resource sampling failed: {e}")
+            return None
+        sample = ResourceSample(time.monotonic(), cpu.user + cpu.system, rss / 1024 / 1024, read_bytes, write_bytes)
+        self._ring[self._written % self.capacity] = sample
+        self._written += 1
+        return sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample_now()
+            self._stop.wait(self.interval)
+
+    def latest(self) -> Optional[ResourceSample]:
+        """Most recent sample, if any"""
+        written = self._written
+        return self._ring[(written - 1) % self.capacity] if written else None
+
+    def samples(self, window_seconds: Optional[float] = None) -> List[ResourceSample]:
+        """Retained samples, oldest first, optionally limited to the last window_seconds"""
+        written = self._written
+        count = min(written, self.capacity)
+        ordered = [self._ring[i % self.capacity] for i in range(written - count, written)]
+        ordered = [sample for sample in ordered if sample is not None]
+        if window_seconds is not None and ordered:
+            cutoff = ordered[-1].timestamp - window_seconds
+            ordered = [sample for sample in ordered if sample.timestamp >= cutoff]
+        return ordered
+
+    def usage(self, window_seconds: float = 60.0) -> Dict[str, float]:
+        """CPU percent, IO rates and RSS over the recent window, from counter deltas"""
+        window = self.samples(window_seconds)
+        if not window:
+            return {"cpu_percent": 0.0, "rss_mb": 0.0, "peak_rss_mb": 0.0, "read_bytes_per_second": 0.0,
+                    "write_bytes_per_second": 0.0, "samples": 0}
+        first, last = window[0], window[-1]
+        elapsed = last.timestamp - first.timestamp
+        return {
+            "cpu_percent": (last.cpu_seconds - first.cpu_seconds) / elapsed * 100 if elapsed > 0 else 0.0,
+            "rss_mb": last.rss_mb,
+            "peak_rss_mb": max(sample.rss_mb for sample in window),
+            "read_bytes_per_second": (last.read_bytes - first.read_bytes) / elapsed if elapsed > 0 else 0.0,
+            "write_bytes_per_second": (last.write_bytes - first.write_bytes) / elapsed if elapsed > 0 else 0.0,
+            "samples": len(window)
+        }
+
+
+_resource_sampler: Optional[ResourceSampler] = None
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Process-wide background sampler, started on first use"""
+    global _resource_sampler
+    if _resource_sampler is None:
+        _resource_sampler = ResourceSampler().start()
+    return _resource_sampler
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Optional[Dict[str, Any]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class PrometheusText:
+    """Builds a Prometheus text format (version 0.0.4) exposition"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace: str = "bfsi"):
+        self.namespace = namespace
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def _family(self, name: str, kind: str, help_text: str) -> List[str]:
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        if full_name not in self._families:
+            self._families[full_name] = (kind, help_text, [])
+        return self._families[full_name][2]
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def counter(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        """Add a monotonically increasing counter sample (name should end in _total)"""
+        self._family(name, "counter", help_text).append(
+            f"{self._name(name)}{_format_labels(labels)} {_format_value(value)}"
+        )
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        """Add a gauge sample"""
+        self._family(name, "gauge", help_text).append(
+            f"{self._name(name)}{_format_labels(labels)} {_format_value(value)}"
+        )
+
+    def summary(self, name: str, help_text: str, histogram: LatencyHistogram,
+                labels: Optional[Dict[str, Any]] = None, quantiles: Iterable[float] = DEFAULT_QUANTILES):
+        """Add quantile, sum and count samples computed from a histogram"""
+        lines = self._family(name, "summary", help_text)
+        labels = dict(labels or {})
+        quantiles = list(quantiles)
+        full_name = self._name(name)
+        for quantile, value in zip(quantiles, histogram.percentiles(quantiles)):
+            lines.append(f"{full_name}{_format_labels({**labels, 'quantile': quantile})} {_format_value(value)}")
+        lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+        lines.append(f"{full_name}_count{_format_labels(labels)} {_format_value(histogram.count)}")
+
+    def render(self) -> str:
+        """Exposition text with HELP and TYPE lines per family"""
+        output = []
+        for name, (kind, help_text, lines) in self._families.items():
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
@@ -3,17 +3,30 @@ BFSI Performance Optimization Module
 ===================================
 
 This module provides performance optimization utilities for the BFSI agent system.
+
+Operation tracking reads the process CPU time and RSS once at the start and
+once at the end of an operation, which costs microseconds and never sleeps.
+Longer-term CPU, memory and IO trends come from the shared background
+ResourceSampler.
 """
 
 import time
-import psutil
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from collections import deque
+from typing import Dict, Any, Optional, Deque
+from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    from .metrics import LatencyHistogram, get_resource_sampler, PSUTIL_AVAILABLE, psutil
+except ImportError:
+    from metrics import LatencyHistogram, get_resource_sampler, PSUTIL_AVAILABLE, psutil
+
 logger = logging.getLogger(__name__)
 
+# Individual operation records kept for inspection; rollups cover all operations
+DEFAULT_HISTORY_SIZE = 1000
+
 @dataclass
 class PerformanceMetrics:
     """Performance metrics data structure."""
@@ -27,27 +40,62 @@ class PerformanceMetrics:
     operation_type: str
     error_message: Optional[str] = None
 
+@dataclass
+class OperationRollup:
+    """Running totals for one operation type."""
+    total_operations: int = 0
+    successful_operations: int = 0
+    failed_operations: int = 0
+    total_duration: float = 0.0
+    total_memory_usage: float = 0.0
+    total_cpu_usage: float = 0.0
+    durations: LatencyHistogram = field(default_factory=LatencyHistogram)
+    
+    def add(self, metrics: PerformanceMetrics) -> None:
+        self.total_operations += 1
+        if not metrics.success:
+            self.failed_operations += 1
+            return
+        self.successful_operations += 1
+        self.total_duration += metrics.duration
+        self.total_memory_usage += metrics.memory_usage
+        self.total_cpu_usage += metrics.cpu_usage
+        self.durations.record(metrics.duration)
+    
+    def merge(self, other: "OperationRollup") -> "OperationRollup":
+        self.total_operations += other.total_operations
+        self.successful_operations += other.successful_operations
+        self.failed_operations += other.failed_operations
+        self.total_duration += other.total_duration
+        self.total_memory_usage += other.total_memory_usage
+        self.total_cpu_usage += other.total_cpu_usage
+        self.durations.merge(other.durations)
+        return self
+
 class BFSIPerformanceOptimizer:
     """
     Performance optimization utilities for BFSI operations.
     """
     
-    def __init__(self):
-        self.metrics_history: List[PerformanceMetrics] = []
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.metrics_history: Deque[PerformanceMetrics] = deque(maxlen=history_size)
+        self.rollups: Dict[str, OperationRollup] = {}
         self.active_operations: Dict[str, Dict[str, Any]] = {}
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        self.resource_sampler = get_resource_sampler()
+    
+    def _rss_mb(self) -> float:
+        if self._process is None:
+            return 0.0
+        return self._process.memory_info().rss / 1024 / 1024
     
     def start_operation(self, operation_id: str, operation_type: str = "general") -> None:
         """Start tracking an operation."""
-        start_time = time.time()
-        process = psutil.Process()
-        
-        # Get accurate baseline CPU usage with small interval
-        start_cpu = process.cpu_percent(interval=0.1)
-        
         self.active_operations[operation_id] = {
-            'start_time': start_time,
-            'start_memory': process.memory_info().rss / 1024 / 1024,  # MB
-            'start_cpu': start_cpu,
+            'start_time': time.time(),
+            'start_clock': time.perf_counter(),
+            'start_cpu_time': time.process_time(),
+            'start_memory': self._rss_mb(),  # MB
             'operation_type': operation_type
         }
         
@@ -60,22 +108,20 @@ class BFSIPerformanceOptimizer:
             return None
         
         operation_data = self.active_operations.pop(operation_id)
-        end_time = time.time()
-        process = psutil.Process()
+        cpu_time = time.process_time() - operation_data['start_cpu_time']
+        duration = time.perf_counter() - operation_data['start_clock']
         
-        # Calculate accurate CPU usage with interval
-        end_cpu = process.cpu_percent(interval=0.1)
-        cpu_usage = max(0, end_cpu - operation_data['start_cpu'])
+        # Process CPU time used during the operation as a percentage of wall time
+        cpu_usage = cpu_time / duration * 100 if duration > 0 else 0.0
         
         # Calculate memory usage difference, ensuring non-negative
-        end_memory = process.memory_info().rss / 1024 / 1024
-        memory_usage = max(0, end_memory - operation_data['start_memory'])
+        memory_usage = max(0, self._rss_mb() - operation_data['start_memory'])
         
         metrics = PerformanceMetrics(
             operation_id=operation_id,
             start_time=operation_data['start_time'],
-            end_time=end_time,
-            duration=end_time - operation_data['start_time'],
+            end_time=operation_data['start_time'] + duration,
+            duration=duration,
             memory_usage=memory_usage,
             cpu_usage=cpu_usage,
             success=success,
@@ -84,6 +130,7 @@ class BFSIPerformanceOptimizer:
         )
         
         self.metrics_history.append(metrics)
+        self.rollups.setdefault(metrics.operation_type, OperationRollup()).add(metrics)
         logger.debug(f"Completed operation {operation_id} in {metrics.duration:.2f}s")
         
         return metrics
@@ -91,35 +138,46 @@ class BFSIPerformanceOptimizer:
     def get_performance_summary(self, operation_type: Optional[str] = None) -> Dict[str, Any]:
         """Get performance summary for operations."""
         if operation_type:
-            filtered_metrics = [m for m in self.metrics_history 
-                              if m.operation_type == operation_type]
+            rollup = self.rollups.get(operation_type)
         else:
-            filtered_metrics = self.metrics_history
+            rollup = OperationRollup()
+            for type_rollup in self.rollups.values():
+                rollup.merge(type_rollup)
         
-        if not filtered_metrics:
+        if rollup is None or not rollup.total_operations:
             return {"message": "No metrics available"}
         
-        successful_ops = [m for m in filtered_metrics if m.success]
-        failed_ops = [m for m in filtered_metrics if not m.success]
-        
+        successful = rollup.successful_operations
+        p50, p95 = rollup.durations.percentiles([0.5, 0.95])
+        return {
+            "total_operations": rollup.total_operations,
+            "successful_operations": successful,
+            "failed_operations": rollup.failed_operations,
+            "success_rate": successful / rollup.total_operations,
+            "average_duration": rollup.total_duration / successful if successful else 0,
+            "p50_duration": p50,
+            "p95_duration": p95,
+            "average_memory_usage": rollup.total_memory_usage / successful if successful else 0,
+            "average_cpu_usage": rollup.total_cpu_usage / successful if successful else 0
+        }
+    
+    def get_resource_usage(self, window_seconds: float = 60.0) -> Dict[str, Any]:
+        """Process CPU, memory and IO rates over the recent window from the background sampler."""
         return {
-            "total_operations": len(filtered_metrics),
-            "successful_operations": len(successful_ops),
-            "failed_operations": len(failed_ops),
-            "success_rate": len(successful_ops) / len(filtered_metrics) if filtered_metrics else 0,
-            "average_duration": sum(m.duration for m in successful_ops) / len(successful_ops) if successful_ops else 0,
-            "average_memory_usage": sum(m.memory_usage for m in successful_ops) / len(successful_ops) if successful_ops else 0,
-            "average_cpu_usage": sum(m.cpu_usage for m in successful_ops) / len(successful_ops) if successful_ops else 0
+            "window_seconds": window_seconds,
+            "timestamp": datetime.now().isoformat(),
+            **self.resource_sampler.usage(window_seconds)
         }
     
     def optimize_memory_usage(self) -> Dict[str, Any]:
         """Analyze and suggest memory optimization."""
-        process = psutil.Process()
-        memory_info = process.memory_info()
+        if self._process is None:
+            return {"error": "psutil not available"}
+        memory_info = self._process.memory_info()
         
         return {
             "current_memory_mb": memory_info.rss / 1024 / 1024,
-            "memory_percent": process.memory_percent(),
+            "memory_percent": self._process.memory_percent(),
             "suggestions": [
                 "Consider implementing lazy loading for large datasets",
                 "Use generators instead of lists for large data processing",
@@ -131,4 +189,5 @@ class BFSIPerformanceOptimizer:
     def clear_metrics_history(self) -> None:
         """Clear performance metrics history."""
         self.metrics_history.clear()
+        self.rollups.clear()
         logger.info("Performance metrics history cleared")
@@ -14,20 +14,21 @@ from enum import Enum
 from dataclasses import dataclass, field
 from functools import wraps
 import json
-import statistics
+
+try:
+    from .metrics import LatencyHistogram, SlidingLatency, PrometheusText, get_process_sampler, PSUTIL_AVAILABLE
+except ImportError:
+    from metrics import LatencyHistogram, SlidingLatency, PrometheusText, get_process_sampler, PSUTIL_AVAILABLE
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Optional dependencies with fallback
-try:
-    import psutil  # type: ignore[import-untyped, reportMissingImports]
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    psutil = None  # type: ignore[assignment]
+if not PSUTIL_AVAILABLE:
     logger.warning("psutil not available, system metrics will be limited")
 
+# Tasks covered by the recent-latency window used for p95/p99
+LATENCY_WINDOW_TASKS = 100
+
 class BFSIAgentType(Enum):
     COMPLIANCE_COORDINATOR = "compliance_coordinator"
     RISK_ANALYZER = "risk_analyzer"
@@ -159,7 +160,8 @@ class BFSISubAgent:
         self.metrics = AgentMetrics()
         
         # Enhanced monitoring
-        self.execution_times: List[float] = []
+        self.latency = LatencyHistogram()
+        self.recent_latency = SlidingLatency(LATENCY_WINDOW_TASKS)
         self.error_history: List[Dict[str, Any]] = []
         self.task_history: List[TaskResult] = []
         self.circuit_breaker_threshold = 5  # Max consecutive failures
@@ -181,30 +183,21 @@ class BFSISubAgent:
             "min_success_rate": 90.0
         }
         
+        # Called with the agent when its circuit breaker opens or closes
+        self.state_listeners: List[Callable[["BFSISubAgent"], None]] = []
+        
         logger.info(f"Initialized {self.name} ({self.agent_type.value})")
     
     def _get_memory_usage(self) -> float:
-        """Get current memory usage"""
-        if PSUTIL_AVAILABLE:
-            try:
-                process = psutil.Process()
-                return process.memory_info().rss / 1024 / 1024  # MB
-            except Exception:
-                pass
-        return 0.0
+        """Process memory in MB from the shared periodic sample"""
+        return get_process_sampler().sample().memory_mb
     
     def _get_cpu_usage(self) -> float:
-        """Get current CPU usage"""
-        if PSUTIL_AVAILABLE:
-            try:
-                process = psutil.Process()
-                return process.cpu_percent()
-            except Exception:
-                pass
-        return 0.0
+        """Process CPU percent from the shared periodic sample"""
+        return get_process_sampler().sample().cpu_percent
     
     def _update_metrics(self, execution_time: float, success: bool, start_memory: float):
-        """Update agent metrics"""
+        """Update agent metrics; percentiles are derived on read in _sync_metrics"""
         self.metrics.total_tasks += 1
         if success:
             self.metrics.successful_tasks += 1
@@ -217,29 +210,43 @@ class BFSISubAgent:
             if self.circuit_breaker_failures >= self.circuit_breaker_threshold:
                 self._open_circuit_breaker()
         
-        # Update execution times
-        self.execution_times.append(execution_time)
-        if len(self.execution_times) > 100:  # Keep only last 100
-            self.execution_times = self.execution_times[-100:]
-        
-        # Calculate averages and percentiles
-        if self.execution_times:
-            self.metrics.average_execution_time = statistics.mean(self.execution_times)
-            if len(self.execution_times) > 1:
-                self.metrics.response_time_p95 = statistics.quantiles(self.execution_times, n=20)[18]
-                self.metrics.response_time_p99 = statistics.quantiles(self.execution_times, n=100)[98]
-        
-        # Update resource usage
-        self.metrics.memory_usage = self._get_memory_usage()
-        self.metrics.cpu_usage = self._get_cpu_usage()
+        # Record execution time
+        self.latency.record(execution_time)
+        self.recent_latency.record(execution_time)
+        self.metrics.average_execution_time = self.recent_latency.mean
         self.metrics.last_activity = datetime.now()
     
+    def _sync_metrics(self) -> AgentMetrics:
+        """Fill in percentiles and resource usage before metrics are reported"""
+        if self.metrics.total_tasks > 1:
+            self.metrics.response_time_p95, self.metrics.response_time_p99 = \
+                self.recent_latency.snapshot().percentiles((0.95, 0.99))
+        stats = get_process_sampler().sample()
+        self.metrics.memory_usage = stats.memory_mb
+        self.metrics.cpu_usage = stats.cpu_percent
+        return self.metrics
+    
+    def collect_metrics(self, exposition: PrometheusText):
+        """Add this agent's series to a Prometheus exposition"""
+        labels = {"agent_id": self.agent_id, "agent_type": self.agent_type.value}
+        exposition.counter("agent_tasks_total", "Tasks executed by the agent",
+                           self.metrics.successful_tasks, {**labels, "outcome": "success"})
+        exposition.counter("agent_tasks_total", "Tasks executed by the agent",
+                           self.metrics.failed_tasks, {**labels, "outcome": "failure"})
+        exposition.summary("agent_task_duration_seconds", "Task execution time", self.latency, labels)
+        exposition.gauge("agent_circuit_breaker_open", "Whether the agent circuit breaker is open",
+                         1.0 if self.circuit_breaker_open else 0.0, labels)
+        exposition.gauge("agent_health_score", "Agent health score (0-100)", self._calculate_health_score(), labels)
+    
     def _open_circuit_breaker(self):
         """Open circuit breaker to prevent cascading failures"""
+        was_open = self.circuit_breaker_open
         self.circuit_breaker_open = True
         self.circuit_breaker_reset_time = datetime.now() + timedelta(minutes=5)
         self.status = AgentStatus.ERROR
         logger.warning(f"Circuit breaker opened for {self.name} due to {self.circuit_breaker_failures} consecutive failures")
+        if not was_open:
+            self._notify_state_change()
     
     def _reset_circuit_breaker(self):
         """Reset circuit breaker"""
@@ -248,6 +255,15 @@ class BFSISubAgent:
         self.circuit_breaker_reset_time = None
         self.status = AgentStatus.READY
         logger.info(f"Circuit breaker reset for {self.name}")
+        self._notify_state_change()
+    
+    def _notify_state_change(self):
+        """Tell listeners (e.g. the orchestrator's health snapshot) that health changed"""
+        for listener in self.state_listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                logger.warning(f"State listener failed for {self.name}: {e}")
     
     def _check_circuit_breaker(self) -> bool:
         """Check if circuit breaker should be reset"""
@@ -262,7 +278,8 @@ class BFSISubAgent:
         """Execute a task with enhanced monitoring and error handling"""
         task_id = str(uuid.uuid4())
         start_time = time.time()
-        start_memory = self._get_memory_usage()
+        # Read RSS directly: the shared sample may predate the task by a whole interval
+        start_memory = get_process_sampler().current_rss_mb()
         
         # Check circuit breaker
         if self._check_circuit_breaker():
@@ -304,7 +321,7 @@ class BFSISubAgent:
                 execution_time=execution_time,
                 timestamp=datetime.now(),
                 performance_metrics={
-                    "memory_delta": self._get_memory_usage() - start_memory,
+                    "memory_delta": get_process_sampler().current_rss_mb() - start_memory,
                     "cpu_usage": self._get_cpu_usage()
                 }
             )
@@ -387,7 +404,7 @@ class BFSISubAgent:
             "status": self.status.value,
             "circuit_breaker_open": self.circuit_breaker_open,
             "circuit_breaker_failures": self.circuit_breaker_failures,
-            "metrics": self.metrics.to_dict(),
+            "metrics": self._sync_metrics().to_dict(),
             "recent_errors": len([e for e in self.error_history if 
                                 datetime.fromisoformat(e["timestamp"]) > datetime.now() - timedelta(hours=1)]),
             "health_score": self._calculate_health_score(),
@@ -1786,6 +1803,18 @@ class FraudDetection(BFSISubAgent):
             "timestamp": datetime.now().isoformat()
         }
 
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Point-in-time health of all sub-agents, replaced as a whole on refresh"""
+    agent_health: Dict[str, Dict[str, Any]]
+    unhealthy_agents: List[str]
+    created_at: float
+    refresh_seconds: float
+    
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.created_at
+
 class BFSIOrchestrator:
     """Enhanced BFSI Orchestrator - Advanced coordination of all BFSI sub-agents with intelligent routing and monitoring"""
     
@@ -1807,6 +1836,7 @@ class BFSIOrchestrator:
         # Enhanced orchestration capabilities
         self.operation_history: List[Dict[str, Any]] = []
         self.performance_metrics = AgentMetrics()
+        self.operation_latency = LatencyHistogram()
         self.load_balancer = {}
         self.circuit_breaker_status = {}
         
@@ -1815,6 +1845,17 @@ class BFSIOrchestrator:
         self.operation_timeout = 60.0
         self.health_check_interval = 300  # 5 minutes
         
+        # Sub-agent health is read from a snapshot refreshed in the background,
+        # after the TTL, or per agent when a circuit breaker changes state
+        self.health_snapshot_ttl = 30.0  # seconds
+        self.health_unhealthy_threshold = 70.0
+        self.health_snapshot: Optional[HealthSnapshot] = None
+        self.health_refresh_latency = LatencyHistogram()
+        self.health_refreshes = {"initial": 0, "ttl": 0, "background": 0, "invalidation": 0}
+        self._health_refresh_task: Optional[asyncio.Task] = None
+        for agent in self.sub_agents.values():
+            agent.state_listeners.append(self._on_agent_state_change)
+        
         # Start background monitoring
         self._monitoring_task = None
         
@@ -1832,7 +1873,7 @@ class BFSIOrchestrator:
                 raise ValueError(f"Invalid operation: {operation_type}")
             
             # Check sub-agent health before execution
-            unhealthy_agents = await self._check_sub_agent_health()
+            unhealthy_agents = self.get_health_snapshot().unhealthy_agents
             if unhealthy_agents:
                 logger.warning(f"Unhealthy agents detected: {unhealthy_agents}")
             
@@ -1912,19 +1953,98 @@ class BFSIOrchestrator:
         return operation_type in valid_operations and isinstance(context, dict)
     
     async def _check_sub_agent_health(self) -> List[str]:
-        """Check health of all sub-agents"""
-        unhealthy_agents = []
-        
-        for agent_type, agent in self.sub_agents.items():
-            try:
-                health_status = agent.get_health_status()
-                if health_status["health_score"] < 70:
-                    unhealthy_agents.append(agent_type.value)
-            except Exception as e:
-                logger.warning(f"Health check failed for {agent_type.value}: {e}")
-                unhealthy_agents.append(agent_type.value)
-        
-        return unhealthy_agents
+        """Check health of all sub-agents, refreshing the health snapshot"""
+        return self._refresh_health_snapshot("background").unhealthy_agents
+    
+    def _agent_health(self, agent_type: BFSIAgentType, agent: BFSISubAgent) -> Dict[str, Any]:
+        try:
+            return agent.get_health_status()
+        except Exception as e:
+            logger.warning(f"Health check failed for {agent_type.value}: {e}")
+            return {"agent_id": agent.agent_id, "health_score": 0.0, "error": str(e)}
+    
+    def _build_snapshot(self, agent_health: Dict[str, Dict[str, Any]], started: float) -> HealthSnapshot:
+        unhealthy = [
+            agent_type for agent_type, health in agent_health.items()
+            if health["health_score"] < self.health_unhealthy_threshold
+        ]
+        now = time.monotonic()
+        return HealthSnapshot(agent_health, unhealthy, now, now - started)
+    
+    def _refresh_health_snapshot(self, reason: str) -> HealthSnapshot:
+        """Recompute the health of every sub-agent"""
+        started = time.monotonic()
+        agent_health = {
+            agent_type.value: self._agent_health(agent_type, agent)
+            for agent_type, agent in self.sub_agents.items()
+        }
+        snapshot = self._build_snapshot(agent_health, started)
+        self.health_snapshot = snapshot
+        self.health_refresh_latency.record(snapshot.refresh_seconds)
+        self.health_refreshes[reason] += 1
+        return snapshot
+    
+    def _on_agent_state_change(self, agent: BFSISubAgent):
+        """Update one agent's entry when its circuit breaker opens or closes"""
+        if self.health_snapshot is None:
+            return
+        started = time.monotonic()
+        agent_health = dict(self.health_snapshot.agent_health)
+        agent_health[agent.agent_type.value] = self._agent_health(agent.agent_type, agent)
+        self.health_snapshot = self._build_snapshot(agent_health, started)
+        self.health_refresh_latency.record(self.health_snapshot.refresh_seconds)
+        self.health_refreshes["invalidation"] += 1
+    
+    def get_health_snapshot(self) -> HealthSnapshot:
+        """
+        Current sub-agent health in O(1).
+        
+        The first call builds the snapshot. Once it is older than the TTL the
+        stale snapshot is still returned while a single refresh is scheduled
+        on the event loop.
+        """
+        snapshot = self.health_snapshot
+        if snapshot is None:
+            return self._refresh_health_snapshot("initial")
+        if snapshot.age_seconds > self.health_snapshot_ttl:
+            if self._health_refresh_task is None or self._health_refresh_task.done():
+                try:
+                    self._health_refresh_task = asyncio.get_running_loop().create_task(self._refresh_health_async())
+                except RuntimeError:
+                    # No running loop: refresh inline
+                    return self._refresh_health_snapshot("ttl")
+        return snapshot
+    
+    async def _refresh_health_async(self):
+        self._refresh_health_snapshot("ttl")
+    
+    async def start_health_monitoring(self, interval: Optional[float] = None):
+        """Refresh the health snapshot periodically in the background"""
+        if self._monitoring_task is not None and not self._monitoring_task.done():
+            return
+        interval = interval or min(self.health_snapshot_ttl, self.health_check_interval)
+        
+        async def monitor():
+            while True:
+                try:
+                    await self._check_sub_agent_health()
+                except Exception as e:
+                    logger.error(f"Health monitoring failed: {e}")
+                await asyncio.sleep(interval)
+        
+        self._monitoring_task = asyncio.get_running_loop().create_task(monitor())
+    
+    async def stop_health_monitoring(self):
+        """Stop the background health refresh"""
+        for task in (self._monitoring_task, self._health_refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._monitoring_task = None
+        self._health_refresh_task = None
     
     async def _execute_operation_with_routing(self, operation_type: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute operation with intelligent routing"""
@@ -1958,6 +2078,42 @@ class BFSIOrchestrator:
             )
         
         self.performance_metrics.last_activity = datetime.now()
+        self.operation_latency.record(execution_time)
+    
+    def get_prometheus_metrics(self) -> str:
+        """Orchestrator, sub-agent and process metrics in Prometheus text format"""
+        exposition = PrometheusText()
+        
+        exposition.counter("operations_total", "BFSI operations executed by the orchestrator",
+                           self.performance_metrics.successful_tasks, {"outcome": "success"})
+        exposition.counter("operations_total", "BFSI operations executed by the orchestrator",
+                           self.performance_metrics.failed_tasks, {"outcome": "failure"})
+        exposition.summary("operation_duration_seconds", "BFSI operation execution time", self.operation_latency)
+        
+        # Per-agent series plus an all-agent latency view from merged histograms
+        all_agents = LatencyHistogram()
+        for agent in self.sub_agents.values():
+            agent.collect_metrics(exposition)
+            all_agents.merge(agent.latency)
+        exposition.summary("agent_task_duration_all_seconds", "Task execution time across all sub-agents", all_agents)
+        
+        if self.health_snapshot is not None:
+            exposition.gauge("health_snapshot_age_seconds", "Age of the sub-agent health snapshot",
+                             self.health_snapshot.age_seconds)
+            exposition.gauge("health_snapshot_unhealthy_agents", "Sub-agents below the health threshold",
+                             len(self.health_snapshot.unhealthy_agents))
+        exposition.summary("health_snapshot_refresh_seconds", "Time to refresh the health snapshot",
+                           self.health_refresh_latency)
+        for reason, count in self.health_refreshes.items():
+            exposition.counter("health_snapshot_refreshes_total", "Health snapshot refreshes by trigger",
+                               count, {"reason": reason})
+        
+        stats = get_process_sampler().sample()
+        exposition.gauge("process_resident_memory_megabytes", "Resident memory of the agent process", stats.memory_mb)
+        exposition.gauge("process_cpu_percent", "CPU usage of the agent process since the previous sample", stats.cpu_percent)
+        exposition.gauge("process_threads", "Threads in the agent process", stats.threads)
+        
+        return exposition.render()
     
     def _assess_operation_complexity(self, operation_type: str) -> str:
         """Assess operation complexity"""
@@ -2243,7 +2399,7 @@ class BFSIOrchestrator:
                 "name": agent.name,
                 "status": agent.status,
                 "last_activity": agent.last_activity.isoformat(),
-                "metrics": agent.metrics
+                "metrics": agent._sync_metrics()
             }
         
         return status
@@ -5,17 +5,22 @@ Enhanced multi-agent orchestration for each industry department
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import os
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import uuid
 import json
+import httpx
 import requests
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 
 # Import existing components
 from multi_agent_strategy import MultiAgentOrchestrator, Task, TaskPriority, TaskStatus
 from advanced_mcp_protocol import AdvancedMCPBroker, MessageType, MessagePriority
 from vector_db.chroma_service import ChromaService
+from retrieval_cache import CachedChromaService
 
 # Import BFSI agent only - other industry agents disabled
 from agents.bfsi.bfsi_grc_agent import BFSIGRCAgent
@@ -26,6 +31,15 @@ from agents.bfsi.bfsi_grc_agent import BFSIGRCAgent
 
 logger = logging.getLogger(__name__)
 
+# Concurrent generate calls allowed per Ollama model
+OLLAMA_MAX_CONCURRENCY_PER_MODEL = int(os.getenv("OLLAMA_MAX_CONCURRENCY_PER_MODEL", "2"))
+# Per-task limit for an industry analysis, counted once the task holds its model slot;
+# slower tasks are reported as timed out
+INDUSTRY_TASK_TIMEOUT_SECONDS = float(os.getenv("INDUSTRY_TASK_TIMEOUT_SECONDS", "90"))
+
+# Models whose concurrency slot the current asyncio task already holds
+_held_model_slots: ContextVar[frozenset] = ContextVar("held_model_slots", default=frozenset())
+
 @dataclass
 class IndustryAgentCapability:
     """Industry-specific agent capability"""
@@ -40,15 +54,23 @@ class IndustryAgentCapability:
 class OllamaIntegration:
     """Ollama LLM integration for local AI processing"""
     
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(self, base_url: str = "http://localhost:11434",
+                 max_concurrency_per_model: int = OLLAMA_MAX_CONCURRENCY_PER_MODEL,
+                 request_timeout: float = 60.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = base_url
         self.available_models = []
+        self.max_concurrency_per_model = max_concurrency_per_model
+        self.request_timeout = request_timeout
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._model_semaphores: Dict[str, asyncio.Semaphore] = {}
         self._load_available_models()
     
     def _load_available_models(self):
         """Load available Ollama models"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
             if response.status_code == 200:
                 models_data = response.json()
                 self.available_models = [model["name"] for model in models_data.get("models", [])]
@@ -58,8 +80,46 @@ class OllamaIntegration:
         except Exception as e:
             logger.error(f"Failed to load Ollama models: {e}")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.request_timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                transport=self.transport
+            )
+        return self._client
+    
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore:
+        semaphore = self._model_semaphores.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency_per_model)
+            self._model_semaphores[model] = semaphore
+        return semaphore
+    
+    @asynccontextmanager
+    async def model_slot(self, model: str):
+        """Hold one of the model's concurrency slots; generate calls made inside reuse it"""
+        held = _held_model_slots.get()
+        if model in held:
+            yield
+            return
+        async with self._model_semaphore(model):
+            token = _held_model_slots.set(held | {model})
+            try:
+                yield
+            finally:
+                _held_model_slots.reset(token)
+    
+    async def close(self):
+        """Close the HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def generate_response(self, model: str, prompt: str, context: str = "") -> str:
-        """Generate response using Ollama model"""
+        """Generate response using Ollama model, at most max_concurrency_per_model calls at a time per model"""
         try:
             full_prompt = f"{context}\n\n{prompt}" if context else prompt
             
@@ -74,11 +134,8 @@ class OllamaIntegration:
                 }
             }
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=60
-            )
+            async with self.model_slot(model):
+                response = await self._get_client().post("/api/generate", json=payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -206,12 +263,14 @@ class IndustryMultiAgentOrchestrator:
     def __init__(self, industry: str):
         self.industry = industry
         self.ollama = OllamaIntegration()
-        self.chroma_service = ChromaService()
+        # Retrieval results are cached per collection version; writes through this service invalidate them
+        self.chroma_service = CachedChromaService(ChromaService())
         self.mcp_broker = AdvancedMCPBroker()
         self.agents = {}
         self.agent_capabilities = {}
         self.industry_specific_models = self._get_industry_models()
         self.chroma_collections = self._get_industry_collections()
+        self.task_timeout = INDUSTRY_TASK_TIMEOUT_SECONDS
         
     def _get_industry_models(self) -> Dict[str, str]:
         """Get BFSI-specific Ollama models only"""
@@ -501,7 +560,8 @@ class IndustryMultiAgentOrchestrator:
                     "agents_used": len(self.agents),
                     "tasks_completed": len(results),
                     "ollama_model": self.industry_specific_models,
-                    "chroma_collections": analysis_scope["chroma_collections"]
+                    "chroma_collections": analysis_scope["chroma_collections"],
+                    "retrieval_cache": self.chroma_service.cache.get_stats()
                 },
                 "timestamp": datetime.now().isoformat()
             }
@@ -637,45 +697,71 @@ class IndustryMultiAgentOrchestrator:
         return tasks
     
     async def _execute_industry_tasks(self, tasks: List[Task]) -> Dict[str, Any]:
-        """Execute industry-specific tasks using agents"""
+        """
+        Execute industry-specific tasks concurrently using agents.
+        Retrieval for all tasks is batched per Chroma collection, Ollama calls
+        are bounded per model, and tasks exceeding task_timeout are reported as
+        timed out while the other results are kept. Each task waits for its
+        model slot before its timeout starts, so queueing behind a slow model
+        does not count against it.
+        """
         results = {}
+        assignments = []
         
         for task in tasks:
-            try:
-                # Find best agent for task
-                best_agent_id = self._find_best_agent_for_task(task)
-                
-                if best_agent_id and best_agent_id in self.agents:
-                    agent = self.agents[best_agent_id]
-                    capability = self.agent_capabilities.get(best_agent_id)
-                    
-                    # Execute task with Ollama and Chroma integration
-                    result = await self._execute_task_with_ollama_chroma(
-                        agent, task, capability
-                    )
-                    
-                    results[task.task_id] = result
-                    logger.info(f"Task {task.task_id} completed by {best_agent_id}")
-                else:
-                    logger.warning(f"No suitable agent found for task {task.task_id}")
-                    results[task.task_id] = {"error": "No suitable agent found"}
-                    
-            except Exception as e:
-                logger.error(f"Failed to execute task {task.task_id}: {e}")
-                results[task.task_id] = {"error": str(e)}
+            # Find best agent for task
+            best_agent_id = self._find_best_agent_for_task(task)
+            
+            if best_agent_id and best_agent_id in self.agents:
+                assignments.append((task, best_agent_id, self.agent_capabilities.get(best_agent_id)))
+            else:
+                logger.warning(f"No suitable agent found for task {task.task_id}")
+                results[task.task_id] = {"error": "No suitable agent found"}
+        
+        documents = await self._get_relevant_documents_batch(
+            [(task, capability.chroma_collection) for task, _, capability in assignments]
+        )
+        
+        async def run_task(task: Task, agent_id: str, capability: IndustryAgentCapability) -> Dict[str, Any]:
+            # Execute task with Ollama and Chroma integration; Ollama calls inside reuse the held slot
+            async with self.ollama.model_slot(capability.ollama_model):
+                return await asyncio.wait_for(
+                    self._execute_task_with_ollama_chroma(
+                        self.agents[agent_id], task, capability, documents.get(task.task_id, [])
+                    ),
+                    timeout=self.task_timeout
+                )
+        
+        outcomes = await asyncio.gather(
+            *(run_task(task, agent_id, capability) for task, agent_id, capability in assignments),
+            return_exceptions=True
+        )
+        
+        for (task, agent_id, _), outcome in zip(assignments, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.warning(f"Task {task.task_id} timed out after {self.task_timeout}s")
+                results[task.task_id] = {"error": f"Timed out after {self.task_timeout}s", "status": "timeout"}
+            elif isinstance(outcome, BaseException):
+                logger.error(f"Failed to execute task {task.task_id}: {outcome}")
+                results[task.task_id] = {"error": str(outcome)}
+            else:
+                results[task.task_id] = outcome
+                logger.info(f"Task {task.task_id} completed by {agent_id}")
         
         return results
     
     async def _execute_task_with_ollama_chroma(self, 
                                              agent, 
                                              task: Task, 
-                                             capability: IndustryAgentCapability) -> Dict[str, Any]:
+                                             capability: IndustryAgentCapability,
+                                             relevant_docs: Optional[List[str]] = None) -> Dict[str, Any]:
         """Execute task using Ollama and Chroma integration"""
         try:
-            # Get relevant documents from Chroma
-            relevant_docs = await self._get_relevant_documents_from_chroma(
-                task, capability.chroma_collection
-            )
+            # Get relevant documents from Chroma unless they were retrieved in a batch
+            if relevant_docs is None:
+                relevant_docs = await self._get_relevant_documents_from_chroma(
+                    task, capability.chroma_collection
+                )
             
             # Prepare context for Ollama
             context = self._prepare_ollama_context(task, relevant_docs)
@@ -716,28 +802,54 @@ class IndustryMultiAgentOrchestrator:
             logger.error(f"Failed to execute task with Ollama/Chroma: {e}")
             return {"error": str(e)}
     
+    def _chroma_query_text(self, task: Task) -> str:
+        """Query text used to retrieve documents for a task"""
+        return f"{task.task_type} {self.industry} {task.context.get('organization_id', '')}"
+    
     async def _get_relevant_documents_from_chroma(self, 
                                                 task: Task, 
                                                 collection_name: str) -> List[str]:
         """Get relevant documents from Chroma collection"""
-        try:
-            # Query Chroma for relevant documents
-            query_text = f"{task.task_type} {self.industry} {task.context.get('organization_id', '')}"
-            
-            results = self.chroma_service.query_documents(
-                query_texts=[query_text],
-                n_results=5,
-                collection_name=collection_name
-            )
+        documents = await self._get_relevant_documents_batch([(task, collection_name)])
+        return documents.get(task.task_id, [])
+    
+    async def _get_relevant_documents_batch(self,
+                                            task_collections: List[Tuple[Task, str]]) -> Dict[str, List[str]]:
+        """
+        Get relevant documents for several tasks with one multi-query call per
+        collection, run off the event loop. Returns documents keyed by task id.
+        """
+        queries_by_collection: Dict[str, Dict[str, List[str]]] = {}
+        for task, collection_name in task_collections:
+            queries = queries_by_collection.setdefault(collection_name, {})
+            queries.setdefault(self._chroma_query_text(task), []).append(task.task_id)
+        
+        async def query_collection(collection_name: str, queries: Dict[str, List[str]]) -> Dict[str, List[str]]:
+            query_texts = list(queries)
+            try:
+                results = await asyncio.to_thread(
+                    self.chroma_service.query_documents,
+                    query_texts=query_texts,
+                    n_results=5,
+                    collection_name=collection_name
+                )
+            except Exception as e:
+                logger.error(f"Failed to get documents from Chroma: {e}")
+                results = None
             
-            if results and results.get('documents'):
-                return results['documents'][0]
-            else:
-                return []
-                
-        except Exception as e:
-            logger.error(f"Failed to get documents from Chroma: {e}")
-            return []
+            per_query = (results or {}).get('documents') or []
+            documents = {}
+            for index, query_text in enumerate(query_texts):
+                for task_id in queries[query_text]:
+                    documents[task_id] = per_query[index] if index < len(per_query) else []
+            return documents
+        
+        documents: Dict[str, List[str]] = {}
+        for collection_documents in await asyncio.gather(
+            *(query_collection(name, queries) for name, queries in queries_by_collection.items())
+        ):
+            documents.update(collection_documents)
+        return documents
     
     def _prepare_ollama_context(self, task: Task, relevant_docs: List[str]) -> Dict[str, Any]:
         """Prepare context for Ollama analysis"""
@@ -839,6 +951,16 @@ class IndustryMultiAgentOrchestrator:
         suitable_agents.sort(key=lambda x: x[1], reverse=True)
         return suitable_agents[0][0]
 
+    async def cleanup(self):
+        """Cleanup orchestrator resources"""
+        # Close the keep-alive Ollama client first so its connections are released even if the broker fails
+        try:
+            await self.ollama.close()
+        finally:
+            await self.mcp_broker.cleanup()
+
+        logger.info(f"Industry Multi-Agent Orchestrator for {self.industry} cleaned up")
+
 # Industry-Specific Agent Classes
 class BFSIComplianceCoordinatorAgent(BFSIGRCAgent):
     def __init__(self):
@@ -872,89 +994,90 @@ class BFSIFraudDetectionAgent(BFSIGRCAgent):
     def __init__(self):
         super().__init__("bfsi_fraud_detection", "BFSI Fraud Detection")
 
+# COMMENTED OUT - Other industry agents disabled (their base classes are not imported)
 # Telecom Agents
-class TelecomComplianceCoordinatorAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_compliance_coordinator", "Telecom Compliance Coordinator")
+# class TelecomComplianceCoordinatorAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_compliance_coordinator", "Telecom Compliance Coordinator")
 
-class TelecomNetworkSecurityAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_network_security", "Telecom Network Security")
+# class TelecomNetworkSecurityAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_network_security", "Telecom Network Security")
 
-class TelecomSpectrumManagementAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_spectrum_management", "Telecom Spectrum Management")
+# class TelecomSpectrumManagementAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_spectrum_management", "Telecom Spectrum Management")
 
-class TelecomServiceQualityAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_service_quality", "Telecom Service Quality")
+# class TelecomServiceQualityAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_service_quality", "Telecom Service Quality")
 
-class TelecomPrivacyComplianceAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_privacy_compliance", "Telecom Privacy Compliance")
+# class TelecomPrivacyComplianceAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_privacy_compliance", "Telecom Privacy Compliance")
 
-class TelecomCyberSecurityAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_cyber_security", "Telecom Cyber Security")
+# class TelecomCyberSecurityAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_cyber_security", "Telecom Cyber Security")
 
-class TelecomIncidentResponseAgent(TelecomGRCAgent):
-    def __init__(self):
-        super().__init__("telecom_incident_response", "Telecom Incident Response")
+# class TelecomIncidentResponseAgent(TelecomGRCAgent):
+#     def __init__(self):
+#         super().__init__("telecom_incident_response", "Telecom Incident Response")
 
 # Manufacturing Agents
-class ManufacturingComplianceCoordinatorAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_compliance_coordinator", "Manufacturing Compliance Coordinator")
+# class ManufacturingComplianceCoordinatorAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_compliance_coordinator", "Manufacturing Compliance Coordinator")
 
-class ManufacturingQualityControlAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_quality_control", "Manufacturing Quality Control")
+# class ManufacturingQualityControlAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_quality_control", "Manufacturing Quality Control")
 
-class ManufacturingSafetyComplianceAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_safety_compliance", "Manufacturing Safety Compliance")
+# class ManufacturingSafetyComplianceAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_safety_compliance", "Manufacturing Safety Compliance")
 
-class ManufacturingSupplyChainAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_supply_chain", "Manufacturing Supply Chain")
+# class ManufacturingSupplyChainAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_supply_chain", "Manufacturing Supply Chain")
 
-class ManufacturingEnvironmentalAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_environmental", "Manufacturing Environmental")
+# class ManufacturingEnvironmentalAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_environmental", "Manufacturing Environmental")
 
-class ManufacturingCyberSecurityAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_cyber_security", "Manufacturing Cyber Security")
+# class ManufacturingCyberSecurityAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_cyber_security", "Manufacturing Cyber Security")
 
-class ManufacturingIncidentResponseAgent(ManufacturingGRCAgent):
-    def __init__(self):
-        super().__init__("manufacturing_incident_response", "Manufacturing Incident Response")
+# class ManufacturingIncidentResponseAgent(ManufacturingGRCAgent):
+#     def __init__(self):
+#         super().__init__("manufacturing_incident_response", "Manufacturing Incident Response")
 
 # Healthcare Agents
-class HealthcareComplianceCoordinatorAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_compliance_coordinator", "Healthcare Compliance Coordinator")
+# class HealthcareComplianceCoordinatorAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_compliance_coordinator", "Healthcare Compliance Coordinator")
 
-class HealthcareHIPAAComplianceAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_hipaa_compliance", "Healthcare HIPAA Compliance")
+# class HealthcareHIPAAComplianceAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_hipaa_compliance", "Healthcare HIPAA Compliance")
 
-class HealthcarePatientSafetyAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_patient_safety", "Healthcare Patient Safety")
+# class HealthcarePatientSafetyAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_patient_safety", "Healthcare Patient Safety")
 
-class HealthcareClinicalRiskAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_clinical_risk", "Healthcare Clinical Risk")
+# class HealthcareClinicalRiskAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_clinical_risk", "Healthcare Clinical Risk")
 
-class HealthcareDataPrivacyAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_data_privacy", "Healthcare Data Privacy")
+# class HealthcareDataPrivacyAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_data_privacy", "Healthcare Data Privacy")
 
-class HealthcareCyberSecurityAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_cyber_security", "Healthcare Cyber Security")
+# class HealthcareCyberSecurityAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_cyber_security", "Healthcare Cyber Security")
 
-class HealthcareIncidentResponseAgent(HealthcareGRCAgent):
-    def __init__(self):
-        super().__init__("healthcare_incident_response", "Healthcare Incident Response")
+# class HealthcareIncidentResponseAgent(HealthcareGRCAgent):
+#     def __init__(self):
+#         super().__init__("healthcare_incident_response", "Healthcare Incident Response")
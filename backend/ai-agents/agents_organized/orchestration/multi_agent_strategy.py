@@ -4,10 +4,13 @@ Advanced orchestration system for GRC Platform
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple, AsyncIterator
 from enum import Enum
 import uuid
 from dataclasses import dataclass
@@ -119,6 +122,118 @@ class Task:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+class CapabilityIndex:
+    """
+    Inverted index from capability to the agents that provide it.
+
+    Each capability keeps a max-heap of its agents ordered by base suitability
+    (performance * (1 - load) * reliability), which bounds the task-specific
+    score from above. Routing walks the heap of the rarest required capability
+    best-first and stops as soon as no remaining agent can beat the best score
+    found. Updating an agent pushes a fresh entry and leaves the old one to be
+    discarded lazily.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, AgentCapability] = {}
+        self._versions: Dict[str, int] = {}
+        self._members: Dict[str, Set[str]] = {}
+        self._heaps: Dict[str, List[Tuple[float, str, int]]] = {}
+
+    @staticmethod
+    def base_score(capability: AgentCapability) -> float:
+        """Task-independent part of the suitability score"""
+        return capability.performance_score * (1 - capability.load_factor) * capability.reliability
+
+    def rebuild(self, capabilities: Dict[str, AgentCapability]):
+        """Index a complete set of agent capabilities"""
+        self._agents.clear()
+        self._members.clear()
+        self._heaps.clear()
+        for capability in capabilities.values():
+            self.update(capability)
+
+    def update(self, capability: AgentCapability):
+        """(Re)index an agent after its capabilities, performance or load changed"""
+        agent_id = capability.agent_id
+        self._drop_membership(agent_id)
+        version = self._versions.get(agent_id, 0) + 1
+        self._versions[agent_id] = version
+        self._agents[agent_id] = capability
+
+        entry = (-self.base_score(capability), agent_id, version)
+        for name in set(capability.capabilities):
+            self._members.setdefault(name, set()).add(agent_id)
+            heap = self._heaps.setdefault(name, [])
+            heapq.heappush(heap, entry)
+            if len(heap) > 2 * len(self._members[name]) + 8:
+                self._compact(name)
+
+    def remove(self, agent_id: str):
+        """Stop routing tasks to an agent"""
+        self._drop_membership(agent_id)
+        self._agents.pop(agent_id, None)
+        self._versions[agent_id] = self._versions.get(agent_id, 0) + 1
+
+    def agents_with(self, capability: str) -> Set[str]:
+        """Agents providing a capability"""
+        return set(self._members.get(capability, ()))
+
+    def best_agent(self, task: Task,
+                   score: Callable[[AgentCapability, Task], float]) -> Optional[str]:
+        """
+        Highest scoring agent that has every capability the task requires
+
+        Args:
+            task: Task to route
+            score: Suitability function; must never exceed base_score for the agent
+        """
+        required = task.required_capabilities
+        if not required:
+            scored = [(score(capability, task), agent_id) for agent_id, capability in self._agents.items()]
+            return max(scored, key=lambda item: item[0])[1] if scored else None
+
+        member_sets = [self._members.get(name) for name in required]
+        if not all(member_sets):
+            return None
+        anchor = min(range(len(required)), key=lambda i: len(member_sets[i]))
+        heap = self._heaps[required[anchor]]
+
+        best_id, best_score = None, float("-inf")
+        frontier = [(heap[0][0], 0)] if heap else []
+        while frontier:
+            negative_bound, position = heapq.heappop(frontier)
+            if -negative_bound <= best_score:
+                break
+            _, agent_id, version = heap[position]
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], child))
+            if version != self._versions.get(agent_id) or not all(agent_id in members for members in member_sets):
+                continue
+            agent_score = score(self._agents[agent_id], task)
+            if agent_score > best_score:
+                best_id, best_score = agent_id, agent_score
+        return best_id
+
+    def _drop_membership(self, agent_id: str):
+        previous = self._agents.get(agent_id)
+        if previous is None:
+            return
+        for name in set(previous.capabilities):
+            members = self._members.get(name)
+            if members is not None:
+                members.discard(agent_id)
+                if not members:
+                    del self._members[name]
+                    self._heaps.pop(name, None)
+
+    def _compact(self, name: str):
+        """Drop superseded entries from a capability heap"""
+        heap = [entry for entry in self._heaps[name] if entry[2] == self._versions.get(entry[1])]
+        heapq.heapify(heap)
+        self._heaps[name] = heap
+
 class MultiAgentOrchestrator:
     """
     Advanced Multi-Agent Orchestrator with MCP Protocol
@@ -129,9 +244,11 @@ class MultiAgentOrchestrator:
         self.mcp_broker = MCPBroker()
         self.agents = {}
         self.agent_capabilities = {}
-        self.task_queue = []
+        self.capability_index = CapabilityIndex()
+        self.task_queue: Dict[str, Task] = {}
         self.active_tasks = {}
         self.completed_tasks = {}
+        self._completion_futures: Dict[str, asyncio.Future] = {}
         self.agent_performance = {}
         self.workload_balancer = WorkloadBalancer()
         self.task_scheduler = TaskScheduler()
@@ -248,6 +365,7 @@ class MultiAgentOrchestrator:
                 reliability=0.93
             )
         }
+        self.capability_index.rebuild(self.agent_capabilities)
     
     async def _register_agents(self):
         """Register all agents with MCP broker"""
@@ -277,10 +395,10 @@ class MultiAgentOrchestrator:
                 raise ValueError("Invalid task definition")
             
             # Add to task queue
-            self.task_queue.append(task)
+            self.task_queue[task.task_id] = task
             
-            # Trigger task scheduling
-            await self.task_scheduler.schedule_task(task, self)
+            # Queue behind unfinished dependencies or dispatch right away
+            await self.task_scheduler.submit(task, self)
             
             logger.info(f"Task {task.task_id} submitted successfully")
             return task.task_id
@@ -409,23 +527,60 @@ class MultiAgentOrchestrator:
         
         return tasks
     
+    def _record_task_result(self, task: Task, result: Dict[str, Any]):
+        """Store a finished task's result and wake everyone waiting on it"""
+        self.active_tasks.pop(task.task_id, None)
+        self.completed_tasks[task.task_id] = result
+        future = self._completion_futures.pop(task.task_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+    
+    def _completion_future(self, task_id: str) -> asyncio.Future:
+        """Future resolved with the task's result when it finishes"""
+        if task_id in self.completed_tasks:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self.completed_tasks[task_id])
+            return future
+        future = self._completion_futures.get(task_id)
+        if future is None or future.cancelled():
+            future = asyncio.get_running_loop().create_future()
+            self._completion_futures[task_id] = future
+        return future
+    
+    async def as_completed(self, task_ids: List[str],
+                           timeout: Optional[float] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (task_id, result) pairs in completion order
+        
+        Stops early, without raising, once the timeout in seconds elapses,
+        so callers keep whatever partial results arrived in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = {}
+        for task_id in dict.fromkeys(task_ids):
+            future = self._completion_future(task_id)
+            pending[asyncio.ensure_future(asyncio.shield(future))] = task_id
+        
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in done:
+                    yield pending.pop(waiter), waiter.result()
+        finally:
+            for waiter in pending:
+                waiter.cancel()
+    
     async def _wait_for_task_completion(self, task_ids: List[str], timeout: int = 300) -> Dict[str, Any]:
-        """Wait for task completion with timeout"""
-        start_time = datetime.now()
+        """Wait for task completion with timeout, returning the results that finished in time"""
         results = {}
+        async for task_id, result in self.as_completed(task_ids, timeout=timeout):
+            results[task_id] = result
         
-        while (datetime.now() - start_time).seconds < timeout:
-            # Check completed tasks
-            for task_id in task_ids:
-                if task_id in self.completed_tasks:
-                    results[task_id] = self.completed_tasks[task_id]
-            
-            # Check if all tasks completed
-            if len(results) == len(task_ids):
-                break
-            
-            await asyncio.sleep(1)
-        
+        if len(results) < len(set(task_ids)):
+            logger.warning(f"Timed out after {timeout}s with {len(set(task_ids)) - len(results)} tasks unfinished")
         return results
     
     async def _synthesize_analysis_results(self, results: Dict[str, Any]) -> Dict[str, Any]:
@@ -501,9 +656,7 @@ class MultiAgentOrchestrator:
             task.completed_at = datetime.now()
             
             # Move from active to completed
-            if task.task_id in self.active_tasks:
-                del self.active_tasks[task.task_id]
-            self.completed_tasks[task.task_id] = result
+            self._record_task_result(task, result)
             
             logger.info(f"Task {task.task_id} completed successfully")
             
@@ -513,29 +666,16 @@ class MultiAgentOrchestrator:
             task.completed_at = datetime.now()
             
             # Move from active to completed with error
-            if task.task_id in self.active_tasks:
-                del self.active_tasks[task.task_id]
-            self.completed_tasks[task.task_id] = {"status": "failed", "error": str(e)}
+            self._record_task_result(task, {"status": "failed", "error": str(e)})
             
             logger.error(f"Task {task.task_id} failed: {e}")
+        
+        # Release tasks that were waiting on this one
+        await self.task_scheduler.task_finished(task, self)
     
     def _find_best_agent_for_task(self, task: Task) -> Optional[str]:
-        """Find the best agent for a given task using intelligent matching"""
-        suitable_agents = []
-        
-        for agent_id, capability in self.agent_capabilities.items():
-            # Check if agent has required capabilities
-            if all(cap in capability.capabilities for cap in task.required_capabilities):
-                # Calculate suitability score
-                score = self._calculate_agent_suitability_score(capability, task)
-                suitable_agents.append((agent_id, score))
-        
-        if not suitable_agents:
-            return None
-        
-        # Return agent with highest score
-        suitable_agents.sort(key=lambda x: x[1], reverse=True)
-        return suitable_agents[0][0]
+        """Find the best agent for a given task using the capability index"""
+        return self.capability_index.best_agent(task, self._calculate_agent_suitability_score)
     
     def _calculate_agent_suitability_score(self, capability: AgentCapability, task: Task) -> float:
         """Calculate how suitable an agent is for a task"""
@@ -597,6 +737,7 @@ class MultiAgentOrchestrator:
                 if agent_id in self.agent_capabilities:
                     self.agent_capabilities[agent_id].performance_score = metrics.get('performance_score', 0.8)
                     self.agent_capabilities[agent_id].load_factor = metrics.get('load_factor', 0.0)
+                    self.capability_index.update(self.agent_capabilities[agent_id])
     
     async def _check_performance_anomalies(self):
         """Check for performance anomalies and take corrective action"""
@@ -663,20 +804,82 @@ class WorkloadBalancer:
                 # Could implement strategy adjustment here
 
 class TaskScheduler:
-    """Intelligent task scheduler for multi-agent system"""
+    """
+    Intelligent task scheduler for multi-agent system
+
+    Runnable tasks wait in a heap ordered by priority and submission order.
+    Tasks with unfinished dependencies are held with a counter of outstanding
+    dependencies and move to the heap as soon as the last one finishes.
+    A dependency may name a task id or a task type; a type resolves to the
+    latest submitted unfinished task of that type, and dependencies that match
+    nothing unfinished are treated as already satisfied.
+    """
+    
+    def __init__(self):
+        self._ready: List[Tuple[int, int, Task]] = []
+        self._sequence = itertools.count()
+        self._blocked: Dict[str, Task] = {}
+        self._remaining: Dict[str, int] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._unfinished: Set[str] = set()
+        self._unfinished_by_type: Dict[str, str] = {}
     
     async def run(self, orchestrator):
         """Run task scheduling"""
         while orchestrator.is_running:
             try:
                 await self.schedule_pending_tasks(orchestrator)
-                await asyncio.sleep(5)  # Schedule every 5 seconds
+                await asyncio.sleep(5)  # Safety net; tasks are normally dispatched on submit and completion
             except Exception as e:
                 logger.error(f"Error in task scheduling: {e}")
                 await asyncio.sleep(15)
     
+    @property
+    def pending_count(self) -> int:
+        """Tasks waiting for dependencies or dispatch"""
+        return len(self._ready) + len(self._blocked)
+    
+    async def submit(self, task: Task, orchestrator):
+        """Queue a task behind its unfinished dependencies and dispatch whatever is runnable"""
+        waiting_on = set()
+        for dependency in task.dependencies:
+            if dependency in self._unfinished:
+                waiting_on.add(dependency)
+            elif dependency in self._unfinished_by_type:
+                waiting_on.add(self._unfinished_by_type[dependency])
+        
+        self._unfinished.add(task.task_id)
+        self._unfinished_by_type[task.task_type] = task.task_id
+        
+        if waiting_on:
+            self._blocked[task.task_id] = task
+            self._remaining[task.task_id] = len(waiting_on)
+            for dependency_id in waiting_on:
+                self._dependents.setdefault(dependency_id, []).append(task.task_id)
+            logger.info(f"Task {task.task_id} waiting on {len(waiting_on)} dependencies")
+        else:
+            self._push_ready(task)
+        
+        await self.schedule_pending_tasks(orchestrator)
+    
+    async def task_finished(self, task: Task, orchestrator):
+        """Release dependents of a completed or failed task and dispatch them"""
+        self._unfinished.discard(task.task_id)
+        if self._unfinished_by_type.get(task.task_type) == task.task_id:
+            del self._unfinished_by_type[task.task_type]
+        
+        for dependent_id in self._dependents.pop(task.task_id, []):
+            self._remaining[dependent_id] -= 1
+            if self._remaining[dependent_id] == 0:
+                del self._remaining[dependent_id]
+                self._push_ready(self._blocked.pop(dependent_id))
+        
+        await self.schedule_pending_tasks(orchestrator)
+    
     async def schedule_task(self, task: Task, orchestrator):
         """Schedule a specific task"""
+        orchestrator.task_queue.pop(task.task_id, None)
+        
         # Find best agent for task
         best_agent = orchestrator._find_best_agent_for_task(task)
         
@@ -696,18 +899,19 @@ class TaskScheduler:
         else:
             logger.error(f"No suitable agent found for task {task.task_id}")
             task.status = TaskStatus.FAILED
+            task.completed_at = datetime.now()
+            orchestrator._record_task_result(task, {"status": "failed", "error": "No suitable agent found"})
+            await self.task_finished(task, orchestrator)
     
     async def schedule_pending_tasks(self, orchestrator):
-        """Schedule all pending tasks"""
-        # Get pending tasks sorted by priority
-        pending_tasks = [task for task in orchestrator.task_queue if task.status == TaskStatus.PENDING]
-        pending_tasks.sort(key=lambda x: x.priority.value)
-        
-        for task in pending_tasks:
-            # Check if dependencies are met
-            if all(dep_id in orchestrator.completed_tasks for dep_id in task.dependencies):
+        """Dispatch all runnable tasks in priority order"""
+        while self._ready:
+            _, _, task = heapq.heappop(self._ready)
+            if task.status == TaskStatus.PENDING:
                 await self.schedule_task(task, orchestrator)
-                orchestrator.task_queue.remove(task)
+    
+    def _push_ready(self, task: Task):
+        heapq.heappush(self._ready, (task.priority.value, next(self._sequence), task))
 
 class QualityAssurance:
     """Quality assurance system for multi-agent results"""
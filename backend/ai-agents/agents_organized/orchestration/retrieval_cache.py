@@ -0,0 +1,198 @@
+"""
+Retrieval Result Cache for Chroma-backed Agent Context
+Caches query results per (collection, normalized query, n_results, collection version)
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for cached retrieval results
+RETRIEVAL_CACHE_MAX_MB = float(os.getenv("RETRIEVAL_CACHE_MAX_MB", "32"))
+
+# Service methods that change a collection's contents and therefore its version
+MUTATING_METHODS = (
+    "add_documents",
+    "upsert_documents",
+    "update_documents",
+    "delete_documents",
+    "delete_collection"
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+CacheKey = Tuple[str, str, int, int]
+
+
+def normalize_query(query_text: str) -> str:
+    """Case- and whitespace-insensitive form of a query"""
+    return _WHITESPACE.sub(" ", query_text).strip().lower()
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate bytes held by a cached result"""
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class RetrievalCache:
+    """
+    LRU cache of per-query retrieval results bounded by an estimated byte budget.
+
+    Keys include a per-collection version; bumping the version on writes makes
+    every older entry for that collection unreachable, and they are dropped
+    eagerly so they do not hold memory until evicted.
+    """
+
+    def __init__(self, max_bytes: int = int(RETRIEVAL_CACHE_MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def version(self, collection_name: str) -> int:
+        return self._epoch + self._versions.get(collection_name, 0)
+
+    def key(self, collection_name: str, query_text: str, n_results: int) -> CacheKey:
+        return (collection_name, normalize_query(query_text), n_results, self.version(collection_name))
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, result: Dict[str, Any]):
+        size = _estimate_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A write may have bumped the version while the query was running
+            if key[3] != self.version(key[0]):
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, collection_name: Optional[str] = None):
+        """Bump a collection's version (or every collection's) and drop its entries"""
+        with self._lock:
+            if collection_name is None:
+                self._epoch += 1
+                self._entries.clear()
+                self.current_bytes = 0
+            else:
+                self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+                for key in [key for key in self._entries if key[0] == collection_name]:
+                    self.current_bytes -= self._entries.pop(key)[1]
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+class CachedChromaService:
+    """
+    ChromaService wrapper that serves query_documents from a RetrievalCache.
+
+    Cache misses of a multi-query call are sent to Chroma together in one call.
+    Calls to mutating methods invalidate the affected collection; every other
+    attribute is delegated to the wrapped service.
+    """
+
+    def __init__(self, service: Any, cache: Optional[RetrievalCache] = None):
+        self._service = service
+        self.cache = cache or RetrievalCache()
+
+    def query_documents(self, query_texts: List[str], n_results: int = 5,
+                        collection_name: str = "default", **kwargs) -> Dict[str, Any]:
+        """Query documents, returning Chroma's per-query list layout"""
+        if kwargs:
+            # Filters are not part of the cache key
+            return self._service.query_documents(
+                query_texts=query_texts, n_results=n_results, collection_name=collection_name, **kwargs
+            )
+
+        keys = [self.cache.key(collection_name, text, n_results) for text in query_texts]
+        per_query: List[Optional[Dict[str, Any]]] = [self.cache.get(key) for key in keys]
+
+        missing: Dict[CacheKey, List[int]] = {}
+        for index, (key, cached) in enumerate(zip(keys, per_query)):
+            if cached is None:
+                missing.setdefault(key, []).append(index)
+
+        if missing:
+            miss_texts = [query_texts[indexes[0]] for indexes in missing.values()]
+            results = self._service.query_documents(
+                query_texts=miss_texts, n_results=n_results, collection_name=collection_name
+            ) or {}
+            for position, (key, indexes) in enumerate(missing.items()):
+                single = {
+                    field: values[position] if position < len(values) else []
+                    for field, values in results.items()
+                    if isinstance(values, list)
+                }
+                self.cache.put(key, single)
+                for index in indexes:
+                    per_query[index] = single
+
+        fields = {field for result in per_query for field in result}
+        return {field: [list(result.get(field) or []) for result in per_query] for field in fields}
+
+    def invalidate_collection(self, collection_name: Optional[str] = None):
+        """Drop cached results after writes made outside this wrapper"""
+        self.cache.invalidate(collection_name)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._service, name)
+        if name not in MUTATING_METHODS or not callable(attribute):
+            return attribute
+
+        def mutating_call(*args, **kwargs):
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self.cache.invalidate(kwargs.get("collection_name"))
+        return mutating_call
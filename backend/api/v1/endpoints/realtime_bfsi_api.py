@@ -17,6 +17,7 @@ Security Features:
 
 import asyncio
 import os
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks, Depends
@@ -25,7 +26,6 @@ from pydantic import BaseModel, Field, validator
 import uvicorn
 import logging
 import json
-import sqlite3
 import hashlib
 import hmac
 import secrets
@@ -52,6 +52,12 @@ from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 from real_bfsi_data_integration import realtime_manager, start_real_time_bfsi, get_real_time_status, stop_real_time_bfsi, RealTimeBFSIEvent, BFSIDataSource
 
 # Configure logging
@@ -282,37 +288,35 @@ class OverflowEventStorage:
     
     def __init__(self, db_path: str = "overflow_events.db"):
         self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
         self.init_database()
     
     def init_database(self):
         """Initialize SQLite database for overflow events"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS overflow_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    event_id TEXT UNIQUE NOT NULL,
-                    event_type TEXT NOT NULL,
-                    priority INTEGER NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    source_system TEXT,
-                    data TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    processed BOOLEAN DEFAULT FALSE,
-                    retry_count INTEGER DEFAULT 0,
-                    error_message TEXT
-                )
-            ''')
-            
-            # Create indexes for efficient querying
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_priority ON overflow_events(priority)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_processed ON overflow_events(processed)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON overflow_events(timestamp)')
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS overflow_events (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        event_id TEXT UNIQUE NOT NULL,
+                        event_type TEXT NOT NULL,
+                        priority INTEGER NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        source_system TEXT,
+                        data TEXT NOT NULL,
+                        created_at TEXT NOT NULL,
+                        processed BOOLEAN DEFAULT FALSE,
+                        retry_count INTEGER DEFAULT 0,
+                        error_message TEXT
+                    )
+                ''')
             
-            conn.commit()
-            conn.close()
+                # Create indexes for efficient querying
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_priority ON overflow_events(priority)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_processed ON overflow_events(processed)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON overflow_events(timestamp)')
             logger.info("Overflow events database initialized successfully")
             
         except Exception as e:
@@ -321,28 +325,25 @@ class OverflowEventStorage:
     def store_overflow_event(self, event: RealTimeBFSIEvent) -> bool:
         """Store overflow event in persistent storage"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Determine event priority
-            priority = EventPriority.get_priority(event.event_type, event.data)
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO overflow_events 
-                (event_id, event_type, priority, timestamp, source_system, data, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event.event_id,
-                event.event_type,
-                priority,
-                event.timestamp.isoformat(),
-                event.source_system,
-                json.dumps(event.data),
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+            
+                # Determine event priority
+                priority = EventPriority.get_priority(event.event_type, event.data)
+            
+                cursor.execute('''
+                    INSERT OR REPLACE INTO overflow_events 
+                    (event_id, event_type, priority, timestamp, source_system, data, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    event.event_id,
+                    event.event_type,
+                    priority,
+                    event.timestamp.isoformat(),
+                    event.source_system,
+                    json.dumps(event.data),
+                    datetime.now().isoformat()
+                ))
             
             logger.info(f"Overflow event {event.event_id} stored with priority {priority}")
             return True
@@ -354,30 +355,28 @@ class OverflowEventStorage:
     def get_pending_events(self, limit: int = 100) -> List[dict]:
         """Retrieve pending overflow events ordered by priority"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT event_id, event_type, priority, timestamp, source_system, data, created_at
-                FROM overflow_events 
-                WHERE processed = FALSE 
-                ORDER BY priority ASC, timestamp ASC 
-                LIMIT ?
-            ''', (limit,))
-            
-            events = []
-            for row in cursor.fetchall():
-                events.append({
-                    "event_id": row[0],
-                    "event_type": row[1],
-                    "priority": row[2],
-                    "timestamp": row[3],
-                    "source_system": row[4],
-                    "data": json.loads(row[5]),
-                    "created_at": row[6]
-                })
-            
-            conn.close()
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    SELECT event_id, event_type, priority, timestamp, source_system, data, created_at
+                    FROM overflow_events 
+                    WHERE processed = FALSE 
+                    ORDER BY priority ASC, timestamp ASC 
+                    LIMIT ?
+                ''', (limit,))
+            
+                events = []
+                for row in cursor.fetchall():
+                    events.append({
+                        "event_id": row[0],
+                        "event_type": row[1],
+                        "priority": row[2],
+                        "timestamp": row[3],
+                        "source_system": row[4],
+                        "data": json.loads(row[5]),
+                        "created_at": row[6]
+                    })
             return events
             
         except Exception as e:
@@ -387,17 +386,14 @@ class OverflowEventStorage:
     def mark_event_processed(self, event_id: str) -> bool:
         """Mark an overflow event as processed"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE overflow_events 
-                SET processed = TRUE 
-                WHERE event_id = ?
-            ''', (event_id,))
-            
-            conn.commit()
-            conn.close()
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    UPDATE overflow_events 
+                    SET processed = TRUE 
+                    WHERE event_id = ?
+                ''', (event_id,))
             return True
             
         except Exception as e:
@@ -407,17 +403,14 @@ class OverflowEventStorage:
     def increment_retry_count(self, event_id: str, error_message: str = None) -> bool:
         """Increment retry count for failed event processing"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE overflow_events 
-                SET retry_count = retry_count + 1, error_message = ?
-                WHERE event_id = ?
-            ''', (error_message, event_id))
-            
-            conn.commit()
-            conn.close()
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    UPDATE overflow_events 
+                    SET retry_count = retry_count + 1, error_message = ?
+                    WHERE event_id = ?
+                ''', (error_message, event_id))
             return True
             
         except Exception as e:
@@ -427,18 +420,16 @@ class OverflowEventStorage:
     def cleanup_old_events(self, days: int = 7) -> int:
         """Clean up old processed events"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
             
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-            cursor.execute('''
-                DELETE FROM overflow_events 
-                WHERE processed = TRUE AND created_at < ?
-            ''', (cutoff_date,))
+                cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+                cursor.execute('''
+                    DELETE FROM overflow_events 
+                    WHERE processed = TRUE AND created_at < ?
+                ''', (cutoff_date,))
             
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+                deleted_count = cursor.rowcount
             
             logger.info(f"Cleaned up {deleted_count} old overflow events")
             return deleted_count
@@ -601,7 +592,7 @@ def validate_connection_config(source_type: str, connection_config: Dict[str, An
 def save_data_source_to_database(data_source: BFSIDataSource) -> bool:
     """Save data source to database for persistence"""
     try:
-        with sqlite3.connect(realtime_manager.db_path) as conn:
+        with get_connection_pool(realtime_manager.db_path).transaction() as conn:
             cursor = conn.cursor()
             
             # Create data_sources table if it doesn't exist
@@ -631,7 +622,6 @@ def save_data_source_to_database(data_source: BFSIDataSource) -> bool:
                 data_source.enabled
             ))
             
-            conn.commit()
             logger.info(f"Data source '{data_source.name}' saved to database")
             return True
             
@@ -643,7 +633,7 @@ def load_data_sources_from_database() -> List[BFSIDataSource]:
     """Load data sources from database"""
     data_sources = []
     try:
-        with sqlite3.connect(realtime_manager.db_path) as conn:
+        with get_connection_pool(realtime_manager.db_path).read_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -676,7 +666,7 @@ def load_data_sources_from_database() -> List[BFSIDataSource]:
 def check_data_source_exists(name: str) -> bool:
     """Check if a data source with the given name already exists"""
     try:
-        with sqlite3.connect(realtime_manager.db_path) as conn:
+        with get_connection_pool(realtime_manager.db_path).read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT COUNT(*) FROM data_sources WHERE name = ?', (name,))
             count = cursor.fetchone()[0]
@@ -1474,7 +1464,7 @@ async def health_check():
         # Check database connectivity
         db_status = "healthy"
         try:
-            with sqlite3.connect(realtime_manager.db_path) as conn:
+            with get_connection_pool(realtime_manager.db_path).read_connection() as conn:
                 # Test connection by executing a simple query
                 conn.execute("SELECT 1")
         except Exception:
@@ -2174,7 +2164,7 @@ async def delete_data_source(source_name: str,
             )
         
         # Remove from database
-        with sqlite3.connect(realtime_manager.db_path) as conn:
+        with get_connection_pool(realtime_manager.db_path).transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM data_sources WHERE name = ?', (source_name,))
             if cursor.rowcount == 0:
@@ -2182,7 +2172,6 @@ async def delete_data_source(source_name: str,
                     status_code=404,
                     detail=f"Data source '{source_name}' not found in database"
                 )
-            conn.commit()
         
         # Remove from realtime manager
         realtime_manager.data_sources = [
@@ -2804,27 +2793,25 @@ async def get_overflow_stats(current_user: User = Depends(get_current_user)):
     """Get overflow event statistics"""
     try:
         # Get basic stats from database
-        conn = sqlite3.connect(overflow_storage.db_path)
-        cursor = conn.cursor()
-        
-        # Total events
-        cursor.execute("SELECT COUNT(*) FROM overflow_events")
-        total_events = cursor.fetchone()[0]
+        with overflow_storage.pool.read_connection() as conn:
+            cursor = conn.cursor()
         
-        # Pending events
-        cursor.execute("SELECT COUNT(*) FROM overflow_events WHERE processed = FALSE")
-        pending_events = cursor.fetchone()[0]
+            # Total events
+            cursor.execute("SELECT COUNT(*) FROM overflow_events")
+            total_events = cursor.fetchone()[0]
         
-        # Events by priority
-        cursor.execute("SELECT priority, COUNT(*) FROM overflow_events WHERE processed = FALSE GROUP BY priority")
-        priority_stats = dict(cursor.fetchall())
+            # Pending events
+            cursor.execute("SELECT COUNT(*) FROM overflow_events WHERE processed = FALSE")
+            pending_events = cursor.fetchone()[0]
         
-        # Recent events (last 24 hours)
-        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
-        cursor.execute("SELECT COUNT(*) FROM overflow_events WHERE created_at > ?", (yesterday,))
-        recent_events = cursor.fetchone()[0]
+            # Events by priority
+            cursor.execute("SELECT priority, COUNT(*) FROM overflow_events WHERE processed = FALSE GROUP BY priority")
+            priority_stats = dict(cursor.fetchall())
         
-        conn.close()
+            # Recent events (last 24 hours)
+            yesterday = (datetime.now() - timedelta(days=1)).isoformat()
+            cursor.execute("SELECT COUNT(*) FROM overflow_events WHERE created_at > ?", (yesterday,))
+            recent_events = cursor.fetchone()[0]
         
         return {
             "total_events": total_events,
@@ -5,8 +5,8 @@ Comprehensive policy gap analysis and mitigation system for clients
 """
 
 import os
+import sys
 import json
-import sqlite3
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
@@ -14,6 +14,12 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -87,6 +93,7 @@ class BFSIGapAnalysisService:
     
     def __init__(self, db_path: str = "bfsi_policies.db"):
         self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
         self.ensure_database()
         
         # Standard BFSI compliance frameworks and requirements
@@ -151,55 +158,52 @@ class BFSIGapAnalysisService:
 
     def ensure_database(self):
         """Ensure database tables exist for gap analysis"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create gap analysis tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS policy_gaps (
-                gap_id TEXT PRIMARY KEY,
-                policy_name TEXT NOT NULL,
-                framework TEXT NOT NULL,
-                severity TEXT NOT NULL,
-                description TEXT,
-                current_status TEXT NOT NULL,
-                required_actions TEXT,
-                mitigation_strategies TEXT,
-                estimated_effort TEXT,
-                business_impact TEXT,
-                regulatory_impact TEXT,
-                priority_score INTEGER,
-                due_date TEXT,
-                assigned_owner TEXT,
-                created_date TEXT,
-                last_updated TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gap_analysis_reports (
-                report_id TEXT PRIMARY KEY,
-                organization_name TEXT NOT NULL,
-                analysis_date TEXT NOT NULL,
-                total_policies INTEGER,
-                implemented_policies INTEGER,
-                partial_policies INTEGER,
-                missing_policies INTEGER,
-                outdated_policies INTEGER,
-                compliance_score REAL,
-                critical_gaps INTEGER,
-                high_priority_gaps INTEGER,
-                medium_priority_gaps INTEGER,
-                low_priority_gaps INTEGER,
-                recommendations TEXT,
-                next_review_date TEXT,
-                executive_summary TEXT,
-                created_date TEXT
-            )
-        ''')
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+        
+            # Create gap analysis tables
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS policy_gaps (
+                    gap_id TEXT PRIMARY KEY,
+                    policy_name TEXT NOT NULL,
+                    framework TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    description TEXT,
+                    current_status TEXT NOT NULL,
+                    required_actions TEXT,
+                    mitigation_strategies TEXT,
+                    estimated_effort TEXT,
+                    business_impact TEXT,
+                    regulatory_impact TEXT,
+                    priority_score INTEGER,
+                    due_date TEXT,
+                    assigned_owner TEXT,
+                    created_date TEXT,
+                    last_updated TEXT
+                )
+            ''')
         
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS gap_analysis_reports (
+                    report_id TEXT PRIMARY KEY,
+                    organization_name TEXT NOT NULL,
+                    analysis_date TEXT NOT NULL,
+                    total_policies INTEGER,
+                    implemented_policies INTEGER,
+                    partial_policies INTEGER,
+                    missing_policies INTEGER,
+                    outdated_policies INTEGER,
+                    compliance_score REAL,
+                    critical_gaps INTEGER,
+                    high_priority_gaps INTEGER,
+                    medium_priority_gaps INTEGER,
+                    low_priority_gaps INTEGER,
+                    recommendations TEXT,
+                    next_review_date TEXT,
+                    executive_summary TEXT,
+                    created_date TEXT
+                )
+            ''')
 
     async def perform_comprehensive_gap_analysis(self, 
                                                 organization_name: str,
@@ -586,140 +590,132 @@ NEXT STEPS:
     def _get_organization_policies(self) -> List[Dict[str, Any]]:
         """Get organization's current policies from database"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Use the actual database schema
-        cursor.execute('''
-            SELECT title, content, policy_type, framework, source_file, file_type, created_at
-            FROM policies
-            ORDER BY created_at DESC
-        ''')
-        
-        policies = []
-        for row in cursor.fetchall():
-            policies.append({
-                "title": row[0],
-                "content": row[1],
-                "category": row[2],  # policy_type maps to category
-                "framework": row[3],
-                "source_file": row[4],
-                "file_type": row[5],
-                "created_date": row[6]
-            })
-        
-        conn.close()
+        with self.pool.read_connection() as conn:
+            cursor = conn.cursor()
+        
+            # Use the actual database schema
+            cursor.execute('''
+                SELECT title, content, policy_type, framework, source_file, file_type, created_at
+                FROM policies
+                ORDER BY created_at DESC
+            ''')
+        
+            policies = []
+            for row in cursor.fetchall():
+                policies.append({
+                    "title": row[0],
+                    "content": row[1],
+                    "category": row[2],  # policy_type maps to category
+                    "framework": row[3],
+                    "source_file": row[4],
+                    "file_type": row[5],
+                    "created_date": row[6]
+                })
         return policies
 
     def _save_gap_analysis_report(self, report: GapAnalysisReport):
         """Save gap analysis report to database"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Save report
-        cursor.execute('''
-            INSERT INTO gap_analysis_reports 
-            (report_id, organization_name, analysis_date, total_policies, implemented_policies,
-             partial_policies, missing_policies, outdated_policies, compliance_score,
-             critical_gaps, high_priority_gaps, medium_priority_gaps, low_priority_gaps,
-             recommendations, next_review_date, executive_summary, created_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            report.report_id,
-            report.organization_name,
-            report.analysis_date.isoformat(),
-            report.total_policies,
-            report.implemented_policies,
-            report.partial_policies,
-            report.missing_policies,
-            report.outdated_policies,
-            report.compliance_score,
-            report.critical_gaps,
-            report.high_priority_gaps,
-            report.medium_priority_gaps,
-            report.low_priority_gaps,
-            json.dumps(report.recommendations),
-            report.next_review_date.isoformat(),
-            report.executive_summary,
-            datetime.now().isoformat()
-        ))
-        
-        # Save individual gaps
-        for gap in report.gaps:
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+        
+            # Save report
             cursor.execute('''
-                INSERT INTO policy_gaps 
-                (gap_id, policy_name, framework, severity, description, current_status,
-                 required_actions, mitigation_strategies, estimated_effort, business_impact,
-                 regulatory_impact, priority_score, due_date, assigned_owner, created_date, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO gap_analysis_reports 
+                (report_id, organization_name, analysis_date, total_policies, implemented_policies,
+                 partial_policies, missing_policies, outdated_policies, compliance_score,
+                 critical_gaps, high_priority_gaps, medium_priority_gaps, low_priority_gaps,
+                 recommendations, next_review_date, executive_summary, created_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
-                gap.gap_id,
-                gap.policy_name,
-                gap.framework.value,
-                gap.severity.value,
-                gap.description,
-                gap.current_status.value,
-                json.dumps(gap.required_actions),
-                json.dumps(gap.mitigation_strategies),
-                gap.estimated_effort,
-                gap.business_impact,
-                gap.regulatory_impact,
-                gap.priority_score,
-                gap.due_date.isoformat() if gap.due_date else None,
-                gap.assigned_owner,
-                gap.created_date.isoformat(),
-                gap.last_updated.isoformat()
+                report.report_id,
+                report.organization_name,
+                report.analysis_date.isoformat(),
+                report.total_policies,
+                report.implemented_policies,
+                report.partial_policies,
+                report.missing_policies,
+                report.outdated_policies,
+                report.compliance_score,
+                report.critical_gaps,
+                report.high_priority_gaps,
+                report.medium_priority_gaps,
+                report.low_priority_gaps,
+                json.dumps(report.recommendations),
+                report.next_review_date.isoformat(),
+                report.executive_summary,
+                datetime.now().isoformat()
             ))
         
-        conn.commit()
-        conn.close()
+            # Save individual gaps
+            for gap in report.gaps:
+                cursor.execute('''
+                    INSERT INTO policy_gaps 
+                    (gap_id, policy_name, framework, severity, description, current_status,
+                     required_actions, mitigation_strategies, estimated_effort, business_impact,
+                     regulatory_impact, priority_score, due_date, assigned_owner, created_date, last_updated)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    gap.gap_id,
+                    gap.policy_name,
+                    gap.framework.value,
+                    gap.severity.value,
+                    gap.description,
+                    gap.current_status.value,
+                    json.dumps(gap.required_actions),
+                    json.dumps(gap.mitigation_strategies),
+                    gap.estimated_effort,
+                    gap.business_impact,
+                    gap.regulatory_impact,
+                    gap.priority_score,
+                    gap.due_date.isoformat() if gap.due_date else None,
+                    gap.assigned_owner,
+                    gap.created_date.isoformat(),
+                    gap.last_updated.isoformat()
+                ))
 
     def get_gap_analysis_report(self, report_id: str) -> Optional[GapAnalysisReport]:
         """Retrieve a gap analysis report by ID"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM gap_analysis_reports WHERE report_id = ?
-        ''', (report_id,))
+        with self.pool.read_connection() as conn:
+            cursor = conn.cursor()
         
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
+            cursor.execute('''
+                SELECT * FROM gap_analysis_reports WHERE report_id = ?
+            ''', (report_id,))
         
-        # Get gaps for this report
-        cursor.execute('''
-            SELECT * FROM policy_gaps WHERE gap_id IN (
-                SELECT gap_id FROM policy_gaps ORDER BY priority_score DESC
-            )
-        ''')
+            row = cursor.fetchone()
+            if not row:
+                return None
         
-        gaps = []
-        for gap_row in cursor.fetchall():
-            gap = PolicyGap(
-                gap_id=gap_row[0],
-                policy_name=gap_row[1],
-                framework=ComplianceFramework(gap_row[2]),
-                severity=GapSeverity(gap_row[3]),
-                description=gap_row[4],
-                current_status=PolicyStatus(gap_row[5]),
-                required_actions=json.loads(gap_row[6]) if gap_row[6] else [],
-                mitigation_strategies=json.loads(gap_row[7]) if gap_row[7] else [],
-                estimated_effort=gap_row[8],
-                business_impact=gap_row[9],
-                regulatory_impact=gap_row[10],
-                priority_score=gap_row[11],
-                due_date=datetime.fromisoformat(gap_row[12]) if gap_row[12] else None,
-                assigned_owner=gap_row[13],
-                created_date=datetime.fromisoformat(gap_row[14]),
-                last_updated=datetime.fromisoformat(gap_row[15])
-            )
-            gaps.append(gap)
+            # Get gaps for this report
+            cursor.execute('''
+                SELECT * FROM policy_gaps WHERE gap_id IN (
+                    SELECT gap_id FROM policy_gaps ORDER BY priority_score DESC
+                )
+            ''')
         
-        conn.close()
+            gaps = []
+            for gap_row in cursor.fetchall():
+                gap = PolicyGap(
+                    gap_id=gap_row[0],
+                    policy_name=gap_row[1],
+                    framework=ComplianceFramework(gap_row[2]),
+                    severity=GapSeverity(gap_row[3]),
+                    description=gap_row[4],
+                    current_status=PolicyStatus(gap_row[5]),
+                    required_actions=json.loads(gap_row[6]) if gap_row[6] else [],
+                    mitigation_strategies=json.loads(gap_row[7]) if gap_row[7] else [],
+                    estimated_effort=gap_row[8],
+                    business_impact=gap_row[9],
+                    regulatory_impact=gap_row[10],
+                    priority_score=gap_row[11],
+                    due_date=datetime.fromisoformat(gap_row[12]) if gap_row[12] else None,
+                    assigned_owner=gap_row[13],
+                    created_date=datetime.fromisoformat(gap_row[14]),
+                    last_updated=datetime.fromisoformat(gap_row[15])
+                )
+                gaps.append(gap)
         
         # Reconstruct report
         report = GapAnalysisReport(
@@ -747,30 +743,28 @@ NEXT STEPS:
     def get_all_gap_analysis_reports(self) -> List[Dict[str, Any]]:
         """Get all gap analysis reports"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT report_id, organization_name, analysis_date, compliance_score,
-                   critical_gaps, high_priority_gaps, medium_priority_gaps, low_priority_gaps
-            FROM gap_analysis_reports
-            ORDER BY analysis_date DESC
-        ''')
-        
-        reports = []
-        for row in cursor.fetchall():
-            reports.append({
-                "report_id": row[0],
-                "organization_name": row[1],
-                "analysis_date": row[2],
-                "compliance_score": row[3],
-                "critical_gaps": row[4],
-                "high_priority_gaps": row[5],
-                "medium_priority_gaps": row[6],
-                "low_priority_gaps": row[7]
-            })
-        
-        conn.close()
+        with self.pool.read_connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute('''
+                SELECT report_id, organization_name, analysis_date, compliance_score,
+                       critical_gaps, high_priority_gaps, medium_priority_gaps, low_priority_gaps
+                FROM gap_analysis_reports
+                ORDER BY analysis_date DESC
+            ''')
+        
+            reports = []
+            for row in cursor.fetchall():
+                reports.append({
+                    "report_id": row[0],
+                    "organization_name": row[1],
+                    "analysis_date": row[2],
+                    "compliance_score": row[3],
+                    "critical_gaps": row[4],
+                    "high_priority_gaps": row[5],
+                    "medium_priority_gaps": row[6],
+                    "low_priority_gaps": row[7]
+                })
         return reports
 
 # Example usage and testing
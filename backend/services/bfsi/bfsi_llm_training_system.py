@@ -7,6 +7,7 @@ Optimized for Mistral-7B with QLoRA and SFTTrainer
 import json
 import logging
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
@@ -26,6 +27,12 @@ from peft import LoraConfig, get_peft_model, TaskType
 from trl import SFTTrainer
 from accelerate import Accelerator
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -301,6 +308,7 @@ class BFSILLMTrainingSystem:
     def __init__(self, db_path: str = "bfsi_policies.db", 
                  content_config: ContentGenerationConfig = None):
         self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
         self.training_history: List[TrainingResult] = []
         self.models_dir = Path("trained_models")
         self.datasets_dir = Path("training_datasets")
@@ -326,54 +334,50 @@ class BFSILLMTrainingSystem:
     
     def _init_database(self):
         """Initialize training database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create training history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS training_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                model_id TEXT UNIQUE NOT NULL,
-                model_name TEXT NOT NULL,
-                training_time REAL NOT NULL,
-                final_loss REAL NOT NULL,
-                eval_loss REAL,
-                perplexity REAL,
-                model_path TEXT NOT NULL,
-                training_config TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                status TEXT DEFAULT 'completed'
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+        
+            # Create training history table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS training_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model_id TEXT UNIQUE NOT NULL,
+                    model_name TEXT NOT NULL,
+                    training_time REAL NOT NULL,
+                    final_loss REAL NOT NULL,
+                    eval_loss REAL,
+                    perplexity REAL,
+                    model_path TEXT NOT NULL,
+                    training_config TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    status TEXT DEFAULT 'completed'
+                )
+            ''')
     
     async def prepare_training_dataset(self, policy_types: List[str] = None, 
                                      frameworks: List[str] = None) -> str:
         """Prepare training dataset from BFSI policies"""
         logger.info("Preparing BFSI policy training dataset...")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.read_connection() as conn:
+            cursor = conn.cursor()
         
-        # Query policies
-        query = "SELECT title, content, policy_type, framework FROM policies WHERE 1=1"
-        params = []
+            # Query policies
+            query = "SELECT title, content, policy_type, framework FROM policies WHERE 1=1"
+            params = []
         
-        if policy_types:
-            placeholders = ','.join(['?' for _ in policy_types])
-            query += f" AND policy_type IN ({placeholders})"
-            params.extend(policy_types)
+            if policy_types:
+                placeholders = ','.join(['?' for _ in policy_types])
+                query += f" AND policy_type IN ({placeholders})"
+                params.extend(policy_types)
         
-        if frameworks:
-            placeholders = ','.join(['?' for _ in frameworks])
-            query += f" AND framework IN ({placeholders})"
-            params.extend(frameworks)
+            if frameworks:
+                placeholders = ','.join(['?' for _ in frameworks])
+                query += f" AND framework IN ({placeholders})"
+                params.extend(frameworks)
         
-        cursor.execute(query, params)
-        policies = cursor.fetchall()
-        conn.close()
+            cursor.execute(query, params)
+            policies = cursor.fetchall()
         
         if not policies:
             raise ValueError("No policies found matching criteria")
@@ -882,60 +886,55 @@ Format as a comprehensive risk assessment suitable for training data."""
     
     async def _save_training_result(self, result: TrainingResult):
         """Save training result to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO training_history 
-            (model_id, model_name, training_time, final_loss, eval_loss, 
-             perplexity, model_path, training_config, timestamp, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            result.model_id,
-            result.model_name,
-            result.training_time,
-            result.final_loss,
-            result.eval_loss,
-            result.perplexity,
-            result.model_path,
-            json.dumps(result.training_config),
-            result.timestamp.isoformat(),
-            'completed'
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute('''
+                INSERT OR REPLACE INTO training_history 
+                (model_id, model_name, training_time, final_loss, eval_loss, 
+                 perplexity, model_path, training_config, timestamp, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                result.model_id,
+                result.model_name,
+                result.training_time,
+                result.final_loss,
+                result.eval_loss,
+                result.perplexity,
+                result.model_path,
+                json.dumps(result.training_config),
+                result.timestamp.isoformat(),
+                'completed'
+            ))
         
         # Also save to memory
         self.training_history.append(result)
     
     async def list_trained_models(self) -> List[Dict[str, Any]]:
         """List all trained models"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT model_id, model_name, training_time, final_loss, 
-                   eval_loss, perplexity, model_path, timestamp, status
-            FROM training_history
-            ORDER BY timestamp DESC
-        ''')
-        
-        models = []
-        for row in cursor.fetchall():
-            models.append({
-                'model_id': row[0],
-                'model_name': row[1],
-                'training_time': row[2],
-                'final_loss': row[3],
-                'eval_loss': row[4],
-                'perplexity': row[5],
-                'model_path': row[6],
-                'timestamp': row[7],
-                'status': row[8]
-            })
-        
-        conn.close()
+        with self.pool.read_connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute('''
+                SELECT model_id, model_name, training_time, final_loss, 
+                       eval_loss, perplexity, model_path, timestamp, status
+                FROM training_history
+                ORDER BY timestamp DESC
+            ''')
+        
+            models = []
+            for row in cursor.fetchall():
+                models.append({
+                    'model_id': row[0],
+                    'model_name': row[1],
+                    'training_time': row[2],
+                    'final_loss': row[3],
+                    'eval_loss': row[4],
+                    'perplexity': row[5],
+                    'model_path': row[6],
+                    'timestamp': row[7],
+                    'status': row[8]
+                })
         return models
     
     async def get_training_statistics(self) -> Dict[str, Any]:
@@ -5,15 +5,22 @@ GRC workflow integration for gap mitigation and compliance management
 """
 
 import os
+import sys
 import json
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Union, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,6 +39,9 @@ class WorkflowPriority(Enum):
     MEDIUM = "medium"
     LOW = "low"
 
+# Workflow states that no longer have a live deadline
+CLOSED_WORKFLOW_STATUSES = (WorkflowStatus.COMPLETED.value, WorkflowStatus.CANCELLED.value)
+
 class TaskStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -78,8 +88,13 @@ class BFSIMitigationWorkflowSystem:
     
     def __init__(self, db_path: str = "bfsi_policies.db"):
         self.db_path = db_path
+        # One WAL writer plus read-only readers shared by every store on this database
+        self.pool = get_connection_pool(db_path)
         self.ensure_database()
         
+        # Callbacks told which workflows' deadlines may have changed after each commit
+        self.deadline_listeners: List[Callable[[List[str]], None]] = []
+        
         # Standard workflow templates for different gap types
         self.workflow_templates = {
             "sox_compliance": {
@@ -214,48 +229,92 @@ class BFSIMitigationWorkflowSystem:
 
     def ensure_database(self):
         """Ensure database tables exist for workflow management"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create workflow tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mitigation_workflows (
-                workflow_id TEXT PRIMARY KEY,
-                gap_id TEXT NOT NULL,
-                organization_name TEXT NOT NULL,
-                workflow_name TEXT NOT NULL,
-                description TEXT,
-                assigned_owner TEXT NOT NULL,
-                target_completion_date TEXT NOT NULL,
-                status TEXT NOT NULL,
-                priority TEXT NOT NULL,
-                progress_percentage INTEGER DEFAULT 0,
-                created_date TEXT NOT NULL,
-                last_updated TEXT NOT NULL,
-                completed_date TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS workflow_tasks (
-                task_id TEXT PRIMARY KEY,
-                workflow_id TEXT NOT NULL,
-                task_name TEXT NOT NULL,
-                description TEXT,
-                assigned_to TEXT NOT NULL,
-                due_date TEXT NOT NULL,
-                status TEXT NOT NULL,
-                priority TEXT NOT NULL,
-                dependencies TEXT,
-                deliverables TEXT,
-                created_date TEXT NOT NULL,
-                completed_date TEXT,
-                FOREIGN KEY (workflow_id) REFERENCES mitigation_workflows (workflow_id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Create workflow tables
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS mitigation_workflows (
+                    workflow_id TEXT PRIMARY KEY,
+                    gap_id TEXT NOT NULL,
+                    organization_name TEXT NOT NULL,
+                    workflow_name TEXT NOT NULL,
+                    description TEXT,
+                    assigned_owner TEXT NOT NULL,
+                    target_completion_date TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    progress_percentage INTEGER DEFAULT 0,
+                    created_date TEXT NOT NULL,
+                    last_updated TEXT NOT NULL,
+                    completed_date TEXT,
+                    total_tasks INTEGER NOT NULL DEFAULT 0,
+                    completed_tasks INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS workflow_tasks (
+                    task_id TEXT PRIMARY KEY,
+                    workflow_id TEXT NOT NULL,
+                    task_name TEXT NOT NULL,
+                    description TEXT,
+                    assigned_to TEXT NOT NULL,
+                    due_date TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    dependencies TEXT,
+                    deliverables TEXT,
+                    created_date TEXT NOT NULL,
+                    completed_date TEXT,
+                    FOREIGN KEY (workflow_id) REFERENCES mitigation_workflows (workflow_id)
+                )
+            ''')
+            
+            # Progress counters were added later; backfill them on existing databases
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(mitigation_workflows)")}
+            if "total_tasks" not in columns:
+                cursor.execute("ALTER TABLE mitigation_workflows ADD COLUMN total_tasks INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("ALTER TABLE mitigation_workflows ADD COLUMN completed_tasks INTEGER NOT NULL DEFAULT 0")
+                cursor.execute('''
+                    UPDATE mitigation_workflows SET
+                        total_tasks = (SELECT COUNT(*) FROM workflow_tasks t
+                                       WHERE t.workflow_id = mitigation_workflows.workflow_id),
+                        completed_tasks = (SELECT COUNT(*) FROM workflow_tasks t
+                                           WHERE t.workflow_id = mitigation_workflows.workflow_id
+                                             AND t.status = 'completed')
+                ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_workflow_tasks_workflow ON workflow_tasks (workflow_id, due_date)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_workflows_owner ON mitigation_workflows (assigned_owner, target_completion_date)")
+            
+            # Live deadlines only; rows are deactivated when a workflow closes
+            cursor.execute('''
+                SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'workflow_deadlines'
+            ''')
+            backfill_deadlines = cursor.fetchone() is None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS workflow_deadlines (
+                    workflow_id TEXT PRIMARY KEY,
+                    assigned_owner TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    deadline TEXT NOT NULL,
+                    active INTEGER NOT NULL DEFAULT 1,
+                    notified_stage INTEGER NOT NULL DEFAULT 0,
+                    FOREIGN KEY (workflow_id) REFERENCES mitigation_workflows (workflow_id)
+                )
+            ''')
+            if backfill_deadlines:
+                cursor.execute(f'''
+                    INSERT INTO workflow_deadlines (workflow_id, assigned_owner, priority, deadline, active)
+                    SELECT workflow_id, assigned_owner, priority, target_completion_date,
+                           status NOT IN ({",".join("?" * len(CLOSED_WORKFLOW_STATUSES))})
+                    FROM mitigation_workflows
+                ''', CLOSED_WORKFLOW_STATUSES)
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deadlines_due ON workflow_deadlines (active, deadline)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deadlines_owner ON workflow_deadlines (active, assigned_owner, priority, deadline)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deadlines_priority ON workflow_deadlines (active, priority, deadline)")
 
     def create_mitigation_workflow(self, 
                                  gap_id: str,
@@ -320,119 +379,238 @@ class BFSIMitigationWorkflowSystem:
     def update_workflow_status(self, workflow_id: str, status: WorkflowStatus) -> bool:
         """Update workflow status"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE mitigation_workflows 
-            SET status = ?, last_updated = ?
-            WHERE workflow_id = ?
-        ''', (status.value, datetime.now().isoformat(), workflow_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self.pool.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE mitigation_workflows 
+                SET status = ?, last_updated = ?
+                WHERE workflow_id = ?
+            ''', (status.value, datetime.now().isoformat(), workflow_id))
+            success = cursor.rowcount > 0
+            conn.execute('''
+                UPDATE workflow_deadlines SET active = ? WHERE workflow_id = ?
+            ''', (status.value not in CLOSED_WORKFLOW_STATUSES, workflow_id))
         
         if success:
             logger.info(f"Updated workflow {workflow_id} status to {status.value}")
+            self._notify_deadline_listeners([workflow_id])
         
         return success
 
     def update_task_status(self, task_id: str, status: TaskStatus) -> bool:
-        """Update task status and recalculate workflow progress"""
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Update task status
-        completed_date = datetime.now().isoformat() if status == TaskStatus.COMPLETED else None
+        """Update task status and workflow progress"""
         
-        cursor.execute('''
-            UPDATE workflow_tasks 
-            SET status = ?, completed_date = ?
-            WHERE task_id = ?
-        ''', (status.value, completed_date, task_id))
-        
-        if cursor.rowcount > 0:
-            # Get workflow ID for this task
-            cursor.execute('SELECT workflow_id FROM workflow_tasks WHERE task_id = ?', (task_id,))
-            workflow_id = cursor.fetchone()[0]
+        updated = self.update_task_statuses([(task_id, status)])
+        if updated:
+            logger.info(f"Updated task {task_id} status to {status.value}")
+        return updated > 0
+
+    def update_task_statuses(self, updates: Union[Dict[str, TaskStatus], Iterable[Tuple[str, TaskStatus]]]) -> int:
+        """
+        Update the status of many tasks and their workflows' progress in one transaction
+        
+        Returns:
+            Number of tasks updated
+        """
+        updates = dict(updates.items() if isinstance(updates, dict) else updates)
+        if not updates:
+            return 0
+        
+        now = datetime.now().isoformat()
+        with self.pool.transaction() as conn:
+            task_ids = list(updates)
+            placeholders = ",".join("?" * len(task_ids))
+            current = conn.execute(
+                f"SELECT task_id, workflow_id, status FROM workflow_tasks WHERE task_id IN ({placeholders})",
+                task_ids
+            ).fetchall()
             
-            # Recalculate workflow progress
-            self._recalculate_workflow_progress(workflow_id)
+            # Net change in completed tasks per workflow
+            completed_delta: Dict[str, int] = {}
+            rows = []
+            for task_id, workflow_id, old_status in current:
+                status = updates[task_id]
+                delta = (status == TaskStatus.COMPLETED) - (old_status == TaskStatus.COMPLETED.value)
+                completed_delta[workflow_id] = completed_delta.get(workflow_id, 0) + delta
+                rows.append((status.value, now if status == TaskStatus.COMPLETED else None, task_id))
             
-            conn.commit()
-            conn.close()
+            conn.executemany('''
+                UPDATE workflow_tasks 
+                SET status = ?, completed_date = ?
+                WHERE task_id = ?
+            ''', rows)
             
-            logger.info(f"Updated task {task_id} status to {status.value}")
-            return True
+            for workflow_id, delta in completed_delta.items():
+                self._apply_progress_delta(conn, workflow_id, delta, now)
         
-        conn.close()
-        return False
+        self._notify_deadline_listeners(list(completed_delta))
+        return len(rows)
 
-    def _recalculate_workflow_progress(self, workflow_id: str):
-        """Recalculate workflow progress based on completed tasks"""
+    def _apply_progress_delta(self, conn: sqlite3.Connection, workflow_id: str, completed_delta: int, now: str):
+        """Adjust a workflow's completed-task counter and derived progress inside the caller's transaction"""
+        conn.execute('''
+            UPDATE mitigation_workflows
+            SET completed_tasks = completed_tasks + ?,
+                progress_percentage = CASE WHEN total_tasks > 0
+                                           THEN ((completed_tasks + ?) * 100) / total_tasks
+                                           ELSE progress_percentage END,
+                last_updated = ?
+            WHERE workflow_id = ?
+        ''', (completed_delta, completed_delta, now, workflow_id))
+        
+        # Update workflow status based on progress
+        conn.execute('''
+            UPDATE mitigation_workflows
+            SET status = 'completed', completed_date = ?
+            WHERE workflow_id = ? AND total_tasks > 0 AND completed_tasks = total_tasks
+        ''', (now, workflow_id))
+        conn.execute('''
+            UPDATE workflow_deadlines SET active = 0
+            WHERE workflow_id = ? AND workflow_id IN (
+                SELECT workflow_id FROM mitigation_workflows WHERE workflow_id = ? AND status = 'completed'
+            )
+        ''', (workflow_id, workflow_id))
+
+    def _recalculate_workflow_progress(self, workflow_id: str, conn: Optional[sqlite3.Connection] = None):
+        """Recount a workflow's tasks and rebuild its progress counters"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if conn is None:
+            with self.pool.transaction() as conn:
+                return self._recalculate_workflow_progress(workflow_id, conn)
         
-        # Get task counts
-        cursor.execute('''
+        total_tasks, completed_tasks = conn.execute('''
             SELECT 
                 COUNT(*) as total_tasks,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_tasks
+                COALESCE(SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END), 0) as completed_tasks
             FROM workflow_tasks 
             WHERE workflow_id = ?
-        ''', (workflow_id,))
-        
-        result = cursor.fetchone()
-        total_tasks = result[0]
-        completed_tasks = result[1]
+        ''', (workflow_id,)).fetchone()
         
-        if total_tasks > 0:
-            progress_percentage = int((completed_tasks / total_tasks) * 100)
-            
-            # Update workflow progress
-            cursor.execute('''
-                UPDATE mitigation_workflows 
-                SET progress_percentage = ?, last_updated = ?
+        conn.execute('''
+            UPDATE mitigation_workflows
+            SET total_tasks = ?, completed_tasks = 0
+            WHERE workflow_id = ?
+        ''', (total_tasks, workflow_id))
+        self._apply_progress_delta(conn, workflow_id, completed_tasks, datetime.now().isoformat())
+
+    def reschedule_workflow(self, workflow_id: str, target_completion_date: str,
+                            as_of: Optional[datetime] = None) -> bool:
+        """
+        Move a workflow's target completion date
+        
+        A deadline moved into the future restarts the deadline notifications and
+        takes an overdue workflow back to in progress (or created, if no task is done yet).
+        
+        Args:
+            workflow_id: Workflow to reschedule
+            target_completion_date: New deadline in ISO format
+            as_of: Reference time (defaults to now)
+        """
+        
+        new_deadline = datetime.fromisoformat(target_completion_date)
+        deadline = new_deadline.isoformat()
+        now = datetime.now()
+        with self.pool.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE mitigation_workflows
+                SET target_completion_date = ?, last_updated = ?
                 WHERE workflow_id = ?
-            ''', (progress_percentage, datetime.now().isoformat(), workflow_id))
-            
-            # Update workflow status based on progress
-            if progress_percentage == 100:
-                cursor.execute('''
-                    UPDATE mitigation_workflows 
-                    SET status = 'completed', completed_date = ?
-                    WHERE workflow_id = ?
-                ''', (datetime.now().isoformat(), workflow_id))
+            ''', (deadline, now.isoformat(), workflow_id))
+            success = cursor.rowcount > 0
+            if new_deadline > (as_of or now):
+                conn.execute('''
+                    UPDATE workflow_deadlines SET deadline = ?, notified_stage = 0 WHERE workflow_id = ?
+                ''', (deadline, workflow_id))
+                conn.execute('''
+                    UPDATE mitigation_workflows
+                    SET status = CASE WHEN completed_tasks > 0 THEN ? ELSE ? END
+                    WHERE workflow_id = ? AND status = ?
+                ''', (WorkflowStatus.IN_PROGRESS.value, WorkflowStatus.CREATED.value,
+                      workflow_id, WorkflowStatus.OVERDUE.value))
+            else:
+                conn.execute('''
+                    UPDATE workflow_deadlines SET deadline = ? WHERE workflow_id = ?
+                ''', (deadline, workflow_id))
+        
+        if success:
+            logger.info(f"Rescheduled workflow {workflow_id} to {deadline}")
+            self._notify_deadline_listeners([workflow_id])
         
-        conn.commit()
-        conn.close()
+        return success
+
+    def get_active_deadlines(self, workflow_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get live deadlines, optionally restricted to the given workflows"""
+        
+        query = '''
+            SELECT workflow_id, assigned_owner, priority, deadline, notified_stage
+            FROM workflow_deadlines
+            WHERE active = 1
+        '''
+        params: List[Any] = []
+        if workflow_ids is not None:
+            if not workflow_ids:
+                return []
+            query += f" AND workflow_id IN ({','.join('?' * len(workflow_ids))})"
+            params.extend(workflow_ids)
+        
+        with self.pool.read_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        return [
+            {
+                "workflow_id": row[0],
+                "assigned_owner": row[1],
+                "priority": row[2],
+                "deadline": datetime.fromisoformat(row[3]),
+                "notified_stage": row[4]
+            }
+            for row in rows
+        ]
+
+    def record_deadline_notifications(self, stages: List[Tuple[str, int]], overdue_workflow_ids: List[str]):
+        """Persist fired deadline stages and mark newly overdue workflows in one transaction"""
+        
+        now = datetime.now().isoformat()
+        with self.pool.transaction() as conn:
+            conn.executemany('''
+                UPDATE workflow_deadlines SET notified_stage = ?
+                WHERE workflow_id = ? AND notified_stage < ?
+            ''', [(stage, workflow_id, stage) for workflow_id, stage in stages])
+            conn.executemany(f'''
+                UPDATE mitigation_workflows SET status = ?, last_updated = ?
+                WHERE workflow_id = ? AND status NOT IN ({",".join("?" * len(CLOSED_WORKFLOW_STATUSES))})
+            ''', [
+                (WorkflowStatus.OVERDUE.value, now, workflow_id, *CLOSED_WORKFLOW_STATUSES)
+                for workflow_id in overdue_workflow_ids
+            ])
+
+    def _notify_deadline_listeners(self, workflow_ids: List[str]):
+        """Tell deadline listeners which workflows changed"""
+        if not workflow_ids:
+            return
+        for listener in self.deadline_listeners:
+            try:
+                listener(workflow_ids)
+            except Exception as e:
+                logger.error(f"Deadline listener failed: {e}")
 
     def get_workflow(self, workflow_id: str) -> Optional[MitigationWorkflow]:
         """Get workflow by ID"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get workflow
-        cursor.execute('''
-            SELECT * FROM mitigation_workflows WHERE workflow_id = ?
-        ''', (workflow_id,))
-        
-        workflow_row = cursor.fetchone()
-        if not workflow_row:
-            conn.close()
-            return None
-        
-        # Get tasks
-        cursor.execute('''
-            SELECT * FROM workflow_tasks WHERE workflow_id = ? ORDER BY due_date
-        ''', (workflow_id,))
+        with self.pool.read_connection() as conn:
+            # Get workflow
+            workflow_row = conn.execute('''
+                SELECT * FROM mitigation_workflows WHERE workflow_id = ?
+            ''', (workflow_id,)).fetchone()
+            if not workflow_row:
+                return None
+            
+            # Get tasks
+            task_rows = conn.execute('''
+                SELECT * FROM workflow_tasks WHERE workflow_id = ? ORDER BY due_date
+            ''', (workflow_id,)).fetchall()
         
         tasks = []
-        for task_row in cursor.fetchall():
+        for task_row in task_rows:
             task = WorkflowTask(
                 task_id=task_row[0],
                 workflow_id=task_row[1],
@@ -449,8 +627,6 @@ class BFSIMitigationWorkflowSystem:
             )
             tasks.append(task)
         
-        conn.close()
-        
         # Reconstruct workflow
         workflow = MitigationWorkflow(
             workflow_id=workflow_row[0],
@@ -474,19 +650,17 @@ class BFSIMitigationWorkflowSystem:
     def get_all_workflows(self) -> List[Dict[str, Any]]:
         """Get all workflows"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT workflow_id, gap_id, organization_name, workflow_name, 
-                   assigned_owner, target_completion_date, status, priority, 
-                   progress_percentage, created_date
-            FROM mitigation_workflows
-            ORDER BY created_date DESC
-        ''')
+        with self.pool.read_connection() as conn:
+            rows = conn.execute('''
+                SELECT workflow_id, gap_id, organization_name, workflow_name, 
+                       assigned_owner, target_completion_date, status, priority, 
+                       progress_percentage, created_date
+                FROM mitigation_workflows
+                ORDER BY created_date DESC
+            ''').fetchall()
         
         workflows = []
-        for row in cursor.fetchall():
+        for row in rows:
             workflows.append({
                 "workflow_id": row[0],
                 "gap_id": row[1],
@@ -500,25 +674,22 @@ class BFSIMitigationWorkflowSystem:
                 "created_date": row[9]
             })
         
-        conn.close()
         return workflows
 
     def get_workflows_by_owner(self, assigned_owner: str) -> List[Dict[str, Any]]:
         """Get workflows assigned to a specific owner"""
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT workflow_id, gap_id, organization_name, workflow_name, 
-                   target_completion_date, status, priority, progress_percentage
-            FROM mitigation_workflows
-            WHERE assigned_owner = ?
-            ORDER BY target_completion_date ASC
-        ''', (assigned_owner,))
+        with self.pool.read_connection() as conn:
+            rows = conn.execute('''
+                SELECT workflow_id, gap_id, organization_name, workflow_name, 
+                       target_completion_date, status, priority, progress_percentage
+                FROM mitigation_workflows
+                WHERE assigned_owner = ?
+                ORDER BY target_completion_date ASC
+            ''', (assigned_owner,)).fetchall()
         
         workflows = []
-        for row in cursor.fetchall():
+        for row in rows:
             workflows.append({
                 "workflow_id": row[0],
                 "gap_id": row[1],
@@ -530,27 +701,49 @@ class BFSIMitigationWorkflowSystem:
                 "progress_percentage": row[7]
             })
         
-        conn.close()
         return workflows
 
-    def get_overdue_workflows(self) -> List[Dict[str, Any]]:
-        """Get overdue workflows"""
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        current_date = datetime.now().isoformat()
-        cursor.execute('''
-            SELECT workflow_id, gap_id, organization_name, workflow_name, 
-                   assigned_owner, target_completion_date, status, priority, 
-                   progress_percentage
-            FROM mitigation_workflows
-            WHERE target_completion_date < ? AND status NOT IN ('completed', 'cancelled')
-            ORDER BY target_completion_date ASC
-        ''', (current_date,))
+    def get_overdue_workflows(self,
+                              assigned_owner: Optional[str] = None,
+                              priority: Optional[str] = None,
+                              limit: Optional[int] = None,
+                              offset: int = 0,
+                              as_of: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get overdue workflows, oldest deadline first
+        
+        Args:
+            assigned_owner: Only workflows owned by this owner
+            priority: Only workflows with this priority
+            limit: Page size (all matches when None)
+            offset: Number of matches to skip
+            as_of: Reference time (defaults to now)
+        """
+        
+        conditions = ["d.active = 1", "d.deadline < ?"]
+        params: List[Any] = [(as_of or datetime.now()).isoformat()]
+        if assigned_owner is not None:
+            conditions.append("d.assigned_owner = ?")
+            params.append(assigned_owner)
+        if priority is not None:
+            conditions.append("d.priority = ?")
+            params.append(priority)
+        params.extend([-1 if limit is None else limit, offset])
+        
+        with self.pool.read_connection() as conn:
+            rows = conn.execute(f'''
+                SELECT w.workflow_id, w.gap_id, w.organization_name, w.workflow_name, 
+                       w.assigned_owner, w.target_completion_date, w.status, w.priority, 
+                       w.progress_percentage, d.notified_stage
+                FROM workflow_deadlines d
+                JOIN mitigation_workflows w ON w.workflow_id = d.workflow_id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY d.deadline ASC, d.workflow_id ASC
+                LIMIT ? OFFSET ?
+            ''', params).fetchall()
         
         workflows = []
-        for row in cursor.fetchall():
+        for row in rows:
             workflows.append({
                 "workflow_id": row[0],
                 "gap_id": row[1],
@@ -560,63 +753,76 @@ class BFSIMitigationWorkflowSystem:
                 "target_completion_date": row[5],
                 "status": row[6],
                 "priority": row[7],
-                "progress_percentage": row[8]
+                "progress_percentage": row[8],
+                "notified_stage": row[9]
             })
         
-        conn.close()
         return workflows
 
     def _save_workflow(self, workflow: MitigationWorkflow):
-        """Save workflow to database"""
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Save workflow
-        cursor.execute('''
-            INSERT INTO mitigation_workflows 
-            (workflow_id, gap_id, organization_name, workflow_name, description,
-             assigned_owner, target_completion_date, status, priority, progress_percentage,
-             created_date, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            workflow.workflow_id,
-            workflow.gap_id,
-            workflow.organization_name,
-            workflow.workflow_name,
-            workflow.description,
-            workflow.assigned_owner,
-            workflow.target_completion_date.isoformat(),
-            workflow.status.value,
-            workflow.priority.value,
-            workflow.progress_percentage,
-            workflow.created_date.isoformat(),
-            workflow.last_updated.isoformat()
-        ))
-        
-        # Save tasks
-        for task in workflow.tasks:
-            cursor.execute('''
+        """Save workflow and its tasks to database in one transaction"""
+        
+        completed_tasks = len([task for task in workflow.tasks if task.status == TaskStatus.COMPLETED])
+        with self.pool.transaction() as conn:
+            # Save workflow
+            conn.execute('''
+                INSERT INTO mitigation_workflows 
+                (workflow_id, gap_id, organization_name, workflow_name, description,
+                 assigned_owner, target_completion_date, status, priority, progress_percentage,
+                 created_date, last_updated, total_tasks, completed_tasks)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                workflow.workflow_id,
+                workflow.gap_id,
+                workflow.organization_name,
+                workflow.workflow_name,
+                workflow.description,
+                workflow.assigned_owner,
+                workflow.target_completion_date.isoformat(),
+                workflow.status.value,
+                workflow.priority.value,
+                workflow.progress_percentage,
+                workflow.created_date.isoformat(),
+                workflow.last_updated.isoformat(),
+                len(workflow.tasks),
+                completed_tasks
+            ))
+            
+            # Save tasks
+            conn.executemany('''
                 INSERT INTO workflow_tasks 
                 (task_id, workflow_id, task_name, description, assigned_to, due_date,
                  status, priority, dependencies, deliverables, created_date)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    task.task_id,
+                    task.workflow_id,
+                    task.task_name,
+                    task.description,
+                    task.assigned_to,
+                    task.due_date.isoformat(),
+                    task.status.value,
+                    task.priority.value,
+                    json.dumps(task.dependencies),
+                    json.dumps(task.deliverables),
+                    task.created_date.isoformat()
+                )
+                for task in workflow.tasks
+            ])
+            
+            conn.execute('''
+                INSERT INTO workflow_deadlines (workflow_id, assigned_owner, priority, deadline, active)
+                VALUES (?, ?, ?, ?, ?)
             ''', (
-                task.task_id,
-                task.workflow_id,
-                task.task_name,
-                task.description,
-                task.assigned_to,
-                task.due_date.isoformat(),
-                task.status.value,
-                task.priority.value,
-                json.dumps(task.dependencies),
-                json.dumps(task.deliverables),
-                task.created_date.isoformat()
+                workflow.workflow_id,
+                workflow.assigned_owner,
+                workflow.priority.value,
+                workflow.target_completion_date.isoformat(),
+                workflow.status.value not in CLOSED_WORKFLOW_STATUSES
             ))
         
-        conn.commit()
-        conn.close()
+        self._notify_deadline_listeners([workflow.workflow_id])
 
     def generate_workflow_report(self, workflow_id: str) -> Dict[str, Any]:
         """Generate detailed workflow report"""
@@ -10,11 +10,18 @@ import subprocess
 import logging
 import re
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import asyncio
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,6 +31,7 @@ class BFSIModelDeployment:
     
     def __init__(self, db_path: str = "bfsi_policies.db"):
         self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
         self.deployment_dir = Path("deployed_models")
         self.config_dir = Path("deployment_configs")
         self.deployment_dir.mkdir(exist_ok=True)
@@ -109,7 +117,7 @@ class BFSIModelDeployment:
     def _init_deployment_db(self):
         """Initialize deployment database with proper error handling and context managers"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.transaction() as conn:
                 cursor = conn.cursor()
                 try:
                     # Create deployment history table
@@ -129,7 +137,6 @@ class BFSIModelDeployment:
                         )
                     ''')
                     
-                    conn.commit()
                     logger.info("Deployment database initialized successfully")
                 finally:
                     cursor.close()
@@ -683,7 +690,7 @@ if __name__ == "__main__":
     def _record_deployment(self, deployment_info: Dict[str, Any]):
         """Record deployment in database with proper error handling and context managers"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.transaction() as conn:
                 cursor = conn.cursor()
                 try:
                     cursor.execute('''
@@ -701,7 +708,6 @@ if __name__ == "__main__":
                         deployment_info['timestamp']
                     ))
                     
-                    conn.commit()
                     logger.info(f"Deployment recorded for model: {deployment_info['model_name']}")
                 finally:
                     cursor.close()
@@ -716,7 +722,7 @@ if __name__ == "__main__":
     def list_deployments(self) -> List[Dict[str, Any]]:
         """List all model deployments with proper error handling and context managers"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.read_connection() as conn:
                 cursor = conn.cursor()
                 try:
                     cursor.execute('''
@@ -825,7 +831,7 @@ if __name__ == "__main__":
     def _update_access_stats(self, model_name: str):
         """Update access statistics for a model with proper error handling and context managers"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.transaction() as conn:
                 cursor = conn.cursor()
                 try:
                     cursor.execute('''
@@ -834,7 +840,6 @@ if __name__ == "__main__":
                         WHERE model_name = ?
                     ''', (datetime.now().isoformat(), model_name))
                     
-                    conn.commit()
                     logger.info(f"Updated access stats for model: {model_name}")
                 finally:
                     cursor.close()
@@ -4,32 +4,371 @@ BFSI Model Validator
 Comprehensive testing and validation system for trained BFSI models
 """
 
+import os
+import sys
 import json
+import random
+import hashlib
 import sqlite3
-import subprocess
 import logging
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import combinations
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit
 import time
+import uuid
+
+import numpy as np
+
+from bfsi_response_evaluator import ResponseEvaluator, keyword_matcher
+
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+# Test cases sent to the model server at once
+VALIDATION_CONCURRENCY = int(os.getenv("VALIDATION_CONCURRENCY", "4"))
+VALIDATION_REQUEST_TIMEOUT = float(os.getenv("VALIDATION_REQUEST_TIMEOUT", "60"))
+# Resamples used for bootstrap confidence intervals and paired permutation tests
+STATS_RESAMPLES = int(os.getenv("VALIDATION_STATS_RESAMPLES", "5000"))
+STATS_SEED = 1234
+# Ollama embedding model used for semantic scoring against reference answers (disabled when unset)
+VALIDATION_EMBEDDING_MODEL = os.getenv("VALIDATION_EMBEDDING_MODEL")
+
+@dataclass
+class BenchmarkSuite:
+    """Versioned set of validation test cases; the fingerprint changes whenever the cases do"""
+    name: str
+    version: str
+    test_cases: List[Dict[str, Any]]
+    temperature: float = 0.7
+    fingerprint: str = field(init=False)
+
+    def __post_init__(self):
+        content = json.dumps({"test_cases": self.test_cases, "temperature": self.temperature}, sort_keys=True)
+        self.fingerprint = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, path: str) -> "BenchmarkSuite":
+        """Load a suite from a JSON file with name, version, test_cases and optional temperature"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data["name"], data["version"], data["test_cases"], data.get("temperature", 0.7))
+
+    def describe(self) -> Dict[str, Any]:
+        return {"suite": self.name, "version": self.version, "fingerprint": self.fingerprint,
+                "temperature": self.temperature}
+
+@dataclass
+class GenerationResult:
+    text: str
+    response_time: float
+    time_to_first_token: Optional[float] = None
+    tokens_generated: int = 0
+    tokens_per_second: Optional[float] = None
+    error: Optional[str] = None
+
+class OllamaHTTPClient:
+    """Ollama API client keeping one keep-alive connection per worker thread"""
+    
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, timeout: float = VALIDATION_REQUEST_TIMEOUT):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 11434
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+    
+    def _connection(self, reconnect: bool = False) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or reconnect:
+            if conn is not None:
+                conn.close()
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> http.client.HTTPResponse:
+        body = json.dumps(payload) if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        try:
+            conn = self._connection()
+            conn.request(method, path, body=body, headers=headers)
+            return conn.getresponse()
+        except (http.client.RemoteDisconnected, http.client.ImproperConnectionState,
+                BrokenPipeError, ConnectionResetError):
+            # The server closed an idle keep-alive connection, or an earlier response on this
+            # thread was abandoned mid-read (ResponseNotReady/CannotSendRequest); retry once on a fresh one
+            conn = self._connection(reconnect=True)
+            conn.request(method, path, body=body, headers=headers)
+            return conn.getresponse()
+    
+    def list_models(self) -> List[str]:
+        """Names of the models available on the server"""
+        response = self._request("GET", "/api/tags")
+        data = json.loads(response.read() or b"{}")
+        if response.status != 200:
+            raise RuntimeError(f"Model list failed with HTTP {response.status}")
+        return [model.get("name", "") for model in data.get("models", [])]
+    
+    def generate(self, model_name: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> GenerationResult:
+        """Stream a completion, timing the first token and the generation rate"""
+        start_time = time.perf_counter()
+        payload = {"model": model_name, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+        try:
+            response = self._request("POST", "/api/generate", payload)
+            if response.status != 200:
+                detail = response.read().decode("utf-8", errors="replace")
+                return GenerationResult(text="", response_time=time.perf_counter() - start_time,
+                                        error=f"HTTP {response.status}: {detail}")
+            
+            pieces: List[str] = []
+            first_token_time = None
+            chunks = 0
+            done = False
+            final: Dict[str, Any] = {}
+            # Read to the end of the stream so the connection can be reused
+            for line in iter(response.readline, b""):
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    final = chunk
+                    continue
+                if chunk.get("response"):
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter()
+                    pieces.append(chunk["response"])
+                    chunks += 1
+                if chunk.get("done"):
+                    final = chunk
+                    done = True
+            end_time = time.perf_counter()
+            if not done:
+                # The stream ended early; the connection's state is unknown
+                self._connection(reconnect=True)
+        except Exception as e:
+            # A half-read response would make every later request on this thread fail
+            self._connection(reconnect=True)
+            return GenerationResult(text="", response_time=time.perf_counter() - start_time, error=str(e))
+        
+        if final.get("error"):
+            return GenerationResult(text="", response_time=end_time - start_time, error=final["error"])
+        
+        # Prefer the server's own token accounting; fall back to streamed chunks
+        tokens = final.get("eval_count") or chunks
+        eval_seconds = (final.get("eval_duration") or 0) / 1e9
+        if not eval_seconds and first_token_time is not None:
+            eval_seconds = end_time - first_token_time
+        
+        return GenerationResult(
+            text="".join(pieces).strip(),
+            response_time=end_time - start_time,
+            time_to_first_token=first_token_time - start_time if first_token_time is not None else None,
+            tokens_generated=tokens,
+            tokens_per_second=tokens / eval_seconds if tokens and eval_seconds > 0 else None
+        )
+    
+    def embed(self, model_name: str, texts: List[str]) -> List[List[float]]:
+        """Embed many texts in one request"""
+        response = self._request("POST", "/api/embed", {"model": model_name, "input": texts})
+        data = json.loads(response.read() or b"{}")
+        if response.status != 200:
+            raise RuntimeError(f"Embedding failed with HTTP {response.status}: {data.get('error', '')}")
+        return data["embeddings"]
+    
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+def bootstrap_ci(values: List[float], confidence: float = 0.95,
+                 resamples: int = STATS_RESAMPLES, seed: int = STATS_SEED) -> Tuple[Optional[float], Optional[float]]:
+    """Percentile bootstrap confidence interval of the mean"""
+    if len(values) < 2:
+        return (None, None)
+    rng = np.random.default_rng(seed)
+    data = np.asarray(values, dtype=float)
+    means = rng.choice(data, size=(resamples, len(data)), replace=True).mean(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(means, [tail, 100 - tail])
+    return (float(low), float(high))
+
+def paired_permutation_test(differences: List[float], resamples: int = STATS_RESAMPLES,
+                            seed: int = STATS_SEED) -> Optional[float]:
+    """Two-sided sign-flip permutation p-value for a zero mean paired difference"""
+    if not differences:
+        return None
+    data = np.asarray(differences, dtype=float)
+    observed = abs(data.mean())
+    rng = np.random.default_rng(seed)
+    signs = rng.choice([-1.0, 1.0], size=(resamples, len(data)))
+    permuted = np.abs((signs * data).mean(axis=1))
+    # Add-one correction keeps the p-value away from an impossible zero
+    return float((np.count_nonzero(permuted >= observed - 1e-12) + 1) / (resamples + 1))
+
+def summarize_runs(test_results: List[Dict[str, Any]], wall_clock_time: Optional[float] = None) -> Dict[str, Any]:
+    """Per-category score intervals, latency percentiles and throughput for a set of test results"""
+    if not test_results:
+        return {}
+    
+    scores = [t["score"] for t in test_results]
+    low, high = bootstrap_ci(scores)
+    categories: Dict[str, List[float]] = {}
+    repeats: Dict[int, List[float]] = {}
+    for t in test_results:
+        categories.setdefault(t["category"], []).append(t["score"])
+        repeats.setdefault(t.get("repeat", 0), []).append(t["score"])
+    
+    per_category = {}
+    for category, values in categories.items():
+        cat_low, cat_high = bootstrap_ci(values)
+        per_category[category] = {"mean": float(np.mean(values)), "ci_low": cat_low, "ci_high": cat_high, "n": len(values)}
+    
+    latencies = np.asarray([t["response_time"] for t in test_results], dtype=float)
+    ttfts = [t["time_to_first_token"] for t in test_results if t.get("time_to_first_token") is not None]
+    rates = [t["tokens_per_second"] for t in test_results if t.get("tokens_per_second") is not None]
+    tokens = sum(t.get("tokens_generated") or 0 for t in test_results)
+    repeat_means = [float(np.mean(values)) for values in repeats.values()]
+    
+    return {
+        "samples": len(test_results),
+        "score": {"mean": float(np.mean(scores)), "ci_low": low, "ci_high": high,
+                  "std_across_repeats": float(np.std(repeat_means, ddof=1)) if len(repeat_means) > 1 else None},
+        "categories": per_category,
+        "latency": {
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "mean": float(latencies.mean())
+        },
+        "time_to_first_token": {
+            "p50": float(np.percentile(ttfts, 50)),
+            "p95": float(np.percentile(ttfts, 95))
+        } if ttfts else None,
+        "throughput": {
+            "requests_per_second": len(test_results) / wall_clock_time if wall_clock_time else None,
+            "tokens_per_second": tokens / wall_clock_time if wall_clock_time and tokens else None,
+            "mean_generation_tokens_per_second": float(np.mean(rates)) if rates else None
+        }
+    }
+
+def paired_comparison(results_a: Dict[str, Any], results_b: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare two models on the test cases and repeats both ran"""
+    scores_a = {(t["test_id"], t.get("repeat", 0)): t["score"] for t in results_a["test_results"]}
+    scores_b = {(t["test_id"], t.get("repeat", 0)): t["score"] for t in results_b["test_results"]}
+    pairs = sorted(set(scores_a) & set(scores_b))
+    differences = [scores_a[key] - scores_b[key] for key in pairs]
+    
+    low, high = bootstrap_ci(differences)
+    p_value = paired_permutation_test(differences)
+    mean_difference = float(np.mean(differences)) if differences else None
+    significant = p_value is not None and p_value < 0.05
+    fingerprints = {(r.get("benchmark") or {}).get("fingerprint") for r in (results_a, results_b)}
+    
+    return {
+        "model_a": results_a["model_name"],
+        "model_b": results_b["model_name"],
+        "pairs": len(pairs),
+        "mean_score_difference": mean_difference,
+        "ci_low": low,
+        "ci_high": high,
+        "p_value": p_value,
+        "significant": significant,
+        "better_model": (results_a["model_name"] if mean_difference > 0 else results_b["model_name"])
+                        if significant and mean_difference else None,
+        # Runs of different suite versions are not directly comparable
+        "same_suite": len(fingerprints) == 1 and None not in fingerprints
+    }
+
 class BFSIModelValidator:
     """Validator for BFSI trained models"""
     
-    def __init__(self, db_path: str = "bfsi_policies.db"):
+    def __init__(self, db_path: str = "bfsi_policies.db",
+                 ollama_url: str = OLLAMA_BASE_URL,
+                 concurrency: int = VALIDATION_CONCURRENCY,
+                 benchmark_suite: Optional[BenchmarkSuite] = None,
+                 embedding_model: Optional[str] = VALIDATION_EMBEDDING_MODEL,
+                 evaluator: Optional[ResponseEvaluator] = None):
         self.db_path = db_path
         self.results_dir = Path("validation_results")
         self.results_dir.mkdir(exist_ok=True)
+        self.ollama_url = ollama_url
+        self.concurrency = max(1, concurrency)
+        self.embedding_model = embedding_model
+        self.evaluator = evaluator or ResponseEvaluator(embed_fn=self._embed if embedding_model else None)
+        self.pool = get_connection_pool(db_path)
+        self.ensure_database()
         
         # Test cases for validation
-        self.test_cases = self._load_test_cases()
+        self.benchmark_suite = benchmark_suite or BenchmarkSuite("bfsi_core", "1.1.0", self._load_test_cases())
+        self.test_cases = self.benchmark_suite.test_cases
         
         logger.info("BFSI Model Validator initialized")
     
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the local Ollama embedding model"""
+        client = OllamaHTTPClient(self.ollama_url)
+        try:
+            return client.embed(self.embedding_model, texts)
+        finally:
+            client.close()
+    
+    def ensure_database(self):
+        """Ensure database tables exist for benchmark history"""
+        with self.pool.transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS benchmark_runs (
+                    run_id TEXT PRIMARY KEY,
+                    model_name TEXT NOT NULL,
+                    model_type TEXT NOT NULL,
+                    suite_name TEXT NOT NULL,
+                    suite_version TEXT NOT NULL,
+                    suite_fingerprint TEXT NOT NULL,
+                    seed INTEGER,
+                    repeats INTEGER NOT NULL,
+                    average_score REAL NOT NULL,
+                    latency_p50 REAL,
+                    latency_p95 REAL,
+                    statistics TEXT NOT NULL,
+                    created_date TEXT NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS benchmark_results (
+                    run_id TEXT NOT NULL,
+                    test_id TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    repeat INTEGER NOT NULL,
+                    score REAL NOT NULL,
+                    response_time REAL NOT NULL,
+                    time_to_first_token REAL,
+                    tokens_generated INTEGER,
+                    tokens_per_second REAL,
+                    FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id)
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_benchmark_runs_model ON benchmark_runs (model_name, suite_name, created_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_benchmark_results_run ON benchmark_results (run_id)")
+    
     def _load_test_cases(self) -> List[Dict[str, Any]]:
         """Load test cases for model validation"""
         return [
@@ -39,7 +378,8 @@ class BFSIModelValidator:
                 "prompt": "Analyze this BFSI compliance policy and identify key requirements:",
                 "context": "Our organization needs to implement a comprehensive data protection policy under GDPR framework for financial services.",
                 "expected_keywords": ["GDPR", "data protection", "compliance", "financial services", "privacy"],
-                "difficulty": "medium"
+                "difficulty": "medium",
+                "reference_answer": "The policy must establish a lawful basis for processing customer data under GDPR, limit collection to what is necessary, protect personal data with security controls, honour data subject rights, report breaches to the regulator within 72 hours and appoint a data protection officer for the financial services business."
             },
             {
                 "id": "risk_assessment",
@@ -47,7 +387,8 @@ class BFSIModelValidator:
                 "prompt": "What are the main risks associated with this BFSI policy?",
                 "context": "A new operational risk management policy for banking operations.",
                 "expected_keywords": ["operational risk", "banking", "mitigation", "controls", "assessment"],
-                "difficulty": "high"
+                "difficulty": "high",
+                "reference_answer": "Key risks are operational failures in banking processes, people and systems, weak internal controls, fraud, third-party and technology outages. Each should be assessed for likelihood and impact, mitigated with controls, monitored with key risk indicators and reported to senior management."
             },
             {
                 "id": "compliance_guidance",
@@ -55,7 +396,8 @@ class BFSIModelValidator:
                 "prompt": "How should this policy ensure SOX compliance?",
                 "context": "Internal controls policy for financial reporting.",
                 "expected_keywords": ["SOX", "internal controls", "financial reporting", "audit", "compliance"],
-                "difficulty": "high"
+                "difficulty": "high",
+                "reference_answer": "To meet SOX the policy should define internal controls over financial reporting, document and test key controls, segregate duties, restrict access to financial systems, have management certify the controls and support independent audit of their effectiveness."
             },
             {
                 "id": "implementation_advice",
@@ -63,7 +405,8 @@ class BFSIModelValidator:
                 "prompt": "Provide implementation guidance for this BFSI policy:",
                 "context": "Anti-money laundering (AML) policy for financial institutions.",
                 "expected_keywords": ["AML", "implementation", "training", "monitoring", "procedures"],
-                "difficulty": "medium"
+                "difficulty": "medium",
+                "reference_answer": "Implement the AML policy by appointing a compliance officer, running customer due diligence, monitoring transactions for suspicious activity, filing suspicious activity reports, training staff regularly, keeping records and documenting procedures that are reviewed through independent testing."
             },
             {
                 "id": "regulatory_framework",
@@ -71,65 +414,101 @@ class BFSIModelValidator:
                 "prompt": "Which regulatory frameworks apply to this policy?",
                 "context": "Customer due diligence policy for banks.",
                 "expected_keywords": ["regulatory", "framework", "due diligence", "banks", "compliance"],
-                "difficulty": "medium"
+                "difficulty": "medium",
+                "reference_answer": "Customer due diligence for banks falls under the Bank Secrecy Act, FATF recommendations, national AML and KYC regulations and the Basel Committee guidance, which require identifying customers and beneficial owners, risk-rating them and applying enhanced due diligence to high-risk relationships."
             }
         ]
     
-    def test_ollama_model(self, model_name: str) -> Dict[str, Any]:
-        """Test Ollama model with validation cases"""
+    def run_benchmark(self, model_name: str, repeats: int = 3, seed: int = 42,
+                      suite: Optional[BenchmarkSuite] = None, concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Run a benchmark suite repeatedly with fixed seeds so runs can be compared statistically"""
+        return self.test_ollama_model(model_name, concurrency=concurrency, repeats=repeats, seed=seed, suite=suite)
+    
+    def test_ollama_model(self, model_name: str, concurrency: Optional[int] = None,
+                          repeats: int = 1, seed: Optional[int] = None,
+                          suite: Optional[BenchmarkSuite] = None) -> Dict[str, Any]:
+        """Test Ollama model with validation cases, running them concurrently over HTTP"""
         logger.info(f"Testing Ollama model: {model_name}")
         
+        suite = suite or self.benchmark_suite
+        concurrency = max(1, concurrency or self.concurrency)
+        client = OllamaHTTPClient(self.ollama_url)
         try:
             # Check if model exists
-            result = subprocess.run(['ollama', 'list'], capture_output=True, text=True)
-            if model_name not in result.stdout:
+            available = client.list_models()
+            if not any(name == model_name or name.split(":")[0] == model_name for name in available):
                 return {"error": f"Model {model_name} not found", "status": "failed"}
             
-            test_results = []
-            total_score = 0
-            
-            for test_case in self.test_cases:
-                logger.info(f"Running test: {test_case['id']}")
+            def run_test(job: Tuple[int, int, Dict[str, Any]]) -> Dict[str, Any]:
+                repeat, _, test_case = job
+                logger.info(f"Running test: {test_case['id']} (repeat {repeat})")
                 
                 # Prepare test prompt
                 full_prompt = f"{test_case['prompt']}\n\nContext: {test_case['context']}"
+                options = {"temperature": suite.temperature}
+                if seed is not None:
+                    options["seed"] = seed + repeat
                 
                 # Run test
-                start_time = time.time()
-                result = self._run_ollama_test(model_name, full_prompt)
-                response_time = time.time() - start_time
-                
-                # Evaluate response
-                score = self._evaluate_response(result, test_case)
+                generation = self._run_ollama_test(client, model_name, full_prompt, options)
+                result = f"Error: {generation.error}" if generation.error else generation.text
                 
-                test_result = {
+                # Scored together with every other response once all tests finish
+                return {
                     "test_id": test_case['id'],
                     "category": test_case['category'],
                     "difficulty": test_case['difficulty'],
+                    "repeat": repeat,
+                    "seed": options.get("seed"),
                     "prompt": full_prompt,
                     "response": result,
-                    "score": score,
-                    "response_time": response_time,
-                    "keywords_found": self._find_keywords(result, test_case['expected_keywords']),
+                    "score": None,
+                    "response_time": generation.response_time,
+                    "time_to_first_token": generation.time_to_first_token,
+                    "tokens_generated": generation.tokens_generated,
+                    "tokens_per_second": generation.tokens_per_second,
+                    "keywords_found": None,
+                    "semantic_similarity": None,
                     "timestamp": datetime.now().isoformat()
                 }
-                
-                test_results.append(test_result)
-                total_score += score
-                
-                logger.info(f"Test {test_case['id']} completed - Score: {score}/10")
+            
+            # Each repeat runs the suite in its own seeded order to avoid order effects
+            jobs = []
+            for repeat in range(repeats):
+                order = list(enumerate(suite.test_cases))
+                if seed is not None:
+                    random.Random(seed + repeat).shuffle(order)
+                jobs.extend((repeat, index, test_case) for index, test_case in order)
+            
+            wall_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bfsi-validation") as executor:
+                test_results = list(executor.map(run_test, jobs))
+            wall_clock_time = time.perf_counter() - wall_start
+            
+            # Evaluate responses
+            self._score_test_results(test_results, [job[2] for job in jobs])
+            test_results = [result for _, result in sorted(zip(((j[0], j[1]) for j in jobs), test_results))]
             
             # Calculate overall metrics
-            avg_score = total_score / len(self.test_cases)
+            total_score = sum(t['score'] for t in test_results)
+            avg_score = total_score / len(test_results)
             avg_response_time = sum(t['response_time'] for t in test_results) / len(test_results)
+            ttfts = [t['time_to_first_token'] for t in test_results if t['time_to_first_token'] is not None]
+            rates = [t['tokens_per_second'] for t in test_results if t['tokens_per_second'] is not None]
             
             validation_result = {
                 "model_name": model_name,
                 "model_type": "ollama",
-                "total_tests": len(self.test_cases),
+                "total_tests": len(test_results),
                 "total_score": total_score,
                 "average_score": avg_score,
                 "average_response_time": avg_response_time,
+                "average_time_to_first_token": sum(ttfts) / len(ttfts) if ttfts else None,
+                "average_tokens_per_second": sum(rates) / len(rates) if rates else None,
+                "concurrency": concurrency,
+                "wall_clock_time": wall_clock_time,
+                "benchmark": dict(suite.describe(), repeats=repeats, seed=seed),
+                "statistics": summarize_runs(test_results, wall_clock_time),
                 "test_results": test_results,
                 "overall_rating": self._get_rating(avg_score),
                 "validation_timestamp": datetime.now().isoformat()
@@ -137,6 +516,7 @@ class BFSIModelValidator:
             
             # Save results
             self._save_validation_results(validation_result)
+            self._store_benchmark_run(validation_result)
             
             logger.info(f"Ollama model validation completed - Average Score: {avg_score:.2f}/10")
             return validation_result
@@ -144,22 +524,16 @@ class BFSIModelValidator:
         except Exception as e:
             logger.error(f"Error testing Ollama model: {e}")
             return {"error": str(e), "status": "failed"}
+        finally:
+            client.close()
     
-    def _run_ollama_test(self, model_name: str, prompt: str) -> str:
+    def _run_ollama_test(self, client: OllamaHTTPClient, model_name: str, prompt: str,
+                         options: Optional[Dict[str, Any]] = None) -> GenerationResult:
         """Run a test with Ollama model"""
-        try:
-            cmd = ['ollama', 'run', model_name, prompt]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                return f"Error: {result.stderr}"
-        
-        except subprocess.TimeoutExpired:
-            return "Error: Test timed out"
-        except Exception as e:
-            return f"Error: {str(e)}"
+        generation = client.generate(model_name, prompt, options)
+        if generation.error:
+            logger.warning(f"Ollama generation failed: {generation.error}")
+        return generation
     
     def test_huggingface_model(self, model_path: str) -> Dict[str, Any]:
         """Test Hugging Face model with validation cases"""
@@ -190,7 +564,6 @@ class BFSIModelValidator:
                 return {"error": error_msg, "status": "failed"}
             
             test_results = []
-            total_score = 0
             
             for test_case in self.test_cases:
                 logger.info(f"Running test: {test_case['id']}")
@@ -207,25 +580,25 @@ class BFSIModelValidator:
                 # Extract response
                 response = result[0]["generated_text"][len(full_prompt):].strip()
                 
-                # Evaluate response
-                score = self._evaluate_response(response, test_case)
-                
                 test_result = {
                     "test_id": test_case['id'],
                     "category": test_case['category'],
                     "difficulty": test_case['difficulty'],
+                    "repeat": 0,
                     "prompt": full_prompt,
                     "response": response,
-                    "score": score,
+                    "score": None,
                     "response_time": response_time,
-                    "keywords_found": self._find_keywords(response, test_case['expected_keywords']),
+                    "keywords_found": None,
+                    "semantic_similarity": None,
                     "timestamp": datetime.now().isoformat()
                 }
                 
                 test_results.append(test_result)
-                total_score += score
-                
-                logger.info(f"Test {test_case['id']} completed - Score: {score}/10")
+            
+            # Evaluate responses
+            self._score_test_results(test_results, self.test_cases)
+            total_score = sum(t['score'] for t in test_results)
             
             # Calculate overall metrics
             avg_score = total_score / len(self.test_cases)
@@ -238,6 +611,8 @@ class BFSIModelValidator:
                 "total_score": total_score,
                 "average_score": avg_score,
                 "average_response_time": avg_response_time,
+                "benchmark": dict(self.benchmark_suite.describe(), repeats=1, seed=None),
+                "statistics": summarize_runs(test_results),
                 "test_results": test_results,
                 "overall_rating": self._get_rating(avg_score),
                 "validation_timestamp": datetime.now().isoformat()
@@ -245,6 +620,7 @@ class BFSIModelValidator:
             
             # Save results
             self._save_validation_results(validation_result)
+            self._store_benchmark_run(validation_result)
             
             logger.info(f"Hugging Face model validation completed - Average Score: {avg_score:.2f}/10")
             return validation_result
@@ -253,48 +629,24 @@ class BFSIModelValidator:
             logger.error(f"Error testing Hugging Face model: {e}")
             return {"error": str(e), "status": "failed"}
     
+    def _score_test_results(self, test_results: List[Dict[str, Any]], test_cases: List[Dict[str, Any]]):
+        """Score all responses in one batch, filling score, keywords and similarity in place"""
+        evaluations = self.evaluator.evaluate_batch(
+            [(result["response"], test_case) for result, test_case in zip(test_results, test_cases)]
+        )
+        for result, evaluation in zip(test_results, evaluations):
+            result["score"] = evaluation.score
+            result["keywords_found"] = evaluation.keywords_found
+            result["semantic_similarity"] = evaluation.semantic_similarity
+            logger.info(f"Test {result['test_id']} completed - Score: {evaluation.score:.2f}/10")
+    
     def _evaluate_response(self, response: str, test_case: Dict[str, Any]) -> float:
         """Evaluate model response quality"""
-        if not response or response.startswith("Error:"):
-            return 0.0
-        
-        score = 0.0
-        
-        # Check for expected keywords (4 points)
-        keywords_found = self._find_keywords(response, test_case['expected_keywords'])
-        keyword_score = (len(keywords_found) / len(test_case['expected_keywords'])) * 4
-        score += keyword_score
-        
-        # Check response length (2 points)
-        if len(response) > 100:
-            score += 2
-        elif len(response) > 50:
-            score += 1
-        
-        # Check for BFSI-specific terms (2 points)
-        bfsi_terms = ["policy", "compliance", "risk", "regulation", "financial", "banking", "security"]
-        bfsi_found = self._find_keywords(response, bfsi_terms)
-        bfsi_score = (len(bfsi_found) / len(bfsi_terms)) * 2
-        score += bfsi_score
-        
-        # Check for structured response (2 points)
-        if any(indicator in response.lower() for indicator in ["1.", "2.", "•", "-", "key", "important"]):
-            score += 2
-        elif any(indicator in response.lower() for indicator in ["first", "second", "next", "then"]):
-            score += 1
-        
-        return min(score, 10.0)  # Cap at 10
+        return self.evaluator.evaluate(response, test_case).score
     
     def _find_keywords(self, text: str, keywords: List[str]) -> List[str]:
         """Find keywords in text (case-insensitive)"""
-        text_lower = text.lower()
-        found = []
-        
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                found.append(keyword)
-        
-        return found
+        return keyword_matcher(tuple(keywords)).find(text)
     
     def _get_rating(self, score: float) -> str:
         """Get rating based on score"""
@@ -309,10 +661,10 @@ class BFSIModelValidator:
         else:
             return "Very Poor"
     
-    def _save_validation_results(self, results: Dict[str, Any]):
+    def _save_validation_results(self, results: Dict[str, Any], prefix: str = "validation"):
         """Save validation results to file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"validation_{results['model_name'].replace('/', '_')}_{timestamp}.json"
+        filename = f"{prefix}_{results['model_name'].replace('/', '_')}_{timestamp}.json"
         filepath = self.results_dir / filename
         
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -321,7 +673,7 @@ class BFSIModelValidator:
         logger.info(f"Validation results saved: {filepath}")
     
     def compare_models(self, model_results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Compare multiple model validation results"""
+        """Compare multiple model validation results, with paired significance tests between each pair"""
         if len(model_results) < 2:
             return {"error": "Need at least 2 models to compare"}
         
@@ -330,6 +682,7 @@ class BFSIModelValidator:
             "models_compared": len(model_results),
             "models": [],
             "rankings": {},
+            "paired_comparisons": [],
             "summary": {}
         }
         
@@ -340,10 +693,16 @@ class BFSIModelValidator:
                 "type": result["model_type"],
                 "average_score": result["average_score"],
                 "average_response_time": result["average_response_time"],
-                "overall_rating": result["overall_rating"]
+                "overall_rating": result["overall_rating"],
+                "benchmark": result.get("benchmark"),
+                "statistics": result.get("statistics") or summarize_runs(result.get("test_results", []))
             }
             comparison["models"].append(model_info)
         
+        for result_a, result_b in combinations(model_results, 2):
+            if result_a.get("test_results") and result_b.get("test_results"):
+                comparison["paired_comparisons"].append(paired_comparison(result_a, result_b))
+        
         # Sort by average score
         sorted_models = sorted(comparison["models"], key=lambda x: x["average_score"], reverse=True)
         
@@ -375,10 +734,148 @@ class BFSIModelValidator:
         }
         
         # Save comparison
-        self._save_validation_results(comparison)
+        comparison["model_name"] = "_vs_".join(model["name"] for model in comparison["models"])
+        self._save_validation_results(comparison, prefix="comparison")
         
         return comparison
     
+    def _store_benchmark_run(self, result: Dict[str, Any]) -> str:
+        """Store a validation run and its per-test results for tracking over time"""
+        run_id = str(uuid.uuid4())
+        benchmark = result.get("benchmark") or dict(self.benchmark_suite.describe(), repeats=1, seed=None)
+        statistics = result.get("statistics") or {}
+        latency = statistics.get("latency") or {}
+        
+        with self.pool.transaction() as conn:
+            conn.execute('''
+                INSERT INTO benchmark_runs
+                (run_id, model_name, model_type, suite_name, suite_version, suite_fingerprint, seed, repeats,
+                 average_score, latency_p50, latency_p95, statistics, created_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                run_id,
+                result["model_name"],
+                result["model_type"],
+                benchmark["suite"],
+                benchmark["version"],
+                benchmark["fingerprint"],
+                benchmark.get("seed"),
+                benchmark.get("repeats", 1),
+                result["average_score"],
+                latency.get("p50"),
+                latency.get("p95"),
+                json.dumps(statistics),
+                result["validation_timestamp"]
+            ))
+            conn.executemany('''
+                INSERT INTO benchmark_results
+                (run_id, test_id, category, repeat, score, response_time, time_to_first_token,
+                 tokens_generated, tokens_per_second)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    run_id,
+                    t["test_id"],
+                    t["category"],
+                    t.get("repeat", 0),
+                    t["score"],
+                    t["response_time"],
+                    t.get("time_to_first_token"),
+                    t.get("tokens_generated"),
+                    t.get("tokens_per_second")
+                )
+                for t in result["test_results"]
+            ])
+        
+        result["run_id"] = run_id
+        logger.info(f"Stored benchmark run {run_id} for {result['model_name']}")
+        return run_id
+    
+    def get_benchmark_history(self, model_name: Optional[str] = None, suite_name: Optional[str] = None,
+                              limit: int = 50) -> List[Dict[str, Any]]:
+        """Get stored benchmark runs, newest first"""
+        conditions, params = [], []
+        if model_name is not None:
+            conditions.append("model_name = ?")
+            params.append(model_name)
+        if suite_name is not None:
+            conditions.append("suite_name = ?")
+            params.append(suite_name)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with self.pool.read_connection() as conn:
+            rows = conn.execute(f'''
+                SELECT run_id, model_name, model_type, suite_name, suite_version, suite_fingerprint,
+                       seed, repeats, average_score, latency_p50, latency_p95, statistics, created_date
+                FROM benchmark_runs
+                {where}
+                ORDER BY created_date DESC
+                LIMIT ?
+            ''', params + [limit]).fetchall()
+        
+        return [
+            {
+                "run_id": row[0],
+                "model_name": row[1],
+                "model_type": row[2],
+                "suite": row[3],
+                "version": row[4],
+                "fingerprint": row[5],
+                "seed": row[6],
+                "repeats": row[7],
+                "average_score": row[8],
+                "latency_p50": row[9],
+                "latency_p95": row[10],
+                "statistics": json.loads(row[11]),
+                "validation_timestamp": row[12]
+            }
+            for row in rows
+        ]
+    
+    def load_benchmark_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a stored run in the shape compare_models() accepts"""
+        with self.pool.read_connection() as conn:
+            run = conn.execute('''
+                SELECT model_name, model_type, suite_name, suite_version, suite_fingerprint, seed, repeats,
+                       average_score, statistics, created_date
+                FROM benchmark_runs WHERE run_id = ?
+            ''', (run_id,)).fetchone()
+            if not run:
+                return None
+            rows = conn.execute('''
+                SELECT test_id, category, repeat, score, response_time, time_to_first_token,
+                       tokens_generated, tokens_per_second
+                FROM benchmark_results WHERE run_id = ?
+                ORDER BY repeat, rowid
+            ''', (run_id,)).fetchall()
+        
+        test_results = [
+            {
+                "test_id": row[0],
+                "category": row[1],
+                "repeat": row[2],
+                "score": row[3],
+                "response_time": row[4],
+                "time_to_first_token": row[5],
+                "tokens_generated": row[6],
+                "tokens_per_second": row[7]
+            }
+            for row in rows
+        ]
+        statistics = json.loads(run[8])
+        return {
+            "run_id": run_id,
+            "model_name": run[0],
+            "model_type": run[1],
+            "average_score": run[7],
+            "average_response_time": statistics.get("latency", {}).get("mean", 0.0),
+            "overall_rating": self._get_rating(run[7]),
+            "benchmark": {"suite": run[2], "version": run[3], "fingerprint": run[4], "seed": run[5], "repeats": run[6]},
+            "statistics": statistics,
+            "test_results": test_results,
+            "validation_timestamp": run[9]
+        }
+    
     def get_validation_history(self) -> List[Dict[str, Any]]:
         """Get validation history"""
         history = []
@@ -415,7 +912,7 @@ def main():
     try:
         # Test Ollama model if available
         print("\n🤖 Testing Ollama models...")
-        ollama_result = validator.test_ollama_model("bfsi-policy-assistant")
+        ollama_result = validator.run_benchmark("bfsi-policy-assistant", repeats=3, seed=42)
         
         if "error" not in ollama_result:
             print(f"✅ Ollama model validation completed")
@@ -453,6 +950,9 @@ def main():
             print(f"Best overall model: {comparison['summary']['best_overall_model']}")
             print(f"Best score: {comparison['summary']['best_score']:.2f}/10")
             print(f"Fastest model: {comparison['rankings']['by_speed'][0]['model']}")
+            for paired in comparison["paired_comparisons"]:
+                verdict = f"{paired['better_model']} better" if paired["significant"] else "no significant difference"
+                print(f"  {paired['model_a']} vs {paired['model_b']}: {verdict} (p={paired['p_value']:.3f})")
         
         # Show validation history
         print("\n📈 Validation History:")
@@ -4,14 +4,21 @@ BFSI Ollama Model Trainer
 Specialized training system for Ollama models on BFSI policies
 """
 
+import os
+import sys
 import json
-import sqlite3
 import subprocess
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +28,7 @@ class BFSIOllamaTrainer:
     
     def __init__(self, db_path: str = "bfsi_policies.db"):
         self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
         self.models_dir = Path("ollama_models")
         self.datasets_dir = Path("ollama_datasets")
         self.models_dir.mkdir(exist_ok=True)
@@ -89,7 +97,7 @@ PARAMETER stop "Assistant:"
         """Create training dataset for Ollama fine-tuning"""
         logger.info("Creating Ollama training dataset...")
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.pool.read_connection() as conn:
             cursor = conn.cursor()
             
             # Query policies
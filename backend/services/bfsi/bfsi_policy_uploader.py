@@ -270,7 +270,7 @@ class BFSIPolicyManager:
     def policy_exists_by_hash(self, file_hash: str) -> bool:
         """Check if policy exists by hash with connection pooling"""
         try:
-            with get_db_connection(self.db_path, max_connections=5, timeout=30) as conn:
+            with get_db_connection(self.db_path, max_connections=5, timeout=30, readonly=True) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("SELECT 1 FROM policies WHERE file_hash = ?", (file_hash,))
@@ -284,7 +284,7 @@ class BFSIPolicyManager:
     def get_policy_id_by_hash(self, file_hash: str) -> str:
         """Get policy ID by hash with connection pooling"""
         try:
-            with get_db_connection(self.db_path, max_connections=5, timeout=30) as conn:
+            with get_db_connection(self.db_path, max_connections=5, timeout=30, readonly=True) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("SELECT policy_id FROM policies WHERE file_hash = ?", (file_hash,))
@@ -297,34 +297,33 @@ class BFSIPolicyManager:
     
     def get_all_policies(self) -> List[BFSIPolicy]:
         """Get all policies"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with get_db_connection(self.db_path, max_connections=5, timeout=30, readonly=True) as conn:
+            cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT policy_id, title, policy_type, content, framework, version, 
-                   upload_date, file_path, file_hash, status, metadata
-            FROM policies
-            ORDER BY upload_date DESC
-        """)
+            cursor.execute("""
+                SELECT policy_id, title, policy_type, content, framework, version, 
+                       upload_date, file_path, file_hash, status, metadata
+                FROM policies
+                ORDER BY upload_date DESC
+            """)
         
-        policies = []
-        for row in cursor.fetchall():
-            policy = BFSIPolicy(
-                policy_id=row[0],
-                title=row[1],
-                policy_type=row[2],
-                content=row[3],
-                framework=row[4],
-                version=row[5],
-                upload_date=datetime.fromisoformat(row[6]),
-                file_path=row[7],
-                file_hash=row[8],
-                status=row[9],
-                metadata=self._safe_json_loads(row[10]) if row[10] else {}
-            )
-            policies.append(policy)
+            policies = []
+            for row in cursor.fetchall():
+                policy = BFSIPolicy(
+                    policy_id=row[0],
+                    title=row[1],
+                    policy_type=row[2],
+                    content=row[3],
+                    framework=row[4],
+                    version=row[5],
+                    upload_date=datetime.fromisoformat(row[6]),
+                    file_path=row[7],
+                    file_hash=row[8],
+                    status=row[9],
+                    metadata=self._safe_json_loads(row[10]) if row[10] else {}
+                )
+                policies.append(policy)
         
-        conn.close()
         return policies
     
     def delete_policy(self, policy_id: str) -> bool:
@@ -406,57 +405,55 @@ class BFSIPolicyManager:
     
     def save_training_dataset(self, dataset: TrainingDataset):
         """Save training dataset to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with get_db_connection(self.db_path, max_connections=5, timeout=30) as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO training_datasets (dataset_id, name, description, policies, 
-                                         created_date, total_tokens, total_policies, 
-                                         framework_coverage, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            dataset.dataset_id,
-            dataset.name,
-            dataset.description,
-            json.dumps(dataset.policies),
-            dataset.created_date.isoformat(),
-            dataset.total_tokens,
-            dataset.total_policies,
-            json.dumps(dataset.framework_coverage),
-            dataset.status
-        ))
+            cursor.execute('''
+                INSERT INTO training_datasets (dataset_id, name, description, policies, 
+                                             created_date, total_tokens, total_policies, 
+                                             framework_coverage, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                dataset.dataset_id,
+                dataset.name,
+                dataset.description,
+                json.dumps(dataset.policies),
+                dataset.created_date.isoformat(),
+                dataset.total_tokens,
+                dataset.total_policies,
+                json.dumps(dataset.framework_coverage),
+                dataset.status
+            ))
         
-        conn.commit()
-        conn.close()
+            conn.commit()
     
     def create_training_chunks(self, dataset: TrainingDataset, policies: List[BFSIPolicy]):
         """Create training chunks from policies"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with get_db_connection(self.db_path, max_connections=5, timeout=30) as conn:
+            cursor = conn.cursor()
         
-        for policy in policies:
-            # Split content into chunks (e.g., 512 tokens per chunk)
-            chunks = self.split_into_chunks(policy.content, max_tokens=512)
+            for policy in policies:
+                # Split content into chunks (e.g., 512 tokens per chunk)
+                chunks = self.split_into_chunks(policy.content, max_tokens=512)
             
-            for i, chunk_content in enumerate(chunks):
-                chunk_id = f"chunk_{dataset.dataset_id}_{policy.policy_id}_{i}"
-                tokens = len(chunk_content.split())
+                for i, chunk_content in enumerate(chunks):
+                    chunk_id = f"chunk_{dataset.dataset_id}_{policy.policy_id}_{i}"
+                    tokens = len(chunk_content.split())
                 
-                cursor.execute('''
-                    INSERT INTO training_chunks (chunk_id, dataset_id, policy_id, 
-                                               chunk_index, content, tokens)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    chunk_id,
-                    dataset.dataset_id,
-                    policy.policy_id,
-                    i,
-                    chunk_content,
-                    tokens
-                ))
+                    cursor.execute('''
+                        INSERT INTO training_chunks (chunk_id, dataset_id, policy_id, 
+                                                   chunk_index, content, tokens)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (
+                        chunk_id,
+                        dataset.dataset_id,
+                        policy.policy_id,
+                        i,
+                        chunk_content,
+                        tokens
+                    ))
         
-        conn.commit()
-        conn.close()
+            conn.commit()
         logger.info(f"Created training chunks for dataset: {dataset.dataset_id}")
     
     def split_into_chunks(self, content: str, max_tokens: int = 512) -> List[str]:
@@ -472,27 +469,26 @@ class BFSIPolicyManager:
     
     def get_training_chunks(self, dataset_id: str) -> List[Dict[str, Any]]:
         """Get training chunks for a dataset"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with get_db_connection(self.db_path, max_connections=5, timeout=30, readonly=True) as conn:
+            cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT chunk_id, policy_id, chunk_index, content, tokens
-            FROM training_chunks
-            WHERE dataset_id = ?
-            ORDER BY policy_id, chunk_index
-        """, (dataset_id,))
+            cursor.execute("""
+                SELECT chunk_id, policy_id, chunk_index, content, tokens
+                FROM training_chunks
+                WHERE dataset_id = ?
+                ORDER BY policy_id, chunk_index
+            """, (dataset_id,))
         
-        chunks = []
-        for row in cursor.fetchall():
-            chunks.append({
-                "chunk_id": row[0],
-                "policy_id": row[1],
-                "chunk_index": row[2],
-                "content": row[3],
-                "tokens": row[4]
-            })
+            chunks = []
+            for row in cursor.fetchall():
+                chunks.append({
+                    "chunk_id": row[0],
+                    "policy_id": row[1],
+                    "chunk_index": row[2],
+                    "content": row[3],
+                    "tokens": row[4]
+                })
         
-        conn.close()
         return chunks
     
     def export_training_data(self, dataset_id: str, format: str = "json") -> str:
@@ -537,27 +533,25 @@ class BFSIPolicyManager:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get policy and training statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Policy statistics
-        cursor.execute("SELECT COUNT(*) FROM policies")
-        total_policies = cursor.fetchone()[0]
+        with get_db_connection(self.db_path, max_connections=5, timeout=30, readonly=True) as conn:
+            cursor = conn.cursor()
         
-        cursor.execute("SELECT policy_type, COUNT(*) FROM policies GROUP BY policy_type")
-        policies_by_type = dict(cursor.fetchall())
+            # Policy statistics
+            cursor.execute("SELECT COUNT(*) FROM policies")
+            total_policies = cursor.fetchone()[0]
         
-        cursor.execute("SELECT framework, COUNT(*) FROM policies GROUP BY framework")
-        policies_by_framework = dict(cursor.fetchall())
+            cursor.execute("SELECT policy_type, COUNT(*) FROM policies GROUP BY policy_type")
+            policies_by_type = dict(cursor.fetchall())
         
-        # Training dataset statistics
-        cursor.execute("SELECT COUNT(*) FROM training_datasets")
-        total_datasets = cursor.fetchone()[0]
+            cursor.execute("SELECT framework, COUNT(*) FROM policies GROUP BY framework")
+            policies_by_framework = dict(cursor.fetchall())
         
-        cursor.execute("SELECT COUNT(*) FROM training_chunks")
-        total_chunks = cursor.fetchone()[0]
+            # Training dataset statistics
+            cursor.execute("SELECT COUNT(*) FROM training_datasets")
+            total_datasets = cursor.fetchone()[0]
         
-        conn.close()
+            cursor.execute("SELECT COUNT(*) FROM training_chunks")
+            total_chunks = cursor.fetchone()[0]
         
         return {
             "total_policies": total_policies,
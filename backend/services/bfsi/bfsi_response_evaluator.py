@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+BFSI Response Evaluator
+Scores model validation responses by keyword coverage, structure and semantic similarity
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BFSI_TERMS = ("policy", "compliance", "risk", "regulation", "financial", "banking", "security")
+STRUCTURE_MARKERS = ("1.", "2.", "•", "-", "key", "important")
+SEQUENCE_MARKERS = ("first", "second", "next", "then")
+
+# Cosine similarity at or below this earns no semantic credit; 1.0 earns full credit
+SEMANTIC_SIMILARITY_FLOOR = 0.3
+
+EmbedFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+class KeywordMatcher:
+    """
+    Case-insensitive substring matcher for a fixed keyword list.
+
+    All keywords are compiled into one alternation scanned once per text. At
+    each position the longest keyword wins, so shorter keywords contained in a
+    match are credited through a precomputed containment map.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(dict.fromkeys(keywords))
+        lowered = {keyword: keyword.lower() for keyword in self.keywords}
+        self._by_lower: Dict[str, List[str]] = {}
+        for keyword, lower in lowered.items():
+            self._by_lower.setdefault(lower, []).append(keyword)
+        self._contained: Dict[str, List[str]] = {
+            outer: [inner for inner in self._by_lower if inner in outer]
+            for outer in self._by_lower
+        }
+        alternation = "|".join(re.escape(lower) for lower in sorted(self._by_lower, key=len, reverse=True))
+        # The lookahead reports a match at every position, including overlapping ones
+        self._pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE) if alternation else None
+
+    def find(self, text: str) -> List[str]:
+        """Keywords present in the text, in keyword-list order"""
+        if not self._pattern or not text:
+            return []
+        matched = set()
+        for hit in self._pattern.findall(text):
+            lower = hit.lower()
+            if lower not in matched:
+                matched.update(self._contained[lower])
+        return [keyword for keyword in self.keywords if keyword.lower() in matched]
+
+@lru_cache(maxsize=256)
+def keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Shared compiled matcher for a keyword tuple"""
+    return KeywordMatcher(keywords)
+
+@dataclass
+class EvaluationResult:
+    score: float
+    keywords_found: List[str] = field(default_factory=list)
+    keyword_score: float = 0.0
+    length_score: float = 0.0
+    bfsi_score: float = 0.0
+    structure_score: float = 0.0
+    semantic_similarity: Optional[float] = None
+
+class ResponseEvaluator:
+    """
+    Batched scorer for validation responses on a 0-10 scale.
+
+    Keyword coverage (4 points), length (2), BFSI vocabulary (2) and
+    structure (2) match the original rubric. When an embedding function is
+    configured and a test case has a reference_answer, the keyword component
+    is the better of keyword coverage and semantic similarity to the
+    reference, so correct paraphrases are not scored as misses.
+    """
+
+    def __init__(self, embed_fn: Optional[EmbedFunction] = None,
+                 similarity_floor: float = SEMANTIC_SIMILARITY_FLOOR):
+        self.embed_fn = embed_fn
+        self.similarity_floor = similarity_floor
+
+    def evaluate(self, response: str, test_case: Dict[str, Any]) -> EvaluationResult:
+        return self.evaluate_batch([(response, test_case)])[0]
+
+    def evaluate_batch(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[EvaluationResult]:
+        """Score every (response, test case) pair, embedding all texts in one call"""
+        similarities = self._similarities(items)
+        return [
+            self._score(response, test_case, similarity)
+            for (response, test_case), similarity in zip(items, similarities)
+        ]
+
+    def _similarities(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Optional[float]]:
+        similarities: List[Optional[float]] = [None] * len(items)
+        if self.embed_fn is None:
+            return similarities
+
+        pairs = [
+            (index, response, test_case["reference_answer"])
+            for index, (response, test_case) in enumerate(items)
+            if test_case.get("reference_answer") and _usable(response)
+        ]
+        if not pairs:
+            return similarities
+
+        texts = list(dict.fromkeys(text for _, response, reference in pairs for text in (response, reference)))
+        try:
+            vectors = np.asarray(self.embed_fn(texts), dtype=float)
+        except Exception as e:
+            logger.warning(f"Embedding failed, scoring without semantic similarity: {e}")
+            return similarities
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        position = {text: i for i, text in enumerate(texts)}
+        for index, response, reference in pairs:
+            similarities[index] = float(vectors[position[response]] @ vectors[position[reference]])
+        return similarities
+
+    def _score(self, response: str, test_case: Dict[str, Any], similarity: Optional[float]) -> EvaluationResult:
+        if not _usable(response):
+            return EvaluationResult(score=0.0)
+
+        expected = test_case.get("expected_keywords", [])
+        keywords_found = keyword_matcher(tuple(expected)).find(response)
+        coverage = len(keywords_found) / len(expected) if expected else 0.0
+        if similarity is not None:
+            semantic = (similarity - self.similarity_floor) / (1.0 - self.similarity_floor)
+            coverage = max(coverage, min(max(semantic, 0.0), 1.0))
+        keyword_score = coverage * 4
+
+        if len(response) > 100:
+            length_score = 2.0
+        elif len(response) > 50:
+            length_score = 1.0
+        else:
+            length_score = 0.0
+
+        bfsi_score = len(keyword_matcher(BFSI_TERMS).find(response)) / len(BFSI_TERMS) * 2
+
+        lowered = response.lower()
+        if any(marker in lowered for marker in STRUCTURE_MARKERS):
+            structure_score = 2.0
+        elif any(marker in lowered for marker in SEQUENCE_MARKERS):
+            structure_score = 1.0
+        else:
+            structure_score = 0.0
+
+        return EvaluationResult(
+            score=min(keyword_score + length_score + bfsi_score + structure_score, 10.0),
+            keywords_found=keywords_found,
+            keyword_score=keyword_score,
+            length_score=length_score,
+            bfsi_score=bfsi_score,
+            structure_score=structure_score,
+            semantic_similarity=similarity
+        )
+
+def _usable(response: str) -> bool:
+    return bool(response) and not response.startswith("Error:")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+BFSI Stub Model Server
+Minimal Ollama-compatible HTTP server for running model validation offline
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+def default_responder(model_name: str, prompt: str) -> str:
+    """Canned compliance answer that restates the prompt's context"""
+    context = prompt.split("Context:", 1)[-1].strip()
+    return (
+        f"Key considerations for this policy: {context}\n"
+        "1. Map each requirement to the applicable regulation and compliance framework.\n"
+        "2. Assess the financial and operational risk, then define controls and monitoring.\n"
+        "3. Document procedures, train staff and schedule periodic audit of the banking policy."
+    )
+
+def hashed_embedding(text: str, dimensions: int = 256) -> List[float]:
+    """Deterministic bag-of-words embedding, so texts sharing words are similar"""
+    vector = [0.0] * dimensions
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        vector[zlib.crc32(word.encode("utf-8")) % dimensions] += 1.0
+    return vector
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+    server: "ThreadingHTTPServer"
+
+    def setup(self):
+        super().setup()
+        self.server.stub._connection_opened()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        stub = self.server.stub
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": name} for name in stub.models]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/embed":
+            texts = request.get("input", [])
+            texts = [texts] if isinstance(texts, str) else texts
+            with stub._lock:
+                stub.embed_requests += 1
+            self._send_json(200, {"model": request.get("model", ""),
+                                  "embeddings": [hashed_embedding(text) for text in texts]})
+            return
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        model_name = request.get("model", "")
+        if model_name not in stub.models and f"{model_name}:latest" not in stub.models:
+            self._send_json(404, {"error": f"model '{model_name}' not found"})
+            return
+
+        with stub._track_request(request.get("options")):
+            tokens = re.findall(r"\S+\s*", stub.responder(model_name, request.get("prompt", "")))
+            start = time.perf_counter()
+            time.sleep(stub.first_token_delay)
+
+            if not request.get("stream", True):
+                time.sleep(stub.token_delay * len(tokens))
+                self._send_json(200, stub._final_chunk(model_name, "".join(tokens), len(tokens), start))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                self._write_chunk({"model": model_name, "response": token, "done": False})
+                time.sleep(stub.token_delay)
+            self._write_chunk(stub._final_chunk(model_name, "", len(tokens), start))
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+class StubModelServer:
+    """
+    Ollama-compatible stub serving /api/tags, /api/generate and /api/embed.
+
+    Responses stream word by word with configurable first-token and per-token
+    delays. Connection and in-flight request counts are recorded so tests can
+    check keep-alive reuse and concurrency.
+    """
+
+    def __init__(self,
+                 models: Sequence[str] = ("bfsi-policy-assistant:latest",),
+                 responder: Callable[[str, str], str] = default_responder,
+                 first_token_delay: float = 0.0,
+                 token_delay: float = 0.0,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        self.models = list(models)
+        self.responder = responder
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.connections_opened = 0
+        self.requests_served = 0
+        self.embed_requests = 0
+        self.max_in_flight = 0
+        self.options_seen: List[Optional[Dict[str, Any]]] = []
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _connection_opened(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    @contextlib.contextmanager
+    def _track_request(self, options: Optional[Dict[str, Any]]):
+        with self._lock:
+            self.options_seen.append(options)
+            self._in_flight += 1
+            self.requests_served += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _final_chunk(self, model_name: str, text: str, tokens: int, start: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start
+        eval_seconds = max(elapsed - self.first_token_delay, 1e-9)
+        return {
+            "model": model_name,
+            "response": text,
+            "done": True,
+            "eval_count": tokens,
+            "eval_duration": int(eval_seconds * 1e9),
+            "total_duration": int(elapsed * 1e9)
+        }
+
+    def start(self) -> "StubModelServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-model-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Stub model server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StubModelServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    """Serve the stub until interrupted"""
+    parser = argparse.ArgumentParser(description="Ollama-compatible stub model server")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", action="append", dest="models")
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = StubModelServer(
+        models=args.models or ["bfsi-policy-assistant:latest"],
+        token_delay=args.token_delay,
+        port=args.port
+    )
+    server.start()
+    print(f"Stub model server running at {server.url} (set OLLAMA_BASE_URL to use it)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
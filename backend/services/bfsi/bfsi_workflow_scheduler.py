@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+BFSI Workflow Deadline Scheduler
+Fires approaching-deadline, overdue and escalation events for mitigation workflows
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+
+from bfsi_mitigation_workflow import BFSIMitigationWorkflowSystem
+
+logger = logging.getLogger(__name__)
+
+# Notification stages stored in workflow_deadlines.notified_stage; escalation level N is stage 2 + N
+STAGE_APPROACHING = 1
+STAGE_OVERDUE = 2
+
+# How long before the deadline an approaching-deadline event fires, per priority
+DEFAULT_APPROACHING_WINDOWS = {
+    "critical": timedelta(days=7),
+    "high": timedelta(days=5),
+    "medium": timedelta(days=3),
+    "low": timedelta(days=1)
+}
+
+@dataclass(frozen=True)
+class EscalationRule:
+    """Escalate a workflow once it has been overdue for `after`"""
+    level: int
+    after: timedelta
+    escalate_to: Optional[str] = None
+    priorities: Optional[Tuple[str, ...]] = None
+
+    def applies_to(self, priority: str) -> bool:
+        return self.priorities is None or priority in self.priorities
+
+DEFAULT_ESCALATION_RULES = (
+    EscalationRule(level=1, after=timedelta(days=1), escalate_to="compliance_manager"),
+    EscalationRule(level=2, after=timedelta(days=7), escalate_to="chief_risk_officer", priorities=("critical", "high"))
+)
+
+@dataclass
+class DeadlineEvent:
+    workflow_id: str
+    event_type: str
+    assigned_owner: str
+    priority: str
+    deadline: datetime
+    fired_at: datetime
+    escalation_level: int = 0
+    escalate_to: Optional[str] = None
+
+class WorkflowDeadlineScheduler:
+    """
+    Heap-based deadline scheduler for mitigation workflows.
+
+    Each live workflow has at most one heap entry: its next unfired stage.
+    Changes reported by the workflow system bump the workflow's generation so
+    older heap entries are skipped when popped. Fired stages are persisted, so
+    a restarted scheduler does not repeat notifications.
+    """
+
+    def __init__(self,
+                 workflow_system: BFSIMitigationWorkflowSystem,
+                 approaching_windows: Optional[Dict[str, timedelta]] = None,
+                 escalation_rules: Iterable[EscalationRule] = DEFAULT_ESCALATION_RULES,
+                 max_sleep_seconds: float = 60.0):
+        self.workflow_system = workflow_system
+        self.approaching_windows = dict(DEFAULT_APPROACHING_WINDOWS, **(approaching_windows or {}))
+        self.escalation_rules = sorted(escalation_rules, key=lambda rule: rule.level)
+        self.max_sleep_seconds = max_sleep_seconds
+        self.handlers: List[Callable[[DeadlineEvent], None]] = []
+
+        self._heap: List[Tuple[datetime, int, str, int, int]] = []
+        self._sequence = itertools.count()
+        self._deadlines: Dict[str, Dict[str, Any]] = {}
+        self._generations: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        workflow_system.deadline_listeners.append(self.refresh)
+        self.load()
+
+    def add_handler(self, handler: Callable[[DeadlineEvent], None]):
+        """Register a callback for fired deadline events"""
+        self.handlers.append(handler)
+
+    def load(self):
+        """Schedule every live deadline from the database"""
+        deadlines = self.workflow_system.get_active_deadlines()
+        with self._condition:
+            self._heap.clear()
+            self._deadlines.clear()
+            for deadline in deadlines:
+                self._schedule(deadline)
+            self._condition.notify()
+
+    def refresh(self, workflow_ids: List[str]):
+        """Reschedule workflows whose deadline, status or priority may have changed"""
+        deadlines = {d["workflow_id"]: d for d in self.workflow_system.get_active_deadlines(workflow_ids)}
+        with self._condition:
+            for workflow_id in workflow_ids:
+                deadline = deadlines.get(workflow_id)
+                if deadline is None:
+                    # Closed workflows keep no live heap entry
+                    self._deadlines.pop(workflow_id, None)
+                    self._generations[workflow_id] = self._generations.get(workflow_id, 0) + 1
+                else:
+                    self._schedule(deadline)
+            self._condition.notify()
+
+    def _stages(self, deadline: Dict[str, Any]) -> List[Tuple[datetime, int, Optional[EscalationRule]]]:
+        """Fire times of every notification stage for a deadline, in stage order"""
+        due = deadline["deadline"]
+        window = self.approaching_windows.get(deadline["priority"], timedelta(0))
+        stages = [(due - window, STAGE_APPROACHING, None), (due, STAGE_OVERDUE, None)]
+        stages.extend(
+            (due + rule.after, STAGE_OVERDUE + rule.level, rule)
+            for rule in self.escalation_rules
+            if rule.applies_to(deadline["priority"])
+        )
+        return stages
+
+    def _schedule(self, deadline: Dict[str, Any]):
+        """Push the next unfired stage of a deadline; caller holds the lock"""
+        workflow_id = deadline["workflow_id"]
+        generation = self._generations.get(workflow_id, 0) + 1
+        self._generations[workflow_id] = generation
+        self._deadlines[workflow_id] = deadline
+
+        for fire_at, stage, _ in self._stages(deadline):
+            if stage > deadline["notified_stage"]:
+                heapq.heappush(self._heap, (fire_at, next(self._sequence), workflow_id, stage, generation))
+                return
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """Time of the earliest pending event, skipping stale entries"""
+        with self._condition:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self):
+        while self._heap and self._heap[0][4] != self._generations.get(self._heap[0][2]):
+            heapq.heappop(self._heap)
+
+    def run_due(self, now: Optional[datetime] = None) -> List[DeadlineEvent]:
+        """Fire every event due at `now` and return them"""
+        now = now or datetime.now()
+        events: List[DeadlineEvent] = []
+
+        with self._condition:
+            while True:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, workflow_id, stage, _ = heapq.heappop(self._heap)
+                deadline = self._deadlines[workflow_id]
+                stages = self._stages(deadline)
+
+                # An approaching warning is moot once the deadline has passed
+                if not (stage == STAGE_APPROACHING and now >= deadline["deadline"]):
+                    events.append(self._build_event(deadline, stage, stages, now))
+                deadline["notified_stage"] = stage
+                self._schedule(deadline)
+
+        if not events:
+            return events
+
+        self.workflow_system.record_deadline_notifications(
+            [(event.workflow_id, self._deadlines[event.workflow_id]["notified_stage"])
+             for event in events if event.workflow_id in self._deadlines],
+            [event.workflow_id for event in events if event.event_type == "overdue"]
+        )
+        for event in events:
+            for handler in self.handlers:
+                try:
+                    handler(event)
+                except Exception as e:
+                    logger.error(f"Deadline handler failed for workflow {event.workflow_id}: {e}")
+
+        logger.info(f"Fired {len(events)} workflow deadline events")
+        return events
+
+    def _build_event(self, deadline: Dict[str, Any], stage: int,
+                     stages: List[Tuple[datetime, int, Optional[EscalationRule]]], now: datetime) -> DeadlineEvent:
+        rule = next((rule for _, s, rule in stages if s == stage), None)
+        if stage == STAGE_APPROACHING:
+            event_type = "approaching_deadline"
+        elif stage == STAGE_OVERDUE:
+            event_type = "overdue"
+        else:
+            event_type = "escalation"
+
+        return DeadlineEvent(
+            workflow_id=deadline["workflow_id"],
+            event_type=event_type,
+            assigned_owner=deadline["assigned_owner"],
+            priority=deadline["priority"],
+            deadline=deadline["deadline"],
+            fired_at=now,
+            escalation_level=rule.level if rule else 0,
+            escalate_to=rule.escalate_to if rule else None
+        )
+
+    def start(self):
+        """Fire events from a background thread as they fall due"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="workflow-deadline-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                next_fire = self.next_fire_time()
+                timeout = self.max_sleep_seconds
+                if next_fire is not None:
+                    timeout = min(timeout, max(0.0, (next_fire - datetime.now()).total_seconds()))
+                if timeout > 0:
+                    # Woken early when a refresh schedules an earlier event or on stop
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"Deadline scheduler run failed: {e}")
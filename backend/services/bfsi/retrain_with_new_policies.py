@@ -15,6 +15,12 @@ from pathlib import Path
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,6 +30,7 @@ class BFSIModelRetrainer:
     
     def __init__(self):
         self.db_path = "bfsi_policies.db"
+        self.pool = get_connection_pool(self.db_path)
         self.models_dir = Path("../../training/models/trained_models")
         self.datasets_dir = Path("../../data/training_datasets/training_datasets")
         self.models_dir.mkdir(parents=True, exist_ok=True)
@@ -73,15 +80,12 @@ class BFSIModelRetrainer:
         logger.info("Creating simple training dataset...")
         
         try:
-            import sqlite3
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get all policies
-            cursor.execute("SELECT title, content, policy_type, framework FROM policies")
-            policies = cursor.fetchall()
-            conn.close()
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Get all policies
+                cursor.execute("SELECT title, content, policy_type, framework FROM policies")
+                policies = cursor.fetchall()
             
             if not policies:
                 logger.error("No policies found in database")
@@ -5,6 +5,7 @@ Upload your BFSI policies directly for model training
 """
 
 import os
+import sys
 import sqlite3
 import json
 import logging
@@ -19,6 +20,12 @@ except ImportError:
     PDF_AVAILABLE = False
     print("⚠️ PyPDF2 not available. Install with: pip install PyPDF2")
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,58 +35,54 @@ class SimplePolicyUploader:
     
     def __init__(self):
         self.db_path = "bfsi_policies.db"
+        self.pool = get_connection_pool(self.db_path)
         self.ensure_database()
     
     def ensure_database(self):
         """Ensure the database exists and is properly initialized"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create policies table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS policies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                policy_type TEXT NOT NULL,
-                framework TEXT NOT NULL,
-                source_file TEXT,
-                file_type TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
         
-        # Add new columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE policies ADD COLUMN source_file TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+            # Create policies table if it doesn't exist
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS policies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    policy_type TEXT NOT NULL,
+                    framework TEXT NOT NULL,
+                    source_file TEXT,
+                    file_type TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
         
-        try:
-            cursor.execute('ALTER TABLE policies ADD COLUMN file_type TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+            # Add new columns if they don't exist (for existing databases)
+            try:
+                cursor.execute('ALTER TABLE policies ADD COLUMN source_file TEXT')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
         
-        conn.commit()
-        conn.close()
+            try:
+                cursor.execute('ALTER TABLE policies ADD COLUMN file_type TEXT')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
         logger.info("Database initialized successfully")
     
     def upload_policy_text(self, title, content, policy_type, framework, source_file=None, file_type=None):
         """Upload policy from text"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
             
-            # Insert policy
-            cursor.execute('''
-                INSERT INTO policies (title, content, policy_type, framework, source_file, file_type)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (title, content, policy_type, framework, source_file, file_type))
+                # Insert policy
+                cursor.execute('''
+                    INSERT INTO policies (title, content, policy_type, framework, source_file, file_type)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (title, content, policy_type, framework, source_file, file_type))
             
-            policy_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+                policy_id = cursor.lastrowid
             
             logger.info(f"Policy uploaded successfully: {title} (ID: {policy_id})")
             return {"success": True, "policy_id": policy_id}
@@ -228,18 +231,17 @@ class SimplePolicyUploader:
         print("-" * 30)
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT id, title, policy_type, framework, created_at
-                FROM policies
-                ORDER BY created_at DESC
-                LIMIT 20
-            ''')
+                cursor.execute('''
+                    SELECT id, title, policy_type, framework, created_at
+                    FROM policies
+                    ORDER BY created_at DESC
+                    LIMIT 20
+                ''')
             
-            policies = cursor.fetchall()
-            conn.close()
+                policies = cursor.fetchall()
             
             if not policies:
                 print("📭 No policies found.")
@@ -265,13 +267,12 @@ class SimplePolicyUploader:
         print("-" * 30)
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
             
-            # Get all policies
-            cursor.execute("SELECT title, content, policy_type, framework FROM policies")
-            policies = cursor.fetchall()
-            conn.close()
+                # Get all policies
+                cursor.execute("SELECT title, content, policy_type, framework FROM policies")
+                policies = cursor.fetchall()
             
             if not policies:
                 print("📭 No policies found to create training data.")
@@ -352,22 +353,20 @@ class SimplePolicyUploader:
     def get_policy_statistics(self):
         """Get policy statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total policies
-            cursor.execute("SELECT COUNT(*) FROM policies")
-            total_policies = cursor.fetchone()[0]
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
             
-            # By type
-            cursor.execute("SELECT policy_type, COUNT(*) FROM policies GROUP BY policy_type")
-            by_type = dict(cursor.fetchall())
+                # Total policies
+                cursor.execute("SELECT COUNT(*) FROM policies")
+                total_policies = cursor.fetchone()[0]
             
-            # By framework
-            cursor.execute("SELECT framework, COUNT(*) FROM policies GROUP BY framework")
-            by_framework = dict(cursor.fetchall())
+                # By type
+                cursor.execute("SELECT policy_type, COUNT(*) FROM policies GROUP BY policy_type")
+                by_type = dict(cursor.fetchall())
             
-            conn.close()
+                # By framework
+                cursor.execute("SELECT framework, COUNT(*) FROM policies GROUP BY framework")
+                by_framework = dict(cursor.fetchall())
             
             return {
                 "total_policies": total_policies,
@@ -7,11 +7,18 @@ Retrain models with uploaded policies using existing training system
 import os
 import sys
 import json
-import sqlite3
 import logging
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
+DB_PATH = "bfsi_policies.db"
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,16 +26,14 @@ logger = logging.getLogger(__name__)
 def check_policies_database():
     """Check if there are policies in the database"""
     try:
-        conn = sqlite3.connect("bfsi_policies.db")
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM policies")
-        count = cursor.fetchone()[0]
+        with get_connection_pool(DB_PATH).read_connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute("SELECT title, policy_type, framework FROM policies LIMIT 5")
-        sample_policies = cursor.fetchall()
+            cursor.execute("SELECT COUNT(*) FROM policies")
+            count = cursor.fetchone()[0]
         
-        conn.close()
+            cursor.execute("SELECT title, policy_type, framework FROM policies LIMIT 5")
+            sample_policies = cursor.fetchall()
         
         return count, sample_policies
     except Exception as e:
@@ -38,13 +43,12 @@ def check_policies_database():
 def create_training_dataset():
     """Create training dataset from policies"""
     try:
-        conn = sqlite3.connect("bfsi_policies.db")
-        cursor = conn.cursor()
+        with get_connection_pool(DB_PATH).read_connection() as conn:
+            cursor = conn.cursor()
         
-        # Get all policies
-        cursor.execute("SELECT title, content, policy_type, framework FROM policies")
-        policies = cursor.fetchall()
-        conn.close()
+            # Get all policies
+            cursor.execute("SELECT title, content, policy_type, framework FROM policies")
+            policies = cursor.fetchall()
         
         if not policies:
             logger.error("No policies found in database")
@@ -7,7 +7,6 @@ Upload your BFSI policies directly for model training
 import os
 import sys
 import json
-import sqlite3
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +16,12 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from bfsi_policy_uploader import policy_manager, upload_policy_text, create_training_dataset
 
+try:
+    from database_connection_manager import get_connection_pool
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+    from database_connection_manager import get_connection_pool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,28 +31,26 @@ class SimplePolicyUploader:
     
     def __init__(self):
         self.db_path = "bfsi_policies.db"
+        self.pool = get_connection_pool(self.db_path)
         self.ensure_database()
     
     def ensure_database(self):
         """Ensure the database exists and is properly initialized"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create policies table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS policies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                policy_type TEXT NOT NULL,
-                framework TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
         
-        conn.commit()
-        conn.close()
+            # Create policies table if it doesn't exist
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS policies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    policy_type TEXT NOT NULL,
+                    framework TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
         logger.info("Database initialized successfully")
     
     def upload_policy_interactive(self):
@@ -184,18 +187,17 @@ class SimplePolicyUploader:
         print("-" * 30)
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT id, title, policy_type, framework, created_at
-                FROM policies
-                ORDER BY created_at DESC
-                LIMIT 20
-            ''')
+                cursor.execute('''
+                    SELECT id, title, policy_type, framework, created_at
+                    FROM policies
+                    ORDER BY created_at DESC
+                    LIMIT 20
+                ''')
             
-            policies = cursor.fetchall()
-            conn.close()
+                policies = cursor.fetchall()
             
             if not policies:
                 print("📭 No policies found.")
@@ -255,22 +257,20 @@ class SimplePolicyUploader:
     def get_policy_statistics(self):
         """Get policy statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total policies
-            cursor.execute("SELECT COUNT(*) FROM policies")
-            total_policies = cursor.fetchone()[0]
+            with self.pool.read_connection() as conn:
+                cursor = conn.cursor()
             
-            # By type
-            cursor.execute("SELECT policy_type, COUNT(*) FROM policies GROUP BY policy_type")
-            by_type = dict(cursor.fetchall())
+                # Total policies
+                cursor.execute("SELECT COUNT(*) FROM policies")
+                total_policies = cursor.fetchone()[0]
             
-            # By framework
-            cursor.execute("SELECT framework, COUNT(*) FROM policies GROUP BY framework")
-            by_framework = dict(cursor.fetchall())
+                # By type
+                cursor.execute("SELECT policy_type, COUNT(*) FROM policies GROUP BY policy_type")
+                by_type = dict(cursor.fetchall())
             
-            conn.close()
+                # By framework
+                cursor.execute("SELECT framework, COUNT(*) FROM policies GROUP BY framework")
+                by_framework = dict(cursor.fetchall())
             
             return {
                 "total_policies": total_policies,
@@ -3,12 +3,15 @@ Authentication API Endpoints
 Handles user authentication, authorization, and session management
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Optional
 
 from ....core.application.services.auth_service import AuthService, AuthenticationError, AuthorizationError
 from ....core.application.services.audit_service import AuditService
+from ....core.application.services.audit_export import EXPORT_MEDIA_TYPES
 from ....core.infrastructure.dependency_injection import get_auth_service, get_audit_service
 from ....core.domain.entities.user import User
 from ....core.domain.entities.audit_log import AuditAction, AuditResource, AuditSeverity
@@ -404,6 +407,77 @@ class AuthController:
             "limit": filter_request.limit
         }
     
+    async def export_audit_logs(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        format: str,
+        after_id: Optional[str],
+        filters: Dict[str, Any],
+        current_user: User
+    ) -> StreamingResponse:
+        """
+        Stream an audit log export as a chunked HTTP response
+        
+        Args:
+            start_date: Start of the exported range
+            end_date: End of the exported range
+            format: Export format (csv, jsonl, parquet)
+            after_id: Resume after the last audit log ID received
+            filters: Optional action/resource/severity/user filters
+            current_user: Authenticated user
+            
+        Returns:
+            Streaming export response
+        """
+        if not current_user.has_permission("can_view_audit_logs"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied: cannot view audit logs"
+            )
+        
+        if format not in EXPORT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported export format: {format}"
+            )
+        
+        if start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date must be before end_date"
+            )
+        
+        export_info = await self.audit_service.export_audit_logs(
+            organization_id=current_user.organization_id,
+            start_date=start_date,
+            end_date=end_date,
+            format=format,
+            filters=filters,
+            after_id=after_id
+        )
+        
+        # A sync iterator is drained on a worker thread, keeping the event loop free
+        body = self.audit_service.stream_audit_logs_export(
+            organization_id=current_user.organization_id,
+            start_date=start_date,
+            end_date=end_date,
+            format=format,
+            filters=filters,
+            after_id=after_id
+        )
+        
+        filename = f"audit_logs_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{format}"
+        return StreamingResponse(
+            body,
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "X-Export-Id": export_info["export_id"],
+                "X-Record-Count": str(export_info["record_count"])
+            }
+        )
+    
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP address"""
         forwarded_for = request.headers.get("X-Forwarded-For")
@@ -528,3 +602,26 @@ async def get_audit_logs(
     """Get audit logs endpoint"""
     return await controller.get_audit_logs(filter_request, current_user)
 
+
+@router.get("/audit-logs/export")
+async def export_audit_logs(
+    start_date: datetime = Query(..., description="Export from date"),
+    end_date: datetime = Query(..., description="Export to date"),
+    format: str = Query("csv", description="Export format: csv, jsonl or parquet"),
+    after_id: Optional[str] = Query(None, description="Resume after this audit log ID"),
+    action: Optional[str] = Query(None, description="Filter by action"),
+    resource: Optional[str] = Query(None, description="Filter by resource"),
+    severity: Optional[str] = Query(None, description="Filter by severity"),
+    user_id: Optional[str] = Query(None, description="Filter by user ID"),
+    controller: AuthController = Depends(get_auth_controller),
+    current_user: User = Depends(require_auth)
+):
+    """Stream audit logs export endpoint"""
+    filters = {
+        key: value for key, value in
+        {"action": action, "resource": resource, "severity": severity, "user_id": user_id}.items()
+        if value is not None
+    }
+    return await controller.export_audit_logs(
+        start_date, end_date, format, after_id, filters, current_user
+    )
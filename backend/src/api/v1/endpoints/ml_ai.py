@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from functools import lru_cache
 import logging
 
 from ...core.application.services.ml_enhanced_ai_service import (
@@ -33,14 +34,16 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/ml-ai", tags=["ML-Enhanced AI"])
 
-# Global service instance
-ml_ai_service = MLEnhancedAIService()
+@lru_cache()
+def get_ml_ai_service() -> MLEnhancedAIService:
+    """Shared service instance, created on first use rather than at import"""
+    return MLEnhancedAIService()
 
 @router.get("/models", response_model=List[ModelResponse])
 async def get_ml_models():
     """Get all ML models"""
     try:
-        models = ml_ai_service.get_models()
+        models = get_ml_ai_service().get_models()
         return models
     except Exception as e:
         logger.error(f"Error getting ML models: {e}")
@@ -50,7 +53,7 @@ async def get_ml_models():
 async def get_ml_model(model_id: str):
     """Get specific ML model"""
     try:
-        models = ml_ai_service.get_models()
+        models = get_ml_ai_service().get_models()
         model = next((m for m in models if m["model_id"] == model_id), None)
         
         if not model:
@@ -67,7 +70,7 @@ async def get_ml_model(model_id: str):
 async def train_model(request: TrainingJobRequest):
     """Train a new ML model"""
     try:
-        model_id = await ml_ai_service.train_model(
+        model_id = await get_ml_ai_service().train_model(
             model_name=request.model_name,
             model_type=MLModelType(request.model_type),
             training_data=request.training_data,
@@ -92,7 +95,7 @@ async def train_model(request: TrainingJobRequest):
 async def make_prediction(model_id: str, request: PredictionRequest):
     """Make a prediction using an ML model"""
     try:
-        prediction = await ml_ai_service.predict(model_id, request.input_data)
+        prediction = await get_ml_ai_service().predict(model_id, request.input_data)
         
         return PredictionResponse(
             prediction_id=prediction.prediction_id,
@@ -117,7 +120,7 @@ async def make_prediction(model_id: str, request: PredictionRequest):
 async def batch_predict(model_id: str, batch_data: List[Dict[str, Any]]):
     """Make batch predictions"""
     try:
-        predictions = await ml_ai_service.batch_predict(model_id, batch_data)
+        predictions = await get_ml_ai_service().batch_predict(model_id, batch_data)
         return [asdict(prediction) for prediction in predictions]
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -129,7 +132,7 @@ async def batch_predict(model_id: str, batch_data: List[Dict[str, Any]]):
 async def get_model_performance(model_id: str):
     """Get model performance metrics"""
     try:
-        performance = ml_ai_service.get_model_performance(model_id)
+        performance = get_ml_ai_service().get_model_performance(model_id)
         return performance
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -141,7 +144,7 @@ async def get_model_performance(model_id: str):
 async def get_feature_importance(model_id: str):
     """Get feature importance for a model"""
     try:
-        feature_importance = ml_ai_service.get_feature_importance(model_id)
+        feature_importance = get_ml_ai_service().get_feature_importance(model_id)
         return [asdict(feature) for feature in feature_importance]
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -153,7 +156,7 @@ async def get_feature_importance(model_id: str):
 async def deploy_model(model_id: str):
     """Deploy a model for predictions"""
     try:
-        success = await ml_ai_service.deploy_model(model_id)
+        success = await get_ml_ai_service().deploy_model(model_id)
         if success:
             return {"message": "Model deployed successfully"}
         else:
@@ -168,7 +171,7 @@ async def deploy_model(model_id: str):
 async def retire_model(model_id: str):
     """Retire a model"""
     try:
-        success = await ml_ai_service.retire_model(model_id)
+        success = await get_ml_ai_service().retire_model(model_id)
         if success:
             return {"message": "Model retired successfully"}
         else:
@@ -183,7 +186,7 @@ async def retire_model(model_id: str):
 async def get_predictions(model_id: Optional[str] = None):
     """Get predictions"""
     try:
-        predictions = ml_ai_service.get_predictions(model_id)
+        predictions = get_ml_ai_service().get_predictions(model_id)
         return predictions
     except Exception as e:
         logger.error(f"Error getting predictions: {e}")
@@ -193,7 +196,7 @@ async def get_predictions(model_id: Optional[str] = None):
 async def get_training_jobs():
     """Get training jobs"""
     try:
-        jobs = ml_ai_service.get_training_jobs()
+        jobs = get_ml_ai_service().get_training_jobs()
         return jobs
     except Exception as e:
         logger.error(f"Error getting training jobs: {e}")
@@ -203,7 +206,7 @@ async def get_training_jobs():
 async def get_ml_metrics():
     """Get ML performance metrics"""
     try:
-        metrics = ml_ai_service.get_performance_metrics()
+        metrics = get_ml_ai_service().get_performance_metrics()
         return metrics
     except Exception as e:
         logger.error(f"Error getting ML metrics: {e}")
@@ -213,7 +216,7 @@ async def get_ml_metrics():
 async def health_check():
     """Health check endpoint"""
     try:
-        metrics = ml_ai_service.get_performance_metrics()
+        metrics = get_ml_ai_service().get_performance_metrics()
         return {
             "status": "healthy",
             "service": "ml-enhanced-ai",
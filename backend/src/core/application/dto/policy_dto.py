@@ -130,6 +130,7 @@ class PolicyStatisticsResponse(BaseModel):
     expired_policies: int = Field(..., description="Number of expired policies")
     policies_by_type: Dict[str, int] = Field(..., description="Policy count by type")
     policies_by_status: Dict[str, int] = Field(..., description="Policy count by status")
+    policies_by_framework: Dict[str, int] = Field(default_factory=dict, description="Policy count by compliance framework")
     recent_policies: int = Field(..., description="Policies created in last 30 days")
     expiring_soon: int = Field(..., description="Policies expiring in next 30 days")
 
@@ -0,0 +1,186 @@
+"""
+Audit Log Export Serializers
+Incremental CSV, JSONL and Parquet encoders for streaming audit log exports
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ...domain.entities.audit_log import AuditLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Columns written by every export format, in order
+EXPORT_COLUMNS = [
+    "id", "timestamp", "action", "resource", "resource_id", "user_id", "user_name",
+    "organization_id", "ip_address", "user_agent", "session_id", "description",
+    "severity", "success", "error_message", "source_system", "source_module",
+    "correlation_id", "old_values", "new_values", "metadata",
+]
+
+# Structured columns serialized as JSON text in flat formats
+_JSON_COLUMNS = {"old_values", "new_values", "metadata"}
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def audit_log_to_row(audit_log: AuditLog) -> Dict[str, Any]:
+    """Flatten an audit log into an export row"""
+    return {
+        "id": str(audit_log.id),
+        "timestamp": audit_log.timestamp.isoformat() if audit_log.timestamp else None,
+        "action": audit_log.action.value,
+        "resource": audit_log.resource.value,
+        "resource_id": audit_log.resource_id,
+        "user_id": audit_log.user_id,
+        "user_name": audit_log.user_name,
+        "organization_id": audit_log.organization_id,
+        "ip_address": audit_log.ip_address,
+        "user_agent": audit_log.user_agent,
+        "session_id": audit_log.session_id,
+        "description": audit_log.description,
+        "severity": audit_log.severity.value if audit_log.severity else None,
+        "success": audit_log.success,
+        "error_message": audit_log.error_message,
+        "source_system": audit_log.source_system,
+        "source_module": audit_log.source_module,
+        "correlation_id": audit_log.correlation_id,
+        "old_values": audit_log.old_values,
+        "new_values": audit_log.new_values,
+        "metadata": audit_log.metadata,
+    }
+
+
+def _flatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: json.dumps(value, default=str) if key in _JSON_COLUMNS and value is not None else value
+        for key, value in row.items()
+    }
+
+
+def encode_csv(chunks: Iterable[List[AuditLog]], include_header: bool = True) -> Iterator[bytes]:
+    """Encode chunks of audit logs as CSV, one output block per chunk"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    if include_header:
+        writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(_flatten(audit_log_to_row(audit_log)) for audit_log in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_jsonl(chunks: Iterable[List[AuditLog]]) -> Iterator[bytes]:
+    """Encode chunks of audit logs as JSON lines, one output block per chunk"""
+    for chunk in chunks:
+        lines = [json.dumps(audit_log_to_row(audit_log), default=str) for audit_log in chunk]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _StreamingSink:
+    """Write-only file object that hands written bytes back to the caller"""
+
+    def __init__(self):
+        self._pending: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._pending.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers record absolute offsets, so report the total written so far
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._pending)
+        self._pending = []
+        return data
+
+
+def encode_parquet(chunks: Iterable[List[AuditLog]]) -> Iterator[bytes]:
+    """
+    Encode chunks of audit logs as a Parquet file, one row group per chunk.
+    Bytes are released as soon as each row group is written; the footer follows the last chunk.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow to be installed")
+
+    schema = pa.schema(
+        [(column, pa.bool_() if column == "success" else pa.string()) for column in EXPORT_COLUMNS]
+    )
+    sink = _StreamingSink()
+    writer: Optional["pq.ParquetWriter"] = None
+    try:
+        writer = pq.ParquetWriter(sink, schema, compression="snappy")
+        for chunk in chunks:
+            if not chunk:
+                continue
+            rows = [_flatten(audit_log_to_row(audit_log)) for audit_log in chunk]
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        if writer is not None:
+            writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+_ENCODERS = {
+    "csv": encode_csv,
+    "jsonl": encode_jsonl,
+    "parquet": encode_parquet,
+}
+
+
+def encode_audit_logs(chunks: Iterable[List[AuditLog]], format: str, resume: bool = False) -> Iterator[bytes]:
+    """
+    Encode a stream of audit log chunks in the requested format
+
+    Args:
+        chunks: Iterable of audit log lists, e.g. from a server-side cursor
+        format: Export format (csv, jsonl, parquet)
+        resume: The output continues an earlier, interrupted export. CSV output
+            then omits the header so it can be appended; Parquet output is always
+            a self-contained file part.
+
+    Returns:
+        Iterator of encoded byte blocks
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    encoder = _ENCODERS.get(format)
+    if encoder is None:
+        raise ValueError(f"Unsupported export format: {format}. Use one of: {', '.join(_ENCODERS)}")
+    if format == "csv":
+        return encode_csv(chunks, include_header=not resume)
+    return encoder(chunks)
@@ -3,13 +3,14 @@ Audit Service
 Handles comprehensive audit trail logging for all GRC operations
 """
 
-from typing import List, Optional, Dict, Any
-from uuid import UUID
+from typing import List, Optional, Dict, Any, Iterator
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 
 from ...domain.entities.user import User
 from ...domain.entities.audit_log import AuditLog, AuditAction, AuditResource, AuditSeverity
 from ...domain.repositories.audit_log_repository import AuditLogRepository
+from .audit_export import encode_audit_logs
 
 
 class AuditService:
@@ -553,51 +554,98 @@ class AuditService:
         organization_id: str,
         start_date: datetime,
         end_date: datetime,
-        format: str = "json",
-        filters: Optional[Dict[str, Any]] = None
+        format: str = "csv",
+        filters: Optional[Dict[str, Any]] = None,
+        after_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Export audit logs
+        Prepare an audit log export and record it in the audit trail
+        
+        The records themselves are produced by stream_audit_logs_export, so only
+        the record count is computed here.
         
         Args:
             organization_id: Organization ID
             start_date: Start date
             end_date: End date
-            format: Export format (json, csv, xml)
+            format: Export format (csv, jsonl, parquet)
             filters: Optional filters
+            after_id: Resume after this audit log ID
             
         Returns:
             Export information
         """
-        # Get audit logs for the date range
-        audit_logs = await self.audit_log_repository.get_by_date_range(
-            organization_id=organization_id,
+        record_count = await self.audit_log_repository.count_by_date_range(
             start_date=start_date,
             end_date=end_date,
-            filters=filters
+            organization_id=organization_id,
+            filters=filters,
+            after_id=after_id
         )
+        export_id = str(uuid4())
         
         # Log the export action
         await self.log_system_event(
             action=AuditAction.EXPORT,
-            description=f"Audit logs exported: {len(audit_logs)} records",
+            description=f"Audit logs exported: {record_count} records",
             metadata={
+                "export_id": export_id,
                 "export_format": format,
                 "start_date": start_date.isoformat(),
                 "end_date": end_date.isoformat(),
-                "record_count": len(audit_logs)
+                "record_count": record_count,
+                "resumed_after_id": after_id
             }
         )
         
         return {
-            "export_id": str(UUID()),
+            "export_id": export_id,
             "format": format,
-            "record_count": len(audit_logs),
+            "record_count": record_count,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
             "created_at": datetime.utcnow().isoformat()
         }
     
+    def stream_audit_logs_export(
+        self,
+        organization_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        format: str = "csv",
+        filters: Optional[Dict[str, Any]] = None,
+        after_id: Optional[str] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[bytes]:
+        """
+        Stream an audit log export with a constant memory footprint
+        
+        Records are read through a server-side cursor in timestamp order and encoded
+        chunk by chunk. This is a blocking iterator; web handlers should hand it
+        to a streaming response, which drains it on a worker thread.
+        
+        Args:
+            organization_id: Organization ID
+            start_date: Start date
+            end_date: End date
+            format: Export format (csv, jsonl, parquet)
+            filters: Optional filters
+            after_id: Resume after the last audit log ID received
+            chunk_size: Records fetched and encoded per chunk
+            
+        Returns:
+            Iterator of encoded byte blocks
+        """
+        chunks = self.audit_log_repository.stream_by_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            organization_id=organization_id,
+            filters=filters,
+            after_id=after_id,
+            chunk_size=chunk_size
+        )
+        return encode_audit_logs(chunks, format, resume=after_id is not None)
+    
     async def cleanup_old_audit_logs(
         self,
         organization_id: str,
@@ -615,15 +663,13 @@ class AuditService:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        # Get count of logs to be deleted
-        old_logs = await self.audit_log_repository.get_by_date_range(
-            organization_id=organization_id,
+        # Count logs to be deleted without loading them
+        deleted_count = await self.audit_log_repository.count_by_date_range(
             start_date=datetime.min,
-            end_date=cutoff_date
+            end_date=cutoff_date,
+            organization_id=organization_id
         )
         
-        deleted_count = len(old_logs)
-        
         # Delete old logs
         if deleted_count > 0:
             await self.audit_log_repository.delete_old_logs(
@@ -18,6 +18,16 @@ import joblib
 from pathlib import Path
 import threading
 import time
+import hashlib
+import os
+import re
+import sys
+
+try:
+    from model_registry import ModelRegistry, ModelStage
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'utils'))
+    from model_registry import ModelRegistry, ModelStage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -117,7 +127,7 @@ class MLEnhancedAIService:
     Provides machine learning capabilities for AI agents with advanced analytics
     """
     
-    def __init__(self):
+    def __init__(self, registry: Optional[ModelRegistry] = None):
         self.service_id = "ml-enhanced-ai-service"
         self.version = "2.0.0"
         
@@ -141,8 +151,12 @@ class MLEnhancedAIService:
             "prediction_latency": 0.0
         }
         
+        # Versioned storage shared with the BFSI ML system (location from $MODEL_REGISTRY_DIR)
+        self.registry = registry or ModelRegistry()
+        
         # Initialize default models
         self._initialize_default_models()
+        self._load_registered_models()
         
         logger.info(f"🚀 Initialized {self.service_id} v{self.version}")
     
@@ -225,6 +239,80 @@ class MLEnhancedAIService:
         
         logger.info(f"Initialized {len(self.models)} default ML models")
     
+    def _load_registered_models(self):
+        """Restore models trained by this service from the model registry"""
+        for name in self.registry.list_models():
+            for manifest in self.registry.list_versions(name):
+                tags = manifest["tags"]
+                if tags.get("source") != self.service_id or manifest["stage"] == ModelStage.ARCHIVED.value:
+                    continue
+                metrics = manifest["metrics"]
+                parameters = manifest["parameters"]
+                model = MLModel(
+                    model_id=tags["model_id"],
+                    name=tags.get("display_name", name),
+                    model_type=MLModelType(parameters["model_type"]),
+                    version=f"{manifest['version']}.0.0",
+                    status=ModelStatus.DEPLOYED if manifest["stage"] == ModelStage.PRODUCTION.value else ModelStatus.TRAINED,
+                    accuracy=metrics.get("accuracy", 0.0),
+                    precision=metrics.get("precision", 0.0),
+                    recall=metrics.get("recall", 0.0),
+                    f1_score=metrics.get("f1_score", 0.0),
+                    created_at=datetime.fromisoformat(manifest["created_at"]),
+                    last_trained=datetime.fromisoformat(manifest["created_at"]),
+                    last_prediction=None,
+                    training_data_size=parameters.get("training_data_size", 0),
+                    features=parameters.get("features", []),
+                    hyperparameters=parameters.get("hyperparameters", {}),
+                    performance_metrics={},
+                    model_path=self.registry.manifest_path(name, manifest["version"]),
+                    metadata={
+                        "registry_name": name,
+                        "registry_version": manifest["version"],
+                        "training_data_hash": manifest["training_data_hash"]
+                    }
+                )
+                self.models[model.model_id] = model
+        
+        self.metrics["total_models"] = len(self.models)
+        self.metrics["active_models"] = len([m for m in self.models.values() if m.status == ModelStatus.DEPLOYED])
+    
+    def _register_model(self, model: MLModel, training_data: Dict[str, Any]):
+        """Record a trained model as a new registry version"""
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", model.name).strip("_") or "model"
+        training_data_hash = hashlib.sha256(
+            json.dumps(training_data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        manifest = self.registry.register(
+            name,
+            artifacts={"training_summary": self.registry.put_json({
+                "features": model.features,
+                "hyperparameters": model.hyperparameters,
+                "training_job_id": model.metadata.get("training_job_id")
+            })},
+            metrics={
+                "accuracy": float(model.accuracy),
+                "precision": float(model.precision),
+                "recall": float(model.recall),
+                "f1_score": float(model.f1_score)
+            },
+            parameters={
+                "model_type": model.model_type.value,
+                "features": model.features,
+                "hyperparameters": model.hyperparameters,
+                "training_data_size": model.training_data_size
+            },
+            training_data_hash=training_data_hash,
+            tags={"source": self.service_id, "model_id": model.model_id, "display_name": model.name}
+        )
+        model.version = f"{manifest['version']}.0.0"
+        model.model_path = self.registry.manifest_path(name, manifest["version"])
+        model.metadata.update({
+            "registry_name": name,
+            "registry_version": manifest["version"],
+            "training_data_hash": training_data_hash
+        })
+    
     async def train_model(self, 
                          model_name: str,
                          model_type: MLModelType,
@@ -285,6 +373,7 @@ class MLEnhancedAIService:
             model_path=None,
             metadata={"training_job_id": training_job.job_id}
         )
+        self._register_model(model, training_data)
         
         self.models[model_id] = model
         self.metrics["total_models"] += 1
@@ -521,6 +610,15 @@ class MLEnhancedAIService:
         if model.status != ModelStatus.TRAINED:
             raise ValueError(f"Model {model_id} is not trained")
         
+        registry_name = model.metadata.get("registry_name")
+        if registry_name:
+            self.registry.promote(registry_name, model.metadata["registry_version"], ModelStage.PRODUCTION)
+            # Promotion archives the previous production version of the same model
+            for other in self.models.values():
+                if (other is not model and other.status == ModelStatus.DEPLOYED
+                        and other.metadata.get("registry_name") == registry_name):
+                    other.status = ModelStatus.RETIRED
+        
         model.status = ModelStatus.DEPLOYED
         self.metrics["active_models"] = len([m for m in self.models.values() if m.status == ModelStatus.DEPLOYED])
         
@@ -533,6 +631,8 @@ class MLEnhancedAIService:
             raise ValueError(f"Model {model_id} not found")
         
         model = self.models[model_id]
+        if model.metadata.get("registry_name"):
+            self.registry.promote(model.metadata["registry_name"], model.metadata["registry_version"], ModelStage.ARCHIVED)
         model.status = ModelStatus.RETIRED
         self.metrics["active_models"] = len([m for m in self.models.values() if m.status == ModelStatus.DEPLOYED])
         
@@ -3,7 +3,7 @@ Policy Service
 Handles policy business logic and operations
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime
 
@@ -180,45 +180,39 @@ class PolicyService:
         Returns:
             List of policies
         """
-        if not filters:
-            return await self.policy_repository.get_by_organization(
-                organization_id=organization_id,
-                skip=skip,
-                limit=limit
-            )
-        
-        # Apply filters
-        if "status" in filters:
-            return await self.policy_repository.get_by_status(
-                status=filters["status"],
-                organization_id=organization_id,
-                skip=skip,
-                limit=limit
-            )
-        
-        if "policy_type" in filters:
-            return await self.policy_repository.get_by_type(
-                policy_type=filters["policy_type"],
-                organization_id=organization_id,
-                skip=skip,
-                limit=limit
-            )
-        
-        if "owner_id" in filters:
-            return await self.policy_repository.get_by_owner(
-                owner_id=filters["owner_id"],
-                organization_id=organization_id,
-                skip=skip,
-                limit=limit
-            )
-        
-        # Default to organization filter
-        return await self.policy_repository.get_by_organization(
+        return await self.policy_repository.list_by_filters(
             organization_id=organization_id,
+            filters=filters,
             skip=skip,
             limit=limit
         )
     
+    async def list_policies_page(
+        self,
+        organization_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Policy], Optional[str]]:
+        """
+        List policies with keyset pagination
+        
+        Args:
+            organization_id: Organization ID
+            limit: Maximum number of records
+            cursor: Cursor returned with the previous page
+            filters: Optional filters
+            
+        Returns:
+            Page of policies and the cursor for the next page (None on the last page)
+        """
+        return await self.policy_repository.list_page(
+            organization_id=organization_id,
+            filters=filters,
+            limit=limit,
+            cursor=cursor
+        )
+    
     async def search_policies(
         self,
         query: str,
@@ -240,18 +234,22 @@ class PolicyService:
         Returns:
             List of matching policies
         """
-        policies = await self.policy_repository.search(
+        if filters:
+            # Filters are applied in SQL together with the full-text match
+            return await self.policy_repository.list_by_filters(
+                organization_id=organization_id,
+                filters=filters,
+                skip=skip,
+                limit=limit,
+                search_query=query
+            )
+        
+        return await self.policy_repository.search(
             query=query,
             organization_id=organization_id,
             skip=skip,
             limit=limit
         )
-        
-        # Apply additional filters if provided
-        if filters:
-            policies = self._apply_filters(policies, filters)
-        
-        return policies
     
     async def count_policies(
         self,
@@ -270,42 +268,45 @@ class PolicyService:
         Returns:
             Number of policies
         """
-        if search_query:
-            # For search queries, we need to get the results and count them
-            policies = await self.policy_repository.search(
-                query=search_query,
-                organization_id=organization_id,
-                skip=0,
-                limit=10000  # Large limit to get all results for counting
-            )
-            if filters:
-                policies = self._apply_filters(policies, filters)
-            return len(policies)
-        
-        # For regular queries, we can use more efficient counting
-        if not filters:
-            return await self.policy_repository.get_effective_policies_count(organization_id)
-        
-        # Apply filters and count
-        if "status" in filters:
-            policies = await self.policy_repository.get_by_status(
-                status=filters["status"],
-                organization_id=organization_id,
-                skip=0,
-                limit=10000
-            )
-            return len(policies)
+        return await self.policy_repository.count_by_filters(
+            organization_id=organization_id,
+            filters=filters,
+            search_query=search_query
+        )
+    
+    async def count_policies_by_status(
+        self,
+        organization_id: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, int]:
+        """
+        Count policies grouped by status
         
-        if "policy_type" in filters:
-            policies = await self.policy_repository.get_by_type(
-                policy_type=filters["policy_type"],
-                organization_id=organization_id,
-                skip=0,
-                limit=10000
-            )
-            return len(policies)
+        Args:
+            organization_id: Organization ID
+            filters: Optional filters
+            
+        Returns:
+            Mapping of status to policy count
+        """
+        return await self.policy_repository.count_by_status(organization_id, filters)
+    
+    async def count_policies_by_framework(
+        self,
+        organization_id: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, int]:
+        """
+        Count policies grouped by compliance framework
         
-        return 0
+        Args:
+            organization_id: Organization ID
+            filters: Optional filters
+            
+        Returns:
+            Mapping of framework to policy count
+        """
+        return await self.policy_repository.count_by_framework(organization_id, filters)
     
     async def approve_policy(
         self,
@@ -545,68 +546,52 @@ class PolicyService:
             
         Returns:
             Update results
-        """
-        successful = 0
-        failed = 0
+            
+        Raises:
+            ValueError: If no updatable fields are given
+        """
+        # update_policy never lets callers change these
+        updates = {field: value for field, value in updates.items()
+                   if field not in ['id', 'created_at', 'created_by']}
+        if not updates:
+            raise ValueError("No updates provided")
+        
+        # Load and validate every policy with one query, then apply one set-based UPDATE
+        policies = {
+            str(policy.id): policy
+            for policy in await self.policy_repository.get_by_ids(policy_ids)
+        }
         errors = []
-        
+        valid_ids = []
         for policy_id in policy_ids:
+            policy = policies.get(str(policy_id))
+            if not policy:
+                errors.append({"policy_id": str(policy_id), "error": "Policy not found"})
+                continue
             try:
-                await self.update_policy(policy_id, updates, updated_by)
-                successful += 1
-            except Exception as e:
-                failed += 1
-                errors.append({
-                    "policy_id": str(policy_id),
-                    "error": str(e)
-                })
+                await self._validate_policy_updates(policy, updates)
+            except ValueError as e:
+                errors.append({"policy_id": str(policy_id), "error": str(e)})
+                continue
+            valid_ids.append(policy_id)
+        
+        updated_ids = await self.policy_repository.bulk_update(valid_ids, updates, updated_by=updated_by)
+        
+        # Policies deleted or re-dated between the read and the UPDATE
+        updated = {str(policy_id) for policy_id in updated_ids}
+        errors.extend(
+            {"policy_id": str(policy_id), "error": "Policy changed during the update; retry"}
+            for policy_id in valid_ids
+            if str(policy_id) not in updated
+        )
         
         return {
-            "successful": successful,
-            "failed": failed,
+            "successful": len(updated),
+            "failed": len(errors),
             "errors": errors,
             "total": len(policy_ids)
         }
     
-    def _apply_filters(self, policies: List[Policy], filters: Dict[str, Any]) -> List[Policy]:
-        """
-        Apply additional filters to policy list
-        
-        Args:
-            policies: List of policies
-            filters: Filters to apply
-            
-        Returns:
-            Filtered list of policies
-        """
-        filtered_policies = policies
-        
-        if "status" in filters:
-            filtered_policies = [
-                policy for policy in filtered_policies
-                if policy.status == filters["status"]
-            ]
-        
-        if "policy_type" in filters:
-            filtered_policies = [
-                policy for policy in filtered_policies
-                if policy.policy_type == filters["policy_type"]
-            ]
-        
-        if "owner_id" in filters:
-            filtered_policies = [
-                policy for policy in filtered_policies
-                if policy.owner_id == filters["owner_id"]
-            ]
-        
-        if "tag" in filters:
-            filtered_policies = [
-                policy for policy in filtered_policies
-                if filters["tag"] in policy.tags
-            ]
-        
-        return filtered_policies
-    
     def _validate_policy_data(
         self,
         title: str,
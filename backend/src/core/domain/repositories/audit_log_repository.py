@@ -4,7 +4,7 @@ Abstract repository for Audit Log entity operations
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from uuid import UUID
 from datetime import datetime
 
@@ -59,6 +59,20 @@ class AuditLogRepository(ABC):
         """Get audit logs within date range"""
         pass
     
+    @abstractmethod
+    async def count_by_date_range(self, start_date: datetime, end_date: datetime, organization_id: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, after_id: Optional[UUID] = None) -> int:
+        """Count audit logs within date range, past ``after_id`` in (timestamp, id) order if given"""
+        pass
+    
+    @abstractmethod
+    def stream_by_date_range(self, start_date: datetime, end_date: datetime, organization_id: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, after_id: Optional[UUID] = None, chunk_size: int = 1000) -> Iterator[List[AuditLog]]:
+        """
+        Stream audit logs within date range in (timestamp, id) order, in chunks, resuming after ``after_id``
+        
+        Blocking iterator: async callers drain it on a worker thread (e.g. via StreamingResponse)
+        """
+        pass
+    
     @abstractmethod
     async def get_failed_actions(self, organization_id: str, skip: int = 0, limit: int = 100) -> List[AuditLog]:
         """Get failed audit actions"""
@@ -4,7 +4,7 @@ Abstract repository for Policy entity operations
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime
 
@@ -24,6 +24,11 @@ class PolicyRepository(ABC):
         """Get policy by ID"""
         pass
     
+    @abstractmethod
+    async def get_by_ids(self, policy_ids: List[UUID], organization_id: Optional[str] = None) -> List[Policy]:
+        """Get many policies in one query"""
+        pass
+    
     @abstractmethod
     async def get_by_organization(self, organization_id: str, skip: int = 0, limit: int = 100) -> List[Policy]:
         """Get policies by organization with pagination"""
@@ -114,6 +119,37 @@ class PolicyRepository(ABC):
         """Get count of effective policies"""
         pass
     
+    @abstractmethod
+    async def list_by_filters(self, organization_id: str, filters: Optional[Dict[str, Any]] = None, skip: int = 0, limit: int = 100, search_query: Optional[str] = None) -> List[Policy]:
+        """List policies matching all filters (status, policy_type, owner_id, framework, tag)"""
+        pass
+    
+    @abstractmethod
+    async def list_page(self, organization_id: str, filters: Optional[Dict[str, Any]] = None, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Policy], Optional[str]]:
+        """Keyset-paginated policy listing; returns the page and the cursor for the next one"""
+        pass
+    
+    @abstractmethod
+    async def count_by_filters(self, organization_id: str, filters: Optional[Dict[str, Any]] = None, search_query: Optional[str] = None) -> int:
+        """Count policies matching all filters"""
+        pass
+    
+    @abstractmethod
+    async def count_by_status(self, organization_id: str, filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Count policies grouped by status"""
+        pass
+    
+    @abstractmethod
+    async def count_by_framework(self, organization_id: str, filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Count policies grouped by compliance framework"""
+        pass
+    
+    @abstractmethod
+    async def bulk_update(self, policy_ids: List[UUID], updates: Dict[str, Any],
+                          organization_id: Optional[str] = None, updated_by: Optional[str] = None) -> List[UUID]:
+        """Apply the same updates to many policies in one statement; returns updated IDs"""
+        pass
+    
     @abstractmethod
     async def bulk_update_status(self, policy_ids: List[UUID], status: PolicyStatus, updated_by: str) -> int:
         """Bulk update policy status"""
@@ -15,7 +15,10 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
-from config.settings import settings
+try:
+    from ....config.settings import settings
+except ImportError:
+    from config.settings import settings
 
 # Create the base class for all models
 Base = declarative_base()
@@ -98,6 +101,18 @@ class DatabaseManager:
             # Import models to ensure they are registered
             from .sqlalchemy_models import Base
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(self._ensure_search_indexes)
+    
+    @staticmethod
+    def _ensure_search_indexes(sync_conn):
+        """
+        Create full-text search indexes for policies and risks
+        """
+        from ..persistence.full_text_search import POLICY_SEARCH, RISK_SEARCH, get_search_backend
+        session = Session(bind=sync_conn)
+        backend = get_search_backend(session)
+        for entity in (POLICY_SEARCH, RISK_SEARCH):
+            backend.ensure_index(entity)
     
     async def drop_tables(self):
         """
@@ -110,6 +125,7 @@ class DatabaseManager:
             await conn.execute(text("DROP SCHEMA public CASCADE"))
             await conn.execute(text("CREATE SCHEMA public"))
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(self._ensure_search_indexes)
     
     async def check_connection(self) -> bool:
         """
@@ -522,6 +522,13 @@ class AuditLogModel(Base):
     
     # Relationships
     user = relationship("UserModel", back_populates="audit_logs")
+    
+    # Indexes matching the (timestamp, id) keyset order of listings and exports
+    __table_args__ = (
+        Index('idx_audit_logs_timestamp_id', 'timestamp', 'id'),
+        Index('idx_audit_logs_org_timestamp_id', 'organization_id', 'timestamp', 'id'),
+        Index('idx_audit_logs_user_timestamp_id', 'user_id', 'timestamp', 'id'),
+    )
 
 
 class OrganizationModel(Base):
@@ -9,11 +9,29 @@ from .repositories import (
     SQLAlchemyRiskRepository,
     SQLAlchemyOrganizationRepository,
 )
+from .full_text_search import (
+    FullTextSearchBackend,
+    PostgresFullTextSearch,
+    SQLiteFTS5Search,
+    SearchHit,
+    SearchPage,
+    POLICY_SEARCH,
+    RISK_SEARCH,
+    get_search_backend,
+)
 
 __all__ = [
     "SQLAlchemyUserRepository",
     "SQLAlchemyPolicyRepository", 
     "SQLAlchemyRiskRepository",
     "SQLAlchemyOrganizationRepository",
+    "FullTextSearchBackend",
+    "PostgresFullTextSearch",
+    "SQLiteFTS5Search",
+    "SearchHit",
+    "SearchPage",
+    "POLICY_SEARCH",
+    "RISK_SEARCH",
+    "get_search_backend",
 ]
 
@@ -0,0 +1,327 @@
+"""
+Full-text search backends for the GRC platform.
+
+Replaces ``ILIKE '%q%'`` scans with ranked, indexed search:
+
+* ``PostgresFullTextSearch`` - weighted ``tsvector`` generated column with a GIN
+  index, ranked with ``ts_rank_cd`` and highlighted with ``ts_headline``.
+* ``SQLiteFTS5Search`` - external-content FTS5 table kept in sync by triggers,
+  ranked with ``bm25`` and highlighted with ``snippet`` (local and test runs).
+
+Both backends keep their index up to date incrementally on insert/update/delete
+and page results with an opaque keyset cursor over ``(rank, id)``.
+"""
+
+import base64
+import json
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import false, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# Relative weights for the Postgres A-D weight classes, reused for FTS5 bm25()
+_WEIGHT_VALUES = {"A": 10.0, "B": 5.0, "C": 2.0, "D": 1.0}
+
+
+@dataclass(frozen=True)
+class SearchableEntity:
+    """Describes a table that participates in full-text search"""
+    table: str
+    # (column, weight class A-D) in descending order of importance
+    columns: Tuple[Tuple[str, str], ...]
+    # Columns used to build highlighted snippets (Postgres; FTS5 picks the best column)
+    snippet_columns: Tuple[str, ...]
+    id_column: str = "id"
+    # Postgres type of id_column, used to bind keyset cursors without casting the column
+    id_type: str = "uuid"
+    organization_column: str = "organization_id"
+
+    @property
+    def index_name(self) -> str:
+        return f"idx_{self.table}_search_vector"
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+
+POLICY_SEARCH = SearchableEntity(
+    table="policies",
+    columns=(("title", "A"), ("description", "B"), ("policy_type", "C"), ("content", "D")),
+    snippet_columns=("description", "content"),
+)
+
+RISK_SEARCH = SearchableEntity(
+    table="risks",
+    columns=(("title", "A"), ("description", "B"), ("category", "C"), ("business_impact", "D")),
+    snippet_columns=("description", "business_impact"),
+)
+
+
+@dataclass
+class SearchHit:
+    """A single ranked search result"""
+    id: str
+    rank: float
+    snippet: str
+
+
+@dataclass
+class SearchPage:
+    """A page of ranked results plus the cursor for the next page"""
+    hits: List[SearchHit] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(rank: float, doc_id: str) -> str:
+    """Encode the keyset position of the last hit on a page"""
+    raw = json.dumps([rank, doc_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Decode a cursor produced by ``encode_cursor``"""
+    try:
+        rank, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(rank), str(doc_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid search cursor: {cursor!r}") from e
+
+
+class FullTextSearchBackend(ABC):
+    """Pluggable full-text search backend bound to a SQLAlchemy session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @abstractmethod
+    def ensure_index(self, entity: SearchableEntity) -> None:
+        """Create the search index and its incremental maintenance hooks"""
+        pass
+
+    @abstractmethod
+    def rebuild_index(self, entity: SearchableEntity) -> None:
+        """Rebuild the search index from the base table"""
+        pass
+
+    @abstractmethod
+    def match_condition(self, entity: SearchableEntity, query: str) -> ColumnElement:
+        """SQL condition matching ``query`` against the base table, for use in ORM filters"""
+        pass
+
+    @abstractmethod
+    def _search_rows(self, entity: SearchableEntity, query: str, fetch: int,
+                     after: Optional[Tuple[float, str]], offset: int,
+                     organization_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Return up to ``fetch`` rows with ``id``, ``rank`` and ``snippet`` keys"""
+        pass
+
+    def search(self, entity: SearchableEntity, query: str, limit: int = 20,
+               cursor: Optional[str] = None, organization_id: Optional[str] = None,
+               offset: int = 0) -> SearchPage:
+        """
+        Ranked search with keyset pagination.
+
+        Args:
+            entity: The searchable table
+            query: Free-text user query
+            limit: Page size
+            cursor: ``next_cursor`` from the previous page
+            organization_id: Restrict results to one organization
+            offset: Legacy offset paging; ignored when ``cursor`` is given
+        """
+        if not query or not query.strip():
+            return SearchPage()
+
+        after = decode_cursor(cursor) if cursor else None
+        rows = self._search_rows(entity, query, limit + 1, after,
+                                 0 if after else offset, organization_id)
+
+        hits = [SearchHit(id=str(row["id"]), rank=float(row["rank"]), snippet=row["snippet"] or "")
+                for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and hits:
+            next_cursor = encode_cursor(hits[-1].rank, hits[-1].id)
+        return SearchPage(hits=hits, next_cursor=next_cursor)
+
+
+class PostgresFullTextSearch(FullTextSearchBackend):
+    """Postgres ``tsvector``/GIN full-text search"""
+
+    def __init__(self, session: Session, language: str = "english"):
+        super().__init__(session)
+        self.language = language
+
+    def _vector_expression(self, entity: SearchableEntity) -> str:
+        parts = [
+            f"setweight(to_tsvector('{self.language}', coalesce({column}, '')), '{weight}')"
+            for column, weight in entity.columns
+        ]
+        return " || ".join(parts)
+
+    def ensure_index(self, entity: SearchableEntity) -> None:
+        # A STORED generated column is recomputed by Postgres on every insert/update
+        self.session.execute(text(
+            f"ALTER TABLE {entity.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({self._vector_expression(entity)}) STORED"
+        ))
+        self.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {entity.index_name} "
+            f"ON {entity.table} USING GIN (search_vector)"
+        ))
+        self.session.commit()
+
+    def rebuild_index(self, entity: SearchableEntity) -> None:
+        self.session.execute(text(f"REINDEX INDEX {entity.index_name}"))
+        self.session.commit()
+
+    def match_condition(self, entity: SearchableEntity, query: str) -> ColumnElement:
+        return text(
+            f"{entity.table}.search_vector @@ websearch_to_tsquery('{self.language}', :fts_query)"
+        ).bindparams(fts_query=query)
+
+    def _search_rows(self, entity, query, fetch, after, offset, organization_id):
+        params: Dict[str, Any] = {"query": query, "fetch": fetch, "offset": offset}
+        conditions = ["t.search_vector @@ q.tsq"]
+        if organization_id:
+            conditions.append(f"t.{entity.organization_column} = :organization_id")
+            params["organization_id"] = organization_id
+
+        keyset = ""
+        if after:
+            # Compare ids in their native type; uuid order matches the cursor's text order
+            keyset = ("WHERE ranked.rank < :after_rank OR "
+                      f"(ranked.rank = :after_rank AND ranked.id > CAST(:after_id AS {entity.id_type}))")
+            params["after_rank"], params["after_id"] = after
+
+        snippet_source = " || ' ' || ".join(f"coalesce(t.{c}, '')" for c in entity.snippet_columns)
+        headline_options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=30"
+
+        # Rank and page first, then run the comparatively expensive ts_headline only for the page.
+        # The id stays in its column type until the outer SELECT so the join can use the primary key.
+        sql = f"""
+            WITH q AS (SELECT websearch_to_tsquery('{self.language}', :query) AS tsq),
+            ranked AS (
+                SELECT t.{entity.id_column} AS id,
+                       ts_rank_cd(t.search_vector, q.tsq)::float8 AS rank
+                FROM {entity.table} t, q
+                WHERE {" AND ".join(conditions)}
+            ),
+            page AS (
+                SELECT ranked.id, ranked.rank FROM ranked
+                {keyset}
+                ORDER BY ranked.rank DESC, ranked.id ASC
+                OFFSET :offset LIMIT :fetch
+            )
+            SELECT page.id::text AS id, page.rank,
+                   ts_headline('{self.language}', {snippet_source}, q.tsq, '{headline_options}') AS snippet
+            FROM page
+            JOIN {entity.table} t ON t.{entity.id_column} = page.id
+            CROSS JOIN q
+            ORDER BY page.rank DESC, page.id ASC
+        """
+        return [dict(row._mapping) for row in self.session.execute(text(sql), params)]
+
+
+class SQLiteFTS5Search(FullTextSearchBackend):
+    """SQLite FTS5 full-text search for local development and tests"""
+
+    _TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    def ensure_index(self, entity: SearchableEntity) -> None:
+        columns = [column for column, _ in entity.columns]
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+        fts = entity.fts_table
+
+        # External-content table: FTS5 stores only the index, keyed on the base rowid.
+        # Note: VACUUM may renumber rowids of tables without an INTEGER PRIMARY KEY;
+        # call rebuild_index() after vacuuming.
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{column_list}, content='{entity.table}', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {entity.table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {entity.table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {entity.table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+        ]
+        for statement in statements:
+            self.session.execute(text(statement))
+        self.session.commit()
+
+    def rebuild_index(self, entity: SearchableEntity) -> None:
+        fts = entity.fts_table
+        self.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        self.session.commit()
+
+    @classmethod
+    def _to_match_expression(cls, query: str) -> str:
+        """Quote each token so user input can never break FTS5 query syntax"""
+        tokens = cls._TOKEN_RE.findall(query)
+        return " ".join(f'"{token}"' for token in tokens)
+
+    def match_condition(self, entity: SearchableEntity, query: str) -> ColumnElement:
+        match = self._to_match_expression(query)
+        if not match:
+            return false()
+        fts = entity.fts_table
+        return text(
+            f"{entity.table}.rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH :fts_query)"
+        ).bindparams(fts_query=match)
+
+    def _search_rows(self, entity, query, fetch, after, offset, organization_id):
+        match = self._to_match_expression(query)
+        if not match:
+            return []
+
+        fts = entity.fts_table
+        weights = ", ".join(str(_WEIGHT_VALUES[weight]) for _, weight in entity.columns)
+
+        params: Dict[str, Any] = {"match": match, "fetch": fetch, "offset": offset}
+        conditions = [f"{fts} MATCH :match"]
+        if organization_id:
+            conditions.append(f"t.{entity.organization_column} = :organization_id")
+            params["organization_id"] = organization_id
+
+        keyset = ""
+        if after:
+            keyset = "WHERE ranked.rank < :after_rank OR (ranked.rank = :after_rank AND ranked.id > :after_id)"
+            params["after_rank"], params["after_id"] = after
+
+        # bm25() is "lower is better"; negate it so both backends sort rank DESC
+        sql = f"""
+            SELECT ranked.id, ranked.rank, ranked.snippet FROM (
+                SELECT CAST(t.{entity.id_column} AS TEXT) AS id,
+                       -bm25({fts}, {weights}) AS rank,
+                       -- column -1 lets FTS5 pick the best-matching column for the snippet
+                       snippet({fts}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '...', 16) AS snippet
+                FROM {fts}
+                JOIN {entity.table} t ON t.rowid = {fts}.rowid
+                WHERE {" AND ".join(conditions)}
+            ) AS ranked
+            {keyset}
+            ORDER BY ranked.rank DESC, ranked.id ASC
+            LIMIT :fetch OFFSET :offset
+        """
+        return [dict(row._mapping) for row in self.session.execute(text(sql), params)]
+
+
+def get_search_backend(session: Session) -> FullTextSearchBackend:
+    """Pick the full-text search backend matching the session's database dialect"""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return PostgresFullTextSearch(session)
+    if dialect == "sqlite":
+        return SQLiteFTS5Search(session)
+    raise ValueError(f"Full-text search is not supported for dialect: {dialect}")
@@ -3,10 +3,15 @@ SQLAlchemy repository implementations for the GRC platform.
 These repositories implement the domain repository interfaces.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import and_, or_, desc, asc
-from datetime import datetime
+from sqlalchemy import JSON, and_, or_, desc, asc, case, cast, func, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime, timedelta
+from enum import Enum
+import asyncio
+import base64
+import json
 import uuid
 
 from ...domain.entities.user import User
@@ -20,6 +25,9 @@ from ...domain.repositories.risk_repository import RiskRepository
 from ...domain.repositories.organization_repository import OrganizationRepository
 from ...domain.repositories.audit_log_repository import AuditLogRepository
 
+from .full_text_search import (
+    FullTextSearchBackend, SearchHit, SearchPage, POLICY_SEARCH, RISK_SEARCH, get_search_backend
+)
 from ..database.sqlalchemy_models import (
     UserModel, PolicyModel, PolicyVersionModel, RiskModel, RiskAssessmentModel,
     RiskTreatmentModel, RiskMitigationModel, ControlModel, ControlOwnerModel,
@@ -28,6 +36,26 @@ from ..database.sqlalchemy_models import (
 )
 
 
+def _column_value(value: Any) -> Any:
+    """Unwrap enum values before they are bound into SQL"""
+    return value.value if isinstance(value, Enum) else value
+
+
+def _encode_keyset(created_at: datetime, record_id: Any) -> str:
+    """Encode a (created_at, id) listing position as an opaque cursor"""
+    raw = json.dumps([created_at.isoformat(), str(record_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_keyset(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by ``_encode_keyset``"""
+    try:
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), uuid.UUID(record_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
 class SQLAlchemyUserRepository:
     """SQLAlchemy implementation of UserRepository - simplified for demo"""
     
@@ -111,8 +139,9 @@ class SQLAlchemyUserRepository:
 class SQLAlchemyPolicyRepository:
     """SQLAlchemy implementation of PolicyRepository - simplified for demo"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, search_backend: Optional[FullTextSearchBackend] = None):
         self.session = session
+        self.search_backend = search_backend or get_search_backend(session)
     
     def create(self, policy: Policy) -> Policy:
         """Create a new policy"""
@@ -144,6 +173,17 @@ class SQLAlchemyPolicyRepository:
             return self._to_domain(policy_model)
         return None
     
+    async def get_by_ids(self, policy_ids: List[uuid.UUID],
+                         organization_id: Optional[str] = None) -> List[Policy]:
+        """Get many policies with a single query"""
+        if not policy_ids:
+            return []
+        conditions = [PolicyModel.id.in_([uuid.UUID(str(policy_id)) for policy_id in policy_ids])]
+        if organization_id:
+            conditions.append(PolicyModel.organization_id == organization_id)
+        policy_models = self.session.query(PolicyModel).filter(*conditions).all()
+        return [self._to_domain(policy_model) for policy_model in policy_models]
+    
     def get_by_title(self, title: str) -> Optional[Policy]:
         """Get policy by title"""
         policy_model = self.session.query(PolicyModel).filter(PolicyModel.title == title).first()
@@ -184,17 +224,213 @@ class SQLAlchemyPolicyRepository:
         policy_models = self.session.query(PolicyModel).offset(skip).limit(limit).all()
         return [self._to_domain(policy_model) for policy_model in policy_models]
     
-    async def search(self, query: str, skip: int = 0, limit: int = 100) -> List[Policy]:
-        """Search policies by query"""
+    async def search(self, query: str, skip: int = 0, limit: int = 100,
+                     organization_id: Optional[str] = None) -> List[Policy]:
+        """Search policies by query, best matches first"""
+        page = self.search_backend.search(
+            POLICY_SEARCH, query, limit=limit, offset=skip, organization_id=organization_id
+        )
+        return self._load_hits(page.hits)
+    
+    async def search_ranked(self, query: str, limit: int = 20, cursor: Optional[str] = None,
+                            organization_id: Optional[str] = None) -> SearchPage:
+        """Ranked policy search with highlighted snippets and keyset pagination"""
+        return self.search_backend.search(
+            POLICY_SEARCH, query, limit=limit, cursor=cursor, organization_id=organization_id
+        )
+    
+    def _load_hits(self, hits: List[SearchHit]) -> List[Policy]:
+        """Load policies for search hits, preserving rank order"""
+        if not hits:
+            return []
+        ids = [uuid.UUID(hit.id) for hit in hits]
+        policy_models = self.session.query(PolicyModel).filter(PolicyModel.id.in_(ids)).all()
+        by_id = {policy_model.id: policy_model for policy_model in policy_models}
+        return [self._to_domain(by_id[doc_id]) for doc_id in ids if doc_id in by_id]
+    
+    # Policy fields bulk_update may set; the same fields update_policy lets callers change
+    BULK_UPDATABLE_FIELDS = (
+        "title", "description", "content", "policy_type", "status", "organization_id", "owner_id",
+        "effective_date", "expiry_date", "tags", "metadata"
+    )
+    
+    @property
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+    
+    @staticmethod
+    def _framework_column():
+        """Compliance framework recorded in the policy metadata"""
+        return PolicyModel.extra_metadata["framework"].as_string()
+    
+    def _set_metadata_key(self, key: str, value: Any):
+        """SQL expression that sets one key of the JSON metadata, keeping the others"""
+        if self._dialect == "postgresql":
+            merged = cast(PolicyModel.extra_metadata, JSONB).op("||")(func.jsonb_build_object(key, value))
+            return cast(merged, JSON)
+        return func.json_set(func.coalesce(PolicyModel.extra_metadata, "{}"), f"$.{key}", value)
+    
+    def _tag_condition(self, tag: str):
+        """Match policies carrying ``tag`` in their JSON tag list"""
+        if self._dialect == "postgresql":
+            return cast(PolicyModel.tags, JSONB).contains([tag])
+        return text(
+            "EXISTS (SELECT 1 FROM json_each(policies.tags) WHERE json_each.value = :tag)"
+        ).bindparams(tag=tag)
+    
+    def _filter_conditions(self, organization_id: Optional[str], filters: Optional[Dict[str, Any]] = None,
+                           search_query: Optional[str] = None) -> List[Any]:
+        """Translate service-level filters into SQL conditions"""
+        filters = filters or {}
+        conditions = []
+        if organization_id:
+            conditions.append(PolicyModel.organization_id == organization_id)
+        if "status" in filters:
+            conditions.append(PolicyModel.status == _column_value(filters["status"]))
+        if "policy_type" in filters:
+            conditions.append(PolicyModel.policy_type == _column_value(filters["policy_type"]))
+        if "owner_id" in filters:
+            conditions.append(PolicyModel.owner_id == str(filters["owner_id"]))
+        if "framework" in filters:
+            conditions.append(self._framework_column() == filters["framework"])
+        if "tag" in filters:
+            conditions.append(self._tag_condition(filters["tag"]))
+        if search_query:
+            conditions.append(self.search_backend.match_condition(POLICY_SEARCH, search_query))
+        return conditions
+    
+    async def list_by_filters(self, organization_id: str, filters: Optional[Dict[str, Any]] = None,
+                              skip: int = 0, limit: int = 100,
+                              search_query: Optional[str] = None) -> List[Policy]:
+        """List policies matching all filters, newest first"""
         policy_models = self.session.query(PolicyModel).filter(
-            or_(
-                PolicyModel.title.ilike(f"%{query}%"),
-                PolicyModel.description.ilike(f"%{query}%"),
-                PolicyModel.policy_type.ilike(f"%{query}%")
-            )
-        ).offset(skip).limit(limit).all()
+            *self._filter_conditions(organization_id, filters, search_query)
+        ).order_by(desc(PolicyModel.created_at), desc(PolicyModel.id)).offset(skip).limit(limit).all()
         return [self._to_domain(policy_model) for policy_model in policy_models]
     
+    async def list_page(self, organization_id: str, filters: Optional[Dict[str, Any]] = None,
+                        limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Policy], Optional[str]]:
+        """Keyset-paginated listing, newest first; returns (policies, next_cursor)"""
+        conditions = self._filter_conditions(organization_id, filters)
+        if cursor:
+            created_at, record_id = _decode_keyset(cursor)
+            conditions.append(or_(
+                PolicyModel.created_at < created_at,
+                and_(PolicyModel.created_at == created_at, PolicyModel.id < record_id)
+            ))
+        policy_models = self.session.query(PolicyModel).filter(*conditions).order_by(
+            desc(PolicyModel.created_at), desc(PolicyModel.id)
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(policy_models) > limit:
+            policy_models = policy_models[:limit]
+            last = policy_models[-1]
+            next_cursor = _encode_keyset(last.created_at, last.id)
+        return [self._to_domain(policy_model) for policy_model in policy_models], next_cursor
+    
+    async def count_by_filters(self, organization_id: str, filters: Optional[Dict[str, Any]] = None,
+                               search_query: Optional[str] = None) -> int:
+        """Count policies matching all filters with a single COUNT(*)"""
+        return self.session.query(func.count(PolicyModel.id)).filter(
+            *self._filter_conditions(organization_id, filters, search_query)
+        ).scalar() or 0
+    
+    async def count_by_status(self, organization_id: str,
+                              filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Policy counts grouped by status"""
+        rows = self.session.query(PolicyModel.status, func.count(PolicyModel.id)).filter(
+            *self._filter_conditions(organization_id, filters)
+        ).group_by(PolicyModel.status).all()
+        return {status: count for status, count in rows}
+    
+    async def count_by_framework(self, organization_id: str,
+                                 filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Policy counts grouped by compliance framework (unset frameworks are reported as "unspecified")"""
+        framework = self._framework_column()
+        rows = self.session.query(framework, func.count(PolicyModel.id)).filter(
+            *self._filter_conditions(organization_id, filters)
+        ).group_by(framework).all()
+        return {(name or "unspecified"): count for name, count in rows}
+    
+    async def get_policy_statistics(self, organization_id: str) -> Dict[str, Any]:
+        """Dashboard statistics computed with SQL aggregates"""
+        now = datetime.utcnow()
+        soon = now + timedelta(days=30)
+        recent = now - timedelta(days=30)
+        
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+        
+        totals = self.session.query(
+            func.count(PolicyModel.id),
+            count_where(PolicyModel.status == "active"),
+            count_where(PolicyModel.status == "draft"),
+            count_where(PolicyModel.status == "under_review"),
+            count_where(PolicyModel.expiry_date < now),
+            count_where(PolicyModel.created_at >= recent),
+            count_where(and_(PolicyModel.expiry_date >= now, PolicyModel.expiry_date <= soon)),
+        ).filter(PolicyModel.organization_id == organization_id).one()
+        
+        by_type = self.session.query(PolicyModel.policy_type, func.count(PolicyModel.id)).filter(
+            PolicyModel.organization_id == organization_id
+        ).group_by(PolicyModel.policy_type).all()
+        
+        return {
+            "total_policies": totals[0],
+            "active_policies": totals[1],
+            "draft_policies": totals[2],
+            "under_review": totals[3],
+            "expired_policies": totals[4],
+            "recent_policies": totals[5],
+            "expiring_soon": totals[6],
+            "policies_by_type": {policy_type: count for policy_type, count in by_type},
+            "policies_by_status": await self.count_by_status(organization_id),
+            "policies_by_framework": await self.count_by_framework(organization_id),
+        }
+    
+    async def bulk_update(self, policy_ids: List[uuid.UUID], updates: Dict[str, Any],
+                          organization_id: Optional[str] = None,
+                          updated_by: Optional[str] = None) -> List[uuid.UUID]:
+        """
+        Apply the same updates to many policies in one UPDATE statement.
+        Rows whose dates would become inconsistent are left untouched.
+        ``updated_by`` is recorded in each policy's metadata.
+        
+        Returns:
+            IDs of the policies that were updated
+        """
+        unsupported = set(updates) - set(self.BULK_UPDATABLE_FIELDS)
+        if unsupported:
+            raise ValueError(f"Fields cannot be bulk updated: {', '.join(sorted(unsupported))}")
+        if not policy_ids:
+            return []
+        
+        conditions = [PolicyModel.id.in_([uuid.UUID(str(policy_id)) for policy_id in policy_ids])]
+        if organization_id:
+            conditions.append(PolicyModel.organization_id == organization_id)
+        effective_date = updates.get("effective_date")
+        expiry_date = updates.get("expiry_date")
+        if effective_date and not expiry_date:
+            conditions.append(or_(PolicyModel.expiry_date.is_(None), PolicyModel.expiry_date > effective_date))
+        if expiry_date and not effective_date:
+            conditions.append(or_(PolicyModel.effective_date.is_(None), PolicyModel.effective_date < expiry_date))
+        
+        values = {field: _column_value(value) for field, value in updates.items() if field != "metadata"}
+        if "metadata" in updates:
+            values["extra_metadata"] = dict(updates["metadata"] or {})
+            if updated_by:
+                values["extra_metadata"]["updated_by"] = updated_by
+        elif updated_by:
+            values["extra_metadata"] = self._set_metadata_key("updated_by", updated_by)
+        values["updated_at"] = datetime.utcnow()
+        result = self.session.execute(
+            update(PolicyModel).where(*conditions).values(**values).returning(PolicyModel.id)
+        )
+        updated_ids = [row[0] for row in result]
+        self.session.commit()
+        return updated_ids
+    
     def _to_domain(self, policy_model: PolicyModel) -> Policy:
         """Convert SQLAlchemy model to domain entity"""
         from ...domain.entities.policy import PolicyType, PolicyStatus
@@ -220,8 +456,9 @@ class SQLAlchemyPolicyRepository:
 class SQLAlchemyRiskRepository:
     """SQLAlchemy implementation of RiskRepository - simplified for demo"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, search_backend: Optional[FullTextSearchBackend] = None):
         self.session = session
+        self.search_backend = search_backend or get_search_backend(session)
     
     def create(self, risk: Risk) -> Risk:
         """Create a new risk"""
@@ -291,17 +528,29 @@ class SQLAlchemyRiskRepository:
         risk_models = self.session.query(RiskModel).offset(skip).limit(limit).all()
         return [self._to_domain(risk_model) for risk_model in risk_models]
     
-    async def search(self, query: str, skip: int = 0, limit: int = 100) -> List[Risk]:
-        """Search risks by query"""
-        risk_models = self.session.query(RiskModel).filter(
-            or_(
-                RiskModel.title.ilike(f"%{query}%"),
-                RiskModel.description.ilike(f"%{query}%"),
-                RiskModel.risk_type.ilike(f"%{query}%"),
-                RiskModel.category.ilike(f"%{query}%")
-            )
-        ).offset(skip).limit(limit).all()
-        return [self._to_domain(risk_model) for risk_model in risk_models]
+    async def search(self, query: str, skip: int = 0, limit: int = 100,
+                     organization_id: Optional[str] = None) -> List[Risk]:
+        """Search risks by query, best matches first"""
+        page = self.search_backend.search(
+            RISK_SEARCH, query, limit=limit, offset=skip, organization_id=organization_id
+        )
+        return self._load_hits(page.hits)
+    
+    async def search_ranked(self, query: str, limit: int = 20, cursor: Optional[str] = None,
+                            organization_id: Optional[str] = None) -> SearchPage:
+        """Ranked risk search with highlighted snippets and keyset pagination"""
+        return self.search_backend.search(
+            RISK_SEARCH, query, limit=limit, cursor=cursor, organization_id=organization_id
+        )
+    
+    def _load_hits(self, hits: List[SearchHit]) -> List[Risk]:
+        """Load risks for search hits, preserving rank order"""
+        if not hits:
+            return []
+        ids = [uuid.UUID(hit.id) for hit in hits]
+        risk_models = self.session.query(RiskModel).filter(RiskModel.id.in_(ids)).all()
+        by_id = {risk_model.id: risk_model for risk_model in risk_models}
+        return [self._to_domain(by_id[doc_id]) for doc_id in ids if doc_id in by_id]
     
     def _to_domain(self, risk_model: RiskModel) -> Risk:
         """Convert SQLAlchemy model to domain entity"""
@@ -478,13 +727,32 @@ class SQLAlchemyAuditLogRepository:
         finally:
             session.close()
     
-    def get_by_user_id(self, user_id):
-        """Get audit logs by user ID"""
+    def _after_condition(self, session, after_id, descending: bool = False):
+        """Keyset condition selecting rows past ``after_id`` in (timestamp, id) order"""
+        after_id = uuid.UUID(str(after_id))
+        timestamp = session.query(AuditLogModel.timestamp).filter(AuditLogModel.id == after_id).scalar()
+        if timestamp is None:
+            raise ValueError(f"Audit log {after_id} not found")
+        if descending:
+            return or_(
+                AuditLogModel.timestamp < timestamp,
+                and_(AuditLogModel.timestamp == timestamp, AuditLogModel.id < after_id)
+            )
+        return or_(
+            AuditLogModel.timestamp > timestamp,
+            and_(AuditLogModel.timestamp == timestamp, AuditLogModel.id > after_id)
+        )
+    
+    def get_by_user_id(self, user_id, limit: int = 1000, after_id=None):
+        """Get audit logs by user ID, newest first (bounded; pass the last ID seen as ``after_id``)"""
         session = self.session_factory()
         try:
-            audit_log_models = session.query(AuditLogModel).filter(
-                AuditLogModel.user_id == user_id
-            ).order_by(desc(AuditLogModel.timestamp)).all()
+            query = session.query(AuditLogModel).filter(AuditLogModel.user_id == user_id)
+            if after_id:
+                query = query.filter(self._after_condition(session, after_id, descending=True))
+            audit_log_models = query.order_by(
+                desc(AuditLogModel.timestamp), desc(AuditLogModel.id)
+            ).limit(limit).all()
             return [self._to_domain(model) for model in audit_log_models]
         finally:
             session.close()
@@ -503,33 +771,103 @@ class SQLAlchemyAuditLogRepository:
         finally:
             session.close()
     
-    def get_by_date_range(self, start_date, end_date):
-        """Get audit logs by date range"""
+    def _date_range_query(self, session, start_date, end_date, organization_id=None, filters=None):
+        """Build the filtered date-range query shared by reads, counts and exports"""
+        query = session.query(AuditLogModel).filter(
+            and_(
+                AuditLogModel.timestamp >= start_date,
+                AuditLogModel.timestamp <= end_date
+            )
+        )
+        if organization_id:
+            query = query.filter(AuditLogModel.organization_id == organization_id)
+        for field in ("action", "resource", "severity", "user_id", "resource_id"):
+            if filters and filters.get(field) is not None:
+                query = query.filter(getattr(AuditLogModel, field) == _column_value(filters[field]))
+        return query
+    
+    def get_by_date_range(self, start_date, end_date, organization_id=None, filters=None,
+                          skip: int = 0, limit: int = 1000):
+        """Get audit logs by date range (bounded; use stream_by_date_range for exports)"""
         session = self.session_factory()
         try:
-            audit_log_models = session.query(AuditLogModel).filter(
-                and_(
-                    AuditLogModel.created_at >= start_date,
-                    AuditLogModel.created_at <= end_date
-                )
-            ).order_by(desc(AuditLogModel.timestamp)).all()
+            audit_log_models = self._date_range_query(
+                session, start_date, end_date, organization_id, filters
+            ).order_by(desc(AuditLogModel.timestamp)).offset(skip).limit(limit).all()
             return [self._to_domain(model) for model in audit_log_models]
         finally:
             session.close()
     
+    async def count_by_date_range(self, start_date, end_date, organization_id=None, filters=None,
+                                  after_id=None) -> int:
+        """Count audit logs in a date range without loading them (only those past ``after_id`` if given)"""
+        def count() -> int:
+            session = self.session_factory()
+            try:
+                query = self._date_range_query(session, start_date, end_date, organization_id, filters)
+                if after_id:
+                    query = query.filter(self._after_condition(session, after_id))
+                return query.with_entities(func.count(AuditLogModel.id)).scalar() or 0
+            finally:
+                session.close()
+        
+        # The session is blocking; keep the COUNT off the event loop
+        return await asyncio.to_thread(count)
+    
+    def stream_by_date_range(self, start_date, end_date, organization_id=None, filters=None,
+                             after_id=None, chunk_size: int = 1000):
+        """
+        Stream audit logs in (timestamp, id) order through a server-side cursor.
+        
+        Yields lists of at most ``chunk_size`` entries, so memory stays constant
+        regardless of the range size. Pass the last id seen as ``after_id`` to resume.
+        This is a blocking iterator; async callers must drain it on a worker thread.
+        """
+        session = self.session_factory()
+        try:
+            query = self._date_range_query(session, start_date, end_date, organization_id, filters)
+            if after_id:
+                query = query.filter(self._after_condition(session, after_id))
+            # Plain column rows bypass the ORM identity map, so finished rows can be collected
+            query = query.with_entities(*AuditLogModel.__table__.columns).order_by(
+                AuditLogModel.timestamp, AuditLogModel.id
+            ).yield_per(chunk_size)
+            
+            chunk = []
+            for row in query:
+                chunk.append(self._to_domain(row))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            session.close()
+    
     def _to_domain(self, audit_log_model):
         """Convert SQLAlchemy model to domain entity"""
         from ...domain.entities.audit_log import AuditLog, AuditAction, AuditResource, AuditSeverity
         
         return AuditLog(
             id=audit_log_model.id,
-            user_id=audit_log_model.user_id,
             action=AuditAction(audit_log_model.action),
             resource=AuditResource(audit_log_model.resource),
             resource_id=audit_log_model.resource_id,
-            details=audit_log_model.details,
+            user_id=str(audit_log_model.user_id) if audit_log_model.user_id else None,
+            user_name=audit_log_model.user_name,
+            organization_id=audit_log_model.organization_id,
+            timestamp=audit_log_model.timestamp,
             ip_address=audit_log_model.ip_address,
             user_agent=audit_log_model.user_agent,
-            severity=AuditSeverity(audit_log_model.severity) if audit_log_model.severity else None,
-            created_at=audit_log_model.timestamp
+            session_id=audit_log_model.session_id,
+            description=audit_log_model.description,
+            old_values=audit_log_model.old_values,
+            new_values=audit_log_model.new_values,
+            severity=AuditSeverity(audit_log_model.severity) if audit_log_model.severity else AuditSeverity.MEDIUM,
+            source_system=audit_log_model.source_system,
+            source_module=audit_log_model.source_module,
+            correlation_id=audit_log_model.correlation_id,
+            success=audit_log_model.success,
+            error_message=audit_log_model.error_message,
+            metadata=audit_log_model.extra_metadata or {}
         )
@@ -0,0 +1,71 @@
+"""
+Unit tests for streaming audit log export serializers
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from src.core.application.services.audit_export import encode_audit_logs, EXPORT_COLUMNS
+from src.core.domain.entities.audit_log import AuditLog, AuditAction, AuditResource
+
+
+def make_audit_log(description: str = "Viewed policy") -> AuditLog:
+    """Build an audit log entry for export tests"""
+    return AuditLog(
+        id=uuid4(),
+        action=AuditAction.READ,
+        resource=AuditResource.POLICY,
+        resource_id="policy-1",
+        user_id="user-1",
+        user_name="Test User",
+        organization_id="org-123",
+        timestamp=datetime(2025, 1, 1, 12, 0, 0),
+        ip_address="127.0.0.1",
+        user_agent=None,
+        session_id=None,
+        description=description,
+        metadata={"source": "test"}
+    )
+
+
+class TestAuditExport:
+    """Test cases for audit log export encoders"""
+
+    def test_csv_emits_one_block_per_chunk(self):
+        """CSV output is produced incrementally and round-trips"""
+        chunks = [[make_audit_log(), make_audit_log('Quoted, "text"')], [make_audit_log()]]
+
+        blocks = list(encode_audit_logs(iter(chunks), "csv"))
+
+        assert len(blocks) == 2
+        rows = list(csv.DictReader(io.StringIO(b"".join(blocks).decode("utf-8"))))
+        assert len(rows) == 3
+        assert list(rows[0].keys()) == EXPORT_COLUMNS
+        assert rows[1]["description"] == 'Quoted, "text"'
+        assert json.loads(rows[0]["metadata"]) == {"source": "test"}
+
+    def test_csv_resume_omits_header(self):
+        """Resumed CSV exports can be appended to the earlier output"""
+        output = b"".join(encode_audit_logs([[make_audit_log()]], "csv", resume=True)).decode("utf-8")
+
+        assert not output.startswith("id,")
+        assert len(output.strip().splitlines()) == 1
+
+    def test_jsonl(self):
+        """JSONL output has one object per audit log"""
+        logs = [make_audit_log(), make_audit_log()]
+
+        output = b"".join(encode_audit_logs([logs], "jsonl")).decode("utf-8")
+
+        records = [json.loads(line) for line in output.splitlines()]
+        assert [record["id"] for record in records] == [str(log.id) for log in logs]
+
+    def test_unsupported_format(self):
+        """Unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            encode_audit_logs([], "xml")
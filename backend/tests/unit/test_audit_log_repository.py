@@ -0,0 +1,123 @@
+"""
+Unit tests for audit log listing, counting and streaming exports
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.infrastructure.database.sqlalchemy_models import Base, AuditLogModel
+from src.core.infrastructure.persistence.repositories import SQLAlchemyAuditLogRepository
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite database shared across threads"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def repository(engine):
+    repository = SQLAlchemyAuditLogRepository()
+    repository.set_session_factory(sessionmaker(bind=engine))
+    return repository
+
+
+def add_logs(engine, minutes, organization_id="org-1"):
+    """Insert one audit log per offset in minutes; returns their IDs in insertion order"""
+    session = sessionmaker(bind=engine)()
+    ids = []
+    for minute in minutes:
+        log_id = uuid.uuid4()
+        session.add(AuditLogModel(
+            id=log_id, action="read", resource="policy", user_id=USER_ID,
+            organization_id=organization_id, timestamp=START + timedelta(minutes=minute),
+            description=f"Event at minute {minute}", severity="low", success=True, extra_metadata={}
+        ))
+        ids.append(log_id)
+    session.commit()
+    session.close()
+    return ids
+
+
+class TestAuditLogRepository:
+    """Test cases for keyset-paginated audit log reads"""
+
+    def test_stream_is_chronological_and_resumes_after_id(self, engine, repository):
+        """Exports follow (timestamp, id) order and resume exactly after the last ID"""
+        ids = add_logs(engine, [5, 1, 3, 3, 0, 4])
+        expected = sorted(zip([5, 1, 3, 3, 0, 4], ids), key=lambda item: (item[0], item[1]))
+        expected_ids = [log_id for _, log_id in expected]
+
+        chunks = list(repository.stream_by_date_range(START, START + timedelta(hours=1), chunk_size=4))
+        streamed = [log.id for chunk in chunks for log in chunk]
+        resumed = [log.id for chunk in repository.stream_by_date_range(
+            START, START + timedelta(hours=1), after_id=expected_ids[2], chunk_size=4
+        ) for log in chunk]
+
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert streamed == expected_ids
+        assert resumed == expected_ids[3:]
+
+    def test_get_by_user_id_is_newest_first(self, engine, repository):
+        """User history lists the most recent activity first and pages backwards"""
+        ids = add_logs(engine, [0, 10, 20, 30])
+
+        first_page = repository.get_by_user_id(USER_ID, limit=2)
+        second_page = repository.get_by_user_id(USER_ID, limit=2, after_id=first_page[-1].id)
+
+        assert [log.id for log in first_page] == [ids[3], ids[2]]
+        assert [log.id for log in second_page] == [ids[1], ids[0]]
+
+    def test_unknown_resume_id_is_rejected(self, engine, repository):
+        """Resuming after an ID that does not exist fails instead of restarting"""
+        add_logs(engine, [0])
+
+        with pytest.raises(ValueError):
+            list(repository.stream_by_date_range(START, START + timedelta(hours=1), after_id=uuid.uuid4()))
+
+    def test_count_by_date_range_is_awaitable(self, engine, repository):
+        """Counts run off the event loop and honour the organization scope"""
+        add_logs(engine, [0, 1, 2])
+        add_logs(engine, [1], organization_id="org-2")
+
+        count = asyncio.run(repository.count_by_date_range(START, START + timedelta(minutes=1), "org-1"))
+
+        assert count == 2
+
+    def test_count_honours_resume_cursor(self, engine, repository):
+        """A resumed export counts only the rows it will still stream"""
+        ids = add_logs(engine, [0, 1, 1, 2, 3])
+        ordered = sorted(zip([0, 1, 1, 2, 3], ids), key=lambda item: (item[0], item[1]))
+        cursor = ordered[2][1]
+
+        count = asyncio.run(repository.count_by_date_range(
+            START, START + timedelta(hours=1), "org-1", after_id=cursor
+        ))
+        streamed = sum(len(chunk) for chunk in repository.stream_by_date_range(
+            START, START + timedelta(hours=1), "org-1", after_id=cursor
+        ))
+
+        assert count == streamed == 2
+
+    def test_keyset_indexes_exist(self, engine):
+        """Listing and export orders are backed by composite indexes"""
+        indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes("audit_logs")}
+
+        assert indexes["idx_audit_logs_timestamp_id"] == ["timestamp", "id"]
+        assert indexes["idx_audit_logs_org_timestamp_id"] == ["organization_id", "timestamp", "id"]
+        assert indexes["idx_audit_logs_user_timestamp_id"] == ["user_id", "timestamp", "id"]
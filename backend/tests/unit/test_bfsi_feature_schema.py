@@ -0,0 +1,60 @@
+"""
+Unit tests for the BFSI feature schema
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent'))
+from bfsi_feature_schema import FeatureSchema, FeatureKind
+
+
+TRAINING_RECORDS = [
+    {"amount": 10.0, "region": "eu", "flagged": True, "history": [1, 2]},
+    {"amount": 30.0, "region": "us", "flagged": False, "history": [3]},
+    {"region": "eu", "flagged": False},
+]
+
+
+class TestFeatureSchema:
+    """Test cases for FeatureSchema"""
+
+    def test_vectors_ignore_key_order(self):
+        """Records with the same values encode identically regardless of key order"""
+        schema = FeatureSchema.fit(TRAINING_RECORDS)
+        record = {"history": [5], "region": "us", "amount": 20.0, "flagged": True}
+        reordered = dict(reversed(list(record.items())))
+
+        assert schema.transform_one(record).tolist() == schema.transform_one(reordered).tolist()
+        assert schema.transform([record]).shape == (1, schema.dimension)
+
+    def test_missing_and_unknown_values(self):
+        """Missing numerics use the fill value and unseen categories use the other slot"""
+        schema = FeatureSchema.fit(TRAINING_RECORDS)
+        names = schema.feature_names
+        vector = schema.transform_one({"region": "apac"})
+
+        assert vector[names.index("amount")] == pytest.approx(0.0)  # training mean after scaling
+        assert vector[names.index("region=<other>")] == 1.0
+        assert vector[names.index("region=eu")] == 0.0
+
+    def test_high_cardinality_columns_are_hashed(self):
+        """Categoricals beyond the one-hot limit use a fixed number of hash buckets"""
+        records = [{"customer": f"c{i}"} for i in range(50)]
+        schema = FeatureSchema.fit(records, max_one_hot_categories=10, hash_buckets=8)
+
+        assert schema.columns[0].kind == FeatureKind.HASHED
+        assert schema.dimension == 8
+        assert schema.transform_one({"customer": "new"}).sum() == 1.0
+
+    def test_round_trip(self, tmp_path):
+        """A saved schema reloads with the same version and encoding"""
+        schema = FeatureSchema.fit(TRAINING_RECORDS)
+        path = tmp_path / "schema.json"
+        schema.save(str(path))
+        loaded = FeatureSchema.load(str(path))
+
+        assert loaded.version == schema.version
+        assert loaded.transform(TRAINING_RECORDS).tolist() == schema.transform(TRAINING_RECORDS).tolist()
@@ -0,0 +1,100 @@
+"""
+Unit tests for the BFSI hyperparameter search
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent'))
+from bfsi_hyperparameter_search import HyperparameterSearch, SearchStrategy, TrialStore
+
+
+def make_dataset():
+    """Small separable classification problem"""
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(90, 3)).astype(np.float32)
+    labels = (features[:, 0] > 0).astype(int)
+    return features, labels
+
+
+PARAM_GRID = {"n_estimators": [5, 10, 20], "max_depth": [2, 4, 8]}
+
+
+class TestHyperparameterSearch:
+    """Test cases for HyperparameterSearch"""
+
+    def test_successive_halving_prunes_configurations(self, tmp_path):
+        """Fewer configurations reach each higher rung and the best one is fully evaluated"""
+        features, labels = make_dataset()
+        search = HyperparameterSearch(
+            "random_forest", PARAM_GRID, cpu_budget=2, store=TrialStore(str(tmp_path / "trials.jsonl"))
+        )
+
+        result = search.run(features, labels)
+
+        assert result["trials_per_rung"][0] == 9
+        assert result["trials_per_rung"][-1] >= 1
+        assert result["trials_per_rung"][-1] < result["trials_per_rung"][0]
+        assert result["best_budget"] == 1.0
+        assert result["best_score"] > 0.7
+
+    def test_resume_skips_recorded_trials(self, tmp_path):
+        """A second run over the same store evaluates nothing new"""
+        features, labels = make_dataset()
+        store_path = str(tmp_path / "trials.jsonl")
+        first = HyperparameterSearch(
+            "random_forest", PARAM_GRID, strategy=SearchStrategy.RANDOM, n_trials=4,
+            min_budget=1.0, cpu_budget=2, store=TrialStore(store_path)
+        ).run(features, labels)
+        second = HyperparameterSearch(
+            "random_forest", PARAM_GRID, strategy=SearchStrategy.RANDOM, n_trials=4,
+            min_budget=1.0, cpu_budget=2, store=TrialStore(store_path)
+        ).run(features, labels)
+
+        assert first["trials_evaluated"] == 4
+        assert second["trials_evaluated"] == 0
+        assert second["best_params"] == first["best_params"]
+
+
+class TestTrialEvaluation:
+    """Test cases for scoring one configuration"""
+
+    def test_lstm_is_scored_as_a_sequence_model(self, monkeypatch):
+        """With PyTorch the LSTM is tuned on its own architecture, not the feed-forward network"""
+        import bfsi_hyperparameter_search
+        calls = []
+
+        def fake_lstm(params, X_train, y_train, X_val, y_val, n_classes, seed):
+            calls.append(len(X_train))
+            return 0.5
+
+        def fail_feed_forward(*args):
+            raise AssertionError("LSTM trials must not use the feed-forward network")
+
+        monkeypatch.setattr(bfsi_hyperparameter_search, "_fit_and_score_lstm", fake_lstm)
+        monkeypatch.setattr(bfsi_hyperparameter_search, "_fit_and_score_torch", fail_feed_forward)
+        features, labels = make_dataset()
+
+        score, fold_scores, _ = bfsi_hyperparameter_search.evaluate_trial(
+            "lstm", {"learning_rate": 0.01}, features, labels, budget=1.0, n_folds=3, seed=0, use_torch=True
+        )
+
+        assert score == 0.5
+        assert len(calls) == 3
+
+    def test_lstm_trial_trains_on_windows(self):
+        """A real LSTM trial returns a validation accuracy"""
+        pytest.importorskip("torch")
+        from bfsi_hyperparameter_search import evaluate_trial
+        features, labels = make_dataset()
+
+        score, fold_scores, _ = evaluate_trial(
+            "lstm", {"learning_rate": 0.01, "hidden_size": 16}, features, labels,
+            budget=1.0, n_folds=3, seed=0, use_torch=True
+        )
+
+        assert 0.0 <= score <= 1.0
+        assert len(fold_scores) == 3
@@ -0,0 +1,76 @@
+"""
+Unit tests for LSTM batch prediction in the BFSI advanced ML system
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent'))
+from bfsi_advanced_ml_system import BFSIAdvancedMLSystem, MLAlgorithm
+
+
+class TestLSTMPrediction:
+    """Test cases for building LSTM inputs at prediction time"""
+
+    def test_windows_match_training_sequences(self):
+        """Row i is read as rows i..i+L-1 with n_features per step, zero-padded at the end"""
+        features = np.arange(12, dtype=np.float32).reshape(6, 2)
+
+        windows = BFSIAdvancedMLSystem._sequence_windows(features, sequence_length=3, rows=6)
+
+        assert windows.shape == (6, 3, 2)
+        np.testing.assert_array_equal(windows[0], features[0:3])
+        np.testing.assert_array_equal(windows[3], features[3:6])
+        np.testing.assert_array_equal(windows[5], [features[5], [0, 0], [0, 0]])
+        # Training reshapes consecutive blocks of rows the same way
+        np.testing.assert_array_equal(windows[::3], features.reshape(-1, 3, 2))
+
+    @pytest.mark.parametrize("rows", [80, 83])
+    def test_training_sequences_keep_every_full_block(self, rows):
+        """Whole blocks are kept whether or not the row count is a multiple of the window length"""
+        features = np.arange(rows * 2, dtype=np.float32).reshape(rows, 2)
+        labels = np.arange(rows)
+
+        sequences, sequence_labels = BFSIAdvancedMLSystem._training_sequences(features, labels, 10)
+
+        assert sequences.shape == (8, 10, 2)
+        np.testing.assert_array_equal(sequences[-1], features[70:80])
+        np.testing.assert_array_equal(sequence_labels, labels[0:80:10])
+
+    def test_short_input_is_padded_into_one_sequence(self):
+        """Fewer rows than one window still yield a single training sequence"""
+        features = np.ones((4, 2), dtype=np.float32)
+
+        sequences, sequence_labels = BFSIAdvancedMLSystem._training_sequences(features, np.array([1, 0, 0, 0]), 10)
+
+        assert sequences.shape == (1, 10, 2)
+        assert sequences[0, 4:].sum() == 0
+        np.testing.assert_array_equal(sequence_labels, [1])
+
+    @pytest.mark.parametrize("rows", [80, 83])
+    def test_train_then_predict_batch(self, rows):
+        """A trained LSTM predicts every record, independent of the inference batch size"""
+        pytest.importorskip("torch")
+        rng = np.random.default_rng(0)
+        features = rng.normal(size=(rows, 3)).astype(np.float32)
+        labels = (features[:, 0] > 0).astype(int)
+        system = BFSIAdvancedMLSystem()
+
+        model = asyncio.run(system._fit_reasoning_model(features, labels, "lstm_model", MLAlgorithm.LSTM))
+        system.ml_models[model.model_id] = model
+        records = [{"a": float(a), "b": float(b), "c": float(c)} for a, b, c in features]
+
+        whole = asyncio.run(system.predict_batch("lstm_model", records, batch_size=len(records)))
+        chunked = asyncio.run(system.predict_batch("lstm_model", records, batch_size=7))
+
+        assert model.parameters["input_size"] == 3
+        assert model.parameters["training_sequences"] == rows // 10
+        assert np.isfinite(model.performance_metrics["loss"])
+        assert len(whole) == len(records)
+        assert np.isfinite([r.probabilities for r in whole]).all()
+        assert [r.prediction for r in chunked] == [r.prediction for r in whole]
+        np.testing.assert_allclose([r.probabilities for r in chunked], [r.probabilities for r in whole], rtol=1e-5)
@@ -0,0 +1,84 @@
+"""
+Unit tests for the BFSI metrics core
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent', 'core'))
+from metrics import LatencyHistogram, SlidingLatency, ProcessSampler, PrometheusText, PSUTIL_AVAILABLE
+
+
+class TestMetricsCore:
+    """Test cases for histograms, process sampling and exposition"""
+
+    def test_histogram_percentiles_and_merge(self):
+        """Percentiles stay within bucket error and merged histograms match a combined one"""
+        rng = random.Random(7)
+        values = [rng.expovariate(50.0) for _ in range(20000)]
+        left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i, value in enumerate(values):
+            (left if i % 2 else right).record(value)
+            combined.record(value)
+
+        merged = left.copy().merge(right)
+        assert merged.counts == combined.counts
+        assert merged.count == len(values)
+
+        ordered = sorted(values)
+        for quantile in (0.5, 0.95, 0.99):
+            exact = ordered[int(quantile * len(values)) - 1]
+            assert merged.percentile(quantile) == pytest.approx(exact, rel=0.05)
+
+    def test_sliding_latency_forgets_old_windows(self):
+        """Recent percentiles reflect only the last windows of observations"""
+        recent = SlidingLatency(window_size=10)
+        for _ in range(10):
+            recent.record(5.0)
+        for _ in range(20):
+            recent.record(0.01)
+
+        assert recent.snapshot().percentile(0.99) == pytest.approx(0.01, rel=0.05)
+        assert recent.mean == pytest.approx(0.01)
+
+    @pytest.mark.skipif(not PSUTIL_AVAILABLE, reason="psutil not installed")
+    def test_process_sampler_caches_between_intervals(self):
+        """Repeated reads inside the interval reuse one sample"""
+        sampler = ProcessSampler(interval=60.0)
+        first = sampler.sample()
+        for _ in range(100):
+            assert sampler.sample() is first
+        assert sampler.samples_taken == 1
+        assert first.memory_mb > 0
+
+    @pytest.mark.skipif(not PSUTIL_AVAILABLE, reason="psutil not installed")
+    def test_current_rss_is_read_live(self):
+        """Per-task memory readings see allocations made after the cached sample"""
+        sampler = ProcessSampler(interval=60.0)
+        cached = sampler.sample()
+        before = sampler.current_rss_mb()
+        ballast = bytearray(64 * 1024 * 1024)
+        ballast[::4096] = b"x" * len(ballast[::4096])
+
+        assert sampler.current_rss_mb() - before > 32
+        assert sampler.sample() is cached
+        assert sampler.samples_taken == 1
+        del ballast
+
+    def test_prometheus_text_format(self):
+        """Families are declared once with their samples grouped beneath"""
+        histogram = LatencyHistogram()
+        histogram.record(0.25)
+        exposition = PrometheusText()
+        exposition.counter("tasks_total", "Tasks", 3, {"agent": 'risk "a"'})
+        exposition.counter("tasks_total", "Tasks", 1, {"agent": "fraud"})
+        exposition.summary("task_duration_seconds", "Durations", histogram, quantiles=(0.5,))
+        text = exposition.render()
+
+        assert text.count("# TYPE bfsi_tasks_total counter") == 1
+        assert 'bfsi_tasks_total{agent="risk \\"a\\""} 3' in text
+        assert "bfsi_task_duration_seconds_count 1" in text
+        assert 'bfsi_task_duration_seconds{quantile="0.5"} 0.25' in text
@@ -0,0 +1,55 @@
+"""
+Unit tests for the BFSI mitigation workflow store
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'bfsi'))
+from database_connection_manager import get_connection_pool
+from bfsi_mitigation_workflow import BFSIMitigationWorkflowSystem, TaskStatus, WorkflowStatus
+
+
+class TestMitigationWorkflowStore:
+    """Test cases for transactional workflow persistence and progress counters"""
+
+    def setup_method(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "workflows.db")
+        self.system = BFSIMitigationWorkflowSystem(self.db_path)
+
+    def test_database_uses_wal(self):
+        """The store shares the WAL-mode connection pool"""
+        with get_connection_pool(self.db_path).read_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_bulk_status_update_maintains_progress(self):
+        """Bulk updates adjust counters incrementally and agree with a full recount"""
+        target = (datetime.now() + timedelta(days=90)).isoformat()
+        workflow_id = self.system.create_mitigation_workflow("GAP-1", "Acme Bank", "compliance_officer", target).workflow_id
+        tasks = self.system.get_workflow(workflow_id).tasks
+        assert len(tasks) > 1
+
+        updated = self.system.update_task_statuses({task.task_id: TaskStatus.COMPLETED for task in tasks[:-1]})
+        assert updated == len(tasks) - 1
+        workflow = self.system.get_workflow(workflow_id)
+        assert workflow.progress_percentage == (len(tasks) - 1) * 100 // len(tasks)
+        assert workflow.status != WorkflowStatus.COMPLETED
+
+        # Re-completing a task must not double count
+        assert self.system.update_task_status(tasks[0].task_id, TaskStatus.COMPLETED)
+        assert self.system.update_task_status(tasks[-1].task_id, TaskStatus.COMPLETED)
+        workflow = self.system.get_workflow(workflow_id)
+        assert workflow.progress_percentage == 100
+        assert workflow.status == WorkflowStatus.COMPLETED
+
+        self.system.update_task_status(tasks[0].task_id, TaskStatus.IN_PROGRESS)
+        incremental = self.system.get_workflow(workflow_id).progress_percentage
+        self.system._recalculate_workflow_progress(workflow_id)
+        assert self.system.get_workflow(workflow_id).progress_percentage == incremental
+
+    def test_unknown_task_is_not_updated(self):
+        """Updating a missing task reports failure"""
+        assert self.system.update_task_status("missing", TaskStatus.COMPLETED) is False
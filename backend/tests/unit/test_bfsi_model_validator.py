@@ -0,0 +1,105 @@
+"""
+Unit tests for HTTP model validation against the stub model server
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'bfsi'))
+from bfsi_model_validator import BFSIModelValidator, OllamaHTTPClient, BenchmarkSuite
+from bfsi_stub_model_server import StubModelServer, default_responder
+
+
+class TestModelValidator:
+    """Test cases for concurrent keep-alive validation"""
+
+    def test_concurrent_validation_records_streaming_metrics(self, tmp_path, monkeypatch):
+        """Test cases run in parallel over reused connections with TTFT and token rates"""
+        monkeypatch.chdir(tmp_path)
+        with StubModelServer(first_token_delay=0.05, token_delay=0.001) as server:
+            validator = BFSIModelValidator(db_path=str(tmp_path / "bench.db"), ollama_url=server.url, concurrency=3)
+            result = validator.test_ollama_model("bfsi-policy-assistant")
+
+            assert "error" not in result
+            assert result["concurrency"] == 3
+            assert server.max_in_flight == 3
+            # One connection for the model list plus one per worker
+            assert server.connections_opened <= 4
+            assert server.requests_served == len(validator.test_cases)
+            for test in result["test_results"]:
+                assert test["time_to_first_token"] >= 0.05
+                assert test["tokens_per_second"] > 0
+                assert test["score"] > 0
+            assert result["wall_clock_time"] < sum(t["response_time"] for t in result["test_results"])
+            assert list((tmp_path / "validation_results").glob("validation_*.json"))
+
+    def test_missing_model_and_generation_errors(self, tmp_path, monkeypatch):
+        """Unknown models fail up front and server errors are reported per request"""
+        monkeypatch.chdir(tmp_path)
+        with StubModelServer(models=["other-model:latest"]) as server:
+            validator = BFSIModelValidator(db_path=str(tmp_path / "bench.db"), ollama_url=server.url)
+            assert validator.test_ollama_model("bfsi-policy-assistant")["status"] == "failed"
+
+            client = OllamaHTTPClient(server.url)
+            generation = client.generate("bfsi-policy-assistant", "hello")
+            assert generation.error.startswith("HTTP 404")
+            assert client.generate("other-model", "hello").tokens_generated > 0
+            client.close()
+
+    def test_timeout_does_not_poison_the_connection(self):
+        """A request abandoned mid-stream is followed by a working one on the same thread"""
+        with StubModelServer(responder=lambda model, prompt: "slow answer") as server:
+            client = OllamaHTTPClient(server.url, timeout=0.5)
+            server.token_delay = 1.0
+            assert "timed out" in client.generate("bfsi-policy-assistant", "hello").error
+
+            server.token_delay = 0.0
+            for _ in range(2):
+                generation = client.generate("bfsi-policy-assistant", "hello")
+                assert generation.error is None
+                assert generation.text == "slow answer"
+            client.close()
+
+
+def _two_model_responder(model_name, prompt):
+    if model_name.startswith("weak"):
+        return "Not sure."
+    return default_responder(model_name, prompt)
+
+
+class TestModelComparison:
+    """Test cases for seeded benchmark runs and statistical comparison"""
+
+    def test_seeded_runs_are_compared_and_stored(self, tmp_path, monkeypatch):
+        """Repeated seeded runs produce intervals, percentiles, a significant paired result and history"""
+        monkeypatch.chdir(tmp_path)
+        with StubModelServer(models=["strong:latest", "weak:latest"], responder=_two_model_responder) as server:
+            validator = BFSIModelValidator(db_path=str(tmp_path / "bench.db"), ollama_url=server.url)
+            strong = validator.run_benchmark("strong", repeats=3, seed=7)
+            weak = validator.run_benchmark("weak", repeats=3, seed=7)
+
+        assert strong["total_tests"] == 3 * len(validator.test_cases)
+        assert sorted({options["seed"] for options in server.options_seen}) == [7, 8, 9]
+        statistics = strong["statistics"]
+        assert statistics["latency"]["p50"] <= statistics["latency"]["p95"]
+        for category in statistics["categories"].values():
+            assert category["n"] == 3
+            assert category["ci_low"] <= category["mean"] <= category["ci_high"]
+
+        comparison = validator.compare_models([strong, weak])
+        paired = comparison["paired_comparisons"][0]
+        assert paired["pairs"] == strong["total_tests"]
+        assert paired["same_suite"] is True
+        assert paired["significant"] and paired["better_model"] == "strong"
+
+        history = validator.get_benchmark_history(suite_name="bfsi_core")
+        assert {run["model_name"] for run in history} == {"strong", "weak"}
+        reloaded = [validator.load_benchmark_run(strong["run_id"]), validator.load_benchmark_run(weak["run_id"])]
+        assert validator.compare_models(reloaded)["paired_comparisons"][0]["p_value"] == paired["p_value"]
+
+    def test_suite_fingerprint_tracks_cases(self):
+        """Editing a suite's cases changes its fingerprint"""
+        cases = [{"id": "a", "category": "c", "prompt": "p", "context": "x", "expected_keywords": [], "difficulty": "low"}]
+        edited = [dict(cases[0], prompt="q")]
+        assert BenchmarkSuite("s", "1", cases).fingerprint == BenchmarkSuite("s", "1", [dict(cases[0])]).fingerprint
+        assert BenchmarkSuite("s", "1", cases).fingerprint != BenchmarkSuite("s", "1", edited).fingerprint
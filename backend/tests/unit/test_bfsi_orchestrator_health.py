@@ -0,0 +1,43 @@
+"""
+Unit tests for the BFSI orchestrator health snapshot
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent', 'core'))
+from subagents import BFSIOrchestrator, BFSIAgentType
+
+
+class TestHealthSnapshot:
+    """Test cases for cached sub-agent health"""
+
+    def test_operations_reuse_snapshot(self):
+        """Operations within the TTL do not recompute sub-agent health"""
+        orchestrator = BFSIOrchestrator()
+
+        async def run():
+            for _ in range(20):
+                await orchestrator.execute_bfsi_operation("regulatory_compliance", {"regulation": "basel_iii"})
+
+        asyncio.run(run())
+        assert orchestrator.health_refreshes["initial"] == 1
+        assert orchestrator.health_refreshes["ttl"] == 0
+        assert "bfsi_health_snapshot_age_seconds" in orchestrator.get_prometheus_metrics()
+
+    def test_circuit_breaker_invalidates_agent_entry(self):
+        """Opening and closing a circuit breaker updates the snapshot immediately"""
+        orchestrator = BFSIOrchestrator()
+        assert orchestrator.get_health_snapshot().unhealthy_agents == []
+
+        agent = orchestrator.sub_agents[BFSIAgentType.AML_ANALYZER]
+        agent._open_circuit_breaker()
+        agent._open_circuit_breaker()
+        snapshot = orchestrator.get_health_snapshot()
+        assert snapshot.agent_health["aml_analyzer"]["circuit_breaker_open"] is True
+        assert orchestrator.health_refreshes["invalidation"] == 1
+
+        agent._reset_circuit_breaker()
+        assert orchestrator.get_health_snapshot().agent_health["aml_analyzer"]["circuit_breaker_open"] is False
+        assert orchestrator.health_refreshes["invalidation"] == 2
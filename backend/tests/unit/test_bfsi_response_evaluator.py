@@ -0,0 +1,58 @@
+"""
+Unit tests for the BFSI response evaluator
+"""
+
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'bfsi'))
+from bfsi_response_evaluator import KeywordMatcher, ResponseEvaluator
+from bfsi_stub_model_server import StubModelServer, hashed_embedding
+from bfsi_model_validator import BFSIModelValidator
+
+
+def _embed(texts):
+    return [hashed_embedding(text) for text in texts]
+
+
+class TestResponseEvaluator:
+    """Test cases for keyword matching, semantic credit and batched scoring"""
+
+    def test_matcher_agrees_with_substring_search(self):
+        """One compiled pass finds the same keywords as per-keyword substring search, overlaps included"""
+        keywords = ["risk", "operational risk", "Risk Assessment", "assess", "AML", "controls", "control"]
+        words = ["operational", "risk", "assessment", "aml", "controls", "the", "bank", "RISK"]
+        rng = random.Random(3)
+        matcher = KeywordMatcher(keywords)
+        for _ in range(200):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+            expected = [k for k in keywords if k.lower() in text.lower()]
+            assert matcher.find(text) == expected
+
+    def test_paraphrase_earns_semantic_credit(self):
+        """A correct answer without the expected keywords scores higher with a reference answer"""
+        case = {
+            "expected_keywords": ["AML", "monitoring"],
+            "reference_answer": "Screen customers, watch transactions for suspicious activity and report it."
+        }
+        paraphrase = "Banks should screen customers and watch transactions for suspicious activity, then report it."
+        keyword_only = ResponseEvaluator().evaluate(paraphrase, case)
+        semantic = ResponseEvaluator(embed_fn=_embed).evaluate(paraphrase, case)
+
+        assert keyword_only.keywords_found == []
+        assert semantic.semantic_similarity > 0.6
+        assert semantic.score > keyword_only.score
+        assert ResponseEvaluator(embed_fn=_embed).evaluate("Error: timeout", case).score == 0.0
+
+    def test_validator_embeds_all_responses_in_one_batch(self, tmp_path, monkeypatch):
+        """Validation scores every response with a single embedding request"""
+        monkeypatch.chdir(tmp_path)
+        with StubModelServer() as server:
+            validator = BFSIModelValidator(db_path=str(tmp_path / "bench.db"), ollama_url=server.url,
+                                           embedding_model="all-minilm")
+            result = validator.run_benchmark("bfsi-policy-assistant", repeats=2, seed=1)
+
+        assert server.embed_requests == 1
+        assert all(t["semantic_similarity"] is not None for t in result["test_results"])
+        assert all(0 < t["score"] <= 10 for t in result["test_results"])
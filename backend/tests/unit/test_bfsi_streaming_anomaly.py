@@ -0,0 +1,91 @@
+"""
+Unit tests for BFSI streaming anomaly detection
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent'))
+from bfsi_streaming_anomaly import P2Quantile, HalfSpaceTrees, StreamingAnomalyDetector
+
+
+def _transactions(rng, count):
+    return [
+        {"amount": float(rng.normal(100, 10)), "count": float(rng.normal(5, 1)), "entity_id": f"acct_{i % 20}"}
+        for i in range(count)
+    ]
+
+
+def _encode(records):
+    return np.array([[r["amount"], r["count"]] for r in records])
+
+
+class TestStreamingAnomaly:
+    """Test cases for the streaming detector and its building blocks"""
+
+    def test_p2_quantile_tracks_exact_quantile(self):
+        """The constant-memory estimate is close to the exact quantile"""
+        values = np.random.default_rng(0).normal(size=20000)
+        estimator = P2Quantile(0.95)
+        for value in values:
+            estimator.add(value)
+
+        assert abs(estimator.value() - np.quantile(values, 0.95)) < 0.05
+
+    def test_half_space_trees_rank_outliers_higher(self):
+        """Half-space trees learn the stream incrementally and score outliers above normal points"""
+        rng = np.random.default_rng(1)
+        features = _encode(_transactions(rng, 1000))
+        trees = HalfSpaceTrees(n_features=2, window_size=250)
+        for start in range(0, len(features), 100):
+            trees.update(features[start:start + 100])
+
+        assert trees.ready
+        outlier = trees.score(np.array([[900.0, 40.0]]))[0]
+        assert outlier > np.quantile(trees.score(features[:200]), 0.99)
+
+    def test_alerts_are_deduplicated_per_key(self):
+        """Repeated anomalies for one key inside the dedup window fold into one alert"""
+        rng = np.random.default_rng(2)
+        detector = StreamingAnomalyDetector(
+            encode=_encode,
+            scorer=lambda features: np.abs(features[:, 0] - 100.0),
+            warmup=200,
+            dedup_window_seconds=60.0
+        )
+        detector.process_batch(_transactions(rng, 500), now=0.0)
+
+        outliers = [{"amount": 500.0, "count": 5.0, "entity_id": "acct_x"}] * 3
+        alerts = detector.process_batch(outliers, now=10.0)
+        assert len(alerts) == 1
+        assert alerts[0].occurrences == 3
+        assert alerts[0].severity == "critical"
+
+        assert detector.process_batch(outliers[:1], now=30.0) == []
+        assert len(detector.process_batch(outliers[:1], now=100.0)) == 1
+
+    def test_half_space_trees_detect_planted_outliers_end_to_end(self):
+        """With the default incremental wiring, outliers are flagged soon after the trees learn a window"""
+        rng = np.random.default_rng(3)
+        trees = HalfSpaceTrees(n_features=2)
+        detector = StreamingAnomalyDetector(
+            encode=_encode,
+            scorer=trees.score,
+            updater=trees.update,
+            ready=lambda: trees.ready
+        )
+
+        flagged = {}
+        for batch_index in range(15):
+            batch = _transactions(rng, 100)
+            if batch_index in (4, 9, 14):
+                batch[50] = {"amount": 900.0, "count": 40.0, "entity_id": f"outlier_{batch_index}"}
+            for alert in detector.process_batch(batch, now=float(batch_index)):
+                flagged.setdefault(batch_index, set()).add(alert.key)
+
+        for batch_index in (4, 9, 14):
+            assert f"outlier_{batch_index}" in flagged.get(batch_index, set())
+        # Placeholder scores from before the first window never entered the baseline
+        assert detector.baseline.observations == 1500 - 300
@@ -0,0 +1,52 @@
+"""
+Unit tests for the BFSI training job manager
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'bfsi_agent'))
+from bfsi_training_jobs import TrainingJobManager, TrainingJobStatus
+
+
+class TestTrainingJobManager:
+    """Test cases for TrainingJobManager"""
+
+    def test_job_trains_in_worker_process(self, tmp_path):
+        """A submitted job trains off the event loop and persists its final state"""
+        rng = np.random.default_rng(0)
+        features = rng.normal(size=(60, 3)).astype(np.float32)
+        labels = (features[:, 0] > 0).astype(int)
+        completed = []
+
+        async def scenario():
+            manager = TrainingJobManager(str(tmp_path), on_complete=lambda job, model: completed.append(job.job_id))
+            job = await manager.submit("reasoning", "random_forest", "model_1", features, labels)
+            model = await manager.wait(job.job_id)
+            return manager, job, model
+
+        manager, job, model = asyncio.run(scenario())
+
+        assert model.model_id == "model_1"
+        assert completed == [job.job_id]
+        with open(tmp_path / job.job_id / "job.json") as f:
+            assert json.load(f)["status"] == "completed"
+        assert manager.get_job(job.job_id).attempts == 1
+
+    def test_restart_marks_active_jobs_interrupted(self, tmp_path):
+        """Jobs that were running when the service stopped are reported as interrupted"""
+        job_dir = tmp_path / "train_abc"
+        job_dir.mkdir()
+        (job_dir / "job.json").write_text(json.dumps({
+            "job_id": "train_abc", "kind": "reasoning", "algorithm": "lstm", "model_id": "m",
+            "status": "running", "created_at": "2025-01-01T00:00:00", "epoch": 12, "total_epochs": 50
+        }))
+
+        job = TrainingJobManager(str(tmp_path)).get_job("train_abc")
+
+        assert job.status == TrainingJobStatus.INTERRUPTED
+        assert job.epoch == 12
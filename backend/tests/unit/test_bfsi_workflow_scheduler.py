@@ -0,0 +1,95 @@
+"""
+Unit tests for the BFSI workflow deadline scheduler
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'bfsi'))
+from bfsi_mitigation_workflow import BFSIMitigationWorkflowSystem, WorkflowStatus
+from bfsi_workflow_scheduler import WorkflowDeadlineScheduler, EscalationRule
+
+
+class TestWorkflowDeadlineScheduler:
+    """Test cases for deadline events, escalation and overdue paging"""
+
+    def setup_method(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "workflows.db")
+        self.system = BFSIMitigationWorkflowSystem(self.db_path)
+        self.now = datetime(2026, 1, 1, 9, 0)
+
+    def _create(self, owner, days):
+        target = (self.now + timedelta(days=days)).isoformat()
+        return self.system.create_mitigation_workflow("GAP-1", "Acme Bank", owner, target).workflow_id
+
+    def test_events_fire_in_order_and_once(self):
+        """Approaching, overdue and escalation events fire at their times and survive a restart"""
+        workflow_id = self._create("alice", 10)
+        scheduler = WorkflowDeadlineScheduler(
+            self.system, escalation_rules=[EscalationRule(level=1, after=timedelta(days=2), escalate_to="cro")]
+        )
+        fired = []
+        scheduler.add_handler(fired.append)
+
+        assert scheduler.run_due(self.now) == []
+        assert [e.event_type for e in scheduler.run_due(self.now + timedelta(days=6))] == ["approaching_deadline"]
+        assert [e.event_type for e in scheduler.run_due(self.now + timedelta(days=10, minutes=1))] == ["overdue"]
+        assert self.system.get_workflow(workflow_id).status == WorkflowStatus.OVERDUE
+
+        # A new scheduler resumes from the persisted stage
+        restarted = WorkflowDeadlineScheduler(
+            self.system, escalation_rules=[EscalationRule(level=1, after=timedelta(days=2), escalate_to="cro")]
+        )
+        events = restarted.run_due(self.now + timedelta(days=13))
+        assert [(e.event_type, e.escalate_to) for e in events] == [("escalation", "cro")]
+        assert restarted.next_fire_time() is None
+        assert len(fired) == 2
+
+    def test_closed_and_rescheduled_workflows(self):
+        """Cancelling drops pending events and rescheduling restarts them"""
+        workflow_id = self._create("alice", 1)
+        scheduler = WorkflowDeadlineScheduler(self.system, escalation_rules=[])
+
+        self.system.update_workflow_status(workflow_id, WorkflowStatus.CANCELLED)
+        assert scheduler.next_fire_time() is None
+
+        self.system.update_workflow_status(workflow_id, WorkflowStatus.IN_PROGRESS)
+        self.system.reschedule_workflow(workflow_id, (self.now + timedelta(days=30)).isoformat(), as_of=self.now)
+        assert scheduler.run_due(self.now + timedelta(days=2)) == []
+        assert scheduler.next_fire_time() == self.now + timedelta(days=25)
+
+    def test_rescheduling_an_overdue_workflow_reopens_it(self):
+        """A future deadline clears the overdue status and restarts notifications"""
+        workflow_id = self._create("alice", 1)
+        scheduler = WorkflowDeadlineScheduler(self.system, escalation_rules=[])
+        scheduler.run_due(self.now + timedelta(days=2))
+        assert self.system.get_workflow(workflow_id).status == WorkflowStatus.OVERDUE
+
+        self.system.reschedule_workflow(workflow_id, (self.now + timedelta(days=3)).isoformat(),
+                                        as_of=self.now + timedelta(days=2))
+        assert self.system.get_workflow(workflow_id).status == WorkflowStatus.CREATED
+        assert self.system.get_active_deadlines([workflow_id])[0]["notified_stage"] == 0
+
+        # A deadline that is still in the past keeps the workflow overdue without re-notifying
+        scheduler.run_due(self.now + timedelta(days=4))
+        self.system.reschedule_workflow(workflow_id, (self.now + timedelta(days=2)).isoformat(),
+                                        as_of=self.now + timedelta(days=4))
+        assert self.system.get_workflow(workflow_id).status == WorkflowStatus.OVERDUE
+        assert scheduler.run_due(self.now + timedelta(days=4)) == []
+
+    def test_overdue_query_pages_by_owner(self):
+        """Overdue workflows are filtered by owner and returned in deadline order"""
+        for days in (-5, -3, -1, 4):
+            self._create("alice", days)
+        self._create("bob", -2)
+
+        page = self.system.get_overdue_workflows(assigned_owner="alice", limit=2, as_of=self.now)
+        rest = self.system.get_overdue_workflows(assigned_owner="alice", limit=2, offset=2, as_of=self.now)
+        deadlines = [w["target_completion_date"] for w in page + rest]
+        assert len(deadlines) == 3
+        assert deadlines == sorted(deadlines)
+        assert len(self.system.get_overdue_workflows(priority="high", as_of=self.now)) == 4
+        assert self.system.get_overdue_workflows(priority="low", as_of=self.now) == []
@@ -0,0 +1,143 @@
+"""
+Unit tests for the SQLite connection pool
+Tests writer/reader separation, cross-thread use and the async API
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+from database_connection_manager import DatabaseConnectionPool
+
+
+@pytest.fixture
+def pool():
+    """Connection pool on a temporary database"""
+    temp_dir = tempfile.mkdtemp()
+    pool = DatabaseConnectionPool(os.path.join(temp_dir, "test.db"), max_connections=4, timeout=5)
+    with pool.transaction() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    yield pool
+    pool.close_all_connections()
+
+
+class TestDatabaseConnectionPool:
+    """Test cases for DatabaseConnectionPool"""
+
+    def test_wal_mode_enabled(self, pool):
+        """Connections run in WAL journal mode"""
+        with pool.read_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_readers_are_read_only(self, pool):
+        """Reader connections reject writes"""
+        with pool.read_connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items (name) VALUES ('x')")
+
+    def test_transaction_commits_and_rolls_back(self, pool):
+        """transaction() commits on success and rolls back on error"""
+        with pool.transaction() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('kept')")
+        with pytest.raises(RuntimeError):
+            with pool.transaction() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('dropped')")
+                raise RuntimeError("boom")
+
+        with pool.read_connection() as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM items")]
+        assert names == ["kept"]
+
+    def test_connections_cross_threads(self, pool):
+        """Pooled connections can be reused by other threads"""
+        errors = []
+
+        def worker(i):
+            try:
+                with pool.transaction() as conn:
+                    conn.execute("INSERT INTO items (name) VALUES (?)", (f"t{i}",))
+                with pool.read_connection() as conn:
+                    conn.execute("SELECT COUNT(*) FROM items").fetchone()
+            except Exception as e:  # pragma: no cover - surfaced by assertion
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert pool.get_pool_status()["active_readers"] <= pool.max_readers
+
+    def test_no_liveness_check_for_busy_connections(self, pool):
+        """Recently used connections are reused without a SELECT 1 round-trip"""
+        for _ in range(5):
+            with pool.read_connection() as conn:
+                conn.execute("SELECT 1")
+        assert pool.get_pool_status()["liveness_checks"] == 0
+
+        pool.idle_check_interval = 0
+        with pool.read_connection():
+            pass
+        assert pool.get_pool_status()["liveness_checks"] == 1
+
+    def test_async_api(self, pool):
+        """Awaitable helpers run queries off the event loop"""
+        async def scenario():
+            await pool.executemany("INSERT INTO items (name) VALUES (?)", [("a",), ("b",)])
+            rowcount, _ = await pool.execute("UPDATE items SET name = 'c' WHERE name = 'a'")
+            rows = await pool.fetchall("SELECT name FROM items ORDER BY name")
+            async with pool.acquire() as conn:
+                count = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            return rowcount, rows, count
+
+        rowcount, rows, count = asyncio.run(scenario())
+        assert rowcount == 1
+        assert rows == [("b",), ("c",)]
+        assert count == 2
+
+    def test_nested_writes_join_the_outer_transaction(self, pool):
+        """A thread holding the writer can re-enter it; the outer block decides commit or rollback"""
+        with pytest.raises(RuntimeError):
+            with pool.transaction() as outer:
+                outer.execute("INSERT INTO items (name) VALUES ('outer')")
+                with pool.get_connection() as inner:
+                    assert inner is outer
+                with pool.transaction() as inner:
+                    inner.execute("INSERT INTO items (name) VALUES ('inner')")
+                raise RuntimeError("boom")
+
+        with pool.transaction() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('kept')")
+            with pool.transaction() as inner:
+                inner.execute("INSERT INTO items (name) VALUES ('nested')")
+
+        with pool.read_connection() as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")]
+        assert names == ["kept", "nested"]
+        assert not pool.get_pool_status()["writer_busy"]
+
+    def test_failed_reopen_frees_the_reader_slot(self, pool, monkeypatch):
+        """A stale reader that cannot be reopened does not shrink the pool"""
+        with pool.read_connection():
+            pass
+        pool.idle_check_interval = 0
+        monkeypatch.setattr(pool, "_is_alive", lambda pooled: False)
+
+        def fail_open(readonly):
+            raise sqlite3.OperationalError("unable to open database file")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(pool, "_open", fail_open)
+            with pytest.raises(sqlite3.OperationalError):
+                with pool.read_connection():
+                    pass
+
+        assert pool.get_pool_status()["active_readers"] == 0
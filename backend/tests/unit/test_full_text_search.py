@@ -0,0 +1,143 @@
+"""
+Unit tests for the full-text search backends
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.infrastructure.database.sqlalchemy_models import Base, PolicyModel
+from src.core.infrastructure.persistence.full_text_search import (
+    PostgresFullTextSearch, SQLiteFTS5Search, POLICY_SEARCH, HIGHLIGHT_START, encode_cursor
+)
+
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with the policy FTS5 index installed"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    SQLiteFTS5Search(session).ensure_index(POLICY_SEARCH)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_policy(session, title, content="General content", description="Policy description",
+               organization_id="org-1"):
+    """Insert a policy row and return the model"""
+    now = datetime.utcnow()
+    policy = PolicyModel(
+        id=uuid.uuid4(), title=title, description=description, content=content,
+        policy_type="compliance", status="active", organization_id=organization_id,
+        owner_id="owner-1", created_at=now, updated_at=now, tags=[], extra_metadata={}
+    )
+    session.add(policy)
+    session.commit()
+    return policy
+
+
+def hit_ids(page):
+    return [uuid.UUID(hit.id) for hit in page.hits]
+
+
+class TestSQLiteFTS5Search:
+    """Test cases for the FTS5 backend"""
+
+    def test_triggers_keep_index_in_sync(self, session):
+        """Inserts, updates and deletes are reflected without a rebuild"""
+        search = SQLiteFTS5Search(session)
+        policy = add_policy(session, "Anti money laundering")
+
+        assert hit_ids(search.search(POLICY_SEARCH, "laundering")) == [policy.id]
+
+        policy.title = "Sanctions screening"
+        session.commit()
+        assert search.search(POLICY_SEARCH, "laundering").hits == []
+        assert hit_ids(search.search(POLICY_SEARCH, "sanctions")) == [policy.id]
+
+        session.delete(policy)
+        session.commit()
+        assert search.search(POLICY_SEARCH, "sanctions").hits == []
+
+    def test_title_matches_outrank_content_matches(self, session):
+        """Column weights favour the title, and snippets highlight the match"""
+        in_content = add_policy(session, "Data retention", content="Covers encryption of backups")
+        in_title = add_policy(session, "Encryption standard")
+
+        page = SQLiteFTS5Search(session).search(POLICY_SEARCH, "encryption")
+
+        assert hit_ids(page) == [in_title.id, in_content.id]
+        assert page.hits[0].rank > page.hits[1].rank
+        assert HIGHLIGHT_START in page.hits[1].snippet
+
+    def test_keyset_pagination_walks_every_hit_once(self, session):
+        """Following next_cursor returns the same order as one large page"""
+        for i in range(7):
+            add_policy(session, f"Vendor risk {i}", content="vendor " * (i % 3))
+        search = SQLiteFTS5Search(session)
+        expected = hit_ids(search.search(POLICY_SEARCH, "vendor", limit=20))
+
+        walked, cursor = [], None
+        while True:
+            page = search.search(POLICY_SEARCH, "vendor", limit=3, cursor=cursor)
+            walked.extend(hit_ids(page))
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        assert len(expected) == 7
+        assert walked == expected
+
+    def test_organization_filter_and_match_condition(self, session):
+        """Results stay inside the organization and match_condition works in ORM filters"""
+        mine = add_policy(session, "Incident response")
+        add_policy(session, "Incident response", organization_id="org-2")
+        search = SQLiteFTS5Search(session)
+
+        assert hit_ids(search.search(POLICY_SEARCH, "incident", organization_id="org-1")) == [mine.id]
+        assert session.query(PolicyModel).filter(
+            search.match_condition(POLICY_SEARCH, "incident")
+        ).count() == 2
+
+    def test_query_syntax_is_escaped(self, session):
+        """FTS5 operators in user input are treated as plain words"""
+        add_policy(session, "Access control")
+        search = SQLiteFTS5Search(session)
+
+        assert len(search.search(POLICY_SEARCH, 'access" (control*').hits) == 1
+        assert search.search(POLICY_SEARCH, 'access NEAR(').hits == []
+        assert search.search(POLICY_SEARCH, '"*').hits == []
+
+
+class TestPostgresFullTextSearch:
+    """Test cases for the SQL built by the Postgres backend"""
+
+    class _RecordingSession:
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, statement, params=None):
+            self.statements.append((str(statement), params))
+            return []
+
+    def test_ids_keep_their_type_until_the_outer_select(self):
+        """The page join compares uuid to uuid so it can use the primary key index"""
+        session = self._RecordingSession()
+        cursor = encode_cursor(0.5, str(uuid.uuid4()))
+
+        PostgresFullTextSearch(session).search(POLICY_SEARCH, "encryption", cursor=cursor)
+
+        sql, params = session.statements[0]
+        assert "JOIN policies t ON t.id = page.id" in sql
+        assert "t.id::text" not in sql
+        assert "SELECT page.id::text AS id" in sql
+        assert "CAST(:after_id AS uuid)" in sql
+        assert params["after_rank"] == 0.5
@@ -0,0 +1,39 @@
+"""
+Unit tests for batched embedding in the enhanced Hugging Face service
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("fastapi")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'applications'))
+from enhanced_huggingface_service import _run_embedding_batch
+
+
+class TestEmbeddingBatch:
+    """Test cases for masked mean pooling"""
+
+    def test_embedding_is_independent_of_batch_padding(self, tmp_path):
+        """A text embeds the same alone and next to a much longer text"""
+        words = ["policy", "risk", "aml", "controls", "audit", "bank", "compliance", "review"]
+        vocab = tmp_path / "vocab.txt"
+        vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+        tokenizer = transformers.BertTokenizer(str(vocab))
+        torch.manual_seed(0)
+        model = transformers.BertModel(transformers.BertConfig(
+            vocab_size=len(words) + 5, hidden_size=16, num_hidden_layers=1,
+            num_attention_heads=2, intermediate_size=32
+        )).eval()
+        pipe = SimpleNamespace(tokenizer=tokenizer, model=model)
+
+        alone = _run_embedding_batch(pipe, ["aml policy"])[0]
+        batched = _run_embedding_batch(pipe, ["aml policy", " ".join(words * 4), "risk"])
+
+        assert torch.allclose(torch.tensor(alone), torch.tensor(batched[0]), atol=1e-5)
+        assert len(batched) == 3
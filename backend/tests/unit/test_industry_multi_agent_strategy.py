@@ -0,0 +1,154 @@
+"""
+Unit tests for concurrent task execution in the industry multi-agent orchestrator
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'orchestration'))
+strategy = pytest.importorskip("industry_multi_agent_strategy")
+
+from multi_agent_strategy import Task, TaskPriority
+
+
+class FakeChromaService:
+    """Records queries and returns one document per query text"""
+
+    def __init__(self):
+        self.calls = []
+
+    def query_documents(self, query_texts, n_results=5, collection_name="default", **kwargs):
+        self.calls.append((collection_name, list(query_texts)))
+        return {
+            "documents": [[f"doc for {text}"] for text in query_texts],
+            "ids": [["1"] for _ in query_texts],
+            "embeddings": None
+        }
+
+
+class FakeOllama:
+    """httpx transport answering /api/generate after a per-model delay, tracking concurrency"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.max_total_in_flight = 0
+
+    async def handle(self, request):
+        model = json.loads(request.content)["model"]
+        self.in_flight[model] = self.in_flight.get(model, 0) + 1
+        self.max_in_flight[model] = max(self.max_in_flight.get(model, 0), self.in_flight[model])
+        self.max_total_in_flight = max(self.max_total_in_flight, sum(self.in_flight.values()))
+        try:
+            await asyncio.sleep(self.delays.get(model, 0.0))
+        finally:
+            self.in_flight[model] -= 1
+        return httpx.Response(200, json={"response": f"analysis by {model}"})
+
+
+def _task(name, capability):
+    return Task(
+        task_id=f"{name}_id",
+        task_type=f"{name}_review",
+        priority=TaskPriority.MEDIUM,
+        complexity=0.5,
+        required_capabilities=[capability],
+        deadline=None,
+        context={"organization_id": "org-1"},
+        dependencies=[],
+        created_at=datetime.now()
+    )
+
+
+def make_orchestrator(monkeypatch, fake_ollama, models, max_concurrency=2, task_timeout=5.0):
+    """Orchestrator with one agent per model, a fake Chroma service and a mocked Ollama transport"""
+    monkeypatch.setattr(strategy, "ChromaService", FakeChromaService)
+    monkeypatch.setattr(strategy.OllamaIntegration, "_load_available_models", lambda self: None)
+    orchestrator = strategy.IndustryMultiAgentOrchestrator("bfsi")
+    orchestrator.ollama = strategy.OllamaIntegration(
+        max_concurrency_per_model=max_concurrency,
+        transport=httpx.MockTransport(fake_ollama.handle)
+    )
+    orchestrator.task_timeout = task_timeout
+    for model in models:
+        orchestrator.agents[model] = object()
+        orchestrator.agent_capabilities[model] = strategy.IndustryAgentCapability(
+            agent_id=model, industry="bfsi", capabilities=[f"uses_{model}"], ollama_model=model,
+            chroma_collection="bfsi_regulations", performance_score=0.9, specialization=model
+        )
+    return orchestrator
+
+
+def run(orchestrator, tasks):
+    async def scenario():
+        try:
+            return await orchestrator._execute_industry_tasks(tasks)
+        finally:
+            await orchestrator.ollama.close()
+
+    return asyncio.run(scenario())
+
+
+class TestIndustryTaskExecution:
+    """Test cases for concurrent, bounded and time-limited task execution"""
+
+    def test_tasks_on_different_models_overlap(self, monkeypatch):
+        """Independent tasks run at the same time rather than one after another"""
+        fake = FakeOllama({"m1": 0.2, "m2": 0.2, "m3": 0.2})
+        orchestrator = make_orchestrator(monkeypatch, fake, ["m1", "m2", "m3"])
+
+        results = run(orchestrator, [_task(model, f"uses_{model}") for model in ["m1", "m2", "m3"]])
+
+        assert fake.max_total_in_flight == 3
+        assert results["m2_id"]["analysis"] == "analysis by m2"
+
+    def test_per_model_concurrency_is_bounded(self, monkeypatch):
+        """No more than max_concurrency_per_model calls reach one model at once"""
+        fake = FakeOllama({"m1": 0.05})
+        orchestrator = make_orchestrator(monkeypatch, fake, ["m1"], max_concurrency=2)
+
+        results = run(orchestrator, [_task(f"t{i}", "uses_m1") for i in range(6)])
+
+        assert fake.max_in_flight["m1"] == 2
+        assert all("error" not in result for result in results.values())
+
+    def test_timed_out_task_keeps_other_results(self, monkeypatch):
+        """A slow task is reported as timed out without cancelling the others"""
+        fake = FakeOllama({"slow": 1.0, "fast": 0.0})
+        orchestrator = make_orchestrator(monkeypatch, fake, ["slow", "fast"], task_timeout=0.3)
+
+        results = run(orchestrator, [_task("slow", "uses_slow"), _task("fast", "uses_fast")])
+
+        assert results["slow_id"]["status"] == "timeout"
+        assert results["fast_id"]["analysis"] == "analysis by fast"
+
+    def test_waiting_for_a_model_slot_does_not_count_against_the_timeout(self, monkeypatch):
+        """Tasks queued behind a busy model still get their full time limit once they run"""
+        fake = FakeOllama({"m1": 0.2})
+        orchestrator = make_orchestrator(monkeypatch, fake, ["m1"], max_concurrency=1, task_timeout=0.35)
+
+        results = run(orchestrator, [_task(f"t{i}", "uses_m1") for i in range(3)])
+
+        assert [result.get("status") for result in results.values()] == [None, None, None]
+        assert fake.max_in_flight["m1"] == 1
+
+    def test_retrieval_is_one_batched_query(self, monkeypatch):
+        """Documents for every task come from a single multi-query Chroma call"""
+        fake = FakeOllama({})
+        orchestrator = make_orchestrator(monkeypatch, fake, ["m1", "m2"])
+
+        results = run(orchestrator, [_task("a", "uses_m1"), _task("b", "uses_m2"), _task("c", "uses_m1")])
+
+        chroma = orchestrator.chroma_service._service
+        assert len(chroma.calls) == 1
+        assert chroma.calls[0][0] == "bfsi_regulations"
+        assert len(chroma.calls[0][1]) == 3
+        assert results["b_id"]["chroma_collection"] == "bfsi_regulations"
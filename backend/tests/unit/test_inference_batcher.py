@@ -0,0 +1,73 @@
+"""
+Unit tests for the dynamic inference batcher
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'applications'))
+from inference_batcher import DynamicBatcher
+
+
+class TestDynamicBatcher:
+    """Test cases for DynamicBatcher"""
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests arriving together are served by one batch call"""
+        calls = []
+
+        def batch_fn(payloads, group_key):
+            calls.append(list(payloads))
+            return [p * 2 for p in payloads]
+
+        async def scenario():
+            batcher = DynamicBatcher("test", batch_fn, max_batch_size=8, max_wait_ms=50)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+            metrics = batcher.get_metrics()
+            await batcher.close()
+            return results, metrics
+
+        results, metrics = asyncio.run(scenario())
+        assert results == [0, 2, 4, 6, 8]
+        assert calls == [[0, 1, 2, 3, 4]]
+        assert metrics["batches_total"] == 1
+        assert metrics["batch_size_histogram"]["8"] == 1
+
+    def test_batches_respect_size_and_group_key(self):
+        """Batches never exceed max size or mix group keys"""
+        calls = []
+
+        def batch_fn(payloads, group_key):
+            calls.append((group_key, list(payloads)))
+            return payloads
+
+        async def scenario():
+            batcher = DynamicBatcher("test", batch_fn, max_batch_size=2, max_wait_ms=20)
+            await asyncio.gather(
+                batcher.submit(1, "a"), batcher.submit(2, "a"), batcher.submit(3, "a"), batcher.submit(4, "b")
+            )
+            await batcher.close()
+
+        asyncio.run(scenario())
+        assert all(len(payloads) <= 2 for _, payloads in calls)
+        assert ("b", [4]) in calls
+        assert sorted(p for key, payloads in calls if key == "a" for p in payloads) == [1, 2, 3]
+
+    def test_errors_propagate_to_callers(self):
+        """A failing batch fails each waiting request"""
+        def batch_fn(payloads, group_key):
+            raise ValueError("model failure")
+
+        async def scenario():
+            batcher = DynamicBatcher("test", batch_fn, max_wait_ms=1)
+            try:
+                with pytest.raises(ValueError):
+                    await batcher.submit("x")
+                return batcher.get_metrics()["errors_total"]
+            finally:
+                await batcher.close()
+
+        assert asyncio.run(scenario()) == 1
@@ -0,0 +1,100 @@
+"""
+Unit tests for the local model registry
+Tests content-addressed artifacts, versioning, stage promotion and safe loading
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
+from model_registry import ArtifactFormat, ModelRegistry, ModelRegistryError, ModelStage, hash_arrays
+
+
+@pytest.fixture
+def registry():
+    """Registry in a temporary directory"""
+    return ModelRegistry(tempfile.mkdtemp())
+
+
+class TestModelRegistry:
+    """Test model versions and artifacts"""
+
+    def test_artifacts_are_deduplicated_and_memory_mapped(self, registry):
+        """Identical arrays share one object and load without copying into memory"""
+        array = np.arange(12, dtype=np.float32).reshape(3, 4)
+        first = registry.put_array(array)
+        second = registry.put_array(array.copy())
+
+        assert first["sha256"] == second["sha256"]
+        loaded = registry.get_artifact(first)
+        assert isinstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, array)
+
+        tensors = registry.put_tensors({"layer.weight": array})
+        np.testing.assert_array_equal(registry.get_artifact(tensors)["layer.weight"], array)
+
+    def test_versions_and_stage_promotion(self, registry):
+        """Promoting to production archives the previous production version"""
+        features = np.ones((4, 2))
+        for accuracy in (0.8, 0.9):
+            registry.register(
+                "risk_model",
+                artifacts={"weights": registry.put_array(features * accuracy)},
+                metrics={"accuracy": accuracy},
+                training_data_hash=hash_arrays(features),
+                feature_schema={"format": 1, "columns": []}
+            )
+
+        registry.promote("risk_model", 1, ModelStage.PRODUCTION)
+        registry.promote("risk_model", 2, ModelStage.PRODUCTION)
+
+        production = registry.get_version("risk_model", stage=ModelStage.PRODUCTION)
+        assert production["version"] == 2
+        assert production["metrics"]["accuracy"] == 0.9
+        assert production["training_data_hash"] == hash_arrays(features)
+        assert registry.get_version("risk_model", 1)["stage"] == ModelStage.ARCHIVED.value
+        assert registry.list_models() == {"risk_model": {"production": 2}}
+
+        with pytest.raises(ModelRegistryError):
+            registry.get_version("risk_model", stage=ModelStage.STAGING)
+
+    def test_pickle_artifacts_require_opt_in(self, registry):
+        """joblib artifacts are refused unless pickle loading is explicitly allowed"""
+        entry = registry._write_artifact(ArtifactFormat.JOBLIB, lambda path: joblib.dump({"coef": [1.0, 2.0]}, path))
+
+        with pytest.raises(ModelRegistryError):
+            registry.get_artifact(entry)
+
+        trusted = ModelRegistry(registry.root_dir, allow_pickle=True)
+        assert trusted.get_artifact(entry) == {"coef": [1.0, 2.0]}
+
+    def test_loading_without_the_serializer_raises_a_clear_error(self, registry, monkeypatch):
+        """skops/safetensors artifacts fail with RuntimeError when the library is missing"""
+        import model_registry
+        skops_entry = registry._write_artifact(ArtifactFormat.SKOPS, lambda path: Path(path).write_bytes(b"skops"))
+        tensor_entry = registry._write_artifact(ArtifactFormat.SAFETENSORS, lambda path: Path(path).write_bytes(b"tensors"))
+        monkeypatch.setattr(model_registry, "SKOPS_AVAILABLE", False)
+        monkeypatch.setattr(model_registry, "SAFETENSORS_AVAILABLE", False)
+
+        with pytest.raises(RuntimeError, match="skops"):
+            registry.get_artifact(skops_entry)
+        with pytest.raises(RuntimeError, match="safetensors"):
+            registry.get_artifact(tensor_entry)
+
+    def test_location_and_pickle_policy_default_from_environment(self, registry, monkeypatch):
+        """Every service shares one registry configured by MODEL_REGISTRY_DIR / MODEL_REGISTRY_ALLOW_PICKLE"""
+        entry = registry._write_artifact(ArtifactFormat.JOBLIB, lambda path: joblib.dump([3], path))
+        monkeypatch.setenv("MODEL_REGISTRY_DIR", registry.root_dir)
+        monkeypatch.setenv("MODEL_REGISTRY_ALLOW_PICKLE", "true")
+
+        from_env = ModelRegistry()
+
+        assert from_env.root_dir == registry.root_dir
+        assert from_env.get_artifact(entry) == [3]
+        assert ModelRegistry(allow_pickle=False).allow_pickle is False
@@ -0,0 +1,153 @@
+"""
+Unit tests for multi-agent capability routing and dependency scheduling
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'orchestration'))
+from multi_agent_strategy import (
+    MultiAgentOrchestrator, AgentCapability, Task, TaskPriority, TaskStatus
+)
+
+
+def _task(task_type, capabilities, dependencies=(), priority=TaskPriority.MEDIUM, complexity=0.5):
+    return Task(
+        task_id=f"{task_type}_id",
+        task_type=task_type,
+        priority=priority,
+        complexity=complexity,
+        required_capabilities=list(capabilities),
+        deadline=None,
+        context={},
+        dependencies=list(dependencies),
+        created_at=datetime.now()
+    )
+
+
+def _orchestrator():
+    orchestrator = MultiAgentOrchestrator()
+    asyncio.run(orchestrator._initialize_agents())
+    return orchestrator
+
+
+class TestCapabilityRouting:
+    """Test cases for the capability index"""
+
+    def test_index_matches_exhaustive_scan(self):
+        """Indexed routing picks the same agent as scoring every agent"""
+        orchestrator = _orchestrator()
+        orchestrator.agent_capabilities["risk_analyzer_2"] = AgentCapability(
+            agent_id="risk_analyzer_2",
+            capabilities=["risk_modeling", "prediction", "statistical_analysis"],
+            performance_score=0.5,
+            load_factor=0.0,
+            specialization="risk_analysis",
+            reliability=0.99
+        )
+        orchestrator.capability_index.update(orchestrator.agent_capabilities["risk_analyzer_2"])
+
+        def exhaustive(task):
+            scored = [
+                (orchestrator._calculate_agent_suitability_score(capability, task), agent_id)
+                for agent_id, capability in orchestrator.agent_capabilities.items()
+                if all(cap in capability.capabilities for cap in task.required_capabilities)
+            ]
+            return max(scored)[1] if scored else None
+
+        for complexity in (0.1, 0.5, 0.9):
+            task = _task("risk", ["risk_modeling", "prediction"], complexity=complexity)
+            assert orchestrator._find_best_agent_for_task(task) == exhaustive(task)
+
+        # A heavily loaded agent loses its place once its metrics are re-indexed
+        orchestrator.agent_capabilities["risk_analyzer"].load_factor = 0.9
+        orchestrator.capability_index.update(orchestrator.agent_capabilities["risk_analyzer"])
+        assert orchestrator._find_best_agent_for_task(_task("risk", ["risk_modeling"], complexity=0.9)) == "risk_analyzer_2"
+        assert orchestrator._find_best_agent_for_task(_task("none", ["risk_modeling", "gap_analysis"])) is None
+
+
+class TestDependencyScheduling:
+    """Test cases for dependency-driven dispatch"""
+
+    def test_dependents_run_when_last_dependency_finishes(self):
+        """A task is dispatched as soon as its dependencies finish, without waiting for a tick"""
+        orchestrator = _orchestrator()
+        order = []
+        gates = {}
+
+        for agent in orchestrator.agents.values():
+            async def execute_task(context):
+                order.append(context["name"])
+                await gates[context["name"]].wait()
+                return {"status": "completed", "result": context["name"]}
+            agent.execute_task = execute_task
+
+        first = _task("risk_assessment", ["risk_modeling"])
+        second = _task("gap_analysis", ["gap_analysis"])
+        dependent = _task("cross_domain_analysis", ["cross_domain_analysis"],
+                          dependencies=["risk_assessment", "gap_analysis"], priority=TaskPriority.CRITICAL)
+        for task in (first, second, dependent):
+            task.context = {"name": task.task_type}
+
+        async def run():
+            gates.update({task.task_type: asyncio.Event() for task in (first, second, dependent)})
+            for task in (first, second, dependent):
+                await orchestrator.submit_task(task)
+            await asyncio.sleep(0)
+            assert dependent.status == TaskStatus.PENDING
+            assert orchestrator.task_scheduler.pending_count == 1
+
+            gates["risk_assessment"].set()
+            await asyncio.sleep(0.01)
+            assert dependent.status == TaskStatus.PENDING
+
+            gates["gap_analysis"].set()
+            await asyncio.sleep(0.01)
+            assert dependent.status == TaskStatus.IN_PROGRESS
+            gates["cross_domain_analysis"].set()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        assert order == ["risk_assessment", "gap_analysis", "cross_domain_analysis"]
+        assert set(orchestrator.completed_tasks) == {first.task_id, second.task_id, dependent.task_id}
+        assert orchestrator.task_queue == {}
+
+
+class TestTaskCompletion:
+    """Test cases for event-driven completion waits"""
+
+    def test_results_stream_in_completion_order_with_partial_timeout(self):
+        """Results arrive as tasks finish and a timeout returns what finished in time"""
+        orchestrator = _orchestrator()
+        delays = {"risk_assessment": 0.05, "gap_analysis": 0.01, "insight_generation": 5.0}
+        for agent in orchestrator.agents.values():
+            async def execute_task(context):
+                await asyncio.sleep(delays[context["name"]])
+                return {"status": "completed", "result": context["name"]}
+            agent.execute_task = execute_task
+
+        tasks = [
+            _task("risk_assessment", ["risk_modeling"]),
+            _task("gap_analysis", ["gap_analysis"]),
+            _task("insight_generation", ["insight_generation"])
+        ]
+        for task in tasks:
+            task.context = {"name": task.task_type}
+
+        async def run():
+            for task in tasks:
+                await orchestrator.submit_task(task)
+            ids = [task.task_id for task in tasks]
+            streamed = [task_id async for task_id, _ in orchestrator.as_completed(ids, timeout=0.5)]
+
+            start = time.monotonic()
+            results = await orchestrator._wait_for_task_completion(ids, timeout=0.1)
+            return streamed, results, time.monotonic() - start
+
+        streamed, results, elapsed = asyncio.run(run())
+        assert streamed == ["gap_analysis_id", "risk_assessment_id"]
+        assert set(results) == {"gap_analysis_id", "risk_assessment_id"}
+        assert elapsed < 0.5
@@ -0,0 +1,173 @@
+"""
+Unit tests for the SQL aggregate queries and bulk updates of the policy repository
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.application.services.policy_service import PolicyService
+from src.core.infrastructure.database.sqlalchemy_models import Base, PolicyModel
+from src.core.infrastructure.persistence.repositories import SQLAlchemyPolicyRepository
+
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with the GRC schema"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_policy(session, organization_id="org-1", status="active", policy_type="compliance",
+               framework=None, tags=None, created_at=None, effective_date=None, expiry_date=None):
+    """Insert a policy row and return its ID"""
+    policy_id = uuid.uuid4()
+    now = datetime.utcnow()
+    session.add(PolicyModel(
+        id=policy_id,
+        title=f"Policy {policy_id.hex[:6]}",
+        description="Policy description",
+        content="Policy content",
+        policy_type=policy_type,
+        status=status,
+        organization_id=organization_id,
+        owner_id="owner-1",
+        created_at=created_at or now,
+        updated_at=now,
+        effective_date=effective_date,
+        expiry_date=expiry_date,
+        tags=tags or [],
+        extra_metadata={"framework": framework} if framework else {}
+    ))
+    session.commit()
+    return policy_id
+
+
+class TestPolicyAggregates:
+    """Test cases for the GROUP BY and COUNT queries"""
+
+    def test_counts_by_status_framework_and_filters(self, session):
+        """Aggregates are scoped to the organization and honour filters"""
+        add_policy(session, status="active", framework="SOX", tags=["aml"])
+        add_policy(session, status="active", framework="SOX")
+        add_policy(session, status="draft", framework="PCI-DSS", tags=["aml"])
+        add_policy(session, status="draft")
+        add_policy(session, organization_id="org-2", status="active", framework="SOX")
+        repository = SQLAlchemyPolicyRepository(session)
+
+        assert asyncio.run(repository.count_by_status("org-1")) == {"active": 2, "draft": 2}
+        assert asyncio.run(repository.count_by_framework("org-1")) == {
+            "SOX": 2, "PCI-DSS": 1, "unspecified": 1
+        }
+        assert asyncio.run(repository.count_by_framework("org-1", {"status": "draft"})) == {
+            "PCI-DSS": 1, "unspecified": 1
+        }
+        assert asyncio.run(repository.count_by_filters("org-1", {"tag": "aml"})) == 2
+        assert asyncio.run(repository.count_by_filters("org-1", {"framework": "SOX", "status": "active"})) == 2
+
+    def test_policy_statistics(self, session):
+        """Dashboard statistics come from conditional aggregates"""
+        now = datetime.utcnow()
+        add_policy(session, status="active", expiry_date=now - timedelta(days=1))
+        add_policy(session, status="active", expiry_date=now + timedelta(days=10))
+        add_policy(session, status="draft", policy_type="security", created_at=now - timedelta(days=90))
+        add_policy(session, status="under_review", policy_type="security")
+        repository = SQLAlchemyPolicyRepository(session)
+
+        stats = asyncio.run(repository.get_policy_statistics("org-1"))
+
+        assert stats["total_policies"] == 4
+        assert stats["active_policies"] == 2
+        assert stats["draft_policies"] == 1
+        assert stats["under_review"] == 1
+        assert stats["expired_policies"] == 1
+        assert stats["expiring_soon"] == 1
+        assert stats["recent_policies"] == 3
+        assert stats["policies_by_type"] == {"compliance": 2, "security": 2}
+
+
+class TestPolicyBulkUpdate:
+    """Test cases for the set-based bulk update"""
+
+    def test_updates_title_content_and_records_updated_by(self, session):
+        """Every field update_policy allows can be bulk updated, and the editor is recorded"""
+        ids = [add_policy(session, framework="SOX"), add_policy(session)]
+        repository = SQLAlchemyPolicyRepository(session)
+
+        updated = asyncio.run(repository.bulk_update(
+            ids, {"title": "Renamed", "content": "New content", "status": "archived"}, updated_by="user-9"
+        ))
+
+        assert set(updated) == set(ids)
+        session.expire_all()
+        for policy in asyncio.run(repository.get_by_ids(ids)):
+            assert policy.title == "Renamed"
+            assert policy.content == "New content"
+            assert policy.status.value == "archived"
+            assert policy.metadata["updated_by"] == "user-9"
+        frameworks = {policy.metadata.get("framework") for policy in asyncio.run(repository.get_by_ids(ids))}
+        assert frameworks == {"SOX", None}
+
+    def test_skips_rows_whose_dates_would_become_inconsistent(self, session):
+        """The UPDATE itself refuses to move an effective date past the expiry date"""
+        now = datetime.utcnow()
+        ok = add_policy(session, expiry_date=now + timedelta(days=60))
+        inconsistent = add_policy(session, expiry_date=now + timedelta(days=5))
+        repository = SQLAlchemyPolicyRepository(session)
+
+        updated = asyncio.run(repository.bulk_update([ok, inconsistent], {"effective_date": now + timedelta(days=30)}))
+
+        assert updated == [ok]
+
+    def test_rejects_unsupported_fields(self, session):
+        """Columns outside the whitelist are never written"""
+        repository = SQLAlchemyPolicyRepository(session)
+
+        with pytest.raises(ValueError):
+            asyncio.run(repository.bulk_update([add_policy(session)], {"updated_at": datetime.utcnow()}))
+
+
+class TestBulkUpdatePolicies:
+    """Test cases for PolicyService.bulk_update_policies"""
+
+    def test_reports_per_policy_errors(self, session):
+        """Missing policies and failed validations keep their specific error messages"""
+        now = datetime.utcnow()
+        ok = add_policy(session, effective_date=now, expiry_date=now + timedelta(days=60))
+        early_expiry = add_policy(session, effective_date=now + timedelta(days=10))
+        missing = uuid.uuid4()
+        service = PolicyService(SQLAlchemyPolicyRepository(session), audit_log_repository=None)
+
+        result = asyncio.run(service.bulk_update_policies(
+            [ok, early_expiry, missing], {"expiry_date": now + timedelta(days=5), "id": uuid.uuid4()}, "user-9"
+        ))
+
+        assert result["successful"] == 1
+        assert result["total"] == 3
+        errors = {error["policy_id"]: error["error"] for error in result["errors"]}
+        assert errors == {
+            str(early_expiry): "Expiry date must be after effective date",
+            str(missing): "Policy not found",
+        }
+
+    def test_empty_content_is_rejected_but_empty_description_is_allowed(self, session):
+        """Bulk updates apply the same validation as update_policy"""
+        policy_id = add_policy(session)
+        service = PolicyService(SQLAlchemyPolicyRepository(session), audit_log_repository=None)
+
+        rejected = asyncio.run(service.bulk_update_policies([policy_id], {"content": " "}, "user-9"))
+        accepted = asyncio.run(service.bulk_update_policies([policy_id], {"description": ""}, "user-9"))
+
+        assert rejected["errors"] == [{"policy_id": str(policy_id), "error": "Policy content cannot be empty"}]
+        assert accepted["successful"] == 1
@@ -0,0 +1,62 @@
+"""
+Unit tests for the Chroma retrieval result cache
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ai-agents', 'agents_organized', 'orchestration'))
+from retrieval_cache import CachedChromaService, RetrievalCache
+
+
+class FakeChromaService:
+    """Records queries and returns one document per query text"""
+
+    def __init__(self):
+        self.calls = []
+        self.documents = {}
+
+    def query_documents(self, query_texts, n_results=5, collection_name="default"):
+        self.calls.append(list(query_texts))
+        stored = self.documents.get(collection_name, [])
+        return {
+            "documents": [[f"{text}:{doc}" for doc in stored][:n_results] for text in query_texts],
+            "ids": [[str(i) for i in range(len(stored))][:n_results] for _ in query_texts],
+            "embeddings": None
+        }
+
+    def add_documents(self, documents, collection_name="default"):
+        self.documents.setdefault(collection_name, []).extend(documents)
+
+
+class TestRetrievalCache:
+    """Test cases for cached retrieval"""
+
+    def test_hits_misses_batching_and_invalidation(self):
+        """Repeated queries are served from cache and adding documents invalidates the collection"""
+        fake = FakeChromaService()
+        service = CachedChromaService(fake)
+        service.add_documents(["basel"], collection_name="bfsi")
+
+        first = service.query_documents(["risk bfsi", "aml bfsi"], n_results=5, collection_name="bfsi")
+        again = service.query_documents(["  Risk   BFSI", "kyc bfsi"], n_results=5, collection_name="bfsi")
+        assert fake.calls == [["risk bfsi", "aml bfsi"], ["kyc bfsi"]]
+        assert again["documents"][0] == first["documents"][0] == ["risk bfsi:basel"]
+        assert service.cache.get_stats()["hits"] == 1
+        assert service.cache.get_stats()["misses"] == 3
+
+        service.add_documents(["sox"], collection_name="bfsi")
+        refreshed = service.query_documents(["risk bfsi"], collection_name="bfsi")
+        assert refreshed["documents"][0] == ["risk bfsi:basel", "risk bfsi:sox"]
+        assert len(fake.calls) == 3
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        """Entries beyond the byte budget are evicted oldest first"""
+        cache = RetrievalCache(max_bytes=4000)
+        for i in range(50):
+            cache.put(cache.key("c", f"query {i}", 5), {"documents": ["x" * 100]})
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 4000
+        assert stats["evictions"] > 0
+        assert cache.get(cache.key("c", "query 49", 5)) is not None
+        assert cache.get(cache.key("c", "query 0", 5)) is None
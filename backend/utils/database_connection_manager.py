@@ -2,221 +2,393 @@
 """
 Database Connection Manager with Connection Pooling
 Provides efficient database connection management for SQLite with pooling capabilities
+
+SQLite allows many concurrent readers but only one writer, so each pool holds a
+single dedicated writer connection (serialized by a lock) plus a set of
+read-only connections. All connections run in WAL mode so readers never block
+the writer. Connections are opened with ``check_same_thread=False`` and may be
+handed across threadpool workers; the pool guarantees that a connection is
+only ever used by one thread at a time. A thread that already holds the writer
+may enter ``write_connection``/``transaction`` again; the nested block joins the
+outer unit of work instead of waiting for itself.
 """
 
+import asyncio
 import sqlite3
 import threading
 import logging
-from contextlib import contextmanager
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, asynccontextmanager
+from typing import Optional, Dict, Any, List, Callable, Iterable, Sequence, Tuple
 from queue import Queue, Empty
 import time
 
 logger = logging.getLogger(__name__)
 
+# Pragmas applied to every pooled connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=10000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+)
+
+
+class _PooledConnection:
+    """A pooled SQLite connection together with its bookkeeping"""
+
+    __slots__ = ("conn", "readonly", "last_used")
+
+    def __init__(self, conn: sqlite3.Connection, readonly: bool):
+        self.conn = conn
+        self.readonly = readonly
+        self.last_used = time.monotonic()
+
+
 class DatabaseConnectionPool:
     """
     SQLite Connection Pool for efficient database access
-    Provides connection pooling with WAL mode for better concurrency
+    Provides one writer connection plus N reader connections in WAL mode
     """
-    
-    def __init__(self, db_path: str, max_connections: int = 10, timeout: int = 30):
+
+    def __init__(self, db_path: str, max_connections: int = 10, timeout: int = 30,
+                 idle_check_interval: float = 30.0, cached_statements: int = 256):
         """
         Initialize connection pool
-        
+
         Args:
             db_path: Path to SQLite database file
-            max_connections: Maximum number of connections in pool
+            max_connections: Maximum number of connections in pool (one of them is the writer)
             timeout: Connection timeout in seconds
+            idle_check_interval: Connections idle longer than this (seconds) are
+                liveness-checked before reuse; busy connections are never pinged
+            cached_statements: Size of each connection's prepared statement cache
         """
         self.db_path = db_path
-        self.max_connections = max_connections
+        self.max_connections = max(2, max_connections)
+        self.max_readers = self.max_connections - 1
         self.timeout = timeout
-        self._pool = Queue(maxsize=max_connections)
+        self.idle_check_interval = idle_check_interval
+        self.cached_statements = cached_statements
+
+        self._readers: Queue = Queue(maxsize=self.max_readers)
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[_PooledConnection] = None
+        self._writer_owner: Optional[int] = None  # Thread ident holding the writer, for reentry
+        self._writer_depth = 0
         self._created_connections = 0
-        self._active_connections = 0
-        
-        # Thread-local storage for thread-safe connection management
-        self._thread_local = threading.local()
-        
+        self._active_readers = 0
+        self._liveness_checks = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # Initialize database with WAL mode for better concurrency
         self._initialize_database()
-        
-        logger.info(f"Database connection pool initialized: {db_path}, max_connections={max_connections}")
-    
+
+        logger.info(f"Database connection pool initialized: {db_path}, "
+                    f"readers={self.max_readers}, writers=1")
+
     def _initialize_database(self):
         """Initialize database with WAL mode for better concurrency"""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                # Enable WAL mode for better concurrency
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Set other performance optimizations
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA cache_size=10000")
-                conn.execute("PRAGMA temp_store=MEMORY")
-                conn.execute("PRAGMA mmap_size=268435456")  # 256MB
-                conn.commit()
-                logger.info("Database initialized with WAL mode and performance optimizations")
+            self._writer = self._open(readonly=False)
+            logger.info("Database initialized with WAL mode and performance optimizations")
         except sqlite3.Error as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
-    
-    def _create_connection(self) -> sqlite3.Connection:
-        """Create a new database connection with optimizations"""
-        # Hold lock during entire connection creation process to prevent race conditions
+
+    def _open(self, readonly: bool) -> _PooledConnection:
+        """Open a new database connection with optimizations"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,  # The pool hands each connection to one thread at a time
+            cached_statements=self.cached_statements,
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+
         with self._lock:
-            try:
-                conn = sqlite3.connect(
-                    self.db_path,
-                    timeout=self.timeout,
-                    check_same_thread=True  # Ensure thread safety - connections only used by creating thread
-                )
-                
-                # Set connection-specific optimizations
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA cache_size=10000")
-                conn.execute("PRAGMA temp_store=MEMORY")
-                
-                # Atomically increment counters after successful connection creation
-                self._created_connections += 1
-                self._active_connections += 1
-                
-                logger.debug(f"Created new database connection (total: {self._created_connections}, active: {self._active_connections})")
-                return conn
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to create database connection: {e}")
-                raise
-    
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get a connection from the pool or create a new one"""
+            self._created_connections += 1
+        logger.debug(f"Created new {'reader' if readonly else 'writer'} connection "
+                     f"(total: {self._created_connections})")
+        return _PooledConnection(conn, readonly)
+
+    def _is_alive(self, pooled: _PooledConnection) -> bool:
+        """Check connection liveness, but only once it has been idle for a while"""
+        if time.monotonic() - pooled.last_used < self.idle_check_interval:
+            return True
+        with self._lock:
+            self._liveness_checks += 1
         try:
-            # Try to get existing connection from pool
-            conn = self._pool.get_nowait()
-            
-            # Test if connection is still valid
-            try:
-                conn.execute("SELECT 1")
-                return conn
-            except sqlite3.Error:
-                # Connection is stale, decrement counter and create a new one
-                logger.debug("Stale connection detected, creating new one")
-                with self._lock:
-                    self._active_connections -= 1
-                    logger.debug(f"Decremented active connections due to stale connection (active: {self._active_connections})")
-                return self._create_connection()
-                
+            pooled.conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(pooled: _PooledConnection):
+        try:
+            pooled.conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _acquire_reader(self) -> _PooledConnection:
+        """Get a reader from the pool, opening a new one while under the limit"""
+        try:
+            pooled = self._readers.get_nowait()
         except Empty:
-            # Pool is empty, create new connection if under limit
-            with self._lock:
-                if self._active_connections < self.max_connections:
-                    # Release lock before calling _create_connection since it will acquire it
-                    pass
-                else:
-                    # Wait for a connection to become available
-                    # Release lock before waiting to avoid deadlock
-                    pass
-            
-            # Check again outside the lock to avoid race condition
             with self._lock:
-                if self._active_connections < self.max_connections:
-                    return self._create_connection()
-                else:
-                    # Wait for a connection to become available
-                    # Release lock before waiting to avoid deadlock
-                    pass
-            
-            # Wait for a connection to become available (outside of lock)
+                can_open = self._active_readers < self.max_readers
+                if can_open:
+                    self._active_readers += 1
+            if can_open:
+                try:
+                    return self._open(readonly=True)
+                except sqlite3.Error:
+                    with self._lock:
+                        self._active_readers -= 1
+                    raise
             try:
-                conn = self._pool.get(timeout=self.timeout)
-                # Test connection
-                conn.execute("SELECT 1")
-                return conn
+                pooled = self._readers.get(timeout=self.timeout)
             except Empty:
                 raise sqlite3.Error("Connection pool timeout - no connections available")
-            except sqlite3.Error:
-                # Connection is stale, decrement counter and create new one
-                logger.debug("Stale connection from pool timeout detected")
-                with self._lock:
-                    self._active_connections -= 1
-                    logger.debug(f"Decremented active connections due to stale connection (active: {self._active_connections})")
-                return self._create_connection()
-    
-    def _return_connection(self, conn: sqlite3.Connection):
-        """Return a connection to the pool"""
+
+        if self._is_alive(pooled):
+            return pooled
+
+        logger.debug("Stale reader connection detected, reopening")
+        self._close_quietly(pooled)
         try:
-            # Reset connection state
-            conn.rollback()  # Clear any pending transactions
-            
-            # Test connection is still valid
-            conn.execute("SELECT 1")
-            
-            # Return to pool
-            self._pool.put_nowait(conn)
-            
+            return self._open(readonly=True)
         except sqlite3.Error:
-            # Connection is stale, close it
-            try:
-                conn.close()
-            except:
-                pass
-            
+            # The stale connection's slot is gone; free it so the pool can open another
+            with self._lock:
+                self._active_readers -= 1
+            raise
+
+    def _release_reader(self, pooled: _PooledConnection):
+        """Return a reader connection to the pool"""
+        try:
+            if pooled.conn.in_transaction:
+                pooled.conn.rollback()
+        except sqlite3.Error:
+            self._close_quietly(pooled)
             with self._lock:
-                self._active_connections -= 1
-            
-            logger.debug("Closed stale connection")
-        except Exception as e:
-            logger.error(f"Error returning connection to pool: {e}")
+                self._active_readers -= 1
+            logger.debug("Closed stale reader connection")
+            return
+        pooled.last_used = time.monotonic()
+        self._readers.put_nowait(pooled)
+
+    def _acquire_writer(self, reentrant: bool = True) -> _PooledConnection:
+        """
+        Take exclusive ownership of the writer connection
+
+        Args:
+            reentrant: Let the calling thread enter again while it holds the writer.
+                Disabled for async callers, whose worker thread is reused by other tasks.
+        """
+        if reentrant and self._writer_owner == threading.get_ident():
+            self._writer_depth += 1
+            return self._writer
+        if not self._write_lock.acquire(timeout=self.timeout):
+            raise sqlite3.Error("Connection pool timeout - writer connection busy")
+        try:
+            if self._writer is None or not self._is_alive(self._writer):
+                if self._writer is not None:
+                    logger.debug("Stale writer connection detected, reopening")
+                    self._close_quietly(self._writer)
+                self._writer = self._open(readonly=False)
+            self._writer_owner = threading.get_ident() if reentrant else None
+            self._writer_depth = 1
+            return self._writer
+        except BaseException:
+            self._write_lock.release()
+            raise
+
+    def _release_writer(self, pooled: _PooledConnection):
+        """Release the writer, discarding any uncommitted work once the outermost holder exits"""
+        if self._writer_depth > 1:
+            self._writer_depth -= 1
+            return
+        self._writer_owner = None
+        self._writer_depth = 0
+        try:
+            if pooled.conn.in_transaction:
+                pooled.conn.rollback()
+            pooled.last_used = time.monotonic()
+        except sqlite3.Error:
+            self._close_quietly(pooled)
+            self._writer = None
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def read_connection(self):
+        """Context manager yielding a read-only connection"""
+        pooled = self._acquire_reader()
+        try:
+            yield pooled.conn
+        finally:
+            self._release_reader(pooled)
+
+    @contextmanager
+    def write_connection(self):
+        """
+        Context manager yielding the single writer connection
+        Uncommitted changes are rolled back when the block exits
+        """
+        pooled = self._acquire_writer()
+        try:
+            yield pooled.conn
+        finally:
+            self._release_writer(pooled)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager running one unit of work on the writer, committing on success
+        A transaction nested inside another block on the writer joins the outer one
+        """
+        with self.write_connection() as conn:
+            if self._writer_depth > 1:
+                yield conn
+                return
             try:
-                conn.close()
-            except:
-                pass
-    
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
     @contextmanager
-    def get_connection(self):
+    def get_connection(self, readonly: bool = False):
         """
         Context manager for database connections
         Automatically handles connection acquisition and return
+
+        Args:
+            readonly: Use a reader connection instead of the writer
         """
-        conn = None
-        try:
-            conn = self._get_connection()
+        manager = self.read_connection() if readonly else self.write_connection()
+        with manager as conn:
             yield conn
-        except Exception as e:
-            if conn:
-                try:
-                    conn.rollback()
-                except:
-                    pass
-            raise
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_connections,
+                        thread_name_prefix="sqlite-pool",
+                    )
+        return self._executor
+
+    async def run_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking callable on the pool's worker threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def _fetchall(self, sql: str, params: Sequence[Any]) -> List[Tuple]:
+        with self.read_connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: Sequence[Any]) -> Optional[Tuple]:
+        with self.read_connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _execute_write(self, sql: str, params: Sequence[Any]) -> Tuple[int, Optional[int]]:
+        with self.transaction() as conn:
+            cursor = conn.execute(sql, params)
+            return cursor.rowcount, cursor.lastrowid
+
+    def _executemany_write(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> int:
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params).rowcount
+
+    def _run_in_transaction(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self.transaction() as conn:
+            return func(conn)
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """Run a query on a reader connection and return all rows"""
+        return await self.run_sync(self._fetchall, sql, params)
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[Tuple]:
+        """Run a query on a reader connection and return the first row"""
+        return await self.run_sync(self._fetchone, sql, params)
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> Tuple[int, Optional[int]]:
+        """Run a statement on the writer in its own transaction; returns (rowcount, lastrowid)"""
+        return await self.run_sync(self._execute_write, sql, params)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> int:
+        """Run a statement for every parameter set in a single transaction"""
+        return await self.run_sync(self._executemany_write, sql, list(seq_of_params))
+
+    async def run_in_transaction(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run ``func(conn)`` on the writer inside one transaction, off the event loop"""
+        return await self.run_sync(self._run_in_transaction, func)
+
+    @asynccontextmanager
+    async def acquire(self, readonly: bool = True):
+        """
+        Async context manager yielding a connection without blocking the event loop
+        while waiting for it. Queries on the connection itself still block, so prefer
+        fetchall/execute/run_in_transaction for anything non-trivial.
+        """
+        if readonly:
+            pooled = await self.run_sync(self._acquire_reader)
+            release = self._release_reader
+        else:
+            pooled = await self.run_sync(self._acquire_writer, False)
+            release = self._release_writer
+        try:
+            yield pooled.conn
         finally:
-            if conn:
-                self._return_connection(conn)
-    
+            release(pooled)
+
     def get_pool_status(self) -> Dict[str, Any]:
         """Get current pool status for monitoring"""
         with self._lock:
+            active = self._active_readers + 1
             return {
                 "max_connections": self.max_connections,
-                "active_connections": self._active_connections,
-                "available_connections": self._pool.qsize(),
+                "max_readers": self.max_readers,
+                "active_connections": active,
+                "active_readers": self._active_readers,
+                "available_connections": self._readers.qsize(),
+                "writer_busy": self._write_lock.locked(),
                 "created_connections": self._created_connections,
-                "pool_utilization": f"{(self._active_connections / self.max_connections) * 100:.1f}%"
+                "liveness_checks": self._liveness_checks,
+                "pool_utilization": f"{(active / self.max_connections) * 100:.1f}%"
             }
-    
+
     def close_all_connections(self):
         """Close all connections in the pool"""
         with self._lock:
-            while not self._pool.empty():
+            while not self._readers.empty():
                 try:
-                    conn = self._pool.get_nowait()
-                    conn.close()
-                except:
-                    pass
-            self._active_connections = 0
-            logger.info("All database connections closed")
+                    self._close_quietly(self._readers.get_nowait())
+                except Empty:
+                    break
+            self._active_readers = 0
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        with self._write_lock:
+            if self._writer is not None:
+                self._close_quietly(self._writer)
+                self._writer = None
+        logger.info("All database connections closed")
 
 # Global connection pool instances
 _connection_pools: Dict[str, DatabaseConnectionPool] = {}
@@ -225,12 +397,12 @@ _pools_lock = threading.Lock()  # Lock for thread-safe access to _connection_poo
 def get_connection_pool(db_path: str, max_connections: int = 10, timeout: int = 30) -> DatabaseConnectionPool:
     """
     Get or create a connection pool for the specified database
-    
+
     Args:
         db_path: Path to SQLite database file
         max_connections: Maximum number of connections in pool
         timeout: Connection timeout in seconds
-    
+
     Returns:
         DatabaseConnectionPool instance
     """
@@ -245,28 +417,33 @@ def get_connection_pool(db_path: str, max_connections: int = 10, timeout: int =
                     max_connections=max_connections,
                     timeout=timeout
                 )
-    
+
     return _connection_pools[db_path]
 
 def close_all_pools():
     """Close all connection pools"""
-    for pool in _connection_pools.values():
-        pool.close_all_connections()
-    _connection_pools.clear()
+    with _pools_lock:
+        for pool in _connection_pools.values():
+            pool.close_all_connections()
+        _connection_pools.clear()
     logger.info("All connection pools closed")
 
 # Convenience function for easy database access
 @contextmanager
-def get_db_connection(db_path: str, max_connections: int = 10, timeout: int = 30):
+def get_db_connection(db_path: str, max_connections: int = 10, timeout: int = 30,
+                      readonly: bool = False):
     """
     Convenience function for getting database connections with pooling
-    
+
     Usage:
         with get_db_connection("database.db") as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM table")
-            result = cursor.fetchall()
+            cursor.execute("INSERT INTO table VALUES (?)", (value,))
+            conn.commit()
+
+        with get_db_connection("database.db", readonly=True) as conn:
+            rows = conn.execute("SELECT * FROM table").fetchall()
     """
     pool = get_connection_pool(db_path, max_connections, timeout)
-    with pool.get_connection() as conn:
+    with pool.get_connection(readonly=readonly) as conn:
         yield conn
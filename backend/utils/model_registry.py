@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Local Filesystem Model Registry
+Versioned, content-addressed storage for trained models and their metadata
+
+Artifacts are stored once under ``objects/`` keyed by their SHA-256 digest;
+each model version is a JSON manifest that references artifacts by digest and
+records metrics, the feature schema and the training data hash. Stages
+(staging, production, archived) point at versions and are switched atomically.
+
+Artifact formats avoid pickle wherever possible:
+    - numpy arrays: ``.npy`` written without pickle and loaded memory-mapped
+    - torch weights: ``safetensors`` (falls back to a pickle-free ``.npz``)
+    - sklearn estimators: ``skops`` when installed; otherwise joblib, which is
+      only loaded when pickle is allowed (allow_pickle=True or
+      MODEL_REGISTRY_ALLOW_PICKLE=true)
+
+The registry location defaults to the MODEL_REGISTRY_DIR environment variable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Dict, Any, List, Iterable
+
+import numpy as np
+
+try:
+    from safetensors.numpy import save_file as save_safetensors, load_file as load_safetensors
+    SAFETENSORS_AVAILABLE = True
+except ImportError:
+    SAFETENSORS_AVAILABLE = False
+
+try:
+    import skops.io as skops_io
+    SKOPS_AVAILABLE = True
+except ImportError:
+    SKOPS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+REGISTRY_DIR_ENV = "MODEL_REGISTRY_DIR"
+ALLOW_PICKLE_ENV = "MODEL_REGISTRY_ALLOW_PICKLE"
+DEFAULT_REGISTRY_DIR = os.path.join("data", "model_registry")
+
+
+class ModelStage(Enum):
+    """Deployment stage of a model version"""
+    NONE = "none"
+    STAGING = "staging"
+    PRODUCTION = "production"
+    ARCHIVED = "archived"
+
+
+class ArtifactFormat(Enum):
+    """Serialization format of a stored artifact"""
+    NUMPY = "npy"
+    SAFETENSORS = "safetensors"
+    NPZ = "npz"
+    JSON = "json"
+    SKOPS = "skops"
+    JOBLIB = "joblib"
+
+
+class ModelRegistryError(Exception):
+    """Raised for missing models, versions or unsafe artifact loads"""
+
+
+def hash_arrays(*arrays: Optional[np.ndarray]) -> str:
+    """SHA-256 over the shapes, dtypes and bytes of training arrays"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        if array is None:
+            digest.update(b"none")
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Versioned model registry on the local filesystem
+    Thread-safe within a process; manifests and stage pointers are written atomically
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, allow_pickle: Optional[bool] = None):
+        """
+        Initialize the registry
+
+        Args:
+            root_dir: Directory holding artifacts and manifests; defaults to
+                $MODEL_REGISTRY_DIR, then data/model_registry
+            allow_pickle: Permit loading joblib (pickle) artifacts; defaults to
+                $MODEL_REGISTRY_ALLOW_PICKLE. Digests are verified first, but
+                pickle can still execute code, so leave this off unless the
+                registry directory is fully trusted.
+        """
+        if root_dir is None:
+            root_dir = os.getenv(REGISTRY_DIR_ENV, DEFAULT_REGISTRY_DIR)
+        if allow_pickle is None:
+            allow_pickle = os.getenv(ALLOW_PICKLE_ENV, "false").lower() == "true"
+        self.root_dir = root_dir
+        self.allow_pickle = allow_pickle
+        self._objects_dir = os.path.join(root_dir, "objects")
+        self._models_dir = os.path.join(root_dir, "models")
+        self._lock = threading.Lock()
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._models_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Artifact storage
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str, fmt: ArtifactFormat) -> str:
+        return os.path.join(self._objects_dir, digest[:2], f"{digest}.{fmt.value}")
+
+    def _store_file(self, tmp_path: str, fmt: ArtifactFormat) -> Dict[str, Any]:
+        """Move a written temp file into content-addressed storage"""
+        digest = hashlib.sha256()
+        with open(tmp_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        size = os.path.getsize(tmp_path)
+        object_path = self._object_path(sha256, fmt)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        if os.path.exists(object_path):
+            # Identical content is already stored
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, object_path)
+        return {"sha256": sha256, "format": fmt.value, "size": size}
+
+    def _write_artifact(self, fmt: ArtifactFormat, writer) -> Dict[str, Any]:
+        fd, tmp_path = tempfile.mkstemp(dir=self._objects_dir, suffix=f".{fmt.value}.tmp")
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            return self._store_file(tmp_path, fmt)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_array(self, array: np.ndarray) -> Dict[str, Any]:
+        """Store a numpy array as a pickle-free .npy file"""
+        array = np.asarray(array)
+        if array.dtype == object:
+            raise ModelRegistryError("Object arrays cannot be stored without pickle")
+
+        def write(path):
+            with open(path, "wb") as f:
+                np.save(f, array, allow_pickle=False)
+
+        entry = self._write_artifact(ArtifactFormat.NUMPY, write)
+        entry.update({"shape": list(array.shape), "dtype": array.dtype.str})
+        return entry
+
+    def put_tensors(self, tensors: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a torch state dict (or dict of arrays) as safetensors"""
+        arrays = {
+            name: np.ascontiguousarray(t.detach().cpu().numpy() if hasattr(t, "detach") else np.asarray(t))
+            for name, t in tensors.items()
+        }
+        if SAFETENSORS_AVAILABLE:
+            return self._write_artifact(ArtifactFormat.SAFETENSORS, lambda path: save_safetensors(arrays, path))
+
+        def write(path):
+            with open(path, "wb") as f:
+                np.savez(f, **arrays)
+
+        return self._write_artifact(ArtifactFormat.NPZ, write)
+
+    def put_json(self, data: Any) -> Dict[str, Any]:
+        """Store JSON-serializable data"""
+        payload = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(payload)
+
+        return self._write_artifact(ArtifactFormat.JSON, write)
+
+    def put_estimator(self, estimator: Any) -> Dict[str, Any]:
+        """Store a scikit-learn estimator, with skops when available"""
+        if SKOPS_AVAILABLE:
+            return self._write_artifact(ArtifactFormat.SKOPS, lambda path: skops_io.dump(estimator, path))
+
+        import joblib
+        return self._write_artifact(ArtifactFormat.JOBLIB, lambda path: joblib.dump(estimator, path))
+
+    def _verify(self, path: str, sha256: str):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        if digest.hexdigest() != sha256:
+            raise ModelRegistryError(f"Artifact {sha256} is corrupted or was modified")
+
+    def get_artifact(self, entry: Dict[str, Any], mmap: bool = True, verify: bool = False) -> Any:
+        """
+        Load an artifact described by a manifest entry
+
+        Args:
+            entry: Artifact entry from a version manifest
+            mmap: Memory-map .npy arrays instead of reading them into memory
+            verify: Check the SHA-256 digest before loading (always done for pickle)
+
+        Returns:
+            The deserialized artifact
+        """
+        fmt = ArtifactFormat(entry["format"])
+        path = self._object_path(entry["sha256"], fmt)
+        if not os.path.exists(path):
+            raise ModelRegistryError(f"Artifact {entry['sha256']} is missing from the registry")
+
+        if fmt == ArtifactFormat.JOBLIB:
+            if not self.allow_pickle:
+                raise ModelRegistryError(
+                    "Refusing to load a pickle-based artifact; install skops, or set "
+                    f"{ALLOW_PICKLE_ENV}=true if the registry directory is trusted"
+                )
+            self._verify(path, entry["sha256"])
+            import joblib
+            return joblib.load(path)
+
+        if verify:
+            self._verify(path, entry["sha256"])
+        if fmt == ArtifactFormat.NUMPY:
+            return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        if fmt == ArtifactFormat.SAFETENSORS:
+            if not SAFETENSORS_AVAILABLE:
+                raise RuntimeError("safetensors is required to load this artifact; install safetensors")
+            return load_safetensors(path)
+        if fmt == ArtifactFormat.NPZ:
+            with np.load(path, allow_pickle=False) as data:
+                return {name: data[name] for name in data.files}
+        if fmt == ArtifactFormat.JSON:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        if not SKOPS_AVAILABLE:
+            raise RuntimeError("skops is required to load this artifact; install skops")
+        # skops refuses types that are not known to be safe
+        untrusted = skops_io.get_untrusted_types(file=path)
+        if untrusted:
+            raise ModelRegistryError(f"Artifact contains untrusted types: {untrusted}")
+        return skops_io.load(path)
+
+    # ------------------------------------------------------------------
+    # Versions and stages
+    # ------------------------------------------------------------------
+
+    def _model_dir(self, name: str) -> str:
+        if not _NAME_PATTERN.match(name):
+            raise ModelRegistryError(f"Invalid model name: {name}")
+        return os.path.join(self._models_dir, name)
+
+    def _write_json(self, path: str, data: Dict[str, Any]):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def register(self, name: str, artifacts: Dict[str, Dict[str, Any]],
+                 metrics: Optional[Dict[str, Any]] = None,
+                 parameters: Optional[Dict[str, Any]] = None,
+                 feature_schema: Optional[Dict[str, Any]] = None,
+                 training_data_hash: Optional[str] = None,
+                 tags: Optional[Dict[str, Any]] = None,
+                 stage: ModelStage = ModelStage.NONE) -> Dict[str, Any]:
+        """
+        Register a new version of a model
+
+        Args:
+            name: Model name; versions are numbered per name
+            artifacts: Artifact entries returned by the put_* methods, by role
+            metrics: Evaluation metrics
+            parameters: Hyperparameters and architecture settings
+            feature_schema: Serialized feature schema used for training
+            training_data_hash: Digest of the training data (see hash_arrays)
+            tags: Free-form metadata
+            stage: Initial stage of the version
+
+        Returns:
+            The version manifest
+        """
+        with self._lock:
+            versions_dir = os.path.join(self._model_dir(name), "versions")
+            os.makedirs(versions_dir, exist_ok=True)
+            existing = [int(f[:-5]) for f in os.listdir(versions_dir) if f.endswith(".json") and f[:-5].isdigit()]
+            version = max(existing, default=0) + 1
+            manifest = {
+                "name": name,
+                "version": version,
+                "created_at": datetime.utcnow().isoformat(),
+                "artifacts": artifacts,
+                "metrics": metrics or {},
+                "parameters": parameters or {},
+                "feature_schema": feature_schema,
+                "training_data_hash": training_data_hash,
+                "tags": tags or {},
+                "stage": ModelStage.NONE.value,
+                "stage_history": []
+            }
+            self._write_json(os.path.join(versions_dir, f"{version}.json"), manifest)
+
+        logger.info(f"Registered model {name} version {version}")
+        if stage != ModelStage.NONE:
+            manifest = self.promote(name, version, stage)
+        return manifest
+
+    def manifest_path(self, name: str, version: int) -> str:
+        """Path of a version manifest"""
+        return os.path.join(self._model_dir(name), "versions", f"{int(version)}.json")
+
+    def _stages_path(self, name: str) -> str:
+        return os.path.join(self._model_dir(name), "stages.json")
+
+    def _stages(self, name: str) -> Dict[str, int]:
+        path = self._stages_path(name)
+        return self._read_json(path) if os.path.exists(path) else {}
+
+    def get_version(self, name: str, version: Optional[int] = None,
+                    stage: Optional[ModelStage] = None) -> Dict[str, Any]:
+        """
+        Read a version manifest by number, by stage, or the latest version
+
+        Raises:
+            ModelRegistryError: If the model, version or stage does not exist
+        """
+        if version is None and stage is not None:
+            version = self._stages(name).get(stage.value)
+            if version is None:
+                raise ModelRegistryError(f"Model {name} has no {stage.value} version")
+        if version is None:
+            versions = self.list_versions(name)
+            if not versions:
+                raise ModelRegistryError(f"Model {name} not found")
+            return versions[-1]
+        path = self.manifest_path(name, version)
+        if not os.path.exists(path):
+            raise ModelRegistryError(f"Model {name} version {version} not found")
+        return self._read_json(path)
+
+    def list_versions(self, name: str) -> List[Dict[str, Any]]:
+        """All version manifests of a model, oldest first"""
+        versions_dir = os.path.join(self._model_dir(name), "versions")
+        if not os.path.isdir(versions_dir):
+            return []
+        numbers = sorted(int(f[:-5]) for f in os.listdir(versions_dir) if f.endswith(".json") and f[:-5].isdigit())
+        return [self._read_json(os.path.join(versions_dir, f"{n}.json")) for n in numbers]
+
+    def list_models(self) -> Dict[str, Dict[str, int]]:
+        """Registered model names with their stage pointers"""
+        return {
+            name: self._stages(name)
+            for name in sorted(os.listdir(self._models_dir))
+            if os.path.isdir(os.path.join(self._models_dir, name))
+        }
+
+    def promote(self, name: str, version: int, stage: ModelStage) -> Dict[str, Any]:
+        """
+        Move a version to a stage. The version previously in staging or
+        production is archived, so each of those stages holds one version.
+
+        Returns:
+            The updated version manifest
+        """
+        with self._lock:
+            manifest = self.get_version(name, version)
+            stages = self._stages(name)
+            versions_dir = os.path.join(self._model_dir(name), "versions")
+            now = datetime.utcnow().isoformat()
+
+            # Remove the version from whatever stage it held
+            for stage_name, stage_version in list(stages.items()):
+                if stage_version == version:
+                    del stages[stage_name]
+
+            if stage in (ModelStage.STAGING, ModelStage.PRODUCTION):
+                previous = stages.get(stage.value)
+                if previous is not None and previous != version:
+                    previous_manifest = self.get_version(name, previous)
+                    previous_manifest["stage"] = ModelStage.ARCHIVED.value
+                    previous_manifest["stage_history"].append({"stage": ModelStage.ARCHIVED.value, "at": now})
+                    self._write_json(os.path.join(versions_dir, f"{previous}.json"), previous_manifest)
+                stages[stage.value] = version
+
+            manifest["stage"] = stage.value
+            manifest["stage_history"].append({"stage": stage.value, "at": now})
+            self._write_json(os.path.join(versions_dir, f"{version}.json"), manifest)
+            self._write_json(self._stages_path(name), stages)
+
+        logger.info(f"Model {name} version {version} moved to {stage.value}")
+        return manifest
+
+    def load_artifacts(self, manifest: Dict[str, Any], names: Optional[Iterable[str]] = None,
+                       mmap: bool = True) -> Dict[str, Any]:
+        """Load the artifacts of a version manifest, optionally only some roles"""
+        wanted = set(names) if names is not None else None
+        return {
+            role: self.get_artifact(entry, mmap=mmap)
+            for role, entry in manifest["artifacts"].items()
+            if wanted is None or role in wanted
+        }